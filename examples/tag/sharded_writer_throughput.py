@@ -0,0 +1,28 @@
+import time
+
+from nisystemlink.clients.tag import DataType, TagData, TagManager
+
+NUM_WRITES = 20000
+PATHS = ["MyTags.Throughput.Tag{}".format(i) for i in range(256)]
+
+mgr = TagManager()
+mgr.update([TagData(path, DataType.INT32) for path in PATHS])
+
+# Compare how fast writers with different numbers of shards send the same writes.
+# Each shard sends its buffers over its own connection, so more shards help most when
+# the server is far away.
+for num_shards in (1, 2, 4, 8):
+    with mgr.create_sharded_writer(num_shards=num_shards, buffer_size=50) as writer:
+        # Open every shard's connection before timing
+        writer.write_many(PATHS, DataType.INT32, [0] * len(PATHS))
+        writer.send_buffered_writes()
+
+        start = time.perf_counter()
+        for i in range(NUM_WRITES):
+            writer.write(PATHS[i % len(PATHS)], DataType.INT32, i)
+        writer.send_buffered_writes()
+        elapsed = time.perf_counter() - start
+
+    print("{} shard(s): {:,.0f} writes/s".format(num_shards, NUM_WRITES / elapsed))
+
+mgr.delete(PATHS)
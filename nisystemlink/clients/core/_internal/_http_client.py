@@ -2,11 +2,13 @@
 
 """Implementation of HttpClient."""
 
+import asyncio
 import json.decoder
 import sys
 import threading
 import typing
 import urllib.parse
+import weakref
 from typing import Any, Awaitable, Dict, Iterable, Optional, Tuple, Union
 
 from nisystemlink.clients import core
@@ -41,7 +43,11 @@ class HttpClient:
         # - https://toolbelt.readthedocs.io/en/latest/threading.html
         # - "there are still a couple corner cases where it isn't perfectly threadsafe"
         self._clients = {}  # type: Dict[int, Client]
-        self._aclients = {}  # type: Dict[int, AsyncClient]
+        # Keep an async client per event loop, so that all requests made from a loop
+        # share its connection pool, but a pool is never used from a different loop
+        self._aclients = (
+            weakref.WeakKeyDictionary()
+        )  # type: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]
 
     def at_uri(self, uri: str) -> "_HttpClientAtUri":
         """Get a client interface for which all queries are relative to ``uri``."""
@@ -62,12 +68,14 @@ class HttpClient:
 
     @property
     def _async_client(self) -> AsyncClient:
-        thread_id = threading.get_ident()
-        if thread_id not in self._clients:
+        loop = asyncio.get_event_loop()
+        client = self._aclients.get(loop)
+        if client is None:
             if sys.version_info < (3, 6):
                 raise RuntimeError("async support is only available for python 3.6+")
-            self._aclients[thread_id] = AsyncClient(**self._kwargs)
-        return self._aclients[thread_id]
+            client = AsyncClient(**self._kwargs)
+            self._aclients[loop] = client
+        return client
 
 
 class _HttpClientAtUri:
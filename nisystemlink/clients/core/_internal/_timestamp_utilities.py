@@ -2,10 +2,39 @@
 
 """Implementation of TimestampUtilities."""
 
+import array
 import datetime
+import functools
+import re
+from typing import Iterable, List, Tuple
 
 from typing_extensions import final
 
+_UTC = datetime.timezone.utc
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_NS_PER_SECOND = 1000000000
+_NS_PER_DAY = 86400 * _NS_PER_SECOND
+
+# The timestamps written by SystemLink: an ASCII date and time with optional fractional
+# seconds of any precision, in UTC. Anything else is left to the slower, more lenient
+# parser.
+_TIMESTAMP = re.compile(
+    r"([0-9]{4}-[0-9]{2}-[0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]*))?Z"
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _format_date(ordinal: int) -> str:
+    # Timestamps written or read together are usually on the same few days, so the
+    # date part of the string is cached by day
+    return datetime.date.fromordinal(ordinal).isoformat() + "T"
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_date(text: str) -> Tuple[int, int, int, int]:
+    date = datetime.date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+    return date.year, date.month, date.day, date.toordinal()
+
 
 @final
 class TimestampUtilities:
@@ -25,17 +54,36 @@ class TimestampUtilities:
         """Convert the given ``datetime.datetime`` into a string timestamp in the standard format used in SystemLink.
 
         Args:
-            value: The date and time to convert.
+            value: The date and time to convert. Naive values are assumed to be in
+                local time.
 
         Returns:
             The string representation of the timestamp.
         """
-        return datetime.datetime.utcfromtimestamp(value.timestamp()).isoformat() + "Z"
+        if value.tzinfo is not _UTC:
+            value = value.astimezone(_UTC)
+        microsecond = value.microsecond
+        if microsecond:
+            return "%s%02d:%02d:%02d.%06dZ" % (
+                _format_date(value.toordinal()),
+                value.hour,
+                value.minute,
+                value.second,
+                microsecond,
+            )
+        return "%s%02d:%02d:%02dZ" % (
+            _format_date(value.toordinal()),
+            value.hour,
+            value.minute,
+            value.second,
+        )
 
     @classmethod
     def str_to_datetime(cls, timestamp: str) -> datetime.datetime:
         """Attempt to parse a SystemLink-formatted timestamp string into a ``datetime.datetime``.
 
+        Fractional seconds beyond microseconds are truncated, and may be omitted.
+
         Args:
             timestamp: The timestamp to parse, in the standard format used in
                 SystemLink.
@@ -46,14 +94,184 @@ class TimestampUtilities:
         Raises:
             ValueError: if the timestamp format is not as expected
         """
-        # Python's supported ISO format requires exactly 6 digits after the
-        # decimal, and doesn't support "Z" as the timezone
-        # Valid format is: YYYY-MM-DDThh:mm:ss.ssssss+NN:NN
         if not timestamp.endswith("Z"):
             raise ValueError(
                 "Given timestamp doesn't end with 'Z': '{}'".format(timestamp)
             )
-        timestamp = timestamp[:-1].ljust(26, "0")[:26] + "+0000"
+        match = _TIMESTAMP.fullmatch(timestamp)
+        if match is None:
+            return cls._parse_lenient(timestamp)
+
+        date, hour, minute, second, fraction = match.groups()
+        year, month, day, _ = _parse_date(date)
         # Note to users: this will be in UTC time; to get a local datetime, you
         # can use value.astimezone()
+        return datetime.datetime(
+            year,
+            month,
+            day,
+            int(hour),
+            int(minute),
+            int(second),
+            int(fraction[:6].ljust(6, "0")) if fraction else 0,
+            _UTC,
+        )
+
+    @classmethod
+    def epoch_ns_to_str(cls, value: int) -> str:
+        """Convert a number of nanoseconds since the Unix epoch into a string timestamp
+        in the standard format used in SystemLink.
+
+        The result is the same as :meth:`datetime_to_str` for the equivalent
+        ``datetime.datetime``, except that nine fractional digits are written when
+        the value isn't a whole number of microseconds.
+
+        Args:
+            value: The number of nanoseconds since 1970-01-01T00:00:00Z.
+
+        Returns:
+            The string representation of the timestamp.
+
+        Raises:
+            ValueError: if ``value`` is outside the range of ``datetime.datetime``.
+        """
+        days, nanoseconds = divmod(value, _NS_PER_DAY)
+        try:
+            date = _format_date(days + _EPOCH_ORDINAL)
+        except OverflowError:
+            raise ValueError("Timestamp out of range: {}".format(value))
+        seconds, nanoseconds = divmod(nanoseconds, _NS_PER_SECOND)
+        hour, seconds = divmod(seconds, 3600)
+        minute, second = divmod(seconds, 60)
+        if nanoseconds % 1000:
+            return "%s%02d:%02d:%02d.%09dZ" % (date, hour, minute, second, nanoseconds)
+        if nanoseconds:
+            return "%s%02d:%02d:%02d.%06dZ" % (
+                date,
+                hour,
+                minute,
+                second,
+                nanoseconds // 1000,
+            )
+        return "%s%02d:%02d:%02dZ" % (date, hour, minute, second)
+
+    @classmethod
+    def str_to_epoch_ns(cls, timestamp: str) -> int:
+        """Parse a SystemLink-formatted timestamp string into a number of nanoseconds
+        since the Unix epoch.
+
+        Unlike :meth:`str_to_datetime`, up to nine fractional digits are kept.
+
+        Args:
+            timestamp: The timestamp to parse, in the standard format used in
+                SystemLink.
+
+        Returns:
+            The number of nanoseconds since 1970-01-01T00:00:00Z.
+
+        Raises:
+            ValueError: if the timestamp format is not as expected
+        """
+        match = _TIMESTAMP.fullmatch(timestamp)
+        if match is None:
+            value = cls.str_to_datetime(timestamp)
+            return (
+                (value.toordinal() - _EPOCH_ORDINAL) * 86400
+                + value.hour * 3600
+                + value.minute * 60
+                + value.second
+            ) * _NS_PER_SECOND + value.microsecond * 1000
+
+        date, hour, minute, second, fraction = match.groups()
+        _, _, _, ordinal = _parse_date(date)
+        hours, minutes, seconds = int(hour), int(minute), int(second)
+        if hours > 23 or minutes > 59 or seconds > 59:
+            raise ValueError("Given timestamp is not valid: '{}'".format(timestamp))
+        return (
+            (ordinal - _EPOCH_ORDINAL) * 86400 + hours * 3600 + minutes * 60 + seconds
+        ) * _NS_PER_SECOND + (int(fraction[:9].ljust(9, "0")) if fraction else 0)
+
+    @classmethod
+    def datetimes_to_strs(cls, values: Iterable[datetime.datetime]) -> List[str]:
+        """Convert several ``datetime.datetime`` values into string timestamps.
+
+        Args:
+            values: The dates and times to convert.
+
+        Returns:
+            The string representation of each timestamp, as returned by
+            :meth:`datetime_to_str`.
+        """
+        convert = cls.datetime_to_str
+        return [convert(v) for v in values]
+
+    @classmethod
+    def strs_to_datetimes(cls, timestamps: Iterable[str]) -> List[datetime.datetime]:
+        """Parse several SystemLink-formatted timestamp strings.
+
+        Args:
+            timestamps: The timestamps to parse.
+
+        Returns:
+            The parsed datetimes, as returned by :meth:`str_to_datetime`.
+
+        Raises:
+            ValueError: if the format of any timestamp is not as expected
+        """
+        convert = cls.str_to_datetime
+        return [convert(t) for t in timestamps]
+
+    @classmethod
+    def epoch_ns_to_strs(cls, values: Iterable[int]) -> List[str]:
+        """Convert several numbers of nanoseconds since the Unix epoch into string
+        timestamps.
+
+        Args:
+            values: The numbers of nanoseconds since 1970-01-01T00:00:00Z, such as an
+                ``array.array("q")``, or a NumPy ``int64`` array or ``datetime64[ns]``
+                array viewed as ``int64``.
+
+        Returns:
+            The string representation of each timestamp, as returned by
+            :meth:`epoch_ns_to_str`.
+
+        Raises:
+            ValueError: if any value is outside the range of ``datetime.datetime``.
+        """
+        if hasattr(values, "tolist"):
+            # Converting arrays to Python integers all at once is much faster than
+            # converting each element as it is formatted
+            values = values.tolist()  # type: ignore
+        convert = cls.epoch_ns_to_str
+        return [convert(v) for v in values]
+
+    @classmethod
+    def strs_to_epoch_ns(cls, timestamps: Iterable[str]) -> "array.array[int]":
+        """Parse several SystemLink-formatted timestamp strings into numbers of
+        nanoseconds since the Unix epoch.
+
+        The result can be used as a NumPy array without copying, for example with
+        ``numpy.frombuffer(result, dtype="datetime64[ns]")``.
+
+        Args:
+            timestamps: The timestamps to parse.
+
+        Returns:
+            An ``array.array("q")`` containing the number of nanoseconds since
+            1970-01-01T00:00:00Z for each timestamp.
+
+        Raises:
+            ValueError: if the format of any timestamp is not as expected
+            OverflowError: if any timestamp is too far from 1970 to be represented
+                as a 64-bit number of nanoseconds.
+        """
+        convert = cls.str_to_epoch_ns
+        return array.array("q", [convert(t) for t in timestamps])
+
+    @classmethod
+    def _parse_lenient(cls, timestamp: str) -> datetime.datetime:
+        # Python's supported ISO format requires exactly 6 digits after the
+        # decimal, and doesn't support "Z" as the timezone
+        # Valid format is: YYYY-MM-DDThh:mm:ss.ssssss+NN:NN
+        timestamp = timestamp[:-1].ljust(26, "0")[:26] + "+0000"
         return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
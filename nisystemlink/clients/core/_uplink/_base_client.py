@@ -1,7 +1,16 @@
 # mypy: disable-error-code = misc
 
 from json import loads
-from typing import Any, Callable, Dict, get_origin, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    get_origin,
+    Optional,
+    Type,
+    Union,
+)
 
 from nisystemlink.clients import core
 from pydantic import parse_obj_as
@@ -41,6 +50,9 @@ def _handle_http_status(response: Response) -> Optional[Response]:
 
 
 class _JsonModelConverter(converters.Factory):
+    def __init__(self, trusted_types: Collection[Type[JsonModel]] = ()) -> None:
+        self._trusted_types = frozenset(trusted_types)
+
     def create_request_body_converter(
         self, _class: Type, _: commands.RequestDefinition
     ) -> Optional[Callable[[JsonModel], Dict]]:
@@ -63,7 +75,17 @@ class _JsonModelConverter(converters.Factory):
 
             return parse_obj_as(_class, data)
 
-        if get_origin(_class) is Union or utils.is_subclass(_class, JsonModel):
+        def trusted_decoder(response: Response) -> Any:
+            try:
+                data = response.json()
+            except AttributeError:
+                data = response
+
+            return _class._construct_from_trusted_obj(data)
+
+        if _class in self._trusted_types:
+            return trusted_decoder
+        elif get_origin(_class) is Union or utils.is_subclass(_class, JsonModel):
             return decoder
         else:
             return None
@@ -72,16 +94,25 @@ class _JsonModelConverter(converters.Factory):
 class BaseClient(Consumer):
     """Base class for SystemLink clients, built on top of `Uplink <https://github.com/prkumar/uplink>`_."""
 
-    def __init__(self, configuration: core.HttpConfiguration, base_path: str = ""):
+    def __init__(
+        self,
+        configuration: core.HttpConfiguration,
+        base_path: str = "",
+        *,
+        trusted_response_types: Collection[Type[JsonModel]] = ()
+    ):
         """Initialize an instance.
 
         Args:
             configuration: Defines the web server to connect to and information about how to connect.
             base_path: The base path for all API calls.
+            trusted_response_types: Response models that are built directly from the
+                server's JSON without being validated. Only models whose fields are
+                already in their JSON representation may be trusted.
         """
         super().__init__(
             base_url=configuration.server_uri + base_path,
-            converter=_JsonModelConverter(),
+            converter=_JsonModelConverter(trusted_response_types),
             hooks=[_handle_http_status],
         )
         if configuration.api_keys:
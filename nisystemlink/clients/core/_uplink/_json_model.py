@@ -1,4 +1,11 @@
+from typing import Any, Dict, Type, TypeVar
+
 from pydantic import BaseModel, Extra
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+from pydantic.utils import lenient_issubclass
+
+
+_T = TypeVar("_T", bound="JsonModel")
 
 
 def _camelcase(s: str) -> str:
@@ -14,3 +21,36 @@ class JsonModel(BaseModel):
         alias_generator = _camelcase
         allow_population_by_field_name = True
         extra = Extra.ignore
+
+    @classmethod
+    def _construct_from_trusted_obj(cls: Type[_T], obj: Dict[str, Any]) -> _T:
+        """Build an instance from trusted JSON data without running any validation.
+
+        Nested models (and lists of nested models) are built recursively. All other
+        values are used exactly as they appear in ``obj``, so this must only be used
+        for models whose fields are already in their JSON representation, such as
+        strings, numbers, and lists of those.
+
+        Args:
+            obj: The decoded JSON object, keyed by field alias or field name.
+
+        Returns:
+            The constructed model.
+        """
+        values = {}
+        for name, field in cls.__fields__.items():
+            if field.alias in obj:
+                value = obj[field.alias]
+            elif name in obj:
+                value = obj[name]
+            else:
+                continue
+
+            if value is not None and lenient_issubclass(field.type_, JsonModel):
+                if field.shape == SHAPE_SINGLETON:
+                    value = field.type_._construct_from_trusted_obj(value)
+                elif field.shape == SHAPE_LIST:
+                    value = [field.type_._construct_from_trusted_obj(v) for v in value]
+            values[name] = value
+
+        return cls.construct(_fields_set=set(values), **values)
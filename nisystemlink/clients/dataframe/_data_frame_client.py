@@ -1,9 +1,10 @@
 """Implementation of DataFrameClient."""
 
-from typing import List, Optional
+from typing import List, Optional, Type
 
 from nisystemlink.clients import core
 from nisystemlink.clients.core._uplink._base_client import BaseClient
+from nisystemlink.clients.core._uplink._json_model import JsonModel
 from nisystemlink.clients.core._uplink._methods import (
     delete,
     get,
@@ -19,7 +20,12 @@ from . import models
 
 
 class DataFrameClient(BaseClient):
-    def __init__(self, configuration: Optional[core.HttpConfiguration] = None):
+    def __init__(
+        self,
+        configuration: Optional[core.HttpConfiguration] = None,
+        *,
+        validate_table_data: bool = True,
+    ):
         """Initialize an instance.
 
         Args:
@@ -27,6 +33,11 @@ class DataFrameClient(BaseClient):
                 how to connect. If not provided, an instance of
                 :class:`JupyterHttpConfiguration <nisystemlink.clients.core.JupyterHttpConfiguration>`
                 is used.
+            validate_table_data: Whether to validate every cell of the data returned
+                by :meth:`get_table_data`, :meth:`query_table_data`, and
+                :meth:`query_decimated_data`. When False, the response from the
+                DataFrame Service is trusted and the models are built directly from
+                it, which is considerably faster for large pages of data.
 
         Raises:
             ApiException: if unable to communicate with the DataFrame Service.
@@ -34,7 +45,14 @@ class DataFrameClient(BaseClient):
         if configuration is None:
             configuration = core.JupyterHttpConfiguration()
 
-        super().__init__(configuration, "/nidataframe/v1/")
+        trusted_response_types = []  # type: List[Type[JsonModel]]
+        if not validate_table_data:
+            trusted_response_types = [models.PagedTableRows, models.TableRows]
+        super().__init__(
+            configuration,
+            "/nidataframe/v1/",
+            trusted_response_types=trusted_response_types,
+        )
 
     @get("")
     def api_info(self) -> models.ApiInfo:
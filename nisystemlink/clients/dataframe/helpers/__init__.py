@@ -0,0 +1,20 @@
+from ._columnar_frame import ColumnarFrame
+from ._filter_expression import (
+    col,
+    ColumnExpression,
+    CompiledFilter,
+    FilterExpression,
+    FilterValue,
+    predicate,
+    query_filtered_data,
+)
+from ._table_catalog import (
+    iter_query_tables,
+    iter_query_tables_partitioned,
+    iter_tables,
+    partition_by_created_at,
+    partition_by_workspace,
+)
+from ._table_file_export import export_table_to_file, TableFileFormat
+
+# flake8: noqa
@@ -0,0 +1,692 @@
+"""Implementation of ColumnarFrame."""
+
+import abc
+import copy
+import itertools
+import math
+import re
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from nisystemlink.clients.dataframe import models
+
+if TYPE_CHECKING:
+    from nisystemlink.clients.dataframe import DataFrameClient
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+_ONE_MILLISECOND = timedelta(milliseconds=1)
+
+_TIMESTAMP_PATTERN = re.compile(
+    r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(?:Z|([+-])(\d{2}):?(\d{2}))?$"
+)
+
+
+def _parse_bool(value: str) -> int:
+    return 1 if value.lower() == "true" else 0
+
+
+def _format_bool(value: int) -> str:
+    return "true" if value else "false"
+
+
+def _format_float(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    # 9 significant digits are enough to round-trip any 32-bit float
+    return "{:.9g}".format(value)
+
+
+def _format_double(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return repr(value)
+
+
+def _parse_timestamp(value: str) -> int:
+    """Parse an ISO-8601 timestamp into milliseconds since the Unix epoch."""
+    match = _TIMESTAMP_PATTERN.match(value)
+    if match is None:
+        raise ValueError("Invalid timestamp '{}'".format(value))
+    seconds, fraction, sign, offset_hours, offset_minutes = match.groups()
+    result = (datetime.fromisoformat(seconds) - _NAIVE_EPOCH) // _ONE_MILLISECOND
+    if fraction:
+        result += int(fraction[:3].ljust(3, "0"))
+    if sign:
+        offset = (int(offset_hours) * 60 + int(offset_minutes)) * 60000
+        result += -offset if sign == "+" else offset
+    return result
+
+
+def _to_datetime(value: int) -> datetime:
+    return _EPOCH + timedelta(milliseconds=value)
+
+
+def _format_timestamp(value: int) -> str:
+    return _to_datetime(value).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class _Column(abc.ABC):
+    """Storage for the values of a single column, plus a lazily-created null mask."""
+
+    def __init__(self, typecode: str) -> None:
+        self.buffer = array(typecode)
+        self._length = 0
+        self._nulls = None  # type: Optional[bytearray]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            if self._nulls is None:
+                self._nulls = bytearray(self._length)
+            self._nulls.append(1)
+            self._append_placeholder()
+        else:
+            if self._nulls is not None:
+                self._nulls.append(0)
+            self._append_value(value)
+        self._length += 1
+
+    def extend(self, other: "_Column") -> None:
+        """Append the values of ``other``, an :meth:`empty_like` column."""
+        if other._nulls is not None:
+            if self._nulls is None:
+                self._nulls = bytearray(self._length)
+            self._nulls += other._nulls
+        elif self._nulls is not None:
+            self._nulls += bytes(other._length)
+        self._extend_buffer(other)
+        self._length += other._length
+
+    def empty_like(self) -> "_Column":
+        """Create an empty column of the same type, to parse values into."""
+        result = copy.copy(self)
+        result.buffer = array(self.buffer.typecode)
+        result._nulls = None
+        result._length = 0
+        return result
+
+    def get(self, index: int) -> Any:
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        return self._get_value(index)
+
+    def get_serialized(self, index: int) -> Optional[str]:
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        return self._get_serialized_value(index)
+
+    def values(self) -> List[Any]:
+        return [self.get(i) for i in range(self._length)]
+
+    @property
+    def nulls(self) -> Optional[bytearray]:
+        return self._nulls
+
+    def take(self, indices: Sequence[int]) -> "_Column":
+        result = copy.copy(self)
+        result.buffer = array(
+            self.buffer.typecode, map(self.buffer.__getitem__, indices)
+        )
+        if self._nulls is not None:
+            result._nulls = bytearray(map(self._nulls.__getitem__, indices))
+        result._length = len(indices)
+        return result
+
+    @abc.abstractmethod
+    def _append_placeholder(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _append_value(self, value: str) -> None:
+        ...
+
+    def _extend_buffer(self, other: "_Column") -> None:
+        self.buffer.extend(other.buffer)
+
+    @abc.abstractmethod
+    def _get_value(self, index: int) -> Any:
+        ...
+
+    @abc.abstractmethod
+    def _get_serialized_value(self, index: int) -> str:
+        ...
+
+
+class _PackedColumn(_Column):
+    """A column of fixed-size values packed into an :class:`array.array`."""
+
+    def __init__(
+        self,
+        typecode: str,
+        parse: Callable[[str], Any],
+        convert: Callable[[Any], Any],
+        serialize: Callable[[Any], str],
+    ) -> None:
+        super().__init__(typecode)
+        self._parse = parse
+        self._convert = convert
+        self._serialize = serialize
+
+    def _append_placeholder(self) -> None:
+        self.buffer.append(0)
+
+    def _append_value(self, value: str) -> None:
+        self.buffer.append(self._parse(value))
+
+    def _get_value(self, index: int) -> Any:
+        return self._convert(self.buffer[index])
+
+    def _get_serialized_value(self, index: int) -> str:
+        return self._serialize(self.buffer[index])
+
+
+class _DictionaryColumn(_Column):
+    """A column of strings, stored as indexes into a dictionary of distinct values."""
+
+    def __init__(self) -> None:
+        super().__init__("i")
+        self.categories = []  # type: List[str]
+        self._codes = {}  # type: Dict[str, int]
+
+    def take(self, indices: Sequence[int]) -> "_Column":
+        result = super().take(indices)
+        assert isinstance(result, _DictionaryColumn)
+        result.categories = list(self.categories)
+        result._codes = dict(self._codes)
+        return result
+
+    def empty_like(self) -> "_Column":
+        result = super().empty_like()
+        assert isinstance(result, _DictionaryColumn)
+        result.categories = []
+        result._codes = {}
+        return result
+
+    def _append_placeholder(self) -> None:
+        self.buffer.append(-1)
+
+    def _append_value(self, value: str) -> None:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.categories)
+            self.categories.append(value)
+        self.buffer.append(code)
+
+    def _get_value(self, index: int) -> str:
+        return self.categories[self.buffer[index]]
+
+    def _extend_buffer(self, other: "_Column") -> None:
+        assert isinstance(other, _DictionaryColumn)
+        # Translate the codes of the other column's categories into this column's
+        codes = [0] * len(other.categories)
+        for i, value in enumerate(other.categories):
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self.categories)
+                self.categories.append(value)
+            codes[i] = code
+        if codes == list(range(len(codes))):
+            self.buffer.extend(other.buffer)
+        else:
+            self.buffer.extend(codes[c] if c >= 0 else -1 for c in other.buffer)
+
+    _get_serialized_value = _get_value
+
+
+def _create_column(data_type: models.DataType) -> _Column:
+    if data_type == models.DataType.String:
+        return _DictionaryColumn()
+    elif data_type == models.DataType.Bool:
+        return _PackedColumn("b", _parse_bool, bool, _format_bool)
+    elif data_type == models.DataType.Int32:
+        return _PackedColumn("i", int, int, str)
+    elif data_type == models.DataType.Int64:
+        return _PackedColumn("q", int, int, str)
+    elif data_type == models.DataType.Float32:
+        return _PackedColumn("f", float, float, _format_float)
+    elif data_type == models.DataType.Float64:
+        return _PackedColumn("d", float, float, _format_double)
+    elif data_type == models.DataType.Timestamp:
+        return _PackedColumn("q", _parse_timestamp, _to_datetime, _format_timestamp)
+    else:
+        raise ValueError("Unsupported data type {}".format(data_type))
+
+
+class ColumnarFrame:
+    """A compact, column-oriented container for rows of table data.
+
+    A :class:`DataFrame <nisystemlink.clients.dataframe.models.DataFrame>` holds every
+    cell as a separate Python string. This container instead parses each value
+    according to its column's :class:`DataType
+    <nisystemlink.clients.dataframe.models.DataType>` and stores it column by column:
+
+    * BOOL, INT32, INT64, FLOAT32, FLOAT64, and TIMESTAMP values are packed into
+      :class:`array.array` buffers. Timestamps are stored as milliseconds since the
+      Unix epoch.
+    * STRING values are dictionary-encoded, so each distinct string is only stored
+      once.
+
+    Null values are tracked in a separate mask that is only allocated once a column
+    contains a null.
+    """
+
+    def __init__(self, columns: Sequence[models.Column]) -> None:
+        """Initialize an empty frame.
+
+        Args:
+            columns: The columns of the frame, in order.
+
+        Raises:
+            ValueError: if ``columns`` contains duplicate names.
+        """
+        self._names = [c.name for c in columns]
+        self._data_types = [c.data_type for c in columns]
+        self._index = {name: i for i, name in enumerate(self._names)}
+        if len(self._index) != len(self._names):
+            raise ValueError("columns contains duplicate names")
+        self._columns = [_create_column(t) for t in self._data_types]
+        self._length = 0
+
+    @classmethod
+    def iter_table_data(
+        cls,
+        client: "DataFrameClient",
+        id: str,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        order_by_descending: Optional[bool] = None,
+        take: Optional[int] = None,
+    ) -> Iterator["ColumnarFrame"]:
+        """Read all pages of data from a table, yielding one frame per page.
+
+        Continuation tokens are followed until all rows have been read. Only one page
+        is held in memory at a time.
+
+        Args:
+            client: The client to use to read the data.
+            id: Unique ID of a data table.
+            columns: Columns to include in the frames. All columns are included if
+                not specified.
+            order_by: List of columns to sort by.
+            order_by_descending: Whether to sort descending instead of ascending.
+            take: The number of rows to request in each page.
+
+        Returns:
+            An iterator over the pages of data.
+
+        Raises:
+            ApiException: if unable to communicate with the DataFrame Service
+                or provided an invalid argument.
+        """
+        table_columns = cls._select_columns(client, id, columns)
+        continuation_token = None  # type: Optional[str]
+        while True:
+            response = client.get_table_data(
+                id,
+                columns=columns,
+                order_by=order_by,
+                order_by_descending=order_by_descending,
+                take=take,
+                continuation_token=continuation_token,
+            )
+            frame = ColumnarFrame(table_columns)
+            frame.append(response.frame)
+            yield frame
+
+            continuation_token = response.continuation_token
+            if continuation_token is None:
+                return
+
+    @classmethod
+    def from_table_data(
+        cls,
+        client: "DataFrameClient",
+        id: str,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        order_by_descending: Optional[bool] = None,
+        take: Optional[int] = None,
+    ) -> "ColumnarFrame":
+        """Read all pages of data from a table into a single frame.
+
+        Args:
+            client: The client to use to read the data.
+            id: Unique ID of a data table.
+            columns: Columns to include in the frame. All columns are included if not
+                specified.
+            order_by: List of columns to sort by.
+            order_by_descending: Whether to sort descending instead of ascending.
+            take: The number of rows to request in each page.
+
+        Returns:
+            A frame containing all of the rows.
+
+        Raises:
+            ApiException: if unable to communicate with the DataFrame Service
+                or provided an invalid argument.
+        """
+        result = ColumnarFrame(cls._select_columns(client, id, columns))
+        continuation_token = None  # type: Optional[str]
+        while True:
+            response = client.get_table_data(
+                id,
+                columns=columns,
+                order_by=order_by,
+                order_by_descending=order_by_descending,
+                take=take,
+                continuation_token=continuation_token,
+            )
+            result.append(response.frame)
+
+            continuation_token = response.continuation_token
+            if continuation_token is None:
+                return result
+
+    @classmethod
+    def iter_query(
+        cls,
+        client: "DataFrameClient",
+        id: str,
+        query: models.QueryTableDataRequest,
+    ) -> Iterator["ColumnarFrame"]:
+        """Query a table for rows of data, yielding one frame per page of results.
+
+        Continuation tokens are followed until all rows have been read, starting from
+        ``query.continuation_token``. Only one page is held in memory at a time.
+
+        Args:
+            client: The client to use to query the data.
+            id: Unique ID of a data table.
+            query: The filtering and sorting to apply when reading data.
+
+        Returns:
+            An iterator over the pages of results.
+
+        Raises:
+            ApiException: if unable to communicate with the DataFrame Service
+                or provided an invalid argument.
+        """
+        table_columns = cls._select_columns(client, id, query.columns)
+        for response in cls._query_pages(client, id, query):
+            frame = ColumnarFrame(table_columns)
+            frame.append(response.frame)
+            yield frame
+
+    @classmethod
+    def from_query(
+        cls,
+        client: "DataFrameClient",
+        id: str,
+        query: models.QueryTableDataRequest,
+    ) -> "ColumnarFrame":
+        """Query a table for rows of data, reading all pages of results into a single frame.
+
+        Args:
+            client: The client to use to query the data.
+            id: Unique ID of a data table.
+            query: The filtering and sorting to apply when reading data.
+
+        Returns:
+            A frame containing all of the matching rows.
+
+        Raises:
+            ApiException: if unable to communicate with the DataFrame Service
+                or provided an invalid argument.
+        """
+        result = ColumnarFrame(cls._select_columns(client, id, query.columns))
+        for response in cls._query_pages(client, id, query):
+            result.append(response.frame)
+        return result
+
+    @property
+    def columns(self) -> List[str]:  # noqa: D401
+        """The names of the columns in the frame, in order."""
+        return list(self._names)
+
+    @property
+    def data_types(self) -> List[models.DataType]:  # noqa: D401
+        """The data types of the columns in the frame, in order."""
+        return list(self._data_types)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over the rows of the frame.
+
+        Each row is a tuple with one value per column. Values are converted to
+        ``bool``, ``int``, ``float``, ``str``, or a UTC ``datetime.datetime``
+        according to the column's data type, or ``None`` for null values.
+        """
+        columns = self._columns
+        for i in range(self._length):
+            yield tuple(c.get(i) for c in columns)
+
+    def row(self, index: int) -> Tuple[Any, ...]:
+        """Get a single row of the frame.
+
+        Args:
+            index: The index of the row.
+
+        Returns:
+            A tuple with one value per column.
+
+        Raises:
+            IndexError: if ``index`` is out of range.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return tuple(c.get(index) for c in self._columns)
+
+    def column(self, name: str) -> List[Any]:
+        """Get all values of a column.
+
+        Args:
+            name: The name of the column.
+
+        Returns:
+            The values of the column, converted according to the column's data type.
+
+        Raises:
+            KeyError: if the frame doesn't have a column named ``name``.
+        """
+        return self._columns[self._index[name]].values()
+
+    def buffer(self, name: str) -> array:
+        """Get the packed storage of a column without converting any values.
+
+        For STRING columns, the buffer contains indexes into :meth:`categories`. For
+        TIMESTAMP columns, the buffer contains milliseconds since the Unix epoch. The
+        value stored for null entries is unspecified.
+
+        Args:
+            name: The name of the column.
+
+        Returns:
+            The array backing the column. It must not be modified.
+
+        Raises:
+            KeyError: if the frame doesn't have a column named ``name``.
+        """
+        return self._columns[self._index[name]].buffer
+
+    def null_mask(self, name: str) -> Optional[bytearray]:
+        """Get the null mask of a column.
+
+        Args:
+            name: The name of the column.
+
+        Returns:
+            One byte per row, which is non-zero if the value in that row is null, or
+            ``None`` if the column doesn't contain any nulls. It must not be modified.
+
+        Raises:
+            KeyError: if the frame doesn't have a column named ``name``.
+        """
+        return self._columns[self._index[name]].nulls
+
+    def categories(self, name: str) -> List[str]:
+        """Get the distinct values of a STRING column, indexed by the values in :meth:`buffer`.
+
+        Args:
+            name: The name of the column.
+
+        Returns:
+            The distinct values of the column.
+
+        Raises:
+            KeyError: if the frame doesn't have a column named ``name``.
+            ValueError: if the column is not a STRING column.
+        """
+        column = self._columns[self._index[name]]
+        if not isinstance(column, _DictionaryColumn):
+            raise ValueError("Column '{}' is not a STRING column".format(name))
+        return list(column.categories)
+
+    def append(self, frame: models.DataFrame) -> None:
+        """Append the rows of a data frame read from a table.
+
+        Args:
+            frame: The rows to append. If ``frame.columns`` is set, its columns must
+                match those of this frame, but may be in a different order.
+
+        Raises:
+            ValueError: if ``frame`` has different columns than this frame.
+            ValueError: if a row of ``frame`` doesn't have one value per column, or
+                has a value that can't be parsed as the column's data type. The frame
+                is left unchanged.
+        """
+        columns = self._columns
+        if frame.columns is not None and frame.columns != self._names:
+            if sorted(frame.columns) != sorted(self._names):
+                raise ValueError("frame has different columns than the ColumnarFrame")
+            columns = [columns[self._index[name]] for name in frame.columns]
+
+        width = len(columns)
+        for row in frame.data:
+            if len(row) != width:
+                raise ValueError(
+                    "frame has a row with {} values, but {} columns".format(
+                        len(row), width
+                    )
+                )
+
+        # Parse every value before changing any column, so that a value that can't be
+        # parsed leaves the frame unchanged
+        parsed = [c.empty_like() for c in columns]
+        appenders = [c.append for c in parsed]
+        for row in frame.data:
+            for append, value in zip(appenders, row):
+                append(value)
+        for column, values in zip(columns, parsed):
+            column.extend(values)
+        self._length += len(frame.data)
+
+    def filter(self, mask: Sequence[int]) -> "ColumnarFrame":
+        """Create a new frame containing the rows selected by a mask.
+
+        Args:
+            mask: One entry per row, which is non-zero if the row should be included.
+
+        Returns:
+            A new frame containing the selected rows, in order.
+
+        Raises:
+            ValueError: if ``mask`` doesn't have one entry per row.
+        """
+        if len(mask) != self._length:
+            raise ValueError("mask must have one entry per row")
+        indices = list(itertools.compress(range(self._length), mask))
+        result = copy.copy(self)
+        result._columns = [c.take(indices) for c in self._columns]
+        result._length = len(indices)
+        return result
+
+    def select(self, columns: Sequence[str]) -> "ColumnarFrame":
+        """Create a new frame containing a subset of the columns.
+
+        The new frame shares its storage with this frame, so no values are copied.
+        Appending to either frame afterwards is not supported.
+
+        Args:
+            columns: The names of the columns to include, in order.
+
+        Returns:
+            A new frame containing the selected columns.
+
+        Raises:
+            KeyError: if the frame doesn't have one of the columns.
+        """
+        indexes = [self._index[name] for name in columns]
+        result = copy.copy(self)
+        result._names = [self._names[i] for i in indexes]
+        result._data_types = [self._data_types[i] for i in indexes]
+        result._index = {name: i for i, name in enumerate(result._names)}
+        result._columns = [self._columns[i] for i in indexes]
+        return result
+
+    def to_data_frame(self) -> models.DataFrame:
+        """Convert the frame back to a data frame, such as for appending it to a table.
+
+        Returns:
+            A data frame containing all rows of this frame.
+        """
+        columns = self._columns
+        return models.DataFrame(
+            columns=list(self._names),
+            data=[[c.get_serialized(i) for c in columns] for i in range(self._length)],
+        )
+
+    @classmethod
+    def _select_columns(
+        cls, client: "DataFrameClient", id: str, names: Optional[List[str]]
+    ) -> List[models.Column]:
+        table_columns = client.get_table_metadata(id).columns
+        if names is None:
+            return table_columns
+
+        by_name = {c.name: c for c in table_columns}
+        try:
+            return [by_name[name] for name in names]
+        except KeyError as ex:
+            raise ValueError("Table has no column named {}".format(ex)) from None
+
+    @classmethod
+    def _query_pages(
+        cls,
+        client: "DataFrameClient",
+        id: str,
+        query: models.QueryTableDataRequest,
+    ) -> Iterator[models.PagedTableRows]:
+        while True:
+            response = client.query_table_data(id, query)
+            yield response
+
+            if response.continuation_token is None:
+                return
+            query = query.copy(
+                update={"continuation_token": response.continuation_token}
+            )
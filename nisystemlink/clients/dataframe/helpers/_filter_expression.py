@@ -0,0 +1,704 @@
+"""Implementation of the filter expression builder."""
+
+import abc
+import math
+import operator
+from array import array
+from datetime import datetime, timezone
+from functools import reduce
+from itertools import repeat
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    TYPE_CHECKING,
+    Union,
+)
+
+from nisystemlink.clients.dataframe import models
+
+from ._columnar_frame import (
+    _EPOCH,
+    _format_double,
+    _format_timestamp,
+    _ONE_MILLISECOND,
+    _parse_timestamp,
+    ColumnarFrame,
+)
+
+if TYPE_CHECKING:
+    from nisystemlink.clients.dataframe import DataFrameClient
+
+
+FilterValue = Union[None, bool, int, float, str, datetime]
+"""The types of values a column can be compared with in a filter expression."""
+
+_Op = models.FilterOperation
+
+_COMPARISONS = {
+    _Op.Equals: operator.eq,
+    _Op.NotEquals: operator.ne,
+    _Op.LessThan: operator.lt,
+    _Op.LessThanEquals: operator.le,
+    _Op.GreaterThan: operator.gt,
+    _Op.GreaterThanEquals: operator.ge,
+}  # type: Mapping[models.FilterOperation, Callable[[Any, Any], bool]]
+
+_NEGATIONS = {
+    _Op.Equals: _Op.NotEquals,
+    _Op.NotEquals: _Op.Equals,
+    _Op.Contains: _Op.NotContains,
+    _Op.NotContains: _Op.Contains,
+}
+
+# Masks are evaluated as one byte per row, each holding 0 or 1, and packed into a
+# single int so that whole masks can be combined with one bitwise operation.
+
+
+def _to_mask(values: Iterable[Any]) -> int:
+    return int.from_bytes(bytes(values), "little")
+
+
+def _all_rows(row_count: int) -> int:
+    return int.from_bytes(b"\x01" * row_count, "little")
+
+
+class FilterExpression(abc.ABC):
+    """A condition on the values in each row of a table.
+
+    Expressions are built from :func:`col` and :func:`predicate`, and combined with
+    the ``&`` (and), ``|`` (or), and ``~`` (not) operators. Python's ``and``, ``or``,
+    and ``not`` keywords can't be used, so comparisons must be wrapped in parentheses
+    when they are combined::
+
+        (col("temperature") > 100) & ((col("status") == "FAIL") | ~col("ok").is_null())
+
+    Comparisons with ``None`` (null) values follow Python's semantics: only ``==``
+    and ``!=`` are true for null values, and every other comparison is false.
+    """
+
+    def __and__(self, other: "FilterExpression") -> "FilterExpression":
+        return _And(self, other)
+
+    def __or__(self, other: "FilterExpression") -> "FilterExpression":
+        return _Or(self, other)
+
+    def __invert__(self) -> "FilterExpression":
+        return _Not(self)
+
+    def __bool__(self) -> bool:
+        raise TypeError(
+            "A FilterExpression has no truth value. Combine expressions with "
+            "'&', '|', and '~' instead of 'and', 'or', and 'not'."
+        )
+
+    @property
+    @abc.abstractmethod
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        ...
+
+    def compile(self, data_types: Mapping[str, models.DataType]) -> "CompiledFilter":
+        """Split the expression into filters for the DataFrame Service and a residual.
+
+        Every top-level condition that is combined with ``&`` and compares a column
+        with a value in a way the service supports becomes a
+        :class:`ColumnFilter <nisystemlink.clients.dataframe.models.ColumnFilter>`.
+        The remaining conditions, such as ``|`` combinations, comparisons between
+        columns, and predicates, form the residual expression.
+
+        Args:
+            data_types: The data type of each column in the table.
+
+        Returns:
+            The compiled filter.
+
+        Raises:
+            ValueError: if the expression references a column that isn't in
+                ``data_types`` or compares a column with a value of the wrong type.
+        """
+        missing = self.columns.difference(data_types)
+        if missing:
+            raise ValueError("Unknown columns: {}".format(", ".join(sorted(missing))))
+        self._validate(data_types)
+
+        filters = []  # type: List[models.ColumnFilter]
+        residual = []  # type: List[FilterExpression]
+        for term in self._conjuncts():
+            column_filter = term._to_column_filter(data_types)
+            if column_filter is not None:
+                filters.append(column_filter)
+            else:
+                residual.append(term)
+        return CompiledFilter(
+            filters, reduce(operator.and_, residual) if residual else None, data_types
+        )
+
+    def _conjuncts(self) -> List["FilterExpression"]:
+        return [self]
+
+    def _validate(self, data_types: Mapping[str, models.DataType]) -> None:
+        pass
+
+    def _to_column_filter(
+        self, data_types: Mapping[str, models.DataType]
+    ) -> Optional[models.ColumnFilter]:
+        return None
+
+    @abc.abstractmethod
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        ...
+
+
+class ColumnExpression:
+    """A reference to a column of a table, used to build a :class:`FilterExpression`.
+
+    Comparing a column with a value or with another column using ``==``, ``!=``,
+    ``<``, ``<=``, ``>``, or ``>=`` creates a :class:`FilterExpression`. Values are
+    compared according to the column's data type, so a TIMESTAMP column is compared
+    with a ``datetime.datetime`` (naive values are assumed to be in UTC) or an
+    ISO-8601 string, a BOOL column with a ``bool``, a STRING column with a ``str``,
+    and numeric columns with an ``int`` or ``float``.
+    """
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self, name: str) -> None:
+        """Initialize an instance.
+
+        Args:
+            name: The name of the column.
+        """
+        self._name = name
+
+    @property
+    def name(self) -> str:  # noqa: D401
+        """The name of the column."""
+        return self._name
+
+    def __eq__(self, other: object) -> FilterExpression:  # type: ignore[override]
+        return self._compare(_Op.Equals, other)
+
+    def __ne__(self, other: object) -> FilterExpression:  # type: ignore[override]
+        return self._compare(_Op.NotEquals, other)
+
+    def __lt__(self, other: object) -> FilterExpression:
+        return self._compare(_Op.LessThan, other)
+
+    def __le__(self, other: object) -> FilterExpression:
+        return self._compare(_Op.LessThanEquals, other)
+
+    def __gt__(self, other: object) -> FilterExpression:
+        return self._compare(_Op.GreaterThan, other)
+
+    def __ge__(self, other: object) -> FilterExpression:
+        return self._compare(_Op.GreaterThanEquals, other)
+
+    def contains(self, value: str) -> FilterExpression:
+        """Create a condition that a STRING column contains a substring.
+
+        Args:
+            value: The substring to search for.
+
+        Returns:
+            The condition.
+        """
+        return _Comparison(self._name, _Op.Contains, value)
+
+    def not_contains(self, value: str) -> FilterExpression:
+        """Create a condition that a STRING column doesn't contain a substring.
+
+        Args:
+            value: The substring to search for.
+
+        Returns:
+            The condition.
+        """
+        return _Comparison(self._name, _Op.NotContains, value)
+
+    def is_null(self) -> FilterExpression:
+        """Create a condition that the column's value is null.
+
+        Returns:
+            The condition.
+        """
+        return _Comparison(self._name, _Op.Equals, None)
+
+    def is_not_null(self) -> FilterExpression:
+        """Create a condition that the column's value is not null.
+
+        Returns:
+            The condition.
+        """
+        return _Comparison(self._name, _Op.NotEquals, None)
+
+    def is_in(self, values: Iterable[FilterValue]) -> FilterExpression:
+        """Create a condition that the column's value equals any of several values.
+
+        Args:
+            values: The values to compare with. Must not be empty.
+
+        Returns:
+            The condition.
+
+        Raises:
+            ValueError: if ``values`` is empty.
+        """
+        conditions = [self._compare(_Op.Equals, v) for v in values]
+        if not conditions:
+            raise ValueError("values must not be empty")
+        return reduce(operator.or_, conditions)
+
+    def between(self, low: FilterValue, high: FilterValue) -> FilterExpression:
+        """Create a condition that the column's value is in an inclusive range.
+
+        Args:
+            low: The lowest value in the range.
+            high: The highest value in the range.
+
+        Returns:
+            The condition.
+        """
+        return (self >= low) & (self <= high)
+
+    def _compare(
+        self, operation: models.FilterOperation, other: Any
+    ) -> FilterExpression:
+        if isinstance(other, ColumnExpression):
+            return _ColumnComparison(self._name, operation, other._name)
+        if other is None and operation not in (_Op.Equals, _Op.NotEquals):
+            raise ValueError("Null values can only be compared with == and !=")
+        return _Comparison(self._name, operation, other)
+
+
+def col(name: str) -> ColumnExpression:
+    """Refer to a column of a table in a filter expression.
+
+    Args:
+        name: The name of the column.
+
+    Returns:
+        An expression that can be compared with a value or another column.
+    """
+    return ColumnExpression(name)
+
+
+def predicate(
+    function: Callable[..., Iterable[Any]], *columns: str
+) -> FilterExpression:
+    """Create a condition computed locally from the values of one or more columns.
+
+    The function is called once for each page of data, with the list of values of each
+    of ``columns`` as positional arguments, and must return one truthy or falsy value
+    for each row. Predicates are never sent to the DataFrame Service.
+
+    Args:
+        function: The function to compute the condition.
+        columns: The names of the columns to pass to the function.
+
+    Returns:
+        The condition.
+    """
+    return _Predicate(function, columns)
+
+
+class CompiledFilter:
+    """A :class:`FilterExpression` split into filters for the DataFrame Service and a
+    residual expression that is evaluated locally.
+    """
+
+    def __init__(
+        self,
+        filters: List[models.ColumnFilter],
+        residual: Optional[FilterExpression],
+        data_types: Mapping[str, models.DataType],
+    ) -> None:
+        """Initialize an instance.
+
+        Args:
+            filters: The filters to send to the DataFrame Service.
+            residual: The part of the expression to evaluate locally, if any.
+            data_types: The data type of each column in the table.
+        """
+        self._filters = filters
+        self._residual = residual
+        self._data_types = data_types
+
+    @property
+    def filters(self) -> List[models.ColumnFilter]:  # noqa: D401
+        """The filters to send to the DataFrame Service."""
+        return list(self._filters)
+
+    @property
+    def residual(self) -> Optional[FilterExpression]:  # noqa: D401
+        """The part of the expression that must be evaluated locally.
+
+        None if the DataFrame Service can evaluate the entire expression.
+        """
+        return self._residual
+
+    @property
+    def residual_columns(self) -> List[str]:  # noqa: D401
+        """The names of the columns needed to evaluate :attr:`residual`."""
+        return sorted(self._residual.columns) if self._residual is not None else []
+
+    def evaluate(self, frame: ColumnarFrame) -> bytes:
+        """Evaluate the residual expression for each row of a frame.
+
+        Args:
+            frame: The rows to evaluate. Must contain the :attr:`residual_columns`.
+
+        Returns:
+            One byte per row, which is 1 if the row matches and 0 otherwise.
+        """
+        if self._residual is None:
+            return b"\x01" * len(frame)
+        mask = self._residual._evaluate(frame, self._data_types)
+        return mask.to_bytes(len(frame), "little")
+
+    def apply(self, frame: ColumnarFrame) -> ColumnarFrame:
+        """Remove the rows of a frame that don't match the residual expression.
+
+        Args:
+            frame: The rows to filter. Must contain the :attr:`residual_columns`.
+
+        Returns:
+            A frame containing only the matching rows.
+        """
+        if self._residual is None:
+            return frame
+        return frame.filter(self.evaluate(frame))
+
+
+def query_filtered_data(
+    client: "DataFrameClient",
+    id: str,
+    where: FilterExpression,
+    columns: Optional[List[str]] = None,
+    order_by: Optional[List[models.ColumnOrderBy]] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[ColumnarFrame]:
+    """Query a table for the rows matching a filter expression.
+
+    As much of the expression as possible is sent to the DataFrame Service as
+    :attr:`QueryTableDataRequest.filters
+    <nisystemlink.clients.dataframe.models.QueryTableDataRequest.filters>`. Any
+    residual conditions are evaluated on each page as it is received, so only the
+    requested columns and the columns the residual needs are downloaded.
+
+    Args:
+        client: The client to use to query the data.
+        id: Unique ID of a data table.
+        where: The condition rows must match.
+        columns: The columns to include in the results. All columns are included if
+            not specified.
+        order_by: The columns to order the results by.
+        page_size: The number of rows to request from the service at a time. Since
+            rows are filtered by the residual after being received, pages yielded may
+            contain fewer rows.
+
+    Returns:
+        An iterator over the non-empty pages of matching rows.
+
+    Raises:
+        ValueError: if the expression or ``columns`` reference a column that isn't in
+            the table or the expression compares a column with a value of the wrong
+            type.
+        ApiException: if unable to communicate with the DataFrame Service
+            or provided an invalid argument.
+    """
+    table_columns = {c.name: c for c in client.get_table_metadata(id).columns}
+    compiled = where.compile({c.name: c.data_type for c in table_columns.values()})
+
+    if columns is None:
+        columns = list(table_columns)
+    requested = columns + [c for c in compiled.residual_columns if c not in columns]
+    try:
+        frame_columns = [table_columns[name] for name in requested]
+    except KeyError as ex:
+        raise ValueError("Table has no column named {}".format(ex)) from None
+
+    query = models.QueryTableDataRequest(columns=requested)
+    if compiled.filters:
+        query.filters = compiled.filters
+    if order_by is not None:
+        query.order_by = order_by
+    if page_size is not None:
+        query.take = page_size
+
+    for response in ColumnarFrame._query_pages(client, id, query):
+        page = ColumnarFrame(frame_columns)
+        page.append(response.frame)
+        page = compiled.apply(page)
+        if len(requested) != len(columns):
+            page = page.select(columns)
+        if len(page):
+            yield page
+
+
+def _invalid_value(
+    name: str, data_type: models.DataType, value: FilterValue
+) -> ValueError:
+    return ValueError(
+        "Cannot compare {} column '{}' with {!r}".format(data_type.value, name, value)
+    )
+
+
+def _to_buffer_value(name: str, data_type: models.DataType, value: FilterValue) -> Any:
+    """Convert a value to the representation ColumnarFrame stores the column in."""
+    if data_type == models.DataType.String:
+        if isinstance(value, str):
+            return value
+    elif data_type == models.DataType.Bool:
+        if isinstance(value, bool):
+            return int(value)
+    elif data_type == models.DataType.Timestamp:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return (value - _EPOCH) // _ONE_MILLISECOND
+        if isinstance(value, str):
+            return _parse_timestamp(value)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        if data_type == models.DataType.Float32:
+            # Compare with the value as it would be stored in the column
+            return array("f", [value])[0]
+        return value
+    raise _invalid_value(name, data_type, value)
+
+
+class _Comparison(FilterExpression):
+    """Compares a column with a value."""
+
+    def __init__(
+        self, column: str, operation: models.FilterOperation, value: FilterValue
+    ) -> None:
+        self._column = column
+        self._operation = operation
+        self._value = value
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return {self._column}
+
+    def _validate(self, data_types: Mapping[str, models.DataType]) -> None:
+        data_type = data_types[self._column]
+        if self._operation in (_Op.Contains, _Op.NotContains):
+            if data_type != models.DataType.String or not isinstance(self._value, str):
+                raise ValueError(
+                    "contains can only be used on STRING columns with a str value"
+                )
+        if self._value is not None:
+            _to_buffer_value(self._column, data_type, self._value)
+
+    def _to_column_filter(
+        self, data_types: Mapping[str, models.DataType]
+    ) -> Optional[models.ColumnFilter]:
+        # Only comparisons the service evaluates the same way they are evaluated
+        # locally are sent to the service.
+        data_type = data_types[self._column]
+        value = self._value
+        if value is None:
+            serialized = None  # type: Optional[str]
+        elif data_type == models.DataType.String:
+            if self._operation not in _NEGATIONS:
+                return None
+            serialized = str(value)
+        elif data_type == models.DataType.Bool:
+            if self._operation not in (_Op.Equals, _Op.NotEquals):
+                return None
+            serialized = "true" if value else "false"
+        elif data_type == models.DataType.Timestamp:
+            serialized = _format_timestamp(
+                _to_buffer_value(self._column, data_type, value)
+            )
+        elif isinstance(value, float):
+            if math.isnan(value):
+                return None
+            if data_type in (models.DataType.Float32, models.DataType.Float64):
+                serialized = _format_double(value)
+            elif value.is_integer():
+                serialized = str(int(value))
+            else:
+                return None
+        else:
+            serialized = str(value)
+        return models.ColumnFilter(
+            column=self._column, operation=self._operation, value=serialized
+        )
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        row_count = len(frame)
+        nulls = frame.null_mask(self._column)
+        null_rows = _to_mask(nulls) if nulls is not None else 0
+        negated = self._operation in (_Op.NotEquals, _Op.NotContains)
+        if self._value is None:
+            return null_rows ^ _all_rows(row_count) if negated else null_rows
+
+        data_type = data_types[self._column]
+        buffer = frame.buffer(self._column)
+        if data_type == models.DataType.String:
+            # Test each distinct value once, then look up each row's code
+            value = self._value
+            if self._operation in (_Op.Contains, _Op.NotContains):
+                test = operator.contains  # type: Callable[[Any, Any], bool]
+            elif negated:
+                test = operator.eq
+            else:
+                test = _COMPARISONS[self._operation]
+            categories = frame.categories(self._column)
+            matches = {i for i, c in enumerate(categories) if test(c, value)}
+            result = _to_mask(map(matches.__contains__, buffer))
+            if negated:
+                result ^= _all_rows(row_count)
+        else:
+            value = _to_buffer_value(self._column, data_type, self._value)
+            comparison = _COMPARISONS[self._operation]
+            result = _to_mask(map(comparison, buffer, repeat(value)))
+
+        if negated:
+            return result | null_rows
+        return result & ~null_rows
+
+
+class _ColumnComparison(FilterExpression):
+    """Compares the values of two columns in the same row."""
+
+    def __init__(
+        self, left: str, operation: models.FilterOperation, right: str
+    ) -> None:
+        self._left = left
+        self._operation = operation
+        self._right = right
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return {self._left, self._right}
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        comparison = _COMPARISONS[self._operation]
+        if self._operation in (_Op.Equals, _Op.NotEquals):
+            return _to_mask(
+                map(comparison, frame.column(self._left), frame.column(self._right))
+            )
+        return _to_mask(
+            a is not None and b is not None and comparison(a, b)
+            for a, b in zip(frame.column(self._left), frame.column(self._right))
+        )
+
+
+class _Predicate(FilterExpression):
+    """A condition computed locally by a function."""
+
+    def __init__(
+        self, function: Callable[..., Iterable[Any]], columns: Sequence[str]
+    ) -> None:
+        self._function = function
+        self._columns = list(columns)
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return set(self._columns)
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        results = bytes(
+            map(bool, self._function(*(frame.column(c) for c in self._columns)))
+        )
+        if len(results) != len(frame):
+            raise ValueError("The predicate must return one value for each row")
+        return int.from_bytes(results, "little")
+
+
+class _And(FilterExpression):
+    def __init__(self, left: FilterExpression, right: FilterExpression) -> None:
+        self._left = left
+        self._right = right
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return self._left.columns | self._right.columns
+
+    def _conjuncts(self) -> List[FilterExpression]:
+        return self._left._conjuncts() + self._right._conjuncts()
+
+    def _validate(self, data_types: Mapping[str, models.DataType]) -> None:
+        self._left._validate(data_types)
+        self._right._validate(data_types)
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        return self._left._evaluate(frame, data_types) & self._right._evaluate(
+            frame, data_types
+        )
+
+
+class _Or(FilterExpression):
+    def __init__(self, left: FilterExpression, right: FilterExpression) -> None:
+        self._left = left
+        self._right = right
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return self._left.columns | self._right.columns
+
+    def _validate(self, data_types: Mapping[str, models.DataType]) -> None:
+        self._left._validate(data_types)
+        self._right._validate(data_types)
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        return self._left._evaluate(frame, data_types) | self._right._evaluate(
+            frame, data_types
+        )
+
+
+class _Not(FilterExpression):
+    def __init__(self, operand: FilterExpression) -> None:
+        self._operand = operand
+
+    @property
+    def columns(self) -> Set[str]:  # noqa: D401
+        """The names of the columns referenced by the expression."""
+        return self._operand.columns
+
+    def _validate(self, data_types: Mapping[str, models.DataType]) -> None:
+        self._operand._validate(data_types)
+
+    def _to_column_filter(
+        self, data_types: Mapping[str, models.DataType]
+    ) -> Optional[models.ColumnFilter]:
+        # Only equality and containment have an exact negation; the negation of an
+        # ordering comparison also matches null values.
+        operand = self._operand
+        if isinstance(operand, _Comparison) and operand._operation in _NEGATIONS:
+            negated = _Comparison(
+                operand._column, _NEGATIONS[operand._operation], operand._value
+            )
+            return negated._to_column_filter(data_types)
+        return None
+
+    def _evaluate(
+        self, frame: ColumnarFrame, data_types: Mapping[str, models.DataType]
+    ) -> int:
+        return self._operand._evaluate(frame, data_types) ^ _all_rows(len(frame))
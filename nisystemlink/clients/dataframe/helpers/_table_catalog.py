@@ -0,0 +1,300 @@
+"""Implementation of the table catalog iterators."""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+from nisystemlink.clients.dataframe import models
+
+if TYPE_CHECKING:
+    from nisystemlink.clients.dataframe import DataFrameClient
+
+
+_PageSource = Callable[[], Iterator[List[models.TableMetadata]]]
+
+# How long a background thread waits for room in the buffer before checking whether
+# the consumer has stopped iterating
+_PUT_INTERVAL = 0.1
+
+
+def iter_tables(
+    client: "DataFrameClient",
+    *,
+    take: Optional[int] = None,
+    id: Optional[List[str]] = None,
+    order_by: Optional[models.OrderBy] = None,
+    order_by_descending: Optional[bool] = None,
+    workspace: Optional[List[str]] = None,
+    read_ahead: int = 1,
+) -> Iterator[models.TableMetadata]:
+    """Iterate over all tables returned by :meth:`DataFrameClient.list_tables
+    <nisystemlink.clients.dataframe.DataFrameClient.list_tables>`.
+
+    Pages are requested lazily by following continuation tokens. While the caller is
+    consuming one page, up to ``read_ahead`` subsequent pages are requested on a
+    background thread.
+
+    Args:
+        client: The client to use to list the tables.
+        take: The number of tables to request in each page.
+        id: List of table IDs to filter by.
+        order_by: The sort order of the returned tables.
+        order_by_descending: Whether to sort descending instead of ascending.
+        workspace: List of workspace IDs to filter by.
+        read_ahead: The maximum number of pages to request before they are needed. If
+            0, each page is requested when the previous one has been consumed.
+
+    Returns:
+        An iterator over the tables.
+
+    Raises:
+        ApiException: if unable to communicate with the DataFrame Service
+            or provided an invalid argument.
+    """
+
+    def pages() -> Iterator[List[models.TableMetadata]]:
+        continuation_token = None  # type: Optional[str]
+        while True:
+            response = client.list_tables(
+                take=take,
+                id=id,
+                order_by=order_by,
+                order_by_descending=order_by_descending,
+                continuation_token=continuation_token,
+                workspace=workspace,
+            )
+            yield response.tables
+
+            continuation_token = response.continuation_token
+            if continuation_token is None:
+                return
+
+    return _iter_tables([pages], 1, read_ahead)
+
+
+def iter_query_tables(
+    client: "DataFrameClient",
+    query: models.QueryTablesRequest,
+    *,
+    read_ahead: int = 1,
+) -> Iterator[models.TableMetadata]:
+    """Iterate over all tables matching a query.
+
+    Pages are requested lazily with :meth:`DataFrameClient.query_tables
+    <nisystemlink.clients.dataframe.DataFrameClient.query_tables>`, starting from
+    ``query.continuation_token``. While the caller is consuming one page, up to
+    ``read_ahead`` subsequent pages are requested on a background thread.
+
+    Args:
+        client: The client to use to query the tables.
+        query: The request to query tables.
+        read_ahead: The maximum number of pages to request before they are needed. If
+            0, each page is requested when the previous one has been consumed.
+
+    Returns:
+        An iterator over the matching tables.
+
+    Raises:
+        ApiException: if unable to communicate with the DataFrame Service
+            or provided an invalid argument.
+    """
+    return _iter_tables([_query_pages(client, query)], 1, read_ahead)
+
+
+def iter_query_tables_partitioned(
+    client: "DataFrameClient",
+    queries: Sequence[models.QueryTablesRequest],
+    *,
+    max_concurrency: int = 4,
+    read_ahead: int = 1,
+) -> Iterator[models.TableMetadata]:
+    """Run several table queries concurrently and merge their results.
+
+    The queries are typically disjoint partitions of a single query, created with
+    :func:`partition_by_created_at` or :func:`partition_by_workspace`. Up to
+    ``max_concurrency`` queries are paged at the same time. Tables are yielded as
+    pages arrive, so tables from the same query are in order but tables from different
+    queries are interleaved.
+
+    Args:
+        client: The client to use to query the tables.
+        queries: The queries to run.
+        max_concurrency: The maximum number of queries to run at the same time.
+        read_ahead: The maximum number of pages per running query to request before
+            they are consumed.
+
+    Returns:
+        An iterator over the tables matching any of the queries.
+
+    Raises:
+        ValueError: if ``max_concurrency`` is less than 1.
+        ApiException: if unable to communicate with the DataFrame Service
+            or provided an invalid argument.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    sources = [_query_pages(client, query) for query in queries]
+    return _iter_tables(sources, max_concurrency, max(read_ahead, 1))
+
+
+def partition_by_created_at(
+    query: models.QueryTablesRequest, boundaries: Sequence[datetime]
+) -> List[models.QueryTablesRequest]:
+    """Split a table query into disjoint queries by the time tables were created.
+
+    For ``n`` boundaries, ``n + 1`` queries are returned. The first matches tables
+    created before the first boundary, the last matches tables created at or after the
+    last boundary, and the others match the ranges between consecutive boundaries.
+    Together, they match exactly the same tables as ``query``.
+
+    Args:
+        query: The query to split. Its continuation token is not copied.
+        boundaries: The times to split at, in ascending order. Naive values are
+            assumed to be in UTC.
+
+    Returns:
+        The partitioned queries.
+
+    Raises:
+        ValueError: if ``boundaries`` is not in ascending order.
+    """
+    times = [b if b.tzinfo else b.replace(tzinfo=timezone.utc) for b in boundaries]
+    if any(a >= b for a, b in zip(times, times[1:])):
+        raise ValueError("boundaries must be in ascending order")
+    values = [t.isoformat() for t in times]  # type: List[Optional[str]]
+    lows = [None] + values
+    highs = values + [None]
+
+    partitions = []
+    for low, high in zip(lows, highs):
+        conditions = []  # type: List[Tuple[str, str]]
+        if low is not None:
+            conditions.append(("createdAt >= @{}", low))
+        if high is not None:
+            conditions.append(("createdAt < @{}", high))
+        partitions.append(_restrict(query, conditions))
+    return partitions
+
+
+def partition_by_workspace(
+    query: models.QueryTablesRequest, workspaces: Sequence[str]
+) -> List[models.QueryTablesRequest]:
+    """Split a table query into one query per workspace.
+
+    Only tables in one of ``workspaces`` are matched by the returned queries.
+
+    Args:
+        query: The query to split. Its continuation token is not copied.
+        workspaces: The IDs of the workspaces to query.
+
+    Returns:
+        The partitioned queries.
+    """
+    return [_restrict(query, [("workspace == @{}", w)]) for w in workspaces]
+
+
+def _restrict(
+    query: models.QueryTablesRequest,
+    conditions: List[Tuple[str, str]],
+) -> models.QueryTablesRequest:
+    """Add conditions to a query's filter, passing their values as substitutions."""
+    substitutions = list(
+        query.substitutions or []
+    )  # type: List[Union[int, bool, str, None]]
+    clauses = ["({})".format(query.filter)] if query.filter.strip() else []
+    for template, value in conditions:
+        clauses.append(template.format(len(substitutions)))
+        substitutions.append(value)
+    if not clauses:
+        clauses.append("true")
+    return query.copy(
+        update={
+            "filter": " and ".join(clauses),
+            "substitutions": substitutions,
+            "continuation_token": None,
+        }
+    )
+
+
+def _query_pages(
+    client: "DataFrameClient", query: models.QueryTablesRequest
+) -> _PageSource:
+    def pages() -> Iterator[List[models.TableMetadata]]:
+        current = query
+        while True:
+            response = client.query_tables(current)
+            yield response.tables
+
+            if response.continuation_token is None:
+                return
+            current = current.copy(
+                update={"continuation_token": response.continuation_token}
+            )
+
+    return pages
+
+
+def _iter_tables(
+    sources: Sequence[_PageSource], max_concurrency: int, read_ahead: int
+) -> Iterator[models.TableMetadata]:
+    if read_ahead <= 0 and len(sources) == 1:
+        for page in sources[0]():
+            yield from page
+        return
+
+    # Each source is paged on a worker thread, which puts its pages into a shared,
+    # bounded buffer so that workers stay at most read_ahead pages ahead. A worker
+    # puts None when its source is exhausted, or the exception it raised.
+    buffer = queue.Queue(
+        maxsize=max(read_ahead, 1) * min(max_concurrency, max(len(sources), 1))
+    )  # type: queue.Queue[Union[List[models.TableMetadata], BaseException, None]]
+    stopped = threading.Event()
+
+    def put(item: Union[List[models.TableMetadata], BaseException, None]) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run(source: _PageSource) -> None:
+        try:
+            for page in source():
+                if not put(page):
+                    return
+        except BaseException as ex:
+            put(ex)
+        else:
+            put(None)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(sources) or 1))
+    futures = []  # type: List[Future]
+    try:
+        futures = [executor.submit(run, source) for source in sources]
+        remaining = len(sources)
+        while remaining:
+            item = buffer.get()
+            if item is None:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield from item
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
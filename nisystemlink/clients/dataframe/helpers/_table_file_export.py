@@ -0,0 +1,290 @@
+"""Implementation of export_table_to_file."""
+
+import json
+import os
+from enum import Enum
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from nisystemlink.clients.dataframe import models
+
+from ._columnar_frame import ColumnarFrame
+
+if TYPE_CHECKING:
+    from nisystemlink.clients.dataframe import DataFrameClient
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class TableFileFormat(str, Enum):
+    """The format of a file written by :func:`export_table_to_file`."""
+
+    PARQUET = "PARQUET"
+    """An Apache Parquet file, with one row group per page of table data."""
+
+    ARROW_IPC = "ARROW_IPC"
+    """An Apache Arrow IPC (Feather v2) file, with one record batch per page of table
+    data."""
+
+
+_CHECKPOINT_VERSION = 1
+
+
+def export_table_to_file(
+    client: "DataFrameClient",
+    id: str,
+    path: str,
+    file_format: TableFileFormat = TableFileFormat.PARQUET,
+    query: Optional[models.QueryTableDataRequest] = None,
+    *,
+    resume: bool = True,
+) -> int:
+    """Stream the rows of a table into a Parquet or Arrow IPC file on local disk.
+
+    Rows are read one page at a time with
+    :meth:`DataFrameClient.query_table_data
+    <nisystemlink.clients.dataframe.DataFrameClient.query_table_data>` and each page
+    is written to the file as soon as it is received, so only a single page is held in
+    memory. The file's schema is derived from the :class:`DataType
+    <nisystemlink.clients.dataframe.models.DataType>` of each column.
+
+    The file is written to ``path + ".part"`` and renamed to ``path`` once all rows
+    have been written. After each page, the continuation token and the number of row
+    groups written are recorded in ``path + ".checkpoint"``. If the export is
+    interrupted by an exception and then called again with the same arguments, it
+    resumes from the last recorded page instead of starting over. If the process was
+    terminated before the partial file could be closed, the export starts over.
+
+    Requires the ``pyarrow`` package.
+
+    Args:
+        client: The client to use to read the data.
+        id: Unique ID of a data table.
+        path: The path of the file to write.
+        file_format: The format of the file to write.
+        query: The columns, filtering, sorting, and page size to use when reading
+            data. All rows and columns are exported if not specified.
+        resume: Whether to resume an interrupted export of the same table and query
+            to the same path. If False, any partial export is discarded.
+
+    Returns:
+        The number of rows written to the file.
+
+    Raises:
+        ImportError: if ``pyarrow`` is not installed.
+        ApiException: if unable to communicate with the DataFrame Service
+            or provided an invalid argument.
+    """
+    if pyarrow is None:
+        raise ImportError(
+            "export_table_to_file requires the pyarrow package, which is installed "
+            "with the 'parquet' extra: pip install nisystemlink-clients[parquet]"
+        )
+
+    if query is None:
+        query = models.QueryTableDataRequest()
+    part_path = path + ".part"
+    checkpoint_path = path + ".checkpoint"
+    identity = {
+        "version": _CHECKPOINT_VERSION,
+        "table": id,
+        "format": file_format.value,
+        "query": json.loads(
+            query.copy(update={"continuation_token": None}).json(
+                by_alias=True, exclude_none=True
+            )
+        ),
+    }
+
+    checkpoint = _read_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is not None and any(
+        checkpoint.get(key) != value for key, value in identity.items()
+    ):
+        checkpoint = None
+    # The partial file is moved aside while it is copied into the new file, so that
+    # it isn't lost if the export is interrupted again during the copy.
+    previous_path = part_path + ".old"
+    previous = None  # type: Optional[_PartialFile]
+    if checkpoint is not None:
+        if not os.path.exists(previous_path) and os.path.exists(part_path):
+            os.replace(part_path, previous_path)
+        previous = _PartialFile.open(
+            previous_path, file_format, checkpoint["rowGroups"]
+        )
+    if previous is not None:
+        assert checkpoint is not None
+        query = query.copy(
+            update={"continuation_token": checkpoint["continuationToken"]}
+        )
+        row_groups = checkpoint["rowGroups"]  # type: int
+        row_count = checkpoint["rowCount"]  # type: int
+    else:
+        row_groups = 0
+        row_count = 0
+        if os.path.exists(previous_path):
+            os.remove(previous_path)
+
+    columns = ColumnarFrame._select_columns(client, id, query.columns)
+    schema = pyarrow.schema(
+        [pyarrow.field(c.name, _ARROW_TYPES[c.data_type]) for c in columns]
+    )
+
+    writer = _PartialFileWriter(part_path, file_format, schema)
+    try:
+        if previous is not None:
+            for index in range(row_groups):
+                writer.write(previous.read_row_group(index))
+            previous.close()
+            os.remove(previous_path)
+
+        for response in ColumnarFrame._query_pages(client, id, query):
+            page = ColumnarFrame(columns)
+            page.append(response.frame)
+            if len(page):
+                writer.write(_to_arrow_table(page, schema))
+                row_groups += 1
+                row_count += len(page)
+            _write_checkpoint(
+                checkpoint_path,
+                dict(
+                    identity,
+                    continuationToken=response.continuation_token,
+                    rowGroups=row_groups,
+                    rowCount=row_count,
+                ),
+            )
+    finally:
+        writer.close()
+
+    os.replace(part_path, path)
+    os.remove(checkpoint_path)
+    return row_count
+
+
+def _arrow_types() -> Dict[models.DataType, Any]:
+    return {
+        models.DataType.Bool: pyarrow.bool_(),
+        models.DataType.Int32: pyarrow.int32(),
+        models.DataType.Int64: pyarrow.int64(),
+        models.DataType.Float32: pyarrow.float32(),
+        models.DataType.Float64: pyarrow.float64(),
+        models.DataType.String: pyarrow.string(),
+        models.DataType.Timestamp: pyarrow.timestamp("ms", tz="UTC"),
+    }
+
+
+_ARROW_TYPES = _arrow_types() if pyarrow is not None else {}
+
+
+def _to_arrow_table(frame: ColumnarFrame, schema: Any) -> Any:
+    """Convert a frame to an Arrow table, wrapping its packed buffers without copying."""
+    arrays = []
+    for name, data_type in zip(frame.columns, frame.data_types):
+        validity = None
+        nulls = frame.null_mask(name)
+        if nulls is not None:
+            is_null = pyarrow.Array.from_buffers(
+                pyarrow.uint8(), len(frame), [None, pyarrow.py_buffer(nulls)]
+            )
+            validity = pyarrow.compute.equal(is_null, 0).buffers()[1]
+        buffers = [validity, pyarrow.py_buffer(frame.buffer(name))]
+
+        if data_type == models.DataType.String:
+            codes = pyarrow.Array.from_buffers(pyarrow.int32(), len(frame), buffers)
+            categories = pyarrow.array(frame.categories(name), pyarrow.string())
+            array = categories.take(codes)
+        elif data_type == models.DataType.Bool:
+            values = pyarrow.Array.from_buffers(pyarrow.int8(), len(frame), buffers)
+            array = values.cast(pyarrow.bool_())
+        else:
+            array = pyarrow.Array.from_buffers(
+                _ARROW_TYPES[data_type], len(frame), buffers
+            )
+        arrays.append(array)
+    return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+
+class _PartialFile:
+    """A partially-exported file left behind by an interrupted export."""
+
+    def __init__(self, source: Any, file_format: TableFileFormat) -> None:
+        self._source = source
+        if file_format == TableFileFormat.PARQUET:
+            self._reader = pyarrow.parquet.ParquetFile(source)
+            self.row_groups = self._reader.num_row_groups
+        else:
+            self._reader = pyarrow.ipc.open_file(source)
+            self.row_groups = self._reader.num_record_batches
+        self._file_format = file_format
+
+    @classmethod
+    def open(
+        cls, path: str, file_format: TableFileFormat, row_groups: int
+    ) -> Optional["_PartialFile"]:
+        """Open a partial file, if it is readable and contains enough row groups.
+
+        Returns:
+            The opened file, or None if the export can't be resumed from it.
+        """
+        try:
+            source = pyarrow.OSFile(path, "rb")
+        except OSError:
+            return None
+        try:
+            file = cls(source, file_format)
+        except (OSError, pyarrow.ArrowException):
+            source.close()
+            return None
+        if file.row_groups < row_groups:
+            file.close()
+            return None
+        return file
+
+    def read_row_group(self, index: int) -> Any:
+        if self._file_format == TableFileFormat.PARQUET:
+            return self._reader.read_row_group(index)
+        return pyarrow.Table.from_batches([self._reader.get_batch(index)])
+
+    def close(self) -> None:
+        self._source.close()
+
+
+class _PartialFileWriter:
+    """Writes tables to a Parquet or Arrow IPC file, one row group at a time."""
+
+    def __init__(self, path: str, file_format: TableFileFormat, schema: Any) -> None:
+        self._file_format = file_format
+        if file_format == TableFileFormat.PARQUET:
+            self._writer = pyarrow.parquet.ParquetWriter(path, schema)
+        else:
+            self._writer = pyarrow.ipc.new_file(path, schema)
+
+    def write(self, table: Any) -> None:
+        if self._file_format == TableFileFormat.PARQUET:
+            self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+        else:
+            for batch in table.to_batches(max_chunksize=max(table.num_rows, 1)):
+                self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temp_path, path)
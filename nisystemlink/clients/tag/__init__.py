@@ -3,19 +3,28 @@
 from ._data_type import DataType
 from ._retention_type import RetentionType
 from ._tag_data import TagData
+from ._tag_summary import TagSummary
+from ._tag_catalog import TagCatalog
 from ._tag_with_aggregates import TagWithAggregates
+from ._tag_read_results import LatencyStatistics, TagReadResults
 from ._async_tag_query_result_collection import AsyncTagQueryResultCollection
 from ._itag_reader import ITagReader
 from ._itag_writer import ITagWriter
+from ._overflow_policy import OverflowPolicy
 from ._buffered_tag_writer import BufferedTagWriter
+from ._async_buffered_tag_writer import AsyncBufferedTagWriter
+from ._sharded_tag_writer import ShardedTagWriter
 from ._tag_value_reader import TagValueReader
 from ._tag_value_writer import TagValueWriter
 from ._tag_update_fields import TagUpdateFields
 from ._tag_data_update import TagDataUpdate
 from ._tag_path_utilities import TagPathUtilities
+from ._tag_value_utilities import TagValueUtilities
 from ._tag_query_result_collection import TagQueryResultCollection
 from ._tag_subscription import TagSubscription
 from ._tag_selection import TagSelection
+from ._caching_tag_reader import CachingTagReader
+from ._tag_index import TagIndex
 from ._tag_manager import TagManager
 
 # flake8: noqa
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of AsyncBufferedTagWriter."""
+
+import abc
+import asyncio
+import datetime
+from types import TracebackType
+from typing import Any, Optional, Set, Type
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._itime_stamper import ITimeStamper
+
+
+class AsyncBufferedTagWriter(tbase.ITagWriter):
+    """Represents an :class:`ITagWriter` that buffers tag writes and sends them
+    asynchronously, without ever blocking the ``asyncio`` event loop.
+
+    Unlike :class:`BufferedTagWriter`, which guards its buffer with a thread lock and
+    sends automatically from a timer thread, this writer is meant to be used from a
+    single event loop. The ``max_buffer_time`` flush is scheduled on the event loop,
+    and buffered writes are always sent with the asynchronous HTTP client.
+
+    :meth:`write_async()` waits for the buffered writes to be sent when the buffer
+    fills. :meth:`write()` never waits: it sends a full buffer from a background task
+    instead. Either way, buffers are sent to the server one at a time in the order they
+    were filled, so writes to the same tag arrive in order. Errors from sends that
+    happen in the background are raised by the next write.
+
+    Writes that utilize automatic timestamps are based on the system time when buffered.
+    All methods must be called from the event loop's thread.
+
+    Note that :class:`AsyncBufferedTagWriter` objects support using the ``async with``
+    statement, to automatically send any remaining buffered writes and wait for them
+    on exit.
+    """
+
+    def __init__(
+        self,
+        stamper: ITimeStamper,
+        buffer_size: int,
+        max_buffer_time: Optional[datetime.timedelta],
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            stamper: An object for time-stamping tag writes.
+            buffer_size: The maximum number of tag writes to buffer before automatically
+                sending them to the server, or 0 to not limit the number.
+            max_buffer_time: The amount of time after buffering a write before the
+                buffered writes are sent automatically, or None to not send them
+                based on time.
+        """
+        self._buffer_limit = buffer_size
+        self._max_buffer_time = (
+            max_buffer_time.total_seconds() if max_buffer_time is not None else None
+        )
+        self._stamper = stamper
+
+        self._closed = False
+        self._num_buffered = 0
+        self._send_error = None  # type: Optional[Exception]
+        self._flush_handle = None  # type: Optional[asyncio.TimerHandle]
+        # Each send waits for the previous one to finish, which keeps the batches in
+        # order even though they're sent from different tasks
+        self._last_send = None  # type: Optional[asyncio.Future]
+        self._background_sends = set()  # type: Set[asyncio.Future]
+
+    @abc.abstractmethod
+    def _buffer_value(self, path: str, value: Any) -> None:
+        """Add a value to the buffer.
+
+        Args:
+            path: The tag path being written.
+            value: The value being written.
+        """
+        ...
+
+    @abc.abstractmethod
+    def _clear_buffer(self) -> None:
+        """Clear the buffer of writes."""
+        ...
+
+    @abc.abstractmethod
+    def _copy_buffer(self) -> Any:
+        """Return the contents of the buffer and clears or replaces the buffer used for future writes.
+
+        Returns:
+            The buffered data.
+        """
+        ...
+
+    @abc.abstractmethod
+    def _create_item(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> Any:
+        """Return an item that can be placed into the buffer.
+
+        Args:
+            path: The path of the tag to write.
+            data_type: The data type of the value to write.
+            value: The tag value to write, serialized as a string.
+            timestamp: The timestamp represented as a nullable ``datetime.datetime``.
+
+        Returns:
+            The created item.
+
+        Raises:
+            ValueError: if ``data_type`` is not supported for writing.
+        """
+        ...
+
+    @abc.abstractmethod
+    async def _send_writes_async(self, updates: Any) -> None:
+        """Asynchronously send the writes stored in ``updates`` to the server.
+
+        Args:
+            updates: The writes to send.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ApiException: if the API call fails.
+        """
+        ...
+
+    def clear_buffered_writes(self) -> None:
+        """Clear any pending writes from :meth:`write()`.
+
+        Writes that are already being sent are not affected.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+        """
+        if self._closed:
+            raise ReferenceError("AsyncBufferedTagWriter")
+
+        self._stop_timer()
+        self._clear_buffer()
+        self._num_buffered = 0
+
+    async def send_buffered_writes_async(self) -> None:
+        """Asynchronously write all of the pending writes from :meth:`write()` to the
+        server.
+
+        Also waits for any writes that are already being sent in the background.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        if self._closed:
+            raise ReferenceError("AsyncBufferedTagWriter")
+
+        updates = self._retrieve_buffered_values()
+        if updates is not None:
+            await self._send(updates)
+        elif self._last_send is not None:
+            await asyncio.wait([self._last_send])
+
+    async def close_async(self) -> None:
+        """Asynchronously send any remaining buffered writes, wait for all sends to
+        finish, and close the writer.
+
+        Does nothing if the writer is already closed.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ApiException: if the API call fails.
+        """
+        if self._closed:
+            return
+
+        try:
+            await self.send_buffered_writes_async()
+        finally:
+            self._stop_timer()
+            self._closed = True
+
+    async def __aenter__(self) -> "AsyncBufferedTagWriter":
+        if self._closed:
+            raise ReferenceError("AsyncBufferedTagWriter")
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        await self.close_async()
+        return False
+
+    def _write(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Write a tag's value that's been serialized to a string.
+
+        Never waits for the server. If the buffer fills, it is sent by a background
+        task on the running event loop.
+
+        Clients do not typically call this method directly. Use a
+        :class:`.TagValueWriter` instead.
+
+        Args:
+            path: The path of the tag to write.
+            data_type: The data type of the value to write.
+            value: The tag value to write, serialized as a string.
+            timestamp: A custom timestamp to associate with the value, or None to have
+                the server specify the timestamp.
+
+        Raises:
+            ValueError: if `path` is empty or invalid.
+            ValueError: if `path` or `value` is None.
+            ValueError: if `data_type` is invalid.
+            ReferenceError: if the writer has been closed.
+            RuntimeError: if there is no running event loop in the current thread.
+            ApiException: if an earlier send in the background failed.
+        """
+        updates = self._buffer_write(path, data_type, value, timestamp)
+        if updates is not None:
+            self._send_in_background(updates)
+
+        self._raise_send_error()
+
+    async def _write_async(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Asynchronously write a tag's value that's been serialized to a string.
+
+        Waits for the buffered writes to be sent if the buffer fills.
+
+        Clients do not typically call this method directly. Use a
+        :class:`.TagValueWriter` instead.
+
+        Args:
+            path: The path of the tag to write.
+            data_type: The data type of the value to write.
+            value: The tag value to write, serialized as a string.
+            timestamp: A custom timestamp to associate with the value, or None to have
+                the server specify the timestamp.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ValueError: if `path` is empty or invalid.
+            ValueError: if `path` or `value` is None.
+            ValueError: if `data_type` is invalid.
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails, or an earlier send in the background
+                failed.
+        """
+        updates = self._buffer_write(path, data_type, value, timestamp)
+        if updates is not None:
+            await self._send(updates)
+
+        self._raise_send_error()
+
+    def _buffer_write(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime],
+    ) -> Any:
+        """Buffer a write, and return the buffered values if the buffer is full.
+
+        Returns:
+            The buffered values that need to be sent, or None.
+        """
+        if self._closed:
+            raise ReferenceError("AsyncBufferedTagWriter")
+
+        if value is None:
+            raise ValueError("value is None")
+
+        if data_type == tbase.DataType.UNKNOWN:
+            raise ValueError("data_type is UNKNOWN")
+
+        if timestamp is None:
+            timestamp = self._stamper.timestamp
+        else:
+            timestamp = timestamp.astimezone(datetime.timezone.utc)
+        item = self._create_item(
+            tbase.TagPathUtilities.validate(path), data_type, value, timestamp
+        )
+
+        self._buffer_value(path, item)
+        self._num_buffered += 1
+        if self._num_buffered == self._buffer_limit:
+            return self._retrieve_buffered_values()
+        elif self._num_buffered == 1:
+            self._start_timer()
+        return None
+
+    def _retrieve_buffered_values(self) -> Any:
+        """Return the buffered values, if any, and clears the buffer.
+
+        Returns:
+            The buffered values, or None if there aren't any.
+        """
+        self._stop_timer()
+
+        if self._num_buffered == 0:
+            return None
+
+        buffer = self._copy_buffer()
+        self._num_buffered = 0
+        return buffer
+
+    def _raise_send_error(self) -> None:
+        if self._send_error is not None:
+            error, self._send_error = self._send_error, None
+            raise error
+
+    def _start_send(self, updates: Any) -> asyncio.Future:
+        """Start sending ``updates`` once the previous send has finished.
+
+        Returns:
+            A task that finishes when the updates have been sent.
+        """
+        previous = self._last_send
+
+        async def send() -> None:
+            if previous is not None:
+                # Wait regardless of the outcome, since each batch is independent
+                await asyncio.wait([previous])
+            await self._send_writes_async(updates)
+
+        task = asyncio.ensure_future(send())
+        self._last_send = task
+        return task
+
+    async def _send(self, updates: Any) -> None:
+        # Shield the send, so that cancelling the caller doesn't leave later batches
+        # waiting on a batch that will never be sent
+        task = self._start_send(updates)
+        task.add_done_callback(_observe_exception)
+        await asyncio.shield(task)
+
+    def _send_in_background(self, updates: Any) -> None:
+        task = self._start_send(updates)
+        self._background_sends.add(task)
+        task.add_done_callback(self._background_send_done)
+
+    def _background_send_done(self, task: asyncio.Future) -> None:
+        self._background_sends.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._send_error = task.exception()  # type: ignore
+
+    def _start_timer(self) -> None:
+        if self._max_buffer_time is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(
+            self._max_buffer_time, self._flush_timer_elapsed
+        )
+
+    def _stop_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _flush_timer_elapsed(self) -> None:
+        self._flush_handle = None
+        if self._closed:
+            return
+
+        updates = self._retrieve_buffered_values()
+        if updates is not None:
+            self._send_in_background(updates)
+
+
+def _observe_exception(task: asyncio.Future) -> None:
+    # The caller that awaited the send receives its exception, unless the caller was
+    # cancelled; retrieve it here so that asyncio doesn't report it as unhandled
+    if not task.cancelled():
+        task.exception()
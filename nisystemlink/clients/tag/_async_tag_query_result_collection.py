@@ -3,7 +3,8 @@
 """Implementation of AsyncTagQueryResultCollection."""
 
 import abc
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional
 
 from nisystemlink.clients import core, tag as tbase
 
@@ -12,7 +13,12 @@ class AsyncTagQueryResultCollection(abc.ABC):
     """Represents a paginated list of tags returned by an asynchronous query."""
 
     def __init__(
-        self, first_page: List[tbase.TagData], total_count: int, skip: int
+        self,
+        first_page: List[tbase.TagData],
+        total_count: int,
+        skip: int,
+        *,
+        max_concurrency: int = 1
     ) -> None:
         """Initialize an instance with the first page of query results.
 
@@ -20,7 +26,13 @@ class AsyncTagQueryResultCollection(abc.ABC):
             first_page: The first page of results, or None if there are no results.
             total_count: The total number of results in the query.
             skip: The skip used for the first page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Raises:
+            ValueError: if ``max_concurrency`` is less than one.
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency cannot be 0 or negative")
         self._total_count = total_count
         self._current_page = None  # type: Optional[List[tbase.TagData]]
         if first_page:
@@ -33,6 +45,10 @@ class AsyncTagQueryResultCollection(abc.ABC):
             pass  # leave it as None, even if passed in as []
         self._skip = skip
         self._current_skip = skip
+        self._max_concurrency = max_concurrency
+        self._page_size = len(first_page) if first_page else None
+        self._pending = {}  # type: Dict[int, asyncio.Future]
+        self._ahead = skip
 
     @property
     def current_page(self) -> Optional[List[tbase.TagData]]:  # noqa: D401
@@ -55,6 +71,10 @@ class AsyncTagQueryResultCollection(abc.ABC):
         Does nothing if the last page has already been retrieved. Use
         :meth:`reset_async()` to start again from the first page.
 
+        If the collection was created with a ``max_concurrency`` greater than one, the
+        following pages are requested ahead of time, at offsets computed from the size
+        of the first page, so that later calls can return without waiting.
+
         Returns:
             A task representing the asynchronous operation. On success, contains the
             next page of results, or None if there are no more results.
@@ -67,9 +87,10 @@ class AsyncTagQueryResultCollection(abc.ABC):
 
         new_skip = self._current_skip + len(self._current_page)
         if new_skip < self.total_count:
-            self._current_page = await self._query_page_async(new_skip)
+            self._current_page = await self._next_page_async(new_skip)
         else:
             self._current_page = None
+            self._discard_pending()
 
         self._current_skip = new_skip
         return self._current_page
@@ -85,10 +106,42 @@ class AsyncTagQueryResultCollection(abc.ABC):
         Raises:
             ApiException: if the API call fails.
         """
+        self._discard_pending()
         self._current_skip = self._skip
         self._current_page = await self._query_page_async(self._current_skip)
+        self._page_size = len(self._current_page) if self._current_page else None
         return self._current_page
 
+    async def _next_page_async(self, skip: int) -> List[tbase.TagData]:
+        if skip not in self._pending:
+            # Either nothing was requested ahead, or a page had an unexpected size and
+            # the pages requested ahead are at the wrong offsets
+            self._discard_pending()
+            self._ahead = skip
+
+        if self._max_concurrency > 1 and self._page_size:
+            while (
+                len(self._pending) < self._max_concurrency
+                and self._ahead < self._total_count
+            ):
+                self._pending[self._ahead] = asyncio.ensure_future(
+                    self._query_page_async(self._ahead)
+                )
+                self._ahead += self._page_size
+
+        task = self._pending.pop(skip, None)
+        if task is None:
+            return await self._query_page_async(skip)
+        return await task
+
+    def _discard_pending(self) -> None:
+        for task in self._pending.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # Don't report the exception as never retrieved
+        self._pending.clear()
+
     @abc.abstractmethod
     async def _query_page_async(self, skip: int) -> List[tbase.TagData]:
         """Asynchronously query for a single page of results and updates :attr:`total_count`.
@@ -3,16 +3,73 @@
 """Implementation of BufferedTagWriter."""
 
 import abc
+import asyncio
 import datetime
+import enum
+import operator
 import sys
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from types import TracebackType
-from typing import Any, Callable, Optional, Type
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Deque,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from nisystemlink.clients import core, tag as tbase
+from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+from nisystemlink.clients.tag._core._adaptive_flush_controller import (
+    AdaptiveFlushController,
+)
+from nisystemlink.clients.tag._core._background_sender import BackgroundSender
+from nisystemlink.clients.tag._core._deadband_filter import DeadbandFilter
 from nisystemlink.clients.tag._core._itime_stamper import ITimeStamper
 from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
 
+# A rough estimate of the memory used by a buffered write, beyond its path and value
+_WRITE_OVERHEAD_BYTES = 100
+# The number of most recent flushes included in the flush latency statistics
+_MAX_FLUSH_LATENCIES = 1000
+
+
+class _Batch(NamedTuple):
+    """A buffer of writes that has been flushed, to be sent to the server."""
+
+    updates: Any
+    """The buffered writes, as returned by :meth:`BufferedTagWriter._copy_buffer`."""
+
+    num_writes: int
+    """The number of writes in the buffer."""
+
+    num_bytes: int
+    """The estimated memory used by the writes in the buffer."""
+
+    flushed: float
+    """The value of ``time.monotonic()`` when the buffer was flushed."""
+
+
+class _Room(enum.Enum):
+    """The outcome of applying a writer's limits on pending writes to a write."""
+
+    ACCEPTED = 1
+    """The write fits, and can be buffered."""
+
+    DROPPED = 2
+    """The write was discarded."""
+
+    WAIT = 3
+    """The write must wait for earlier writes to be sent."""
+
 
 class BufferedTagWriter(tbase.ITagWriter):
     """Represents an :class:`ITagWriter` that buffers tag writes instead of sending them immediately.
@@ -21,13 +78,43 @@ class BufferedTagWriter(tbase.ITagWriter):
     Implementations may provide automatic sending of buffered writes based on different
     conditions. Unsent writes are discarded when the instance is deleted.
 
+    By default, a write that fills the buffer sends the buffered writes before
+    returning. When sending in the background, the writer instead swaps in an empty
+    buffer and returns immediately, and dedicated threads send the full buffers to
+    the server. Several buffers may be sent at once, but writes to the same tag always
+    reach the server in the order they were made. Errors from sends that happen
+    automatically are raised by the next write, or passed to a callback instead.
+
+    A :class:`SpoolingBufferedTagWriter` can also store full buffers on disk until the
+    server accepts them.
+
+    The number of pending writes, and the memory they use, can be limited, so that
+    writes don't pile up without bound when the server falls behind. Pending writes
+    include buffered writes and full buffers that are waiting to be sent or being
+    sent, but not those stored in a spool. When a write would exceed a limit, any
+    buffered writes are flushed, and then the writer's :class:`OverflowPolicy` decides
+    what happens to the write.
+
     Note that :class:`BufferedTagWriter` objects support using the ``with`` statement
     (or the ``async with`` statement), to automatically :meth:`send
     <send_buffered_writes>` any remaining buffered writes on exit.
     """
 
     def __init__(
-        self, stamper: ITimeStamper, buffer_size: int, flush_timer: ManualResetTimer
+        self,
+        stamper: ITimeStamper,
+        buffer_size: int,
+        flush_timer: ManualResetTimer,
+        *,
+        send_in_background: bool = False,
+        send_error_callback: Optional[Callable[[Exception], None]] = None,
+        max_concurrent_sends: int = 1,
+        max_pending_writes: Optional[int] = None,
+        max_pending_bytes: Optional[int] = None,
+        overflow_policy: "tbase.OverflowPolicy" = tbase.OverflowPolicy.BLOCK,
+        overflow_timeout: Optional[datetime.timedelta] = None,
+        flush_controller: Optional[AdaptiveFlushController] = None,
+        deadband_filter: Optional[DeadbandFilter] = None
     ) -> None:
         """Initialize the writer.
 
@@ -37,15 +124,87 @@ class BufferedTagWriter(tbase.ITagWriter):
                 sending them to the server.
             flush_timer: A timer that, once started, elapses whenever buffered writes
                 should be sent automatically. Does not have to be a configured timer.
+            send_in_background: Whether to send full buffers from a dedicated thread
+                instead of the thread that filled them.
+            send_error_callback: A function to call with the exception when sending
+                writes automatically fails, or None to raise the exception from the
+                next write instead. May be called from the timer or sender thread.
+            max_concurrent_sends: The maximum number of buffers to send to the server
+                at once when sending in the background.
+            max_pending_writes: The maximum number of writes that haven't been sent, or
+                None for no limit.
+            max_pending_bytes: The maximum estimated memory used by writes that haven't
+                been sent, or None for no limit. A single write is always accepted when
+                nothing else is pending, even if it is larger.
+            overflow_policy: What to do with a write that would exceed
+                ``max_pending_writes`` or ``max_pending_bytes``.
+            overflow_timeout: How long a write waits for room with the
+                :attr:`OverflowPolicy.BLOCK` policy, or None to wait indefinitely.
+            flush_controller: A controller that adjusts the buffer size and the flush
+                timer's interval as writes are sent, or None to keep them fixed. The
+                controller's settings replace ``buffer_size``.
+            deadband_filter: A filter that suppresses writes whose values haven't
+                changed enough since the last value written to the same tag, or None to
+                buffer every write. The filter is reset whenever writes it let through
+                may not reach the server, so that the next write to each tag is sent.
+
+        Raises:
+            ValueError: if ``max_concurrent_sends`` is less than one, or more than one
+                without ``send_in_background``.
+            ValueError: if ``max_pending_writes`` or ``max_pending_bytes`` is less than
+                one.
+            ValueError: if ``overflow_timeout`` is negative.
         """
+        if max_concurrent_sends < 1:
+            raise ValueError("max_concurrent_sends must be at least 1")
+        if max_concurrent_sends > 1 and not send_in_background:
+            raise ValueError("max_concurrent_sends requires send_in_background")
+        if max_pending_writes is not None and max_pending_writes < 1:
+            raise ValueError("max_pending_writes must be at least 1")
+        if max_pending_bytes is not None and max_pending_bytes < 1:
+            raise ValueError("max_pending_bytes must be at least 1")
+        if overflow_timeout is not None and overflow_timeout.total_seconds() < 0:
+            raise ValueError("overflow_timeout cannot be negative")
+
         self._lock = threading.Lock()
+        self._room_available = threading.Condition(self._lock)
         self._buffer_limit = buffer_size
         self._flush_timer = flush_timer
         self._stamper = stamper
+        self._send_error_callback = send_error_callback
+        self._sender = (
+            BackgroundSender(
+                self._send_batch, "BufferedTagWriter sender", max_concurrent_sends
+            )
+            if send_in_background
+            else None
+        )  # type: Optional[BackgroundSender]
+        # Whether full buffers are queued by _submit_while_locked, instead of being
+        # sent by the thread that filled them
+        self._submits_batches = self._sender is not None
+        self._max_pending_writes = max_pending_writes
+        self._max_pending_bytes = max_pending_bytes
+        self._overflow_policy = overflow_policy
+        self._overflow_timeout = (
+            overflow_timeout.total_seconds() if overflow_timeout is not None else None
+        )
+        self._deadband_filter = deadband_filter
+        self._flush_controller = flush_controller
+        if flush_controller is not None:
+            self._apply_flush_settings_while_locked()
 
         self._closed = False
         self._num_buffered = 0
-        self._send_error = None  # type: Optional[core.ApiException]
+        self._send_error = None  # type: Optional[Exception]
+        self._num_coalesced = 0
+        self._num_filtered = 0
+        self._buffered_bytes = 0
+        self._num_pending = 0
+        self._pending_bytes = 0
+        self._num_dropped = 0
+        # Full buffers queued on the sender that can still be dropped, oldest first
+        self._queued = deque()  # type: Deque[Tuple[Future, _Batch]]
+        self._flush_latencies = deque(maxlen=_MAX_FLUSH_LATENCIES)  # type: Deque[float]
         self._timer_generation = 0
         self._timer_handler = None  # type: Optional[Callable[[], None]]
 
@@ -59,6 +218,19 @@ class BufferedTagWriter(tbase.ITagWriter):
         """
         ...
 
+    def _buffer_values(self, paths: List[str], values: List[Any]) -> None:
+        """Add several values to the buffer, in order.
+
+        The default implementation calls :meth:`_buffer_value` for each value.
+
+        Args:
+            paths: The tag path being written by each value.
+            values: The values being written.
+        """
+        buffer_value = self._buffer_value
+        for path, value in zip(paths, values):
+            buffer_value(path, value)
+
     @abc.abstractmethod
     def _clear_buffer(self) -> None:
         """Clear the buffer of writes."""
@@ -97,6 +269,51 @@ class BufferedTagWriter(tbase.ITagWriter):
         """
         ...
 
+    def _create_items(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: List[str],
+    ) -> List[Any]:
+        """Return items for several values of the same data type that can be placed
+        into the buffer.
+
+        The default implementation calls :meth:`_create_item` for each value.
+
+        Args:
+            paths: The path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`.
+
+        Returns:
+            The created items.
+        """
+        create = self._create_item
+        return [
+            create(path, data_type, value, timestamp)
+            for path, value, timestamp in zip(
+                paths, values, TimestampUtilities.strs_to_datetimes(timestamps)
+            )
+        ]
+
+    def _buffer_paths(self, updates: Any) -> Optional[Collection[str]]:
+        """Return the tag paths written by the buffered writes in ``updates``.
+
+        Buffers that write none of the same paths may be sent to the server at the
+        same time. The default implementation returns None, so that buffers are sent
+        one at a time.
+
+        Args:
+            updates: The buffered writes, as returned by :meth:`_copy_buffer`.
+
+        Returns:
+            The paths written, or None if they aren't known.
+        """
+        return None
+
     @abc.abstractmethod
     def _send_writes(self, updates: Any) -> None:
         """Send the writes stored in ``updates`` to the server.
@@ -124,6 +341,75 @@ class BufferedTagWriter(tbase.ITagWriter):
         """
         ...
 
+    @property
+    def coalesced_writes(self) -> int:  # noqa: D401
+        """The number of writes that were replaced in the buffer by a newer write to the
+        same tag, and so were never sent to the server.
+
+        Always 0 unless the writer was created to coalesce writes.
+        """
+        return self._num_coalesced
+
+    @property
+    def filtered_writes(self) -> int:  # noqa: D401
+        """The number of writes that were suppressed by the writer's deadband filter,
+        and so were never sent to the server.
+
+        Always 0 unless the writer was created with a deadband filter.
+        """
+        return self._num_filtered
+
+    @property
+    def buffer_size(self) -> Optional[int]:  # noqa: D401
+        """The number of buffered writes that causes them to be sent automatically, or
+        None if they are only sent based on time.
+
+        Changes as writes are sent when the writer adapts its flush settings.
+        """
+        return self._buffer_limit or None
+
+    @property
+    def max_buffer_time(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The longest time a write is buffered before it is sent automatically, or
+        None if writes are only sent based on :attr:`buffer_size`.
+
+        Changes as writes are sent when the writer adapts its flush settings.
+        """
+        if not self._flush_timer.can_start:
+            return None
+        return self._flush_timer.interval
+
+    @property
+    def pending_writes(self) -> int:  # noqa: D401
+        """The number of writes that haven't been sent to the server, including
+        buffered writes and full buffers waiting to be sent or being sent.
+
+        Writes stored in a spool are not included.
+        """
+        return self._num_pending
+
+    @property
+    def pending_bytes(self) -> int:  # noqa: D401
+        """An estimate of the memory used by the :attr:`pending_writes`, in bytes."""
+        return self._pending_bytes
+
+    @property
+    def dropped_writes(self) -> int:  # noqa: D401
+        """The number of writes discarded to stay within the limits on pending writes."""
+        return self._num_dropped
+
+    @property
+    def flush_latency(self) -> "tbase.LatencyStatistics":  # noqa: D401
+        """Statistics of the time taken to send each of the most recently flushed
+        buffers, from when the buffer was flushed until the server accepted it.
+
+        Includes the time full buffers spend waiting to be sent. For buffers stored in
+        a spool, only the time taken by the successful send is included.
+        """
+        with self._lock:
+            latencies = list(self._flush_latencies)
+        return tbase.LatencyStatistics(latencies)
+
     def clear_buffered_writes(self) -> None:
         """Clear any pending writes from :meth:`write()`.
 
@@ -136,7 +422,10 @@ class BufferedTagWriter(tbase.ITagWriter):
         with self._lock:
             self._stop_timer_while_locked()
             self._clear_buffer()
+            self._release_while_locked(self._num_buffered, self._buffered_bytes)
+            self._writes_lost_while_locked()
             self._num_buffered = 0
+            self._buffered_bytes = 0
 
     def send_buffered_writes(self) -> None:
         """Write all of the pending writes from :meth:`write()` to the server.
@@ -150,11 +439,18 @@ class BufferedTagWriter(tbase.ITagWriter):
         if self._closed:
             raise ReferenceError("BufferedTagWriter")
 
+        if self._sender is not None:
+            sent, all_sent = self._send_in_background()
+            all_sent.result()
+            if sent is not None:
+                sent.result()
+            return
+
         with self._lock:
-            updates = self._retrieve_buffered_values_while_locked()
+            batch = self._retrieve_buffered_values_while_locked()
 
-        if updates is not None:
-            self._send_writes(updates)
+        if batch is not None:
+            self._send_batch(batch)
 
     async def send_buffered_writes_async(self) -> None:
         """Asynchronously write all of the pending writes from :meth:`write()` to the server.
@@ -168,11 +464,18 @@ class BufferedTagWriter(tbase.ITagWriter):
         if self._closed:
             raise ReferenceError("BufferedTagWriter")
 
+        if self._sender is not None:
+            sent, all_sent = self._send_in_background()
+            await asyncio.wrap_future(all_sent)
+            if sent is not None:
+                sent.result()
+            return
+
         with self._lock:
-            updates = self._retrieve_buffered_values_while_locked()
+            batch = self._retrieve_buffered_values_while_locked()
 
-        if updates is not None:
-            await self._send_writes_async(updates)
+        if batch is not None:
+            await self._send_batch_async(batch)
 
     def __enter__(self) -> "BufferedTagWriter":
         if self._closed:
@@ -197,8 +500,12 @@ class BufferedTagWriter(tbase.ITagWriter):
         if self._closed:
             return False
 
-        self.send_buffered_writes()
-        self._closed = True
+        try:
+            self.send_buffered_writes()
+        finally:
+            self._closed = True
+            if self._sender is not None:
+                self._sender.close()
 
         suppress = self._flush_timer.__exit__(exc_type, exc_val, exc_tb)
         return suppress
@@ -212,8 +519,13 @@ class BufferedTagWriter(tbase.ITagWriter):
         if self._closed:
             return False
 
-        await self.send_buffered_writes_async()
-        self._closed = True
+        try:
+            await self.send_buffered_writes_async()
+        finally:
+            self._closed = True
+            if self._sender is not None:
+                # Everything has been sent, so the thread stops right away
+                self._sender.close(wait=False)
 
         suppress = await self._flush_timer.__aexit__(exc_type, exc_val, exc_tb)
         return suppress
@@ -243,29 +555,17 @@ class BufferedTagWriter(tbase.ITagWriter):
             ValueError: if `data_type` is invalid.
             ReferenceError: if the writer has been closed.
             ApiException: if the API call fails.
+            BufferError: if the write would exceed the limits on pending writes, with
+                the :attr:`OverflowPolicy.RAISE` policy.
+            TimeoutError: if there is no room for the write within the overflow
+                timeout, with the :attr:`OverflowPolicy.BLOCK` policy.
         """
         timestamped_value = self._prepare_write(path, data_type, value, timestamp)
-
-        pending_error = None
-        updates = None
-        with self._lock:
-            self._buffer_value(path, timestamped_value)
-            self._num_buffered += 1
-
-            if self._num_buffered == self._buffer_limit:
-                updates = self._retrieve_buffered_values_while_locked()
-            elif self._num_buffered == 1:
-                self._start_timer_while_locked()
-
-            if self._send_error is not None:
-                pending_error = self._send_error
-                self._send_error = None
-
-        if updates is not None:
-            self._send_writes(updates)
-
-        if pending_error:
-            raise pending_error
+        if self._deadband_filter is not None and not self._accept_write(
+            path, data_type, value
+        ):
+            return
+        self._write_items([path], [timestamped_value], [len(path) + len(value)])
 
     async def _write_async(
         self,
@@ -295,30 +595,282 @@ class BufferedTagWriter(tbase.ITagWriter):
             ValueError: if `data_type` is invalid.
             ReferenceError: if the writer has been closed.
             ApiException: if the API call fails.
+            BufferError: if the write would exceed the limits on pending writes, with
+                the :attr:`OverflowPolicy.RAISE` policy.
+            TimeoutError: if there is no room for the write within the overflow
+                timeout, with the :attr:`OverflowPolicy.BLOCK` policy.
         """
         timestamped_value = self._prepare_write(path, data_type, value, timestamp)
+        if self._deadband_filter is not None and not self._accept_write(
+            path, data_type, value
+        ):
+            return
+        await self._write_items_async(
+            [path], [timestamped_value], [len(path) + len(value)]
+        )
 
-        pending_error = None
-        updates = None
+    def _write_many(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Write many tag values that have been validated and serialized to strings.
+
+        The values are added to the buffer together, sending it whenever it fills.
+        Values without timestamps are all stamped with the same time.
+
+        Clients do not typically call this method directly. Use :meth:`write_many`
+        instead.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to use the
+                current time.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+            BufferError: if a write would exceed the limits on pending writes, with
+                the :attr:`OverflowPolicy.RAISE` policy.
+            TimeoutError: if there is no room for a write within the overflow
+                timeout, with the :attr:`OverflowPolicy.BLOCK` policy.
+        """
+        self._write_items(
+            *self._prepare_write_many(paths, data_type, values, timestamps)
+        )
+
+    async def _write_many_async(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Asynchronously write many tag values that have been validated and
+        serialized to strings.
+
+        The values are added to the buffer together, sending it whenever it fills.
+        Values without timestamps are all stamped with the same time.
+
+        Clients do not typically call this method directly. Use
+        :meth:`write_many_async` instead.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to use the
+                current time.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+            BufferError: if a write would exceed the limits on pending writes, with
+                the :attr:`OverflowPolicy.RAISE` policy.
+            TimeoutError: if there is no room for a write within the overflow
+                timeout, with the :attr:`OverflowPolicy.BLOCK` policy.
+        """
+        await self._write_items_async(
+            *self._prepare_write_many(paths, data_type, values, timestamps)
+        )
+
+    def _prepare_write_many(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]],
+    ) -> Tuple[List[str], List[Any], List[int]]:
+        if self._closed:
+            raise ReferenceError("BufferedTagWriter")
+
+        if self._deadband_filter is not None:
+            paths, values, timestamps = self._filter_writes(
+                paths, data_type, values, timestamps
+            )
+        if timestamps is None:
+            timestamp = TimestampUtilities.datetime_to_str(self._stamper.timestamp)
+            timestamps = [timestamp] * len(values)
+        items = self._create_items(paths, data_type, values, timestamps)
+        sizes = list(map(operator.add, map(len, paths), map(len, values)))
+        return paths, items, sizes
+
+    def _accept_write(self, path: str, data_type: tbase.DataType, value: str) -> bool:
+        """Return whether a write passes the deadband filter, counting it if not.
+
+        Raises:
+            Exception: the error from a failed automatic send, if the write doesn't
+                pass the filter, like :meth:`_write_items` would for a buffered write.
+        """
+        assert self._deadband_filter is not None
         with self._lock:
-            self._buffer_value(path, timestamped_value)
-            self._num_buffered += 1
+            if self._deadband_filter.accept(path, data_type, value, time.monotonic()):
+                return True
+            self._num_filtered += 1
+            pending_error = self._send_error
+            self._send_error = None
 
-            if self._num_buffered == self._buffer_limit:
-                updates = self._retrieve_buffered_values_while_locked()
-            elif self._num_buffered == 1:
-                self._start_timer_while_locked()
+        if pending_error:
+            raise pending_error
+        return False
 
-            if self._send_error is not None:
-                pending_error = self._send_error
-                self._send_error = None
+    def _filter_writes(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]],
+    ) -> Tuple[List[str], List[str], Optional[List[str]]]:
+        """Remove the writes that don't pass the deadband filter, counting them.
 
-        if updates is not None:
-            await self._send_writes_async(updates)
+        Returns:
+            The path, value, and timestamp of each remaining write.
+        """
+        assert self._deadband_filter is not None
+        accept = self._deadband_filter.accept
+        now = time.monotonic()
+        with self._lock:
+            kept = [
+                i
+                for i, (path, value) in enumerate(zip(paths, values))
+                if accept(path, data_type, value, now)
+            ]
+            self._num_filtered += len(values) - len(kept)
+
+        if len(kept) == len(values):
+            return paths, values, timestamps
+        return (
+            [paths[i] for i in kept],
+            [values[i] for i in kept],
+            [timestamps[i] for i in kept] if timestamps is not None else None,
+        )
+
+    def _write_items(
+        self, paths: List[str], items: List[Any], sizes: List[int]
+    ) -> None:
+        """Buffer writes in order, sending the buffer on this thread when needed.
+
+        Args:
+            paths: The path of each write.
+            items: The buffer item of each write.
+            sizes: The length of each write's path and value.
+        """
+        deadline = self._overflow_deadline()
+        index = 0
+        while True:
+            with self._lock:
+                index, batch = self._buffer_items_while_locked(
+                    paths, items, sizes, index, deadline, True
+                )
+                if batch is None:
+                    pending_error = self._send_error
+                    self._send_error = None
+                    break
+
+            assert isinstance(batch, _Batch)
+            self._send_batch(batch)
 
         if pending_error:
             raise pending_error
 
+    async def _write_items_async(
+        self, paths: List[str], items: List[Any], sizes: List[int]
+    ) -> None:
+        """Buffer writes in order, sending the buffer from this task when needed.
+
+        Args:
+            paths: The path of each write.
+            items: The buffer item of each write.
+            sizes: The length of each write's path and value.
+        """
+        deadline = self._overflow_deadline()
+        index = 0
+        while True:
+            with self._lock:
+                index, batch = self._buffer_items_while_locked(
+                    paths, items, sizes, index, deadline, False
+                )
+                if batch is None:
+                    pending_error = self._send_error
+                    self._send_error = None
+                    break
+
+            if isinstance(batch, _Batch):
+                await self._send_batch_async(batch)
+            else:
+                # Wait on another thread, so that the event loop isn't blocked
+                size = sizes[index] + _WRITE_OVERHEAD_BYTES
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self._wait_for_room, size, deadline)
+
+        if pending_error:
+            raise pending_error
+
+    def _buffer_items_while_locked(
+        self,
+        paths: List[str],
+        items: List[Any],
+        sizes: List[int],
+        index: int,
+        deadline: Optional[float],
+        block: bool,
+    ) -> Tuple[int, Union[_Batch, _Room, None]]:
+        """Buffer writes, starting at ``index``, until they have all been buffered or
+        the calling thread must send a buffer or wait for room.
+
+        Must hold :attr:`_lock`.
+
+        Returns:
+            The index of the first write that hasn't been buffered or dropped, and the
+            buffer to send, :attr:`_Room.WAIT`, or None if every write was handled.
+
+        Raises:
+            BufferError: if there is no room, with the :attr:`OverflowPolicy.RAISE`
+                policy.
+            TimeoutError: if ``deadline`` passes while waiting for room.
+        """
+        count = len(items)
+        while index < count:
+            if self._max_pending_writes is None and self._max_pending_bytes is None:
+                # Without limits, add as many writes at once as fit in the buffer
+                end = count
+                if self._buffer_limit:
+                    space = self._buffer_limit - self._num_buffered
+                    end = min(end, index + max(space, 1))
+                num_bytes = sum(sizes[index:end]) + _WRITE_OVERHEAD_BYTES * (
+                    end - index
+                )
+                batch = self._buffer_many_while_locked(
+                    paths[index:end], items[index:end], num_bytes
+                )
+                index = end
+            else:
+                size = sizes[index] + _WRITE_OVERHEAD_BYTES
+                room = self._make_room_while_locked(size, deadline, block)
+                if room is _Room.WAIT or isinstance(room, _Batch):
+                    # The write is tried again once the buffer has been sent or
+                    # there's room
+                    return index, room
+                batch = None
+                if room is _Room.ACCEPTED:
+                    batch = self._buffer_many_while_locked(
+                        paths[index : index + 1], items[index : index + 1], size
+                    )
+                index += 1
+
+            if batch is not None:
+                return index, batch
+        return index, None
+
     def _prepare_write(
         self,
         path: str,
@@ -351,7 +903,219 @@ class BufferedTagWriter(tbase.ITagWriter):
             tbase.TagPathUtilities.validate(path), data_type, value, timestamp
         )
 
-    def _retrieve_buffered_values_while_locked(self) -> Any:
+    def _buffer_many_while_locked(
+        self, paths: List[str], items: List[Any], num_bytes: int
+    ) -> Optional[_Batch]:
+        """Add writes to the buffer, flushing the buffer if it is full.
+
+        Must hold :attr:`_lock`.
+
+        Args:
+            paths: The path of each write.
+            items: The buffer item of each write. Must not overfill the buffer.
+            num_bytes: The estimated memory used by the writes.
+
+        Returns:
+            The flushed buffer, if it must be sent on the calling thread, or None.
+        """
+        count = len(items)
+        self._buffer_values(paths, items)
+        self._num_buffered += count
+        self._buffered_bytes += num_bytes
+        self._num_pending += count
+        self._pending_bytes += num_bytes
+
+        if self._buffer_limit and self._num_buffered >= self._buffer_limit:
+            batch = self._retrieve_buffered_values_while_locked()
+            if self._submits_batches:
+                # Queue the full buffer while still holding the lock, so that buffers
+                # filled by different threads are sent in order
+                assert batch is not None
+                self._submit_while_locked(batch)
+                return None
+            return batch
+        elif self._num_buffered == count:
+            self._start_timer_while_locked()
+        return None
+
+    def _overflow_deadline(self) -> Optional[float]:
+        if self._overflow_timeout is None:
+            return None
+        return time.monotonic() + self._overflow_timeout
+
+    def _over_limit_while_locked(self, size: int) -> bool:
+        """Return whether a write of ``size`` bytes would exceed the limits on pending
+        writes.
+
+        Must hold :attr:`_lock`.
+        """
+        if self._num_pending == 0:
+            return False
+        if (
+            self._max_pending_writes is not None
+            and self._num_pending >= self._max_pending_writes
+        ):
+            return True
+        return (
+            self._max_pending_bytes is not None
+            and self._pending_bytes + size > self._max_pending_bytes
+        )
+
+    def _make_room_while_locked(
+        self, size: int, deadline: Optional[float], block: bool
+    ) -> Union[_Batch, _Room]:
+        """Apply the limits on pending writes to a write of ``size`` bytes.
+
+        Must hold :attr:`_lock`.
+
+        Args:
+            size: The estimated memory used by the write.
+            deadline: The ``time.monotonic()`` value at which to stop waiting for room,
+                or None to wait indefinitely.
+            block: Whether to wait for room while holding the lock, instead of
+                returning :attr:`_Room.WAIT`.
+
+        Returns:
+            Whether the write was accepted or dropped, or must wait; or the buffer, if
+            it was flushed to make room and must be sent on the calling thread.
+
+        Raises:
+            BufferError: if there is no room, with the :attr:`OverflowPolicy.RAISE`
+                policy.
+            TimeoutError: if ``deadline`` passes while waiting for room.
+        """
+        while self._over_limit_while_locked(size):
+            if self._num_buffered:
+                # Buffered writes won't be sent until the buffer is flushed, so flush
+                # it before applying the overflow policy
+                batch = self._retrieve_buffered_values_while_locked()
+                assert batch is not None
+                if not self._submits_batches:
+                    return batch
+                self._submit_while_locked(batch)
+                continue
+
+            policy = self._overflow_policy
+            if policy is tbase.OverflowPolicy.RAISE:
+                self._writes_lost_while_locked()
+                raise BufferError("The limit on pending tag writes has been reached")
+            if (
+                policy is tbase.OverflowPolicy.DROP_OLDEST
+                and self._drop_oldest_while_locked()
+            ):
+                continue
+            if policy is not tbase.OverflowPolicy.BLOCK:
+                self._num_dropped += 1
+                self._writes_lost_while_locked()
+                return _Room.DROPPED
+            if not block:
+                return _Room.WAIT
+            self._wait_for_room_while_locked(deadline)
+        return _Room.ACCEPTED
+
+    def _wait_for_room(self, size: int, deadline: Optional[float]) -> None:
+        with self._lock:
+            if self._over_limit_while_locked(size) and not self._num_buffered:
+                self._wait_for_room_while_locked(deadline)
+
+    def _wait_for_room_while_locked(self, deadline: Optional[float]) -> None:
+        """Wait until pending writes are sent, or ``deadline`` passes.
+
+        Must hold :attr:`_lock`.
+
+        Raises:
+            TimeoutError: if ``deadline`` has already passed.
+        """
+        if deadline is None:
+            self._room_available.wait()
+            return
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._writes_lost_while_locked()
+            raise TimeoutError("Timed out waiting for room to buffer the tag write")
+        self._room_available.wait(remaining)
+
+    def _drop_oldest_while_locked(self) -> bool:
+        """Discard the oldest full buffer that is still waiting to be sent.
+
+        Must hold :attr:`_lock`.
+
+        Returns:
+            Whether a buffer was discarded.
+        """
+        while self._queued:
+            future, batch = self._queued.popleft()
+            # Buffers that are being sent, or have been sent, can't be canceled
+            if future.cancel():
+                self._num_dropped += batch.num_writes
+                self._writes_lost_while_locked()
+                self._release_while_locked(batch.num_writes, batch.num_bytes)
+                return True
+        return False
+
+    def _release_while_locked(self, num_writes: int, num_bytes: int) -> None:
+        """Stop counting writes as pending, and wake any writes waiting for room.
+
+        Must hold :attr:`_lock`.
+        """
+        self._num_pending -= num_writes
+        self._pending_bytes -= num_bytes
+        self._room_available.notify_all()
+
+    def _writes_lost_while_locked(self) -> None:
+        """Reset the deadband filter, if any, because writes it let through may not
+        reach the server.
+
+        Must hold :attr:`_lock`.
+        """
+        if self._deadband_filter is not None:
+            self._deadband_filter.reset()
+
+    def _send_batch(self, batch: _Batch) -> None:
+        start = time.monotonic()
+        try:
+            self._send_writes(batch.updates)
+        except BaseException:
+            with self._lock:
+                self._release_while_locked(batch.num_writes, batch.num_bytes)
+                self._writes_lost_while_locked()
+            raise
+        self._batch_sent(batch, start)
+
+    async def _send_batch_async(self, batch: _Batch) -> None:
+        start = time.monotonic()
+        try:
+            await self._send_writes_async(batch.updates)
+        except BaseException:
+            with self._lock:
+                self._release_while_locked(batch.num_writes, batch.num_bytes)
+                self._writes_lost_while_locked()
+            raise
+        self._batch_sent(batch, start)
+
+    def _batch_sent(self, batch: _Batch, start: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._release_while_locked(batch.num_writes, batch.num_bytes)
+            self._flush_latencies.append(now - batch.flushed)
+            if self._flush_controller is not None:
+                self._flush_controller.record_send(
+                    batch.num_writes, batch.num_bytes, now - start
+                )
+                self._apply_flush_settings_while_locked()
+
+    def _apply_flush_settings_while_locked(self) -> None:
+        """Use the flush controller's current buffer size and flush interval.
+
+        Must hold :attr:`_lock`.
+        """
+        assert self._flush_controller is not None
+        self._buffer_limit = self._flush_controller.buffer_size or 0
+        if self._flush_timer.can_start:
+            self._flush_timer.interval = self._flush_controller.flush_interval
+
+    def _retrieve_buffered_values_while_locked(self) -> Optional[_Batch]:
         """Return the buffered values, if any, and clears the buffer.
 
         Must hold :attr:`_lock`.
@@ -364,9 +1128,18 @@ class BufferedTagWriter(tbase.ITagWriter):
         if self._num_buffered == 0:
             return None
 
-        buffer = self._copy_buffer()
+        batch = _Batch(
+            self._copy_buffer(),
+            self._num_buffered,
+            self._buffered_bytes,
+            time.monotonic(),
+        )
         self._num_buffered = 0
-        return buffer
+        self._buffered_bytes = 0
+        if self._flush_controller is not None:
+            self._flush_controller.record_flush(batch.num_writes, batch.flushed)
+            self._apply_flush_settings_while_locked()
+        return batch
 
     def _start_timer_while_locked(self) -> None:
         """Start the flush timer, if configured.
@@ -399,11 +1172,59 @@ class BufferedTagWriter(tbase.ITagWriter):
                 # The timer was canceled after we were already queued.
                 return
 
-            updates = self._retrieve_buffered_values_while_locked()
+            batch = self._retrieve_buffered_values_while_locked()
+            if batch is not None and self._submits_batches:
+                self._submit_while_locked(batch)
+                return
 
-        if updates is not None:
+        if batch is not None:
             try:
-                self._send_writes(updates)
+                self._send_batch(batch)
             except core.ApiException as ex:
-                with self._lock:
-                    self._send_error = ex
+                self._report_send_error(ex)
+
+    def _send_in_background(self) -> Tuple[Optional[Future], Future]:
+        """Queue any buffered writes to be sent by the sender threads.
+
+        Returns:
+            A future that completes when the buffered writes have been sent, or None if
+            nothing was buffered, and a future that completes when every write queued
+            so far has been sent.
+        """
+        assert self._sender is not None
+        with self._lock:
+            batch = self._retrieve_buffered_values_while_locked()
+            sent = None
+            if batch is not None:
+                sent = self._sender.submit(batch, self._buffer_paths(batch.updates))
+            return sent, self._sender.flush()
+
+    def _submit_while_locked(self, batch: _Batch) -> None:
+        """Queue ``batch`` to be sent by the sender threads, reporting any error.
+
+        Must hold :attr:`_lock`.
+        """
+        assert self._sender is not None
+        while self._queued and self._queued[0][0].done():
+            self._queued.popleft()
+        future = self._sender.submit(
+            batch, self._buffer_paths(batch.updates), self._background_send_done
+        )
+        self._queued.append((future, batch))
+
+    def _background_send_done(self, future: Future) -> None:
+        if future.cancelled():
+            # Dropped to make room for newer writes
+            return
+        error = future.exception()
+        if error is not None:
+            self._report_send_error(error)  # type: ignore
+
+    def _report_send_error(self, error: Exception) -> None:
+        with self._lock:
+            # Also reached when the spool discards a batch the server rejected
+            self._writes_lost_while_locked()
+            if self._send_error_callback is None:
+                self._send_error = error
+                return
+        self._send_error_callback(error)
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of CachingTagReader."""
+
+import asyncio
+import collections
+import datetime
+import re
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Callable, Dict, Mapping, Optional, Tuple, Type
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
+    SerializedTagWithAggregates,
+)
+from typing_extensions import final
+
+_ReadKey = Tuple[str, bool, bool]
+_Generation = Tuple[int, int]
+
+
+class _CacheEntry:
+    __slots__ = ("value", "has_timestamp", "has_aggregates", "expires")
+
+    def __init__(
+        self,
+        value: Optional[SerializedTagWithAggregates],
+        has_timestamp: bool,
+        has_aggregates: bool,
+        expires: Optional[float],
+    ) -> None:
+        self.value = value
+        self.has_timestamp = has_timestamp
+        self.has_aggregates = has_aggregates
+        self.expires = expires
+
+
+@final
+class CachingTagReader(tbase.ITagReader):
+    """Represents an :class:`ITagReader` that caches the values read by another reader.
+
+    Each value is kept for a time to live after it is read, and the least recently
+    used values are evicted once ``max_entries`` values are cached. When several
+    callers read the same uncached tag at the same time, only one request is sent to
+    the server and all of the callers receive its result.
+
+    If a :class:`TagSubscription` is given, values for tags that match one of its
+    paths don't expire. Instead, they are replaced as the subscription reports
+    changes, so that reading them doesn't require a request to the server. Such values
+    are only as recent as the subscription's most recent update.
+
+    Call :meth:`close()` to close the subscription. Note that
+    :class:`CachingTagReader` objects support using the ``with`` statement (or the
+    ``async with`` statement), to :meth:`close()` the reader automatically on exit.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'CachingTagReader' is not an acceptable base type")
+
+    def __init__(
+        self,
+        reader: tbase.ITagReader,
+        *,
+        time_to_live: datetime.timedelta,
+        max_entries: int = 1000,
+        path_time_to_live: Optional[Mapping[str, datetime.timedelta]] = None,
+        subscription: Optional[tbase.TagSubscription] = None
+    ) -> None:
+        """Initialize an instance.
+
+        Args:
+            reader: The reader to use to read values that aren't cached.
+            time_to_live: How long to cache each value after it is read.
+            max_entries: The maximum number of tags to cache values for.
+            path_time_to_live: How long to cache the values of specific tags, indexed
+                by path, if different from ``time_to_live``.
+            subscription: A subscription whose changes are used to update cached
+                values, or None to only expire cached values by time. The reader takes
+                ownership of the subscription and closes it when the reader is closed.
+
+        Raises:
+            ValueError: if ``reader`` is None.
+            ValueError: if ``max_entries`` is less than one.
+            ValueError: if ``time_to_live`` or any of ``path_time_to_live`` is
+                negative.
+        """
+        if reader is None:
+            raise ValueError("reader cannot be None")
+        if max_entries < 1:
+            raise ValueError("max_entries cannot be 0 or negative")
+        overrides = dict(path_time_to_live or {})
+        if any(t.total_seconds() < 0 for t in [time_to_live, *overrides.values()]):
+            raise ValueError("time to live cannot be negative")
+
+        self._reader = reader
+        self._time_to_live = time_to_live.total_seconds()
+        self._path_time_to_live = {p: t.total_seconds() for p, t in overrides.items()}
+        self._max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[str, _CacheEntry]
+        # Incremented whenever a tag is changed or invalidated, so that reads which
+        # were already in progress don't overwrite newer information
+        self._epoch = 0
+        self._generations = {}  # type: Dict[str, int]
+        self._pending = {}  # type: Dict[_ReadKey, Future]
+        self._pending_async = {}  # type: Dict[_ReadKey, asyncio.Future]
+
+        self._subscription = subscription
+        self._subscribed = None  # type: Optional[re.Pattern]
+        if subscription is not None:
+            self._subscribed = re.compile(
+                "|".join(re.escape(p).replace(r"\*", ".*") for p in subscription.paths)
+                or "(?!)"
+            )
+            subscription.tag_changed += self._on_tag_changed
+
+    def close(self) -> None:
+        """Close the subscription, if any, and clear the cache."""
+        if self._subscription is not None:
+            self._subscription.tag_changed -= self._on_tag_changed
+            self._subscription.close()
+            self._subscription = None
+        self.invalidate()
+
+    async def close_async(self) -> None:
+        """Asynchronously close the subscription, if any, and clear the cache.
+
+        Returns:
+            A task representing the asynchronous operation.
+        """
+        if self._subscription is not None:
+            self._subscription.tag_changed -= self._on_tag_changed
+            await self._subscription.close_async()
+            self._subscription = None
+        self.invalidate()
+
+    def __enter__(self) -> "CachingTagReader":
+        return self
+
+    async def __aenter__(self) -> "CachingTagReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.close_async()
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Remove a cached value, so that the next read retrieves it from the server.
+
+        Args:
+            path: The path of the tag whose value to remove, or None to remove all
+                cached values.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._generations.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(path, None)
+                self._bump_generation(path)
+
+    def _read(
+        self, path: str, include_timestamp: bool, include_aggregates: bool
+    ) -> Optional[SerializedTagWithAggregates]:
+        """Retrieve the current value of the tag with the given ``path``, from the
+        cache if possible.
+
+        Optionally retrieves the aggregate values as well. The tag must exist. Clients
+        do not typically call this method directly. Use a :class:`.TagValueReader`
+        instead.
+
+        Args:
+            path: The path of the tag to read.
+            include_timestamp: True to include the timestamp associated with the value
+                in the result.
+            include_aggregates: True to include the tag's aggregate values in the result
+                if the tag is set to :attr:`TagData.collect_aggregates`.
+
+        Returns:
+            The value serialized as a string, or None if the tag exists but doesn't have
+            a value.
+
+        Raises:
+            ValueError: if ``path`` is empty or invalid.
+            ValueError: if ``path`` is None.
+            ApiException: if the API call fails.
+        """
+        path = tbase.TagPathUtilities.validate(path)
+        key = (path, include_timestamp, include_aggregates)
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                return value
+
+            pending = self._pending.get(key)
+            if pending is None:
+                future = Future()  # type: Future
+                self._pending[key] = future
+                generation = self._generation(path)
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = self._reader._read(path, include_timestamp, include_aggregates)
+        except BaseException as ex:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(ex)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._store(key, value, generation)
+        future.set_result(value)
+        return value
+
+    async def _read_async(
+        self, path: str, include_timestamp: bool, include_aggregates: bool
+    ) -> Optional[SerializedTagWithAggregates]:
+        """Asynchronously retrieve the current value of the tag with the given
+        ``path``, from the cache if possible.
+
+        Optionally retrieves the aggregate values as well. The tag must exist. Clients
+        do not typically call this method directly. Use a :class:`.TagValueReader`
+        instead.
+
+        Args:
+            path: The path of the tag to read.
+            include_timestamp: True to include the timestamp associated with the value
+                in the result.
+            include_aggregates: True to include the tag's aggregate values in the result
+                if the tag is set to :attr:`TagData.collect_aggregates`.
+
+        Returns:
+            The value serialized as a string, or None if the tag exists but doesn't have
+            a value.
+
+        Raises:
+            ValueError: if ``path`` is empty or invalid.
+            ValueError: if ``path`` is None.
+            ApiException: if the API call fails.
+        """
+        path = tbase.TagPathUtilities.validate(path)
+        key = (path, include_timestamp, include_aggregates)
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                return value
+
+            task = self._pending_async.get(key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    self._reader._read_async(
+                        path, include_timestamp, include_aggregates
+                    )
+                )
+                self._pending_async[key] = task
+                task.add_done_callback(
+                    self._make_store_callback(key, self._generation(path))
+                )
+
+        # Shield the shared read, so that cancelling one caller doesn't cancel the
+        # read for the others
+        return await asyncio.shield(task)
+
+    def _make_store_callback(
+        self, key: _ReadKey, generation: _Generation
+    ) -> Callable[[asyncio.Future], None]:
+        def callback(task: asyncio.Future) -> None:
+            with self._lock:
+                del self._pending_async[key]
+                if not task.cancelled() and task.exception() is None:
+                    self._store(key, task.result(), generation)
+
+        return callback
+
+    def _lookup(
+        self, key: _ReadKey
+    ) -> Tuple[bool, Optional[SerializedTagWithAggregates]]:
+        # Must be called while holding the lock
+        path, include_timestamp, include_aggregates = key
+        entry = self._entries.get(path)
+        if entry is None:
+            return False, None
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            del self._entries[path]
+            if not self._is_pending(path):
+                self._generations.pop(path, None)
+            return False, None
+        if (include_timestamp and not entry.has_timestamp) or (
+            include_aggregates and not entry.has_aggregates
+        ):
+            return False, None
+
+        self._entries.move_to_end(path)
+        if entry.value is None:
+            return True, None
+        return True, entry.value.select(include_timestamp, include_aggregates)
+
+    def _store(
+        self,
+        key: _ReadKey,
+        value: Optional[SerializedTagWithAggregates],
+        generation: _Generation,
+    ) -> None:
+        # Must be called while holding the lock
+        path, include_timestamp, include_aggregates = key
+        if self._generation(path) != generation:
+            # The tag was changed or invalidated while it was being read
+            return
+
+        if self._subscribed is not None and self._subscribed.fullmatch(path):
+            expires = None  # type: Optional[float]
+        else:
+            expires = time.monotonic() + self._path_time_to_live.get(
+                path, self._time_to_live
+            )
+        self._put(
+            path, _CacheEntry(value, include_timestamp, include_aggregates, expires)
+        )
+
+    def _put(self, path: str, entry: _CacheEntry) -> None:
+        # Must be called while holding the lock
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self._max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._generations.pop(evicted, None)
+
+    def _is_pending(self, path: str) -> bool:
+        # Must be called while holding the lock
+        return any(k[0] == path for k in self._pending) or any(
+            k[0] == path for k in self._pending_async
+        )
+
+    def _generation(self, path: str) -> _Generation:
+        # Must be called while holding the lock
+        return self._epoch, self._generations.get(path, 0)
+
+    def _bump_generation(self, path: str) -> None:
+        # Must be called while holding the lock. Generations only need to be tracked
+        # while a tag is cached or being read, which keeps the dictionary bounded.
+        if path in self._entries or self._is_pending(path):
+            self._generations[path] = self._generations.get(path, 0) + 1
+        else:
+            self._generations.pop(path, None)
+
+    def _on_tag_changed(
+        self, tag: tbase.TagData, reader: Optional[tbase.TagValueReader]
+    ) -> None:
+        value = None  # type: Optional[SerializedTagWithAggregates]
+        if reader is not None:
+            value = reader._reader._read(tag.path, True, True)
+
+        with self._lock:
+            self._bump_generation(tag.path)
+            if value is None:
+                self._entries.pop(tag.path, None)
+            else:
+                # Updates don't reliably include aggregates, so only the value and its
+                # timestamp are cached. Reading the aggregates goes to the server.
+                self._put(tag.path, _CacheEntry(value, True, False, None))
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of AdaptiveFlushController."""
+
+import datetime
+from typing import Optional, Tuple
+
+from typing_extensions import final
+
+# The shortest time-based flush interval the controller chooses
+_MIN_FLUSH_INTERVAL = 0.001
+# The minimum relative spread of payload sizes needed to estimate how send times
+# depend on payload size, instead of assuming they don't
+_MIN_RELATIVE_VARIANCE = 1e-6
+
+
+@final
+class AdaptiveFlushController:
+    """Chooses when a :class:`BufferedTagWriter` sends its buffered writes, based on
+    how quickly writes arrive and how long the server takes to accept them.
+
+    The controller keeps exponentially weighted estimates of the incoming write rate,
+    the average size of a write, and a linear model of the time a send takes for a
+    given payload size: a fixed cost per request plus a cost per byte. From those, it
+    chooses the largest buffer that still lets a write be buffered and sent within
+    ``max_latency``, but never one so small that sends can't keep up with the incoming
+    writes. The time-based flush interval is whatever remains of ``max_latency`` after
+    sending a full buffer.
+
+    When even a single write can't be sent within ``max_latency``, or sends can't keep
+    up with the incoming writes, the controller falls back to the largest buffer size
+    and flush interval allowed, to send as few requests as possible.
+
+    The controller is not thread-safe; the writer calls it while holding its lock.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'AdaptiveFlushController' is not an acceptable base type")
+
+    def __init__(
+        self,
+        max_buffer_size: Optional[int],
+        max_latency: datetime.timedelta,
+        *,
+        smoothing: float = 0.3
+    ) -> None:
+        """Initialize the controller, starting with the largest allowed settings.
+
+        Args:
+            max_buffer_size: The largest number of writes to buffer before sending
+                them, or None for no limit.
+            max_latency: The longest a write should wait to be accepted by the server,
+                from when it is buffered.
+            smoothing: The weight given to each new observation in the estimates,
+                between 0 and 1. Larger values adapt faster but less smoothly.
+
+        Raises:
+            ValueError: if ``max_buffer_size`` is less than one.
+            ValueError: if ``max_latency`` is less than 1 millisecond.
+            ValueError: if ``smoothing`` is not greater than 0 and at most 1.
+        """
+        if max_buffer_size is not None and max_buffer_size < 1:
+            raise ValueError("max_buffer_size must be at least 1")
+        if max_latency.total_seconds() < _MIN_FLUSH_INTERVAL:
+            raise ValueError("max_latency must be at least 1 millisecond")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be greater than 0 and at most 1")
+
+        self._max_buffer_size = max_buffer_size
+        self._max_latency = max_latency.total_seconds()
+        self._smoothing = smoothing
+
+        self._buffer_size = max_buffer_size
+        self._flush_interval = self._max_latency
+        self._last_flush = None  # type: Optional[float]
+        self._write_rate = None  # type: Optional[float]
+        self._bytes_per_write = None  # type: Optional[float]
+        # Exponentially weighted sums for a least-squares fit of send time against
+        # payload size
+        self._weight = 0.0
+        self._sum_bytes = 0.0
+        self._sum_time = 0.0
+        self._sum_bytes_squared = 0.0
+        self._sum_bytes_time = 0.0
+
+    @property
+    def buffer_size(self) -> Optional[int]:  # noqa: D401
+        """The number of buffered writes at which to send them, or None for no limit."""
+        return self._buffer_size
+
+    @property
+    def flush_interval(self) -> datetime.timedelta:  # noqa: D401
+        """The longest time to keep a write in the buffer before sending it."""
+        return datetime.timedelta(seconds=self._flush_interval)
+
+    @property
+    def write_rate(self) -> Optional[float]:  # noqa: D401
+        """The estimated number of writes per second, or None if not yet known."""
+        return self._write_rate
+
+    def record_flush(self, num_writes: int, now: float) -> None:
+        """Record that buffered writes are about to be sent.
+
+        Args:
+            num_writes: The number of writes in the buffer.
+            now: The value of ``time.monotonic()`` when the buffer was flushed.
+        """
+        last_flush, self._last_flush = self._last_flush, now
+        if last_flush is None or now <= last_flush:
+            return
+
+        self._write_rate = self._smooth(
+            self._write_rate, num_writes / (now - last_flush)
+        )
+        self._update()
+
+    def record_send(self, num_writes: int, num_bytes: int, duration: float) -> None:
+        """Record that the server accepted a buffer of writes.
+
+        Args:
+            num_writes: The number of writes in the buffer.
+            num_bytes: The estimated size of the writes in the buffer.
+            duration: The number of seconds the send took.
+        """
+        if num_writes:
+            self._bytes_per_write = self._smooth(
+                self._bytes_per_write, num_bytes / num_writes
+            )
+
+        decay = 1 - self._smoothing
+        self._weight = self._weight * decay + 1
+        self._sum_bytes = self._sum_bytes * decay + num_bytes
+        self._sum_time = self._sum_time * decay + duration
+        self._sum_bytes_squared = self._sum_bytes_squared * decay + num_bytes**2
+        self._sum_bytes_time = self._sum_bytes_time * decay + num_bytes * duration
+        self._update()
+
+    def _smooth(self, estimate: Optional[float], observation: float) -> float:
+        if estimate is None:
+            return observation
+        return estimate + self._smoothing * (observation - estimate)
+
+    def _send_model(self) -> Tuple[float, float]:
+        """Estimate the time a send takes as a fixed cost plus a cost per byte.
+
+        Returns:
+            The fixed cost in seconds, and the cost per byte in seconds.
+        """
+        if not self._weight:
+            return 0.0, 0.0
+
+        weight = self._weight
+        variance = weight * self._sum_bytes_squared - self._sum_bytes**2
+        if variance > _MIN_RELATIVE_VARIANCE * weight * self._sum_bytes_squared:
+            per_byte = (
+                weight * self._sum_bytes_time - self._sum_bytes * self._sum_time
+            ) / variance
+            fixed = (self._sum_time - per_byte * self._sum_bytes) / weight
+            if per_byte >= 0 and fixed >= 0:
+                return fixed, per_byte
+        # Every payload was about the same size, or the fit makes no sense, so assume
+        # the send time doesn't depend on the payload size
+        return self._sum_time / weight, 0.0
+
+    def _update(self) -> None:
+        rate = self._write_rate
+        if rate is None:
+            return
+
+        fixed, per_byte = self._send_model()
+        per_write = per_byte * (self._bytes_per_write or 0.0)
+        budget = self._max_latency - fixed
+        if budget <= 0 or rate * per_write >= 1:
+            # Sends can't meet the latency bound, or can't keep up, whatever the
+            # buffer size, so fall back to the largest settings to send as few
+            # requests as allowed
+            self._buffer_size = self._max_buffer_size
+            self._flush_interval = self._max_latency
+            return
+
+        # The most writes that arrive while the buffer fills, and can still be sent
+        # within the latency bound...
+        size = rate * budget / (1 + rate * per_write)
+        # ...but at least enough that sends keep up with the incoming writes
+        size = max(size, rate * fixed / (1 - rate * per_write))
+        if self._max_buffer_size is not None and size >= self._max_buffer_size:
+            self._buffer_size = self._max_buffer_size
+        else:
+            self._buffer_size = max(1, int(size))
+
+        send_time = fixed + per_write * self._buffer_size
+        self._flush_interval = min(
+            max(self._max_latency - send_time, _MIN_FLUSH_INTERVAL), self._max_latency
+        )
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of BackgroundSender."""
+
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Collection, List, Optional, Set, Tuple
+
+from typing_extensions import final
+
+# A batch whose tag paths aren't known, which is ordered with respect to every batch
+_ALL_PATHS = None
+
+
+@final
+class BackgroundSender:
+    """Sends batches of buffered tag writes from dedicated threads.
+
+    Submitting a batch never waits for the server; if the server falls behind,
+    submitted batches queue up until a thread gets to them. Up to ``max_concurrency``
+    batches are sent at once, but a batch is only released once every batch submitted
+    before it that writes any of the same tag paths has been sent. Writes to each tag
+    therefore reach the server in the order they were submitted.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'BackgroundSender' is not an acceptable base type")
+
+    def __init__(
+        self, send: Callable[[Any], None], name: str, max_concurrency: int = 1
+    ) -> None:
+        """Initialize the sender. The threads are started when the first batch is
+        submitted.
+
+        Args:
+            send: The function to call, on one of the sender's threads, to send a
+                batch. Must be safe to call from several threads at once if
+                ``max_concurrency`` is more than 1.
+            name: The name of the sender's threads.
+            max_concurrency: The maximum number of batches to send at once.
+
+        Raises:
+            ValueError: if ``max_concurrency`` is less than one.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._send = send
+        self._name = name
+        self._max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        # Batches that haven't been released yet, in the order they were submitted
+        self._pending = []  # type: List[Tuple[Any, Optional[Collection[str]], Future]]
+        self._in_flight = set()  # type: Set[Future]
+        self._busy_paths = Counter()  # type: Counter[str]
+        self._busy_all_paths = 0
+        self._threads = []  # type: List[threading.Thread]
+        self._closed = False
+
+    @property
+    def max_concurrency(self) -> int:  # noqa: D401
+        """The maximum number of batches sent at once."""
+        return self._max_concurrency
+
+    def submit(
+        self,
+        updates: Any,
+        paths: Optional[Collection[str]] = _ALL_PATHS,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """Queue a batch to be sent, and return immediately.
+
+        Args:
+            updates: The batch to send.
+            paths: The tag paths written by the batch, or None if they aren't known,
+                in which case the batch is sent after, and before, every other batch.
+            callback: A function to call on the sender's thread with the returned
+                future once the batch has been sent, or None.
+
+        Returns:
+            A future that completes when the batch has been sent, and contains the
+            exception raised by the send function, if any.
+        """
+        future = Future()  # type: Future
+        if callback is not None:
+            # Add the callback before queueing the batch, so that it is never called
+            # on the submitting thread
+            future.add_done_callback(callback)
+        with self._condition:
+            self._pending.append((updates, paths, future))
+            if len(self._threads) < self._max_concurrency:
+                # Start another thread for each batch queued, up to the limit
+                thread = threading.Thread(target=self._run, name=self._name)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+            self._condition.notify_all()
+        return future
+
+    def flush(self) -> Future:
+        """Return a future that completes once all of the batches already submitted
+        have been sent, without submitting a batch.
+
+        Returns:
+            The future. Errors from the batches are not reported through it.
+        """
+        done = Future()  # type: Future
+        done.set_running_or_notify_cancel()
+        with self._condition:
+            outstanding = [f for _, _, f in self._pending] + list(self._in_flight)
+        if not outstanding:
+            done.set_result(None)
+            return done
+
+        remaining = [len(outstanding)]
+        lock = threading.Lock()
+
+        def batch_done(_: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                done.set_result(None)
+
+        for future in outstanding:
+            future.add_done_callback(batch_done)
+        return done
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the threads once all of the batches already submitted have been sent.
+
+        Args:
+            wait: Whether to wait for the threads to stop.
+        """
+        with self._condition:
+            self._closed = True
+            threads, self._threads = self._threads, []
+            self._condition.notify_all()
+
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _next_batch_while_locked(
+        self,
+    ) -> Optional[Tuple[Any, Optional[Collection[str]], Future]]:
+        """Remove and return the first pending batch that can be sent now, if any.
+
+        Must hold :attr:`_condition`.
+        """
+        if self._busy_all_paths:
+            return None
+
+        # Paths written by earlier batches that are still pending
+        blocked = set()  # type: Set[str]
+        for index, batch in enumerate(self._pending):
+            paths = batch[1]
+            if paths is _ALL_PATHS:
+                if index == 0 and not self._in_flight:
+                    return self._pending.pop(0)
+                return None
+            if not any(p in blocked or p in self._busy_paths for p in paths):
+                return self._pending.pop(index)
+            blocked.update(paths)
+        return None
+
+    def _run(self) -> None:
+        condition = self._condition
+        while True:
+            with condition:
+                batch = self._next_batch_while_locked()
+                while batch is None:
+                    if self._closed and not self._pending:
+                        return
+                    condition.wait()
+                    batch = self._next_batch_while_locked()
+
+                updates, paths, future = batch
+                self._in_flight.add(future)
+                if paths is _ALL_PATHS:
+                    self._busy_all_paths += 1
+                else:
+                    self._busy_paths.update(paths)
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    self._send(updates)
+                except Exception as ex:
+                    future.set_exception(ex)
+                else:
+                    future.set_result(None)
+
+            with condition:
+                self._in_flight.discard(future)
+                if paths is _ALL_PATHS:
+                    self._busy_all_paths -= 1
+                else:
+                    self._busy_paths.subtract(paths)
+                    for path in paths:
+                        if self._busy_paths[path] <= 0:
+                            del self._busy_paths[path]
+                condition.notify_all()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of DeadbandFilter."""
+
+import datetime
+from typing import Callable, Dict, NamedTuple, Optional, Union
+
+from nisystemlink.clients import tag as tbase
+from typing_extensions import final
+
+# The data types whose values can be compared against a numeric deadband
+_NUMERIC_TYPES = {
+    tbase.DataType.DOUBLE: float,
+    tbase.DataType.INT32: int,
+    tbase.DataType.UINT64: int,
+}  # type: Dict[tbase.DataType, Callable[[str], Union[int, float]]]
+
+
+class _LastWrite(NamedTuple):
+    """The last write to a tag that passed the filter."""
+
+    data_type: tbase.DataType
+    value: str
+    number: Optional[Union[int, float]]
+    time: float
+
+
+@final
+class DeadbandFilter:
+    """Decides which tag writes are worth sending, by comparing each write with the
+    last write to the same tag that was sent.
+
+    A write is suppressed when its value equals the last value sent for the tag. For
+    :attr:`DataType.DOUBLE`, :attr:`DataType.INT32`, and :attr:`DataType.UINT64`
+    tags, a write is also suppressed when its value differs from the last value sent
+    by no more than an absolute deadband, or by no more than a percentage of the last
+    value sent. Suppressed writes don't move the reference value, so that slow drifts
+    are still sent once they leave the deadband. A write is never suppressed when the
+    tag's data type changed, or when no write to the tag has been sent for longer
+    than the maximum silence interval.
+
+    The filter is not thread-safe; the writer calls it while holding its lock.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'DeadbandFilter' is not an acceptable base type")
+
+    def __init__(
+        self,
+        *,
+        absolute: Optional[float] = None,
+        percent: Optional[float] = None,
+        max_silence: Optional[datetime.timedelta] = None
+    ) -> None:
+        """Initialize the filter.
+
+        Args:
+            absolute: The largest change in a numeric tag's value to suppress, or None
+                to only suppress unchanged values.
+            percent: The largest change in a numeric tag's value to suppress, as a
+                percentage of the last value sent, or None to only suppress unchanged
+                values.
+            max_silence: The longest time to suppress writes to a tag, after which
+                the next write to the tag is sent, or None to suppress writes
+                indefinitely.
+
+        Raises:
+            ValueError: if ``absolute`` or ``percent`` is negative.
+            ValueError: if both ``absolute`` and ``percent`` are given.
+            ValueError: if ``max_silence`` is not positive.
+        """
+        if absolute is not None and absolute < 0:
+            raise ValueError("absolute cannot be negative")
+        if percent is not None and percent < 0:
+            raise ValueError("percent cannot be negative")
+        if absolute is not None and percent is not None:
+            raise ValueError("only one of absolute and percent can be given")
+        if max_silence is not None and max_silence.total_seconds() <= 0:
+            raise ValueError("max_silence must be positive")
+
+        self._absolute = absolute
+        self._fraction = percent / 100 if percent is not None else None
+        self._max_silence = (
+            max_silence.total_seconds() if max_silence is not None else None
+        )
+        self._last = {}  # type: Dict[str, _LastWrite]
+
+    @property
+    def absolute(self) -> Optional[float]:  # noqa: D401
+        """The largest change in a numeric tag's value to suppress, if any."""
+        return self._absolute
+
+    @property
+    def percent(self) -> Optional[float]:  # noqa: D401
+        """The largest change in a numeric tag's value to suppress, as a percentage of
+        the last value sent, if any.
+        """
+        return self._fraction * 100 if self._fraction is not None else None
+
+    @property
+    def max_silence(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The longest time to suppress writes to a tag, if any."""
+        if self._max_silence is None:
+            return None
+        return datetime.timedelta(seconds=self._max_silence)
+
+    def accept(
+        self, path: str, data_type: tbase.DataType, value: str, now: float
+    ) -> bool:
+        """Decide whether to send a write, and remember it as the tag's last value
+        sent if so.
+
+        Args:
+            path: The path of the tag being written.
+            data_type: The data type of the value.
+            value: The value, serialized as a string.
+            now: The value of ``time.monotonic()`` when the value was written.
+
+        Returns:
+            Whether to send the write.
+        """
+        last = self._last.get(path)
+        if (
+            last is not None
+            and last.data_type == data_type
+            and (self._max_silence is None or now - last.time < self._max_silence)
+        ):
+            if value == last.value:
+                return False
+            number = self._parse(data_type, value)
+            if self._within_deadband(last.number, number):
+                return False
+        else:
+            number = self._parse(data_type, value)
+
+        self._last[path] = _LastWrite(data_type, value, number, now)
+        return True
+
+    def reset(self) -> None:
+        """Forget the last value sent for every tag, so that the next write to each
+        tag is sent.
+
+        Call this when writes that passed the filter may not reach the server.
+        """
+        self._last.clear()
+
+    def _parse(
+        self, data_type: tbase.DataType, value: str
+    ) -> Optional[Union[int, float]]:
+        if self._absolute is None and self._fraction is None:
+            return None
+        parse = _NUMERIC_TYPES.get(data_type)
+        if parse is None:
+            return None
+        try:
+            return parse(value)
+        except ValueError:
+            return None
+
+    def _within_deadband(
+        self,
+        last: Optional[Union[int, float]],
+        number: Optional[Union[int, float]],
+    ) -> bool:
+        if last is None or number is None:
+            return False
+        change = abs(number - last)
+        if self._absolute is not None:
+            return change <= self._absolute
+        assert self._fraction is not None
+        return change <= self._fraction * abs(last)
@@ -53,6 +53,7 @@ class ManualResetTimer(events.Events, metaclass=ClasspropertySupport):
 
             obj._thread = None
             obj._running = []  # used as mutable boolean; empty is False
+            obj._interval = []
 
             cls.__null_timer_impl = obj
         return cls.__null_timer_impl
@@ -75,13 +76,15 @@ class ManualResetTimer(events.Events, metaclass=ClasspropertySupport):
 
         # Note: This _running flag means that the *thread* is running, not the timer
         self._running = [None]  # used as mutable boolean; non-empty is True
+        # Shared with the thread, so that the interval can be changed
+        self._interval = [interval_secs]
         self._timer_start = threading.Event()
         self._timer_cancel = threading.Event()
         self._thread = threading.Thread(
             target=self._run,
             args=[
                 self._running,
-                interval_secs,
+                self._interval,
                 self._timer_start,
                 self._timer_cancel,
                 self.elapsed,
@@ -99,6 +102,32 @@ class ManualResetTimer(events.Events, metaclass=ClasspropertySupport):
         """
         return self._thread is not None
 
+    @property
+    def interval(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The amount of time after calling :meth:`start()` before :attr:`elapsed` is
+        raised, or None if the timer isn't configured.
+
+        Setting the interval takes effect the next time the timer is started.
+
+        Raises:
+            ValueError: if set to a value less than or equal to zero.
+            RuntimeError: if set on a timer that isn't configured.
+        """
+        if not self._interval:
+            return None
+        return datetime.timedelta(seconds=self._interval[0])
+
+    @interval.setter
+    def interval(self, interval: datetime.timedelta) -> None:
+        interval_secs = interval.total_seconds()
+        if interval_secs <= 0:
+            raise ValueError("interval cannot be <= 0")
+        if not self._interval:
+            raise RuntimeError(
+                "Cannot set the interval of a timer that isn't configured"
+            )
+        self._interval[0] = interval_secs
+
     def start(self) -> None:
         """Start the timer."""
         if self._running:
@@ -113,7 +142,7 @@ class ManualResetTimer(events.Events, metaclass=ClasspropertySupport):
     @staticmethod
     def _run(
         running: List[None],
-        interval: int,
+        interval: List[float],
         timer_start: threading.Event,
         timer_cancel: threading.Event,
         elapsed: Callable[[], None],
@@ -121,7 +150,7 @@ class ManualResetTimer(events.Events, metaclass=ClasspropertySupport):
         while running:
             timer_start.wait()
             timer_start.clear()
-            if running and not timer_cancel.wait(interval):
+            if running and not timer_cancel.wait(interval[0]):
                 try:
                     elapsed()
                 except Exception:
@@ -3,11 +3,50 @@
 """Implementation of SerializedTagWithAggregates."""
 
 import datetime
-from typing import Optional
+import typing
+from typing import Any, Callable, Optional
 
 from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
 from typing_extensions import final
 
+_DESERIALIZERS = {
+    tbase.DataType.BOOLEAN: {"True": True, "False": False}.get,
+    tbase.DataType.DATE_TIME: TimestampUtilities.str_to_datetime,
+    tbase.DataType.DOUBLE: float,
+    tbase.DataType.INT32: int,
+    tbase.DataType.UINT64: int,
+    tbase.DataType.STRING: str,
+}
+
+# Marks a value that hasn't been deserialized yet, since None is a valid result
+_NOT_DESERIALIZED = object()
+
+
+def deserialize_value(value: Optional[str], data_type: tbase.DataType) -> Any:
+    """Convert a value serialized as a string to the given data type.
+
+    Args:
+        value: The value serialized as a string.
+        data_type: The data type of the value.
+
+    Returns:
+        The converted value, or None if ``value`` is None or can't be converted.
+
+    Raises:
+        ValueError: if ``data_type`` is unknown.
+    """
+    if value is None:
+        return None
+    try:
+        deserializer = typing.cast(Callable[[str], Any], _DESERIALIZERS[data_type])
+    except KeyError:
+        raise ValueError("data_type is unknown")
+    try:
+        return deserializer(value)
+    except ValueError:
+        return None
+
 
 @final
 class SerializedTagWithAggregates:
@@ -60,6 +99,9 @@ class SerializedTagWithAggregates:
         self._min = min
         self._max = max
         self._mean = mean
+        self._deserialized_value = _NOT_DESERIALIZED  # type: Any
+        self._deserialized_min = _NOT_DESERIALIZED  # type: Any
+        self._deserialized_max = _NOT_DESERIALIZED  # type: Any
 
     @property
     def data_type(self) -> tbase.DataType:  # noqa: D401
@@ -108,3 +150,76 @@ class SerializedTagWithAggregates:
         the data type of the tag does not track a mean value.
         """
         return self._mean
+
+    @property
+    def deserialized_value(self) -> Any:  # noqa: D401
+        """The value of the tag converted to its data type, or None if it can't be
+        converted.
+
+        The value is converted the first time it is needed, and the result is reused
+        by later reads of the same value.
+
+        Raises:
+            ValueError: if the data type is unknown.
+        """
+        if self._deserialized_value is _NOT_DESERIALIZED:
+            self._deserialized_value = deserialize_value(self._value, self._data_type)
+        return self._deserialized_value
+
+    @property
+    def deserialized_min(self) -> Any:  # noqa: D401
+        """The minimum value of the tag converted to its data type, or None if there
+        is no minimum value or it can't be converted.
+
+        Raises:
+            ValueError: if the data type is unknown.
+        """
+        if self._deserialized_min is _NOT_DESERIALIZED:
+            self._deserialized_min = deserialize_value(self._min, self._data_type)
+        return self._deserialized_min
+
+    @property
+    def deserialized_max(self) -> Any:  # noqa: D401
+        """The maximum value of the tag converted to its data type, or None if there
+        is no maximum value or it can't be converted.
+
+        Raises:
+            ValueError: if the data type is unknown.
+        """
+        if self._deserialized_max is _NOT_DESERIALIZED:
+            self._deserialized_max = deserialize_value(self._max, self._data_type)
+        return self._deserialized_max
+
+    def select(
+        self, include_timestamp: bool, include_aggregates: bool
+    ) -> "SerializedTagWithAggregates":
+        """Get a copy of the value that only contains the requested information.
+
+        Args:
+            include_timestamp: True to keep the timestamp associated with the value.
+            include_aggregates: True to keep the aggregate values.
+
+        Returns:
+            The value with the timestamp and/or aggregate values cleared if not
+            requested.
+        """
+        if include_aggregates:
+            aggregates = (self._count, self._min, self._max, self._mean)
+        else:
+            aggregates = (None, None, None, None)
+        selected = SerializedTagWithAggregates(
+            self._path,
+            self._data_type,
+            self._value,
+            self._timestamp if include_timestamp else None,
+            *aggregates,
+        )
+        # Share the values that were already converted, so that each copy doesn't
+        # convert them again
+        selected._deserialized_value = self._deserialized_value
+        if include_aggregates:
+            selected._deserialized_min = self._deserialized_min
+            selected._deserialized_max = self._deserialized_max
+        else:
+            selected._deserialized_min = selected._deserialized_max = None
+        return selected
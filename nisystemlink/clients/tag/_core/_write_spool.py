@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of WriteSpool."""
+
+import datetime
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+from nisystemlink.clients import core
+from typing_extensions import final
+
+_SEGMENT_SUFFIX = ".seg"
+_TEMP_SUFFIX = ".tmp"
+_CORRUPT_SUFFIX = ".corrupt"
+
+
+@final
+class WriteSpool:
+    """Persists batches of tag writes to segment files in a directory until they have
+    been sent, so that they survive server outages and process crashes.
+
+    Each batch is written to its own segment file before it is sent, and the file is
+    deleted once the server accepts the batch. A dedicated thread sends the segments
+    oldest first. When a send fails because the server can't be reached or is
+    temporarily unavailable, the thread keeps the segment and retries it after a delay
+    that doubles with each failure, up to a limit; later segments wait, so writes
+    reach the server in order. Segments left behind by an earlier process using the
+    same directory are sent first. A segment that can't be decoded, such as one left
+    empty by an operating system crash, is never retried: it is renamed with a
+    ``.corrupt`` suffix, counted as discarded, and reported as an error.
+
+    When storing a batch would use more than the allowed disk space, the oldest
+    segments are discarded to make room.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'WriteSpool' is not an acceptable base type")
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        *,
+        retry_interval: datetime.timedelta = datetime.timedelta(seconds=1),
+        max_retry_interval: datetime.timedelta = datetime.timedelta(minutes=1),
+        sync: bool = False
+    ) -> None:
+        """Initialize the spool, recovering any segments already in ``directory``.
+
+        Args:
+            directory: The directory to store the segment files in, which is created if
+                it doesn't exist. Only one spool may use a directory at a time.
+            max_bytes: The maximum total size of the segment files.
+            retry_interval: The delay before the first retry of a failed send.
+            max_retry_interval: The maximum delay between retries.
+            sync: Whether to flush each segment file to the storage device before
+                returning, so that batches also survive power loss and operating system
+                crashes, at the cost of slower writes.
+
+        Raises:
+            ValueError: if ``max_bytes`` is less than one.
+            ValueError: if ``retry_interval`` is not positive, or is greater than
+                ``max_retry_interval``.
+            OSError: if the directory can't be created or read.
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if retry_interval.total_seconds() <= 0:
+            raise ValueError("retry_interval must be positive")
+        if max_retry_interval < retry_interval:
+            raise ValueError("max_retry_interval cannot be less than retry_interval")
+
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._retry_interval = retry_interval.total_seconds()
+        self._max_retry_interval = max_retry_interval.total_seconds()
+        self._sync = sync
+
+        self._condition = threading.Condition()
+        # The segments that haven't been sent, oldest first: (sequence, path, size)
+        self._segments = deque()  # type: Deque[Tuple[int, str, int]]
+        self._num_bytes = 0
+        self._num_dropped = 0
+        # Every segment with a lower sequence number has been sent or discarded
+        self._next_unsent = 0
+        self._next_sequence = 0
+        self._failed_attempts = 0
+        self._last_error = None  # type: Optional[Exception]
+        self._retry_now = False
+        self._thread = None  # type: Optional[threading.Thread]
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    @property
+    def directory(self) -> str:  # noqa: D401
+        """The directory containing the segment files."""
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:  # noqa: D401
+        """The maximum total size of the segment files."""
+        return self._max_bytes
+
+    @property
+    def num_batches(self) -> int:  # noqa: D401
+        """The number of batches stored in the spool that haven't been sent."""
+        with self._condition:
+            return len(self._segments)
+
+    @property
+    def num_bytes(self) -> int:  # noqa: D401
+        """The total size of the segment files that haven't been sent."""
+        with self._condition:
+            return self._num_bytes
+
+    @property
+    def num_dropped(self) -> int:  # noqa: D401
+        """The number of batches discarded to stay within :attr:`max_bytes`, or
+        because they were corrupt.
+        """
+        with self._condition:
+            return self._num_dropped
+
+    @property
+    def last_sequence(self) -> int:  # noqa: D401
+        """The sequence number of the most recently stored batch, or -1 if none."""
+        with self._condition:
+            return self._next_sequence - 1
+
+    def start(
+        self,
+        send: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        decode: Optional[Callable[[bytes], Any]] = None,
+    ) -> None:
+        """Start sending the stored batches from a dedicated thread.
+
+        Args:
+            send: The function to call, on the spool's thread, to send a decoded
+                batch.
+            on_error: The function to call, on the spool's thread, when the server
+                rejects a batch or a batch can't be decoded, which is then discarded
+                instead of retried.
+            decode: The function to call to decode each stored batch before sending
+                it, raising an exception if the batch is corrupt, or None to send the
+                stored bytes.
+
+        Raises:
+            RuntimeError: if the spool has already been started.
+        """
+        with self._condition:
+            if self._thread is not None or self._closed:
+                raise RuntimeError("The spool has already been started")
+            self._thread = threading.Thread(
+                target=self._run,
+                args=[send, on_error, decode],
+                name="WriteSpool sender",
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def append(self, data: bytes) -> int:
+        """Store a batch, to be sent after all of the batches stored before it.
+
+        Args:
+            data: The serialized batch.
+
+        Returns:
+            The batch's sequence number, for use with :meth:`wait_sent`.
+
+        Raises:
+            OSError: if the segment file can't be written.
+        """
+        with self._condition:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            if len(data) > self._max_bytes:
+                # Never fits, so it's discarded on arrival
+                self._num_dropped += 1
+                self._advance_unsent_while_locked()
+                return sequence
+
+            while self._segments and self._num_bytes + len(data) > self._max_bytes:
+                self._drop_oldest_while_locked()
+
+            path = os.path.join(
+                self._directory, "%020d%s" % (sequence, _SEGMENT_SUFFIX)
+            )
+            self._write_segment(path, data)
+            self._segments.append((sequence, path, len(data)))
+            self._num_bytes += len(data)
+            self._condition.notify_all()
+            return sequence
+
+    def wait_sent(self, sequence: int) -> None:
+        """Wait until the batch with the given sequence number, and every batch stored
+        before it, has been sent or discarded.
+
+        Retries a failing send right away, instead of waiting for the next retry.
+
+        Args:
+            sequence: The sequence number returned by :meth:`append`.
+
+        Raises:
+            Exception: the error from the next failed attempt to send a batch, if a
+                batch fails to send before the wait completes. The batch is kept, and
+                retried later.
+        """
+        with self._condition:
+            failed_attempts = self._failed_attempts
+            self._retry_now = True
+            self._condition.notify_all()
+            while self._next_unsent <= sequence:
+                if self._failed_attempts != failed_attempts:
+                    assert self._last_error is not None
+                    raise self._last_error
+                if self._thread is None:
+                    raise RuntimeError("The spool is not sending")
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Stop sending batches. Batches that haven't been sent stay in the directory,
+        and are sent by the next spool that uses it.
+        """
+        with self._condition:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _recover(self) -> None:
+        for name in sorted(os.listdir(self._directory)):
+            path = os.path.join(self._directory, name)
+            if name.endswith(_TEMP_SUFFIX):
+                # Left by a crash while writing a segment, which was never stored
+                os.remove(path)
+            elif name.endswith(_SEGMENT_SUFFIX):
+                try:
+                    sequence = int(name[: -len(_SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                size = os.path.getsize(path)
+                self._segments.append((sequence, path, size))
+                self._num_bytes += size
+        if self._segments:
+            self._next_unsent = self._segments[0][0]
+            self._next_sequence = self._segments[-1][0] + 1
+
+    def _write_segment(self, path: str, data: bytes) -> None:
+        # Write to a temporary file first, so that a crash never leaves a partial
+        # segment behind
+        temp_path = path + _TEMP_SUFFIX
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            if self._sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def _drop_oldest_while_locked(self) -> None:
+        _, path, size = self._segments.popleft()
+        self._num_bytes -= size
+        self._num_dropped += 1
+        _remove(path)
+        self._advance_unsent_while_locked()
+
+    def _advance_unsent_while_locked(self) -> None:
+        self._next_unsent = (
+            self._segments[0][0] if self._segments else self._next_sequence
+        )
+        self._condition.notify_all()
+
+    def _run(
+        self,
+        send: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        decode: Optional[Callable[[bytes], Any]],
+    ) -> None:
+        delay = self._retry_interval
+        while True:
+            with self._condition:
+                while not self._segments and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                segment = self._segments[0]
+
+            try:
+                with open(segment[1], "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                # Discarded to make room while we weren't holding the lock
+                continue
+
+            try:
+                batch = decode(data) if decode is not None else data
+            except Exception as ex:
+                # Retrying can't fix a corrupt segment, and would hold back every
+                # segment after it
+                self._set_aside(segment)
+                corrupt = ValueError(
+                    "Spool segment {} is corrupt, and was set aside".format(segment[1])
+                )
+                corrupt.__cause__ = ex
+                on_error(corrupt)
+                continue
+
+            error = None  # type: Optional[Exception]
+            try:
+                send(batch)
+            except Exception as ex:
+                error = ex
+
+            if error is not None and _is_retryable(error):
+                with self._condition:
+                    self._failed_attempts += 1
+                    self._last_error = error
+                    self._retry_now = False
+                    self._condition.notify_all()
+                    self._condition.wait_for(
+                        lambda: self._retry_now or self._closed, delay
+                    )
+                delay = min(delay * 2, self._max_retry_interval)
+                continue
+
+            delay = self._retry_interval
+            with self._condition:
+                if self._segments and self._segments[0] is segment:
+                    self._segments.popleft()
+                    self._num_bytes -= segment[2]
+                    _remove(segment[1])
+                    self._advance_unsent_while_locked()
+            if error is not None:
+                on_error(error)
+
+    def _set_aside(self, segment: Tuple[int, str, int]) -> None:
+        with self._condition:
+            if not self._segments or self._segments[0] is not segment:
+                return
+            self._segments.popleft()
+            self._num_bytes -= segment[2]
+            self._num_dropped += 1
+            try:
+                os.replace(segment[1], segment[1] + _CORRUPT_SUFFIX)
+            except OSError:
+                _remove(segment[1])
+            self._advance_unsent_while_locked()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Return whether a failed send might succeed if tried again later.
+
+    Only batches the server rejects outright are not retried: anything else, such as
+    a connection failure, might be caused by an outage.
+    """
+    if isinstance(error, core.ApiException):
+        status = error.http_status_code
+        if status is not None and 400 <= status < 500 and status not in (408, 429):
+            return False
+    return True
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -26,11 +26,13 @@ class HttpAsyncTagQueryResultCollection(tbase.AsyncTagQueryResultCollection):
         take: Optional[int],
         tag_query_result: Dict[str, Any],
         http_response: HttpResponse,
+        *,
+        max_concurrency: int = 1,
     ) -> None:
         first_page, total_count = self.__handle_query_response(
             tag_query_result, http_response
         )
-        super().__init__(first_page, total_count, skip)
+        super().__init__(first_page, total_count, skip, max_concurrency=max_concurrency)
 
         api = client.at_uri("/nitag/v2")
         base_params = {
@@ -63,16 +65,5 @@ class HttpAsyncTagQueryResultCollection(tbase.AsyncTagQueryResultCollection):
         if response.get("totalCount") is None:
             raise tbase.TagManager.invalid_response(http_response)
 
-        tags = []
-        for t in response["tags"]:
-            tags.append(
-                tbase.TagData(
-                    t["path"],
-                    tbase.DataType.from_api_name(t["type"]) if t["type"] else None,
-                    t.get("keywords"),
-                    t.get("properties"),
-                )
-            )
-            if t.get("collectAggregates"):
-                tags[-1].collect_aggregates = True
+        tags = [tbase.TagData.from_json_dict(t) for t in response["tags"]]
         return tags, response["totalCount"]
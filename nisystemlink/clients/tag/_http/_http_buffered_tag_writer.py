@@ -3,19 +3,28 @@
 """Implementation of HttpBufferedTagWriter."""
 
 import datetime
+import json
 from collections import OrderedDict
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Collection, Dict, List, Optional
 
 from nisystemlink.clients import tag as tbase
 from nisystemlink.clients.core._internal._http_client import HttpClient
 from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+from nisystemlink.clients.tag._core._adaptive_flush_controller import (
+    AdaptiveFlushController,
+)
+from nisystemlink.clients.tag._core._deadband_filter import DeadbandFilter
 from nisystemlink.clients.tag._core._itime_stamper import ITimeStamper
 from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
+from nisystemlink.clients.tag._core._write_spool import WriteSpool
+from nisystemlink.clients.tag._spooling_buffered_tag_writer import (
+    SpoolingBufferedTagWriter,
+)
 from typing_extensions import final
 
 
 @final
-class HttpBufferedTagWriter(tbase.BufferedTagWriter):
+class HttpBufferedTagWriter(SpoolingBufferedTagWriter):
     def __init_subclass__(cls) -> None:
         raise TypeError("type 'HttpBufferedTagWriter' is not an acceptable base type")
 
@@ -25,15 +34,61 @@ class HttpBufferedTagWriter(tbase.BufferedTagWriter):
         stamper: ITimeStamper,
         buffer_size: int,
         flush_timer: ManualResetTimer,
+        *,
+        send_in_background: bool = False,
+        send_error_callback: Optional[Callable[[Exception], None]] = None,
+        max_concurrent_sends: int = 1,
+        coalesce: bool = False,
+        spool: Optional[WriteSpool] = None,
+        max_pending_writes: Optional[int] = None,
+        max_pending_bytes: Optional[int] = None,
+        overflow_policy: tbase.OverflowPolicy = tbase.OverflowPolicy.BLOCK,
+        overflow_timeout: Optional[datetime.timedelta] = None,
+        flush_controller: Optional[AdaptiveFlushController] = None,
+        deadband_filter: Optional[DeadbandFilter] = None
     ) -> None:
-        super().__init__(stamper, buffer_size, flush_timer)
         self._api = client.at_uri("/nitag/v2")
         self._buffer = OrderedDict()  # type: OrderedDict[str, Dict[str, Any]]
+        self._coalesce = coalesce
+        # The spool is started by SpoolingBufferedTagWriter, so it can send as soon as
+        # the attributes it needs are set
+        super().__init__(
+            stamper,
+            buffer_size,
+            flush_timer,
+            send_in_background=send_in_background,
+            send_error_callback=send_error_callback,
+            max_concurrent_sends=max_concurrent_sends,
+            spool=spool,
+            max_pending_writes=max_pending_writes,
+            max_pending_bytes=max_pending_bytes,
+            overflow_policy=overflow_policy,
+            overflow_timeout=overflow_timeout,
+            flush_controller=flush_controller,
+            deadband_filter=deadband_filter,
+        )
 
     def _buffer_value(self, path: str, value: Dict[str, Any]) -> None:
-        if path not in self._buffer:
-            self._buffer.setdefault(path, {"path": path, "updates": []})
-        self._buffer[path]["updates"].append(value)
+        entry = self._buffer.get(path)
+        if entry is None:
+            self._buffer[path] = {"path": path, "updates": [value]}
+        elif self._coalesce:
+            entry["updates"][0] = value
+            self._num_coalesced += 1
+        else:
+            entry["updates"].append(value)
+
+    def _buffer_values(self, paths: List[str], values: List[Dict[str, Any]]) -> None:
+        buffer = self._buffer
+        for path, value in zip(paths, values):
+            entry = buffer.get(path)
+            if entry is None:
+                buffer[path] = {"path": path, "updates": [value]}
+            elif self._coalesce:
+                entry["updates"][0] = value
+                self._num_coalesced += 1
+            else:
+                entry["updates"].append(value)
 
     def _clear_buffer(self) -> None:
         self._buffer.clear()
@@ -43,6 +98,15 @@ class HttpBufferedTagWriter(tbase.BufferedTagWriter):
         self._buffer = OrderedDict()
         return updates
 
+    def _serialize_buffer(self, updates: Dict[str, Dict[str, Any]]) -> bytes:
+        return json.dumps(list(updates.values()), separators=(",", ":")).encode()
+
+    def _deserialize_buffer(self, data: bytes) -> Dict[str, Dict[str, Any]]:
+        return OrderedDict((entry["path"], entry) for entry in json.loads(data))
+
+    def _buffer_paths(self, updates: Dict[str, Dict[str, Any]]) -> Collection[str]:
+        return updates.keys()
+
     def _create_item(
         self,
         path: str,
@@ -57,6 +121,19 @@ class HttpBufferedTagWriter(tbase.BufferedTagWriter):
             item["timestamp"] = TimestampUtilities.datetime_to_str(timestamp)
         return item
 
+    def _create_items(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: List[str],
+    ) -> List[Dict[str, Any]]:
+        type_name = data_type.api_name
+        return [
+            {"value": {"value": value, "type": type_name}, "timestamp": timestamp}
+            for value, timestamp in zip(values, timestamps)
+        ]
+
     def _send_writes(self, updates: Dict[str, Dict[str, Any]]) -> None:
         self._api.post("/update-current-values", data=list(updates.values()))
 
@@ -232,8 +232,9 @@ class HttpTagSelection(tbase.TagSelection):
         response, http_response = await self._ensure_selection_and_call_async(fn)
         return self._handle_read_tags_values(response, http_response)
 
+    @classmethod
     def _handle_read_tags_values(
-        self,
+        cls,
         response: List[Any],
         http_response: HttpResponse,
         paths: Optional[List[str]] = None,
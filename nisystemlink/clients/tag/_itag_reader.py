@@ -5,26 +5,16 @@
 import abc
 import datetime
 import typing
-from typing import Any, Callable, Optional
+from typing import Any, Optional
 
 from nisystemlink.clients import core, tag as tbase
-from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+from nisystemlink.clients.tag._core import _serialized_tag_with_aggregates
 from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
     SerializedTagWithAggregates,
 )
 from typing_extensions import Literal
 
 
-_DESERIALIZERS = {
-    tbase.DataType.BOOLEAN: {"True": True, "False": False}.get,
-    tbase.DataType.DATE_TIME: TimestampUtilities.str_to_datetime,
-    tbase.DataType.DOUBLE: float,
-    tbase.DataType.INT32: int,
-    tbase.DataType.UINT64: int,
-    tbase.DataType.STRING: str,
-}
-
-
 class _ITagReaderOverloads(abc.ABC):
     """Contains the overloaded methods of ITagReader.
 
@@ -136,21 +126,7 @@ class ITagReader(_ITagReaderOverloads):
         if data is None or data.value is None:
             return None
 
-        value = self._deserialize_value(data.value, data.data_type)
-        if value is None:
-            # TODO: Error information
-            raise core.ApiException()
-
-        return tbase.TagWithAggregates(
-            data.path,
-            data.data_type,
-            value,
-            data.timestamp,
-            data.count,
-            self._deserialize_value(data.min, data.data_type),
-            self._deserialize_value(data.max, data.data_type),
-            data.mean,
-        )
+        return self._deserialize(data)
 
     async def read_async(
         self,
@@ -184,21 +160,7 @@ class ITagReader(_ITagReaderOverloads):
         if data is None or data.value is None:
             return None
 
-        value = self._deserialize_value(data.value, data.data_type)
-        if value is None:
-            # TODO: Error information
-            raise core.ApiException()
-
-        return tbase.TagWithAggregates(
-            data.path,
-            data.data_type,
-            value,
-            data.timestamp,
-            data.count,
-            self._deserialize_value(data.min, data.data_type),
-            self._deserialize_value(data.max, data.data_type),
-            data.mean,
-        )
+        return self._deserialize(data)
 
     @abc.abstractmethod
     def _read(
@@ -259,17 +221,29 @@ class ITagReader(_ITagReaderOverloads):
         ...
 
     @classmethod
-    def _deserialize_value(cls, value: Optional[str], data_type: tbase.DataType) -> Any:
+    def _deserialize(cls, data: SerializedTagWithAggregates) -> tbase.TagWithAggregates:
+        # The values are converted once per serialized value and cached, so that
+        # repeated reads of the same value, such as from a subscription or selection,
+        # don't convert it again
+        value = data.deserialized_value
         if value is None:
-            return None
-        try:
-            deserializer = typing.cast(Callable[[str], Any], _DESERIALIZERS[data_type])
-        except KeyError:
-            raise ValueError("data_type is unknown")
-        try:
-            return deserializer(value)
-        except ValueError:
-            return None
+            # TODO: Error information
+            raise core.ApiException()
+
+        return tbase.TagWithAggregates(
+            data.path,
+            data.data_type,
+            value,
+            data.timestamp,
+            data.count,
+            data.deserialized_min,
+            data.deserialized_max,
+            data.mean,
+        )
+
+    @classmethod
+    def _deserialize_value(cls, value: Optional[str], data_type: tbase.DataType) -> Any:
+        return _serialized_tag_with_aggregates.deserialize_value(value, data_type)
 
     def _get_tag_reader(
         self, path: str, data_type: tbase.DataType
@@ -4,8 +4,19 @@
 
 import abc
 import datetime
+import itertools
 import typing
-from typing import Any, Awaitable, Dict, Optional, Tuple, Union
+from typing import (
+    Any,
+    Awaitable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from nisystemlink.clients import tag as tbase
 from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
@@ -21,6 +32,25 @@ _VALID_TYPES = {
     tbase.DataType.STRING: str,
 }  # type: Dict[tbase.DataType, Union[type, Tuple[type, type]]]
 
+# The kinds of NumPy arrays accepted for each data type by write_many
+_VALID_ARRAY_KINDS = {
+    tbase.DataType.BOOLEAN: "b",
+    tbase.DataType.DATE_TIME: "M",
+    tbase.DataType.DOUBLE: "fiu",
+    tbase.DataType.INT32: "iu",
+    tbase.DataType.UINT64: "iu",
+    tbase.DataType.STRING: "U",
+}  # type: Dict[tbase.DataType, str]
+
+# The integer ranges accepted for each integer data type
+_VALID_RANGES = {
+    tbase.DataType.INT32: (-(2**31), 2**31, "an INT32"),
+    tbase.DataType.UINT64: (0, 2**64, "a UINT64"),
+}  # type: Dict[tbase.DataType, Tuple[int, int, str]]
+
+# NumPy's "not a time" value, viewed as a number of nanoseconds
+_NAT = -(2**63)
+
 
 class _ITagWriterOverloads(abc.ABC):
     """Contains the overloaded methods of ITagWriter.
@@ -172,6 +202,199 @@ class ITagWriter(_ITagWriterOverloads):
 
         return self._write_async(path, data_type, str(value), timestamp)
 
+    def write_many(
+        self,
+        paths: Union[str, Collection[str]],
+        data_type: tbase.DataType,
+        values: Collection[Union[bool, int, float, str, datetime.datetime]],
+        timestamps: Optional[Collection[datetime.datetime]] = None,
+    ) -> None:
+        """Write many values of the same data type at once.
+
+        Equivalent to calling :meth:`write` for each value in turn, but the values are
+        validated and serialized together, which is much faster for large numbers of
+        values.
+
+        ``values`` and ``timestamps`` may be NumPy arrays. Arrays of values must have a
+        data type that matches ``data_type``: ``bool`` for :attr:`DataType.BOOLEAN`,
+        an integer type for :attr:`DataType.INT32` and :attr:`DataType.UINT64`, a
+        floating point or integer type for :attr:`DataType.DOUBLE`, a string type for
+        :attr:`DataType.STRING`, and ``datetime64`` in UTC for
+        :attr:`DataType.DATE_TIME`. Arrays of timestamps must be ``datetime64`` in UTC.
+
+        Args:
+            paths: The path of the tag to write each value to, or a single path to
+                write all of the values to the same tag.
+            data_type: The data type of the values to write.
+            values: The tag values to write.
+            timestamps: A custom timestamp to associate with each value, or None to
+                have the server specify the timestamps.
+
+        Raises:
+            ValueError: if any path is empty or invalid.
+            ValueError: if ``paths`` or ``values`` is None, or contains None.
+            ValueError: if ``data_type`` is invalid.
+            ValueError: if any value has the wrong data type.
+            ValueError: if ``paths`` or ``timestamps`` doesn't have one item for each
+                value.
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        prepared = self._prepare_many(paths, data_type, values, timestamps)
+        self._write_many(prepared[0], data_type, prepared[1], prepared[2])
+
+    def write_many_async(
+        self,
+        paths: Union[str, Collection[str]],
+        data_type: tbase.DataType,
+        values: Collection[Union[bool, int, float, str, datetime.datetime]],
+        timestamps: Optional[Collection[datetime.datetime]] = None,
+    ) -> Awaitable[None]:
+        """Asynchronously write many values of the same data type at once.
+
+        See :meth:`write_many` for details.
+
+        Args:
+            paths: The path of the tag to write each value to, or a single path to
+                write all of the values to the same tag.
+            data_type: The data type of the values to write.
+            values: The tag values to write.
+            timestamps: A custom timestamp to associate with each value, or None to
+                have the server specify the timestamps.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ValueError: if any path is empty or invalid.
+            ValueError: if ``paths`` or ``values`` is None, or contains None.
+            ValueError: if ``data_type`` is invalid.
+            ValueError: if any value has the wrong data type.
+            ValueError: if ``paths`` or ``timestamps`` doesn't have one item for each
+                value.
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        prepared = self._prepare_many(paths, data_type, values, timestamps)
+        return self._write_many_async(prepared[0], data_type, prepared[1], prepared[2])
+
+    @classmethod
+    def _prepare_many(
+        cls,
+        paths: Union[str, Collection[str]],
+        data_type: tbase.DataType,
+        values: Collection[Any],
+        timestamps: Optional[Collection[Any]],
+    ) -> Tuple[List[str], List[str], Optional[List[str]]]:
+        """Validate and serialize the arguments of :meth:`write_many`.
+
+        Returns:
+            The path, serialized value, and serialized timestamp of each write.
+        """
+        if paths is None:
+            raise ValueError("paths is None")
+        serialized = cls._serialize_values(values, data_type)
+
+        if isinstance(paths, str):
+            path_list = [tbase.TagPathUtilities.validate(paths)] * len(serialized)
+        else:
+            path_list = _to_list(paths)
+            if len(path_list) != len(serialized):
+                raise ValueError("paths must contain one path for each value")
+            for path in set(path_list):
+                tbase.TagPathUtilities.validate(path)
+
+        serialized_timestamps = None
+        if timestamps is not None:
+            serialized_timestamps = cls._serialize_timestamps(timestamps)
+            if len(serialized_timestamps) != len(serialized):
+                raise ValueError("timestamps must contain one timestamp for each value")
+        return path_list, serialized, serialized_timestamps
+
+    @classmethod
+    def _serialize_values(
+        cls, values: Collection[Any], data_type: tbase.DataType
+    ) -> List[str]:
+        if values is None:
+            raise ValueError("values is None")
+        if data_type == tbase.DataType.UNKNOWN:
+            raise ValueError("data_type is UNKNOWN")
+
+        if _is_array(values) and values.dtype.kind != "O":  # type: ignore
+            return cls._serialize_array(values, data_type)
+
+        value_list = _to_list(values)
+        expected = _VALID_TYPES[data_type]
+        # Check each distinct type once, instead of each value
+        for value_type in set(map(type, value_list)):
+            if not issubclass(value_type, expected) or (
+                issubclass(value_type, bool) and data_type != tbase.DataType.BOOLEAN
+            ):
+                raise ValueError(
+                    "value has wrong python data type ({}) for SystemLink data type {}".format(
+                        value_type.__name__, data_type.name
+                    )
+                )
+        if data_type in _VALID_RANGES and value_list:
+            cls._validate_range(min(value_list), max(value_list), data_type)
+
+        if data_type == tbase.DataType.DATE_TIME:
+            return TimestampUtilities.datetimes_to_strs(value_list)
+        if data_type == tbase.DataType.STRING:
+            return value_list
+        return list(map(str, value_list))
+
+    @classmethod
+    def _serialize_array(cls, values: Any, data_type: tbase.DataType) -> List[str]:
+        if values.ndim != 1:
+            raise ValueError("values must be a one-dimensional array")
+        if values.dtype.kind not in _VALID_ARRAY_KINDS[data_type]:
+            raise ValueError(
+                "values has wrong NumPy data type ({}) for SystemLink data type {}".format(
+                    values.dtype, data_type.name
+                )
+            )
+
+        if data_type == tbase.DataType.DATE_TIME:
+            return cls._serialize_timestamps(values)
+        if data_type in _VALID_RANGES and len(values):
+            cls._validate_range(int(values.min()), int(values.max()), data_type)
+        # Converting the whole array to Python objects at once is much faster than
+        # converting each element as it is formatted
+        return list(map(str, values.tolist()))
+
+    @classmethod
+    def _serialize_timestamps(cls, timestamps: Collection[Any]) -> List[str]:
+        if _is_array(timestamps):
+            array = timestamps  # type: Any
+            if array.ndim != 1 or array.dtype.kind != "M":
+                raise ValueError(
+                    "timestamps must be a one-dimensional datetime64 array"
+                )
+            epoch_ns = array.astype("datetime64[ns]").view("int64")
+            if len(epoch_ns) and epoch_ns.min() == _NAT:
+                raise ValueError("timestamps cannot contain NaT")
+            return TimestampUtilities.epoch_ns_to_strs(epoch_ns)
+
+        timestamp_list = _to_list(timestamps)
+        for timestamp_type in set(map(type, timestamp_list)):
+            if not issubclass(timestamp_type, datetime.datetime):
+                raise ValueError(
+                    "timestamp has wrong python data type ({})".format(
+                        timestamp_type.__name__
+                    )
+                )
+        return TimestampUtilities.datetimes_to_strs(timestamp_list)
+
+    @classmethod
+    def _validate_range(cls, low: int, high: int, data_type: tbase.DataType) -> None:
+        minimum, maximum, name = _VALID_RANGES[data_type]
+        for value in (low, high):
+            if not minimum <= value < maximum:
+                raise ValueError(
+                    "value {} is not the valid range of {}".format(value, name)
+                )
+
     @classmethod
     def _validate_type(
         cls,
@@ -264,6 +487,62 @@ class ITagWriter(_ITagWriterOverloads):
         """
         ...
 
+    def _write_many(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Write many tag values that have been validated and serialized to strings.
+
+        The default implementation calls :meth:`_write` for each value.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to have the server
+                specify the timestamps.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        for path, value, timestamp in zip(paths, values, _parse_all(timestamps)):
+            self._write(path, data_type, value, timestamp)
+
+    async def _write_many_async(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Asynchronously write many tag values that have been validated and
+        serialized to strings.
+
+        The default implementation calls :meth:`_write_async` for each value.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to have the server
+                specify the timestamps.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        for path, value, timestamp in zip(paths, values, _parse_all(timestamps)):
+            await self._write_async(path, data_type, value, timestamp)
+
     def _get_tag_writer(
         self, path: str, data_type: tbase.DataType
     ) -> "tbase.TagValueWriter":
@@ -274,3 +553,22 @@ class ITagWriter(_ITagWriterOverloads):
             data_type: The data type of the tag to write.
         """
         return tbase.TagValueWriter(self, tbase.TagData(path, data_type))
+
+
+def _is_array(values: Any) -> bool:
+    """Return whether ``values`` is a NumPy array, without requiring NumPy."""
+    return hasattr(values, "dtype") and hasattr(values, "tolist")
+
+
+def _to_list(values: Collection[Any]) -> List[Any]:
+    if _is_array(values):
+        return values.tolist()  # type: ignore
+    return list(values)
+
+
+def _parse_all(
+    timestamps: Optional[List[str]],
+) -> Iterable[Optional[datetime.datetime]]:
+    if timestamps is None:
+        return itertools.repeat(None)
+    return TimestampUtilities.strs_to_datetimes(timestamps)
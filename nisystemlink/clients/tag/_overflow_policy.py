@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of OverflowPolicy."""
+
+import enum
+
+
+class OverflowPolicy(enum.Enum):
+    """Represents what a :class:`BufferedTagWriter` does with a write that would take it
+    over its limit on pending writes.
+    """
+
+    BLOCK = 1
+    """Wait for earlier writes to be sent until there is room for the write, raising
+    :class:`TimeoutError` if there still isn't room after the writer's overflow timeout.
+    """
+
+    DROP_OLDEST = 2
+    """Discard the oldest buffers that are waiting to be sent, and keep the write.
+
+    Buffers that are already being sent are never discarded. When there are no other
+    buffers to discard, the write is discarded instead.
+    """
+
+    DROP_NEWEST = 3
+    """Discard the write, and keep the writes that are already pending."""
+
+    RAISE = 4
+    """Raise :class:`BufferError` without buffering the write."""
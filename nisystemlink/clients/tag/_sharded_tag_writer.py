@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of ShardedTagWriter."""
+
+import asyncio
+import datetime
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from nisystemlink.clients import tag as tbase
+from typing_extensions import final
+
+
+@final
+class ShardedTagWriter(tbase.ITagWriter):
+    """Represents an :class:`ITagWriter` that spreads tag writes across several
+    :class:`BufferedTagWriter` objects, called shards, to write faster than a single
+    writer can.
+
+    Each tag path is always written by the same shard, chosen from a hash of the path,
+    so that writes to the same tag still reach the server in order. Each shard has its
+    own buffer and lock, so writes to different shards don't contend with each other,
+    and shards that send in the background each send from their own threads, over
+    their own connections to the server.
+
+    :meth:`send_buffered_writes()` and :meth:`clear_buffered_writes()` apply to every
+    shard. Note that :class:`ShardedTagWriter` objects support using the ``with``
+    statement (or the ``async with`` statement), to automatically send any remaining
+    buffered writes and close every shard on exit.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'ShardedTagWriter' is not an acceptable base type")
+
+    def __init__(self, writers: Sequence["tbase.BufferedTagWriter"]) -> None:
+        """Initialize an instance.
+
+        Args:
+            writers: The shards to spread writes across. The sharded writer takes
+                ownership of the shards, and closes them when it is closed.
+
+        Raises:
+            ValueError: if ``writers`` is None or empty.
+        """
+        if not writers:
+            raise ValueError("writers cannot be None or empty")
+
+        self._writers = tuple(writers)
+        self._closed = False
+        # Used to send and close the shards at the same time; threads are only started
+        # as they're needed
+        self._executor = (
+            ThreadPoolExecutor(
+                len(self._writers), thread_name_prefix="ShardedTagWriter"
+            )
+            if len(self._writers) > 1
+            else None
+        )  # type: Optional[ThreadPoolExecutor]
+
+    @property
+    def writers(self) -> Tuple["tbase.BufferedTagWriter", ...]:  # noqa: D401
+        """The shards that writes are spread across."""
+        return self._writers
+
+    @property
+    def pending_writes(self) -> int:  # noqa: D401
+        """The total :attr:`~BufferedTagWriter.pending_writes` of every shard."""
+        return sum(writer.pending_writes for writer in self._writers)
+
+    @property
+    def pending_bytes(self) -> int:  # noqa: D401
+        """The total :attr:`~BufferedTagWriter.pending_bytes` of every shard."""
+        return sum(writer.pending_bytes for writer in self._writers)
+
+    @property
+    def dropped_writes(self) -> int:  # noqa: D401
+        """The total :attr:`~BufferedTagWriter.dropped_writes` of every shard."""
+        return sum(writer.dropped_writes for writer in self._writers)
+
+    def get_shard(self, path: str) -> "tbase.BufferedTagWriter":
+        """Get the shard that writes the tag with the given path.
+
+        Args:
+            path: The path of the tag.
+
+        Returns:
+            The shard that writes the tag.
+
+        Raises:
+            ValueError: if ``path`` is None or empty.
+        """
+        return self._writers[self._shard_index(path)]
+
+    def clear_buffered_writes(self) -> None:
+        """Clear any pending writes from :meth:`write()` in every shard.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+        """
+        if self._closed:
+            raise ReferenceError("ShardedTagWriter")
+
+        for writer in self._writers:
+            writer.clear_buffered_writes()
+
+    def send_buffered_writes(self) -> None:
+        """Write all of the pending writes from :meth:`write()` to the server, sending
+        the writes of every shard at the same time.
+
+        Does nothing if there are no pending writes.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails. The other shards' writes are still
+                sent.
+        """
+        if self._closed:
+            raise ReferenceError("ShardedTagWriter")
+
+        self._for_each_shard(lambda writer: writer.send_buffered_writes())
+
+    async def send_buffered_writes_async(self) -> None:
+        """Asynchronously write all of the pending writes from :meth:`write()` to the
+        server, sending the writes of every shard at the same time.
+
+        Does nothing if there are no pending writes.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails. The other shards' writes are still
+                sent.
+        """
+        if self._closed:
+            raise ReferenceError("ShardedTagWriter")
+
+        await self._for_each_shard_async(
+            lambda writer: writer.send_buffered_writes_async()
+        )
+
+    def __enter__(self) -> "ShardedTagWriter":
+        if self._closed:
+            raise ReferenceError("ShardedTagWriter")
+
+        for writer in self._writers:
+            writer.__enter__()
+        return self
+
+    async def __aenter__(self) -> "ShardedTagWriter":
+        if self._closed:
+            raise ReferenceError("ShardedTagWriter")
+
+        for writer in self._writers:
+            await writer.__aenter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        if self._closed:
+            return False
+
+        self._closed = True
+        try:
+            self._for_each_shard(
+                lambda writer: writer.__exit__(exc_type, exc_val, exc_tb)
+            )
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+        return False
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        if self._closed:
+            return False
+
+        self._closed = True
+        try:
+            await self._for_each_shard_async(
+                lambda writer: writer.__aexit__(exc_type, exc_val, exc_tb)
+            )
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+        return False
+
+    def _write(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Write a tag's value that's been serialized to a string, using the tag's
+        shard.
+
+        Clients do not typically call this method directly. Use a
+        :class:`.TagValueWriter` instead.
+
+        Args:
+            path: The path of the tag to write.
+            data_type: The data type of the value to write.
+            value: The tag value to write, serialized as a string.
+            timestamp: A custom timestamp to associate with the value, or None to have
+                the server specify the timestamp.
+
+        Raises:
+            ValueError: if `path` is empty or invalid.
+            ValueError: if `path` or `value` is None.
+            ValueError: if `data_type` is invalid.
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        self.get_shard(path)._write(path, data_type, value, timestamp)
+
+    async def _write_async(
+        self,
+        path: str,
+        data_type: tbase.DataType,
+        value: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Asynchronously write a tag's value that's been serialized to a string,
+        using the tag's shard.
+
+        Clients do not typically call this method directly. Use a
+        :class:`.TagValueWriter` instead.
+
+        Args:
+            path: The path of the tag to write.
+            data_type: The data type of the value to write.
+            value: The tag value to write, serialized as a string.
+            timestamp: A custom timestamp to associate with the value, or None to have
+                the server specify the timestamp.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ValueError: if `path` is empty or invalid.
+            ValueError: if `path` or `value` is None.
+            ValueError: if `data_type` is invalid.
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        await self.get_shard(path)._write_async(path, data_type, value, timestamp)
+
+    def _write_many(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Write many tag values that have been validated and serialized to strings,
+        passing each shard the values of its tags together.
+
+        Clients do not typically call this method directly. Use :meth:`write_many`
+        instead.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to use the
+                current time.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        for writer, shard_paths, shard_values, shard_timestamps in self._partition(
+            paths, values, timestamps
+        ):
+            writer._write_many(shard_paths, data_type, shard_values, shard_timestamps)
+
+    async def _write_many_async(
+        self,
+        paths: List[str],
+        data_type: tbase.DataType,
+        values: List[str],
+        timestamps: Optional[List[str]] = None,
+    ) -> None:
+        """Asynchronously write many tag values that have been validated and
+        serialized to strings, passing each shard the values of its tags together.
+
+        Clients do not typically call this method directly. Use
+        :meth:`write_many_async` instead.
+
+        Args:
+            paths: The validated path of the tag to write each value to.
+            data_type: The data type of the values to write.
+            values: The tag values to write, serialized as strings.
+            timestamps: The timestamp of each value, serialized as by
+                :meth:`TimestampUtilities.datetime_to_str`, or None to use the
+                current time.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        for writer, shard_paths, shard_values, shard_timestamps in self._partition(
+            paths, values, timestamps
+        ):
+            await writer._write_many_async(
+                shard_paths, data_type, shard_values, shard_timestamps
+            )
+
+    def _shard_index(self, path: str) -> int:
+        tbase.TagPathUtilities.validate(path)
+        # A stable hash, so that a tag keeps its shard across processes, and with it
+        # any spool directory that is specific to the shard
+        return zlib.crc32(path.encode("utf-8")) % len(self._writers)
+
+    def _partition(
+        self, paths: List[str], values: List[str], timestamps: Optional[List[str]]
+    ) -> List[
+        Tuple["tbase.BufferedTagWriter", List[str], List[str], Optional[List[str]]]
+    ]:
+        """Split the arguments of :meth:`_write_many` by shard, keeping the order of
+        the values within each shard.
+
+        Returns:
+            Each shard that writes any of the values, with the arguments for it.
+        """
+        indexes = {path: self._shard_index(path) for path in set(paths)}
+        if len(set(indexes.values())) == 1:
+            return [(self._writers[indexes[paths[0]]], paths, values, timestamps)]
+
+        grouped = {}  # type: Dict[int, Tuple[List[str], List[str], List[str]]]
+        for i, path in enumerate(paths):
+            group = grouped.get(indexes[path])
+            if group is None:
+                group = grouped[indexes[path]] = ([], [], [])
+            group[0].append(path)
+            group[1].append(values[i])
+            if timestamps is not None:
+                group[2].append(timestamps[i])
+        return [
+            (
+                self._writers[index],
+                shard_paths,
+                shard_values,
+                shard_timestamps if timestamps is not None else None,
+            )
+            for index, (shard_paths, shard_values, shard_timestamps) in sorted(
+                grouped.items()
+            )
+        ]
+
+    def _for_each_shard(
+        self, action: Callable[["tbase.BufferedTagWriter"], Any]
+    ) -> None:
+        """Call ``action`` for every shard at the same time, and wait for all of them.
+
+        Raises:
+            Exception: the first error raised by ``action``, once every call is done.
+        """
+        if self._executor is None:
+            action(self._writers[0])
+            return
+
+        futures = [self._executor.submit(action, writer) for writer in self._writers]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    async def _for_each_shard_async(
+        self, action: Callable[["tbase.BufferedTagWriter"], Awaitable[Any]]
+    ) -> None:
+        """Await ``action`` for every shard at the same time.
+
+        Raises:
+            Exception: the first error raised by ``action``, once every call is done.
+        """
+        results = await asyncio.gather(
+            *[action(writer) for writer in self._writers], return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
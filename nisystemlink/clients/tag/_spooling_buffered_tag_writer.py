@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of SpoolingBufferedTagWriter."""
+
+import abc
+import asyncio
+import time
+from types import TracebackType
+from typing import Any, Optional, Type
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._buffered_tag_writer import _Batch
+from nisystemlink.clients.tag._core._itime_stamper import ITimeStamper
+from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
+from nisystemlink.clients.tag._core._write_spool import WriteSpool
+
+
+class SpoolingBufferedTagWriter(tbase.BufferedTagWriter):
+    """Represents a :class:`BufferedTagWriter` that can store full buffers in a
+    :class:`WriteSpool` until the server accepts them.
+
+    With a spool, full buffers are sent in the background, but are stored on disk
+    first, and are retried until the server accepts them instead of being lost when
+    the server can't be reached. Implementations serialize their buffers for the
+    spool with :meth:`_serialize_buffer` and :meth:`_deserialize_buffer`.
+    """
+
+    def __init__(
+        self,
+        stamper: ITimeStamper,
+        buffer_size: int,
+        flush_timer: ManualResetTimer,
+        *,
+        spool: Optional[WriteSpool] = None,
+        send_in_background: bool = False,
+        max_concurrent_sends: int = 1,
+        **kwargs: Any
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            stamper: An object for time-stamping tag writes.
+            buffer_size: The maximum number of tag writes to buffer before automatically
+                sending them to the server.
+            flush_timer: A timer that, once started, elapses whenever buffered writes
+                should be sent automatically. Does not have to be a configured timer.
+            spool: A spool to store full buffers in until they have been sent, or None
+                to not store them. The writer starts the spool, and closes it when the
+                writer is closed. Implies sending in the background. Writes that the
+                server rejects are reported like other send errors; other failures are
+                retried by the spool.
+            send_in_background: Whether to send full buffers from a dedicated thread
+                instead of the thread that filled them, when there is no ``spool``.
+            max_concurrent_sends: The maximum number of buffers to send to the server
+                at once when sending in the background without a ``spool``.
+            kwargs: The other arguments of :class:`BufferedTagWriter`.
+
+        Raises:
+            ValueError: if ``max_concurrent_sends`` is more than one with a ``spool``.
+            ValueError: if any of the other arguments are invalid for
+                :class:`BufferedTagWriter`.
+        """
+        if spool is not None and max_concurrent_sends > 1:
+            raise ValueError("max_concurrent_sends cannot be used with a spool")
+
+        super().__init__(
+            stamper,
+            buffer_size,
+            flush_timer,
+            send_in_background=send_in_background and spool is None,
+            max_concurrent_sends=max_concurrent_sends,
+            **kwargs
+        )
+        self._spool = spool
+        if spool is not None:
+            self._submits_batches = True
+            spool.start(
+                self._send_spooled_writes,
+                self._report_send_error,
+                self._deserialize_buffer,
+            )
+
+    @abc.abstractmethod
+    def _serialize_buffer(self, updates: Any) -> bytes:
+        """Serialize buffered writes to store them in a :class:`WriteSpool`.
+
+        Args:
+            updates: The buffered writes, as returned by :meth:`_copy_buffer`.
+
+        Returns:
+            The serialized writes.
+        """
+        ...
+
+    @abc.abstractmethod
+    def _deserialize_buffer(self, data: bytes) -> Any:
+        """Deserialize buffered writes stored by :meth:`_serialize_buffer`.
+
+        Args:
+            data: The serialized writes.
+
+        Returns:
+            The buffered writes, suitable for :meth:`_send_writes`.
+
+        Raises:
+            Exception: if ``data`` is corrupt. The spool then sets the stored buffer
+                aside instead of sending it.
+        """
+        ...
+
+    def send_buffered_writes(self) -> None:
+        """Write all of the pending writes from :meth:`write()` to the server.
+
+        With a spool, the buffered writes are stored, and then sent along with any
+        earlier stored buffers.
+
+        Does nothing if there are no pending writes.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        if self._spool is None or self._closed:
+            super().send_buffered_writes()
+            return
+
+        self._spool.wait_sent(self._spool_buffered_values())
+
+    async def send_buffered_writes_async(self) -> None:
+        """Asynchronously write all of the pending writes from :meth:`write()` to the server.
+
+        With a spool, the buffered writes are stored, and then sent along with any
+        earlier stored buffers.
+
+        Does nothing if there are no pending writes.
+
+        Raises:
+            ReferenceError: if the writer has been closed.
+            ApiException: if the API call fails.
+        """
+        if self._spool is None or self._closed:
+            await super().send_buffered_writes_async()
+            return
+
+        sequence = self._spool_buffered_values()
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._spool.wait_sent, sequence)
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        try:
+            return super().__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            if self._spool is not None:
+                self._spool.close()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        try:
+            return await super().__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            if self._spool is not None:
+                self._spool.close()
+
+    def _submit_while_locked(self, batch: _Batch) -> None:
+        """Store ``batch`` in the spool, or queue it to be sent by the sender threads
+        when there is no spool, reporting any error.
+
+        Must hold :attr:`_lock`.
+        """
+        if self._spool is None:
+            super()._submit_while_locked(batch)
+            return
+
+        self._spool_while_locked(batch)
+
+    def _spool_buffered_values(self) -> int:
+        """Store any buffered writes in the spool.
+
+        Returns:
+            The spool's sequence number for the last batch stored so far.
+        """
+        assert self._spool is not None
+        with self._lock:
+            batch = self._retrieve_buffered_values_while_locked()
+            if batch is not None:
+                return self._spool_while_locked(batch)
+            return self._spool.last_sequence
+
+    def _spool_while_locked(self, batch: _Batch) -> int:
+        """Store ``batch`` in the spool, which frees the memory it uses.
+
+        Must hold :attr:`_lock`.
+
+        Returns:
+            The spool's sequence number for the batch.
+        """
+        assert self._spool is not None
+        try:
+            return self._spool.append(self._serialize_buffer(batch.updates))
+        finally:
+            self._release_while_locked(batch.num_writes, batch.num_bytes)
+
+    def _send_spooled_writes(self, updates: Any) -> None:
+        start = time.monotonic()
+        self._send_writes(updates)
+        latency = time.monotonic() - start
+        with self._lock:
+            self._flush_latencies.append(latency)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of TagCatalog."""
+
+import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag import _tag_catalog_snapshot
+from typing_extensions import final
+
+_Keywords = Tuple[str, ...]
+_Properties = Tuple[Tuple[str, str], ...]
+# The path, data type value, collect aggregates flag, keywords and properties of a tag
+_Row = Tuple[str, int, int, _Keywords, _Properties]
+
+
+@final
+class TagCatalog:
+    """Stores the metadata for a large number of tags compactly.
+
+    Rather than keeping a :class:`TagData` object for each tag, the metadata is kept
+    in columns: the paths in a list, the data types and aggregate settings in arrays,
+    and the keywords and properties (including the retention settings) as immutable
+    tuples that are shared between all tags with the same values. This typically
+    takes a fraction of the memory needed for the equivalent :class:`TagData` objects.
+
+    A :class:`TagData` object is created each time a tag is retrieved from the
+    catalog. Changes to that object don't affect the catalog.
+
+    Use :meth:`save()` and :meth:`load()` to keep a catalog in a file, so that it
+    doesn't have to be queried from the server again when a process restarts.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'TagCatalog' is not an acceptable base type")
+
+    def __init__(self, tags: Optional[Iterable[tbase.TagData]] = None) -> None:
+        """Initialize an instance.
+
+        Args:
+            tags: The tags to add to the catalog, or None to create an empty catalog.
+                May be an iterator, such as one returned by
+                :meth:`TagManager.iter_query`.
+        """
+        self._paths = []  # type: List[str]
+        self._data_types = array.array("b")
+        self._collect_aggregates = array.array("b")
+        self._keywords = []  # type: List[_Keywords]
+        self._properties = []  # type: List[_Properties]
+        self._shared_keywords = {}  # type: Dict[_Keywords, _Keywords]
+        self._shared_properties = {}  # type: Dict[_Properties, _Properties]
+        if tags is not None:
+            self.extend(tags)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __getitem__(self, index: int) -> tbase.TagData:
+        """Get the tag at the given index.
+
+        Args:
+            index: The index of the tag. May be negative to index from the end.
+
+        Returns:
+            A new :class:`TagData` containing the tag's metadata.
+
+        Raises:
+            IndexError: if ``index`` is out of range.
+        """
+        path, data_type, collect_aggregates, keywords, properties = self._row(index)
+        return tbase.TagData._create_deferred(
+            path,
+            tbase.DataType(data_type),
+            keywords,
+            dict(properties) if properties else None,
+            bool(collect_aggregates),
+        )
+
+    def __setitem__(self, index: int, tag: tbase.TagData) -> None:
+        """Replace the tag at the given index.
+
+        The catalog copies the tag's metadata, so later changes to ``tag`` don't
+        affect the catalog.
+
+        Args:
+            index: The index of the tag. May be negative to index from the end.
+            tag: The tag to store.
+
+        Raises:
+            ValueError: if ``tag`` is None.
+            IndexError: if ``index`` is out of range.
+        """
+        if tag is None:
+            raise ValueError("tag cannot be None")
+        self._set_row(index, self._make_row(tag))
+
+    def __iter__(self) -> Iterator[tbase.TagData]:
+        """Enumerate the tags in the catalog, in the order they were added.
+
+        Returns:
+            An iterator over new :class:`TagData` objects for each tag.
+        """
+        for index in range(len(self._paths)):
+            yield self[index]
+
+    @property
+    def paths(self) -> Sequence[str]:  # noqa: D401
+        """The paths of the tags in the catalog, in the order they were added.
+
+        The sequence must not be modified.
+        """
+        return self._paths
+
+    def summaries(self) -> Iterator[tbase.TagSummary]:
+        """Enumerate the paths and data types of the tags in the catalog, without
+        creating :class:`TagData` objects.
+
+        Returns:
+            An iterator over the paths and data types of the tags.
+        """
+        for path, data_type in zip(self._paths, self._data_types):
+            yield tbase.TagSummary(path, tbase.DataType(data_type))
+
+    def append(self, tag: tbase.TagData) -> None:
+        """Add a tag to the end of the catalog.
+
+        The catalog copies the tag's metadata, so later changes to ``tag`` don't
+        affect the catalog.
+
+        Args:
+            tag: The tag to add.
+
+        Raises:
+            ValueError: if ``tag`` is None.
+        """
+        if tag is None:
+            raise ValueError("tag cannot be None")
+        self._append_row(self._make_row(tag))
+
+    def extend(self, tags: Iterable[tbase.TagData]) -> None:
+        """Add several tags to the end of the catalog.
+
+        Args:
+            tags: The tags to add.
+
+        Raises:
+            ValueError: if ``tags`` is None or contains None.
+        """
+        if tags is None:
+            raise ValueError("tags cannot be None")
+        for tag in tags:
+            self.append(tag)
+
+    def save(self, file_path: str) -> None:
+        """Save the catalog to a file, which can later be read with :meth:`load()`.
+
+        The file is replaced atomically, so a process reading it never sees a
+        partially written catalog.
+
+        Args:
+            file_path: The path of the file.
+
+        Raises:
+            ValueError: if a tag path contains a NUL character.
+            OSError: if the file can't be written.
+        """
+        _tag_catalog_snapshot.save_snapshot(file_path, self, {})
+
+    @classmethod
+    def load(cls, file_path: str) -> "TagCatalog":
+        """Load a catalog that was saved with :meth:`save()`.
+
+        Args:
+            file_path: The path of the file.
+
+        Returns:
+            The loaded catalog.
+
+        Raises:
+            ValueError: if the file isn't a valid tag catalog.
+            OSError: if the file can't be read.
+        """
+        catalog, _ = _tag_catalog_snapshot.load_snapshot(file_path)
+        return catalog
+
+    @classmethod
+    def _make_row(cls, tag: tbase.TagData) -> _Row:
+        keywords, properties = tag._compact_metadata()
+        return (
+            tag.path,
+            tag.data_type.value,
+            1 if tag.collect_aggregates else 0,
+            keywords,
+            properties,
+        )
+
+    def _row(self, index: int) -> _Row:
+        return (
+            self._paths[index],
+            self._data_types[index],
+            self._collect_aggregates[index],
+            self._keywords[index],
+            self._properties[index],
+        )
+
+    def _append_row(self, row: _Row) -> None:
+        path, data_type, collect_aggregates, keywords, properties = row
+        self._paths.append(path)
+        self._data_types.append(data_type)
+        self._collect_aggregates.append(collect_aggregates)
+        self._keywords.append(self._shared_keywords.setdefault(keywords, keywords))
+        self._properties.append(
+            self._shared_properties.setdefault(properties, properties)
+        )
+
+    def _set_row(self, index: int, row: _Row) -> None:
+        path, data_type, collect_aggregates, keywords, properties = row
+        self._paths[index] = path
+        self._data_types[index] = data_type
+        self._collect_aggregates[index] = collect_aggregates
+        self._keywords[index] = self._shared_keywords.setdefault(keywords, keywords)
+        self._properties[index] = self._shared_properties.setdefault(
+            properties, properties
+        )
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of the TagCatalog snapshot file format."""
+
+import array
+import json
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._tag_data import _intern
+
+# A snapshot is the magic bytes and version, followed by length-prefixed sections: a
+# JSON header, the NUL-separated paths, and one array per remaining column. Keywords
+# and properties are stored once per distinct set in the header, and each tag refers
+# to its sets by position, so a snapshot is about as compact as the catalog itself
+# and can be loaded without parsing each tag.
+_MAGIC = b"NITAGCAT"
+_VERSION = 1
+_ID_TYPECODE = "I"
+_LENGTH = struct.Struct("<Q")
+
+
+def save_snapshot(
+    file_path: str, catalog: "tbase.TagCatalog", metadata: Dict[str, Any]
+) -> None:
+    """Write ``catalog`` to ``file_path``, replacing the file atomically.
+
+    Args:
+        file_path: The path of the snapshot file.
+        catalog: The catalog to save.
+        metadata: JSON-serializable information to store with the snapshot.
+
+    Raises:
+        ValueError: if a tag path contains a NUL character.
+        OSError: if the file can't be written.
+    """
+    if any("\0" in p for p in catalog._paths):
+        raise ValueError("Tag paths in a snapshot cannot contain NUL characters")
+
+    keyword_ids = {}  # type: Dict[Tuple[str, ...], int]
+    property_ids = {}  # type: Dict[Tuple[Tuple[str, str], ...], int]
+    keywords = array.array(
+        _ID_TYPECODE,
+        (keyword_ids.setdefault(k, len(keyword_ids)) for k in catalog._keywords),
+    )
+    properties = array.array(
+        _ID_TYPECODE,
+        (property_ids.setdefault(p, len(property_ids)) for p in catalog._properties),
+    )
+    header = {
+        "byteorder": sys.byteorder,
+        "idSize": keywords.itemsize,
+        "count": len(catalog),
+        "metadata": metadata,
+        "keywords": [list(k) for k in keyword_ids],
+        "properties": [[list(item) for item in p] for p in property_ids],
+    }
+
+    # Write to a uniquely named file in the same directory, so that concurrent saves
+    # don't interfere and the final rename is atomic
+    fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(file_path) + ".",
+        suffix=".tmp",
+        dir=os.path.dirname(os.path.abspath(file_path)),
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_MAGIC)
+            file.write(struct.pack("<I", _VERSION))
+            _write_section(file, json.dumps(header).encode("utf-8"))
+            _write_section(file, "\0".join(catalog._paths).encode("utf-8"))
+            _write_section(file, catalog._data_types.tobytes())
+            _write_section(file, catalog._collect_aggregates.tobytes())
+            _write_section(file, keywords.tobytes())
+            _write_section(file, properties.tobytes())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_snapshot(
+    file_path: str,
+) -> Tuple["tbase.TagCatalog", Dict[str, Any]]:
+    """Read a catalog written by :func:`save_snapshot`.
+
+    Args:
+        file_path: The path of the snapshot file.
+
+    Returns:
+        The catalog and the metadata stored with it.
+
+    Raises:
+        ValueError: if the file isn't a valid snapshot.
+        OSError: if the file can't be read.
+    """
+    with open(file_path, "rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("The file is not a tag catalog snapshot")
+        (version,) = struct.unpack("<I", _read_exactly(file, 4))
+        if version != _VERSION:
+            raise ValueError("Unsupported tag catalog snapshot version")
+        header = json.loads(_read_section(file).decode("utf-8"))
+        paths_blob = _read_section(file).decode("utf-8")
+        columns = [_read_section(file) for _ in range(4)]
+
+    count = header["count"]
+    paths = paths_blob.split("\0") if count else []  # type: List[str]
+    data_types = array.array("b", columns[0])
+    collect_aggregates = array.array("b", columns[1])
+    keyword_ids = array.array(_ID_TYPECODE)
+    property_ids = array.array(_ID_TYPECODE)
+    if header["idSize"] != keyword_ids.itemsize:
+        raise ValueError("The tag catalog snapshot was saved on an incompatible system")
+    keyword_ids.frombytes(columns[2])
+    property_ids.frombytes(columns[3])
+    if header["byteorder"] != sys.byteorder:
+        keyword_ids.byteswap()
+        property_ids.byteswap()
+    lengths = [
+        len(paths),
+        len(data_types),
+        len(collect_aggregates),
+        len(keyword_ids),
+        len(property_ids),
+    ]
+    if any(length != count for length in lengths):
+        raise ValueError("The tag catalog snapshot is truncated or corrupt")
+
+    keyword_pool = [tuple(sys.intern(k) for k in ks) for ks in header["keywords"]]
+    property_pool = [
+        tuple((sys.intern(k), _intern(v)) for k, v in ps) for ps in header["properties"]
+    ]
+    try:
+        keywords = [keyword_pool[i] for i in keyword_ids]
+        properties = [property_pool[i] for i in property_ids]
+    except IndexError:
+        raise ValueError("The tag catalog snapshot is truncated or corrupt")
+
+    catalog = tbase.TagCatalog()
+    catalog._paths = paths
+    catalog._data_types = data_types
+    catalog._collect_aggregates = collect_aggregates
+    catalog._keywords = keywords
+    catalog._properties = properties
+    catalog._shared_keywords = {k: k for k in keyword_pool}
+    catalog._shared_properties = {p: p for p in property_pool}
+    return catalog, header["metadata"]
+
+
+def try_load_snapshot(
+    file_path: str,
+) -> Optional[Tuple["tbase.TagCatalog", Dict[str, Any]]]:
+    """Read a catalog written by :func:`save_snapshot`, if possible.
+
+    Args:
+        file_path: The path of the snapshot file.
+
+    Returns:
+        The catalog and the metadata stored with it, or None if the file doesn't
+        exist or isn't a valid snapshot.
+    """
+    try:
+        return load_snapshot(file_path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_section(file: BinaryIO, data: bytes) -> None:
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def _read_section(file: BinaryIO) -> bytes:
+    (length,) = _LENGTH.unpack(_read_exactly(file, _LENGTH.size))
+    return _read_exactly(file, length)
+
+
+def _read_exactly(file: BinaryIO, length: int) -> bytes:
+    data = file.read(length)
+    if len(data) != length:
+        raise ValueError("The tag catalog snapshot is truncated or corrupt")
+    return data
@@ -2,16 +2,44 @@
 
 """Implementation of TagData."""
 
-from typing import Any, Dict, Iterable, List, Optional
+import sys
+import types
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from nisystemlink.clients import tag as tbase
 from typing_extensions import final
 
+# Shared by all tags without keywords or properties, and replaced with a new list or
+# dictionary when a tag's keywords or properties are accessed
+_NO_KEYWORDS = ()  # type: Tuple[str, ...]
+_NO_PROPERTIES = types.MappingProxyType({})  # type: Mapping[str, str]
+
+
+def _intern(value: Any) -> Any:
+    """Intern ``value`` if it is a string, and return anything else unchanged."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 @final
 class TagData:
     """Contains the metadata for a SystemLink tag."""
 
+    # Tags are often held in very large numbers, so each one is kept small: there is
+    # no per-instance dictionary, keyword and property strings are interned, and tags
+    # without keywords or properties share immutable empty collections.
+    __slots__ = (
+        "_path",
+        "_data_type",
+        "_keywords",
+        "_properties",
+        "_collect_aggregates",
+        "_retention_type",
+        "_retention_count",
+        "_retention_days",
+        "_pending_keywords",
+        "_pending_properties",
+    )
+
     _RETENTION_TYPE_PROP = "nitagRetention"
 
     _RETENTION_TYPE_NONE = "NONE"
@@ -47,12 +75,19 @@ class TagData:
         """
         self._path = path
         self._data_type = tbase.DataType.UNKNOWN if data_type is None else data_type
-        self._keywords = list(keywords) if keywords else []
-        self._properties = {}  # type: Dict[str, str]
+        self._keywords = _NO_KEYWORDS  # type: Sequence[str]
+        if keywords:
+            self._keywords = tuple(sys.intern(k) for k in keywords)
+        self._properties = _NO_PROPERTIES  # type: Mapping[str, str]
         self._collect_aggregates = False
         self._retention_type = tbase.RetentionType.NONE
         self._retention_count = None  # type: Optional[int]
         self._retention_days = None  # type: Optional[int]
+        # Keywords and properties that haven't been copied or parsed yet. Tags read
+        # from the server defer that work until the keywords or properties are used,
+        # since scans over many tags often only need the paths.
+        self._pending_keywords = None  # type: Optional[Sequence[str]]
+        self._pending_properties = None  # type: Optional[Dict[str, str]]
         if properties:
             self.replace_properties(properties)
 
@@ -60,12 +95,63 @@ class TagData:
     def from_json_dict(cls, data: Dict[str, Any]) -> "TagData":
         data_type_str = data.get("type") or "UNKNOWN"
         data_type = tbase.DataType.from_api_name(data_type_str)
-        tag = cls(data["path"], data_type, data.get("keywords"), data.get("properties"))
-        if data.get("collectAggregates"):
-            tag.collect_aggregates = True
+        return cls._create_deferred(
+            data["path"],
+            data_type,
+            data.get("keywords"),
+            data.get("properties"),
+            bool(data.get("collectAggregates")),
+        )
+
+    @classmethod
+    def _create_deferred(
+        cls,
+        path: str,
+        data_type: tbase.DataType,
+        keywords: Optional[Sequence[str]],
+        properties: Optional[Dict[str, str]],
+        collect_aggregates: bool,
+    ) -> "TagData":
+        """Create a tag whose ``keywords`` and ``properties`` are only copied and
+        parsed when they are first used.
+
+        The caller must not modify ``keywords`` or ``properties`` afterward.
+        """
+        tag = cls(path, data_type)
+        tag._pending_keywords = keywords or None
+        tag._pending_properties = properties or None
+        tag._collect_aggregates = collect_aggregates
         return tag
 
+    def _compact_metadata(
+        self,
+    ) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+        """Get the tag's keywords and its properties, including the retention
+        properties, in an immutable form with interned strings.
+
+        Clients do not typically call this method directly.
+        """
+        if self._pending_keywords is not None:
+            keywords = tuple(sys.intern(k) for k in self._pending_keywords)
+        else:
+            keywords = tuple(self._keywords)
+
+        if self._pending_properties is not None:
+            properties = dict(self._pending_properties)
+        else:
+            properties = dict(self._properties)
+            if (
+                self._retention_type != tbase.RetentionType.NONE
+                or self._retention_count is not None
+                or self._retention_days is not None
+            ):
+                self._copy_retention_properties(properties)
+        return keywords, tuple(
+            (sys.intern(k), _intern(v)) for k, v in properties.items()
+        )
+
     def to_json_dict(self) -> Dict[str, Any]:
+        self._materialize()
         self.validate_path()
         if self.data_type == tbase.DataType.UNKNOWN:
             raise ValueError("Invalid tag data type")
@@ -76,7 +162,7 @@ class TagData:
         data["collectAggregates"] = self.collect_aggregates
 
         if self._keywords:
-            data["keywords"] = self._keywords
+            data["keywords"] = list(self._keywords)
 
         data["properties"] = dict(self._properties) if self._properties else {}
         self._copy_retention_properties(data["properties"])
@@ -113,6 +199,9 @@ class TagData:
     @property
     def keywords(self) -> List[str]:  # noqa: D401
         """The list of keywords associated with the tag."""
+        self._materialize()
+        if not isinstance(self._keywords, list):
+            self._keywords = list(self._keywords)
         return self._keywords
 
     @property
@@ -123,6 +212,9 @@ class TagData:
     @property
     def properties(self) -> Dict[str, str]:  # noqa: D401
         """The properties associated with the tag."""
+        self._materialize()
+        if not isinstance(self._properties, dict):
+            self._properties = dict(self._properties)
         return self._properties
 
     @property
@@ -137,10 +229,12 @@ class TagData:
         retained when the tag historian is not available, regardless of the retention
         type.
         """
+        self._materialize()
         return self._retention_type
 
     @retention_type.setter
     def retention_type(self, value: tbase.RetentionType) -> None:
+        self._materialize()
         self._retention_type = value
 
     @property
@@ -149,10 +243,12 @@ class TagData:
         :attr:`RetentionType.COUNT`, or None to use the server-specified default of
         10000.
         """
+        self._materialize()
         return self._retention_count
 
     @retention_count.setter
     def retention_count(self, value: Optional[int]) -> None:
+        self._materialize()
         self._retention_count = value
 
     @property
@@ -161,10 +257,12 @@ class TagData:
         :attr:`retention_type` is :attr:`RetentionType.DURATION`, or None to use the
         server-specified default of 30 days.
         """
+        self._materialize()
         return self._retention_days
 
     @retention_days.setter
     def retention_days(self, value: Optional[int]) -> None:
+        self._materialize()
         self._retention_days = value
 
     def replace_keywords(self, keywords: Iterable[str]) -> None:
@@ -173,7 +271,11 @@ class TagData:
         Args:
             keywords: The tag's new keywords, or None to clear all keywords.
         """
-        self._keywords[:] = keywords
+        self._materialize()
+        if isinstance(self._keywords, list):
+            self._keywords[:] = keywords
+        else:
+            self._keywords = tuple(sys.intern(k) for k in keywords)
 
     def replace_properties(self, properties: Dict[str, str]) -> None:
         """Replace all of the tag's :attr:`properties` with those in ``properties``.
@@ -181,7 +283,12 @@ class TagData:
         Args:
             properties: The tag's new properties, or None to clear all properties.
         """
-        self._properties.clear()
+        self._materialize()
+        if isinstance(self._properties, dict):
+            self._properties.clear()
+            preserved = self._properties
+        else:
+            preserved = {}
 
         if properties is None:
             return
@@ -211,7 +318,10 @@ class TagData:
                     self._retention_count = None
             else:
                 # Not a special property. Preserve it in the dictionary.
-                self._properties[key] = value
+                preserved[sys.intern(key)] = _intern(value)
+
+        if preserved:
+            self._properties = preserved
 
     def _copy_retention_properties(self, destination: Dict[str, str]) -> None:
         """Copy the tag's retention settings into ``destination``.
@@ -228,6 +338,7 @@ class TagData:
         if destination is None:
             raise ValueError("destination cannot be None")
 
+        self._materialize()
         if self._retention_type == tbase.RetentionType.NONE:
             destination[self._RETENTION_TYPE_PROP] = self._RETENTION_TYPE_NONE
         elif self._retention_type == tbase.RetentionType.DURATION:
@@ -243,6 +354,18 @@ class TagData:
         if self._retention_days is not None:
             destination[self._HISTORY_TTL_DAYS_PROP] = str(self._retention_days)
 
+    def _materialize(self) -> None:
+        """Copy and parse the keywords and properties that were deferred by
+        :meth:`from_json_dict`, if any.
+        """
+        if self._pending_keywords is not None:
+            self._keywords = tuple(sys.intern(k) for k in self._pending_keywords)
+            self._pending_keywords = None
+        if self._pending_properties is not None:
+            properties = self._pending_properties
+            self._pending_properties = None
+            self.replace_properties(properties)
+
     def clear_retention(self) -> None:
         """Clear all retention settings, setting it to use a
         :attr:`TagData.retention_type` of :attr:`RetentionType.NONE`.
@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of TagIndex."""
+
+import asyncio
+import bisect
+import functools
+import re
+import threading
+import traceback
+from types import TracebackType
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
+from nisystemlink.clients.tag._tag_catalog import _Row
+from typing_extensions import final
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_pattern(path: str) -> Pattern[str]:
+    return re.compile(re.escape(path).replace(r"\*", ".*"))
+
+
+@final
+class TagIndex:
+    """Represents an in-memory index of tag metadata that answers the same queries as
+    :meth:`TagManager.query` without a request to the server.
+
+    Paths are kept sorted, so that path patterns only examine the tags that start with
+    the text before the first wildcard. Keywords and properties are indexed with
+    inverted lists of the tags that have them.
+
+    Use :meth:`refresh()` to update the index with the current metadata on the server.
+    An index created with :meth:`TagManager.create_index` can also refresh itself
+    periodically; call :meth:`close()` to stop. Note that :class:`TagIndex` objects
+    support using the ``with`` statement, to :meth:`close()` the index automatically on
+    exit.
+
+    All methods may be called from multiple threads at once.
+    """
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'TagIndex' is not an acceptable base type")
+
+    def __init__(self, tags: Optional[Iterable[tbase.TagData]] = None) -> None:
+        """Initialize an instance.
+
+        Args:
+            tags: The tags to index, or None to create an empty index. May be a
+                :class:`TagCatalog` or an iterator, such as one returned by
+                :meth:`TagManager.iter_query`. If several tags have the same path, the
+                last one is used.
+        """
+        self._lock = threading.Lock()
+        self._catalog = tbase.TagCatalog()
+        # The index in _catalog of each tag's current metadata. Rows for tags that
+        # have since been updated or removed are left in the catalog until there are
+        # enough of them to be worth compacting.
+        self._rows = {}  # type: Dict[str, int]
+        self._sorted_paths = []  # type: List[str]
+        self._keywords = {}  # type: Dict[str, Set[int]]
+        self._properties = {}  # type: Dict[Tuple[str, str], Set[int]]
+        self._refresh_timer = ManualResetTimer.null_timer
+        self._refresh = None  # type: Optional[Callable[[], None]]
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None  # type: Optional[threading.Thread]
+        self._refresh_task = None  # type: Optional[asyncio.Future]
+        if isinstance(tags, tbase.TagCatalog):
+            # Copy the catalog, since the index modifies its own catalog
+            catalog = tbase.TagCatalog()
+            for index in range(len(tags)):
+                catalog._append_row(tags._row(index))
+            self._rebuild(catalog)
+        elif tags is not None:
+            self._rebuild(tbase.TagCatalog(tags))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def __contains__(self, path: object) -> bool:
+        with self._lock:
+            return path in self._rows
+
+    @classmethod
+    def _from_catalog(cls, catalog: tbase.TagCatalog) -> "TagIndex":
+        """Create an index that takes ownership of ``catalog``, rather than copying
+        it.
+        """
+        index = cls()
+        index._rebuild(catalog)
+        return index
+
+    def to_catalog(self) -> tbase.TagCatalog:
+        """Copy the metadata of the tags in the index into a new catalog.
+
+        Returns:
+            A catalog containing the tags in the index, ordered by path. Use
+            :meth:`TagCatalog.save` to save it to a file.
+        """
+        catalog = tbase.TagCatalog()
+        with self._lock:
+            for path in self._sorted_paths:
+                catalog._append_row(self._catalog._row(self._rows[path]))
+        return catalog
+
+    def close(self) -> None:
+        """Stop refreshing the index, if it was doing so."""
+        with self._lock:
+            self._refresh = None
+            timer = self._refresh_timer
+            self._refresh_timer = ManualResetTimer.null_timer
+        if timer is not ManualResetTimer.null_timer:
+            timer.__exit__(None, None, None)
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    def __enter__(self) -> "TagIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def get(self, path: str) -> Optional[tbase.TagData]:
+        """Get the metadata of the tag with the given ``path``.
+
+        Args:
+            path: The path of the tag.
+
+        Returns:
+            A new :class:`TagData` containing the tag's metadata, or None if the tag
+            isn't in the index.
+        """
+        with self._lock:
+            row = self._rows.get(path)
+            return self._catalog[row] if row is not None else None
+
+    def query(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+    ) -> List[tbase.TagData]:
+        """Find the tags in the index matching the given criteria.
+
+        The criteria have the same meaning as for :meth:`TagManager.query`: a tag
+        matches if its path matches any of ``paths`` and it has all of ``keywords``
+        and all of ``properties``.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+
+        Returns:
+            New :class:`TagData` objects for the matching tags, ordered by path.
+
+        Raises:
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+        """
+        keywords = list(keywords) if keywords is not None else None
+        tbase.TagManager._prepare_query(paths, keywords, properties, None)
+        with self._lock:
+            return [
+                self._catalog[self._rows[p]]
+                for p in self._match(paths, keywords, properties)
+            ]
+
+    def query_paths(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        """Find the paths of the tags in the index matching the given criteria.
+
+        This is the same as :meth:`query`, but doesn't create :class:`TagData`
+        objects.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+
+        Returns:
+            The paths of the matching tags, in order.
+
+        Raises:
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+        """
+        keywords = list(keywords) if keywords is not None else None
+        tbase.TagManager._prepare_query(paths, keywords, properties, None)
+        with self._lock:
+            return self._match(paths, keywords, properties)
+
+    def refresh(
+        self,
+        tag_manager: "tbase.TagManager",
+        paths: Optional[Sequence[str]] = None,
+        *,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> None:
+        """Query the server for the current metadata of the tags matching ``paths``
+        and update the index.
+
+        Only the differences are applied: tags that are new or whose metadata changed
+        are updated, and tags matching ``paths`` that no longer exist on the server are
+        removed. Tags not matching ``paths`` are unaffected, so that part of the index
+        can be refreshed more often than the rest. The index can still be queried while
+        the server is queried.
+
+        Args:
+            tag_manager: The tag manager to use to query the server.
+            paths: List of tag paths to refresh, which may include glob-style
+                wildcards, or None to refresh all tags.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Raises:
+            ValueError: if ``tag_manager`` is None.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+            ValueError: if ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ApiException: if the API call fails.
+        """
+        if tag_manager is None:
+            raise ValueError("tag_manager cannot be None")
+        current = tbase.TagCatalog(
+            tag_manager.iter_query(paths, take=take, max_concurrency=max_concurrency)
+        )
+        self._apply(paths, current)
+
+    async def refresh_async(
+        self,
+        tag_manager: "tbase.TagManager",
+        paths: Optional[Sequence[str]] = None,
+        *,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> None:
+        """Asynchronously query the server for the current metadata of the tags
+        matching ``paths`` and update the index.
+
+        Only the differences are applied: tags that are new or whose metadata changed
+        are updated, and tags matching ``paths`` that no longer exist on the server are
+        removed. Tags not matching ``paths`` are unaffected, so that part of the index
+        can be refreshed more often than the rest. The index can still be queried while
+        the server is queried.
+
+        Args:
+            tag_manager: The tag manager to use to query the server.
+            paths: List of tag paths to refresh, which may include glob-style
+                wildcards, or None to refresh all tags.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            A task representing the asynchronous operation.
+
+        Raises:
+            ValueError: if ``tag_manager`` is None.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+            ValueError: if ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ApiException: if the API call fails.
+        """
+        if tag_manager is None:
+            raise ValueError("tag_manager cannot be None")
+        current = tbase.TagCatalog()
+        async for tag in tag_manager.iter_query_async(
+            paths, take=take, max_concurrency=max_concurrency
+        ):
+            current.append(tag)
+        self._apply(paths, current)
+
+    def _start_refresh(
+        self, refresh: Callable[[], None], timer: ManualResetTimer
+    ) -> None:
+        """Call ``refresh`` each time ``timer`` elapses, until the index is closed."""
+        with self._lock:
+            self._refresh = refresh
+            self._refresh_timer = timer
+            timer.elapsed += self._on_refresh_timer_elapsed
+            timer.start()
+
+    def _refresh_in_background(self, refresh: Callable[[], None]) -> None:
+        """Call ``refresh`` once, on a background thread."""
+
+        def run() -> None:
+            try:
+                with self._refresh_lock:
+                    refresh()
+            except Exception:
+                traceback.print_exc()
+
+        self._refresh_thread = threading.Thread(target=run)
+        self._refresh_thread.daemon = True
+        self._refresh_thread.start()
+
+    def _refresh_in_background_async(
+        self, refresh: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Call ``refresh`` once, as a task on the current event loop."""
+
+        def done(task: asyncio.Future) -> None:
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is not None:
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+        self._refresh_task = asyncio.ensure_future(refresh())
+        self._refresh_task.add_done_callback(done)
+
+    def _run_refresh(self) -> None:
+        # Refreshes on background threads are serialized, so that they don't
+        # interleave their updates
+        with self._refresh_lock:
+            refresh = self._refresh
+            if refresh is not None:
+                refresh()
+
+    def _on_refresh_timer_elapsed(self) -> None:
+        try:
+            self._run_refresh()
+        finally:
+            # Restart the timer even if the refresh failed, to try again later
+            with self._lock:
+                if self._refresh is not None:
+                    self._refresh_timer.start()
+
+    def _match(
+        self,
+        paths: Optional[Sequence[str]],
+        keywords: Optional[Iterable[str]],
+        properties: Optional[Dict[str, str]],
+    ) -> List[str]:
+        # Must be called while holding the lock
+        candidates = None  # type: Optional[Set[int]]
+        postings = [self._keywords.get(k, set()) for k in keywords or []]
+        postings.extend(
+            self._properties.get(item, set()) for item in (properties or {}).items()
+        )
+        if postings:
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+
+        ranges = None  # type: Optional[List[Tuple[Optional[Pattern[str]], int, int]]]
+        if paths is not None:
+            ranges = [self._path_range(p) for p in paths]
+
+        if candidates is not None and (
+            ranges is None
+            or len(candidates) <= sum(end - start for _, start, end in ranges)
+        ):
+            # There are fewer tags with the keywords and properties than tags in the
+            # path ranges, so check those tags against the paths directly
+            catalog_paths = self._catalog.paths
+            matched = sorted(catalog_paths[row] for row in candidates)
+            if paths is None:
+                return matched
+            patterns = [_compile_pattern(p) for p in paths]
+            return [p for p in matched if any(r.fullmatch(p) for r in patterns)]
+
+        if ranges is None:
+            return list(self._sorted_paths)
+        result = set()  # type: Set[str]
+        for pattern, start, end in ranges:
+            for index in range(start, end):
+                path = self._sorted_paths[index]
+                if pattern is not None and not pattern.fullmatch(path):
+                    continue
+                if candidates is None or self._rows[path] in candidates:
+                    result.add(path)
+        return sorted(result)
+
+    def _path_range(self, path: str) -> Tuple[Optional[Pattern[str]], int, int]:
+        """Find the range of sorted paths that could match ``path``, and the pattern
+        to check them with, or None if ``path`` has no wildcards.
+        """
+        # Must be called while holding the lock
+        sorted_paths = self._sorted_paths
+        if "*" not in path:
+            start = bisect.bisect_left(sorted_paths, path)
+            found = start < len(sorted_paths) and sorted_paths[start] == path
+            return None, start, start + 1 if found else start
+
+        prefix = path[: path.index("*")]
+        start = bisect.bisect_left(sorted_paths, prefix)
+        end = bisect.bisect_left(sorted_paths, prefix + "\U0010ffff", start)
+        while end < len(sorted_paths) and sorted_paths[end].startswith(prefix):
+            end += 1
+        return _compile_pattern(path), start, end
+
+    def _apply(self, paths: Optional[Sequence[str]], current: tbase.TagCatalog) -> None:
+        patterns = [_compile_pattern(p) for p in paths] if paths is not None else None
+        with self._lock:
+            seen = set()  # type: Set[str]
+            for index in range(len(current)):
+                row = current._row(index)
+                path = row[0]
+                seen.add(path)
+                existing = self._rows.get(path)
+                if existing is not None:
+                    if self._catalog._row(existing) == row:
+                        continue
+                    self._remove(path)
+                self._add(row)
+
+            removed = [
+                p
+                for p in self._rows
+                if p not in seen
+                and (patterns is None or any(r.fullmatch(p) for r in patterns))
+            ]
+            for path in removed:
+                self._remove(path)
+
+            # Compact once at least half of the catalog is out of date
+            dead = len(self._catalog) - len(self._rows)
+            if dead >= max(len(self._rows), 1000):
+                live = tbase.TagCatalog()
+                for path in self._sorted_paths:
+                    live._append_row(self._catalog._row(self._rows[path]))
+                self._rebuild(live)
+
+    def _rebuild(self, catalog: tbase.TagCatalog) -> None:
+        # Must be called while holding the lock, or during construction
+        self._catalog = catalog
+        # If several rows have the same path, the last one is used
+        self._rows = {path: row for row, path in enumerate(catalog.paths)}
+        self._sorted_paths = sorted(self._rows)
+        self._keywords = {}
+        self._properties = {}
+
+        # Most tags share their keywords and properties with many others, so index
+        # each distinct set once rather than each tag separately
+        if len(self._rows) == len(catalog):
+            live = range(len(catalog))  # type: Iterable[int]
+        else:
+            live = sorted(self._rows.values())
+        keyword_groups = {}  # type: Dict[int, Tuple[Tuple[str, ...], List[int]]]
+        property_groups = (
+            {}
+        )  # type: Dict[int, Tuple[Tuple[Tuple[str, str], ...], List[int]]]
+        for row in live:
+            keywords = catalog._keywords[row]
+            if keywords:
+                keyword_groups.setdefault(id(keywords), (keywords, []))[1].append(row)
+            properties = catalog._properties[row]
+            if properties:
+                property_groups.setdefault(id(properties), (properties, []))[1].append(
+                    row
+                )
+        for keywords, rows in keyword_groups.values():
+            for keyword in keywords:
+                self._keywords.setdefault(keyword, set()).update(rows)
+        for properties, rows in property_groups.values():
+            for item in properties:
+                self._properties.setdefault(item, set()).update(rows)
+
+    def _add(self, row: _Row) -> None:
+        # Must be called while holding the lock
+        self._catalog._append_row(row)
+        index = len(self._catalog) - 1
+        self._rows[row[0]] = index
+        self._index(index)
+        bisect.insort(self._sorted_paths, row[0])
+
+    def _remove(self, path: str) -> None:
+        # Must be called while holding the lock
+        self._unindex(self._rows.pop(path))
+        del self._sorted_paths[bisect.bisect_left(self._sorted_paths, path)]
+
+    def _index(self, row: int) -> None:
+        _, _, _, keywords, properties = self._catalog._row(row)
+        for keyword in keywords:
+            self._keywords.setdefault(keyword, set()).add(row)
+        for item in properties:
+            self._properties.setdefault(item, set()).add(row)
+
+    def _unindex(self, row: int) -> None:
+        _, _, _, keywords, properties = self._catalog._row(row)
+        for keyword in keywords:
+            rows = self._keywords[keyword]
+            rows.discard(row)
+            if not rows:
+                del self._keywords[keyword]
+        for item in properties:
+            rows = self._properties[item]
+            rows.discard(row)
+            if not rows:
+                del self._properties[item]
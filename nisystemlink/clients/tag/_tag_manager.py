@@ -4,12 +4,18 @@
 
 import asyncio
 import datetime
+import os
+import time
 from typing import (
     Any,
+    AsyncIterator,
     Awaitable,
+    Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
+    Mapping,
     Optional,
     Sequence,
     Tuple,
@@ -19,11 +25,20 @@ from typing import (
 from nisystemlink.clients import core, tag as tbase
 from nisystemlink.clients.core._internal._http_client import HttpClient, HttpResponse
 from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+from nisystemlink.clients.tag import _tag_catalog_snapshot
+from nisystemlink.clients.tag._core._adaptive_flush_controller import (
+    AdaptiveFlushController,
+)
+from nisystemlink.clients.tag._core._deadband_filter import DeadbandFilter
 from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
 from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
     SerializedTagWithAggregates,
 )
 from nisystemlink.clients.tag._core._system_time_stamper import SystemTimeStamper
+from nisystemlink.clients.tag._core._write_spool import WriteSpool
+from nisystemlink.clients.tag._http._http_async_buffered_tag_writer import (
+    HttpAsyncBufferedTagWriter,
+)
 from nisystemlink.clients.tag._http._http_async_tag_query_result_collection import (
     HttpAsyncTagQueryResultCollection,
 )
@@ -34,6 +49,7 @@ from nisystemlink.clients.tag._http._http_tag_query_result_collection import (
     HttpTagQueryResultCollection,
 )
 from nisystemlink.clients.tag._http._http_tag_selection import HttpTagSelection
+from nisystemlink.clients.tag._http._http_tag_subscription import HttpTagSubscription
 from nisystemlink.clients.tag._http._temporary_tag_selection import (
     TemporaryTagSelection,
 )
@@ -44,6 +60,9 @@ from typing_extensions import final
 class TagManager(tbase.ITagReader):
     """Represents common ways to create, read, and query SystemLink tags for a specific server connection."""
 
+    _READ_MANY_CHUNK_SIZE = 1000
+    """The maximum number of tags read with a single selection by :meth:`read_many`."""
+
     def __init_subclass__(cls) -> None:
         raise TypeError("type 'TagManager' is not an acceptable base type")
 
@@ -335,7 +354,8 @@ class TagManager(tbase.ITagReader):
         properties: Optional[Dict[str, str]] = None,
         *,
         skip: int = 0,
-        take: Optional[int] = None
+        take: Optional[int] = None,
+        max_concurrency: int = 1
     ) -> tbase.TagQueryResultCollection:
         """Query the server for available tags matching the given criteria.
 
@@ -347,6 +367,10 @@ class TagManager(tbase.ITagReader):
                 None.
             skip: The number of tags to initially skip in the results.
             take: The number of tags to include in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time
+                when enumerating the results. If greater than one, pages after the
+                first are requested ahead of time, which is much faster for large
+                queries. Pages are still returned in order.
 
         Returns:
             A :class:`TagQueryResultCollection` containing the first page of results.
@@ -355,12 +379,13 @@ class TagManager(tbase.ITagReader):
 
         Raises:
             ValueError: if ``skip`` or ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
             ValueError: if ``paths`` is an empty list.
             ValueError: if any of ``paths`` are None.
             ApiException: if the API call fails.
         """
         path_str, keyword_str, prop_str = self._prepare_query(
-            paths, keywords, properties, skip, take
+            paths, keywords, properties, skip, take, max_concurrency
         )
         params = {
             "path": path_str,
@@ -382,6 +407,7 @@ class TagManager(tbase.ITagReader):
             take,
             first_page,
             http_response,
+            max_concurrency=max_concurrency,
         )
 
     async def query_async(
@@ -391,7 +417,8 @@ class TagManager(tbase.ITagReader):
         properties: Optional[Dict[str, str]] = None,
         *,
         skip: int = 0,
-        take: Optional[int] = None
+        take: Optional[int] = None,
+        max_concurrency: int = 1
     ) -> tbase.AsyncTagQueryResultCollection:
         """Asynchronously query the server for available tags matching the given criteria.
 
@@ -403,6 +430,10 @@ class TagManager(tbase.ITagReader):
                 None.
             skip: The number of tags to initially skip in the results.
             take: The number of tags to include in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time
+                when enumerating the results. If greater than one, pages after the
+                first are requested ahead of time, which is much faster for large
+                queries. Pages are still returned in order.
 
         Returns:
             A task representing the asynchronous operation. On success, contains a
@@ -413,10 +444,11 @@ class TagManager(tbase.ITagReader):
         Raises:
             ValueError: if ``skip`` is negative.
             ValueError: if ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
             ApiException: if the API call fails.
         """
         path_str, keyword_str, prop_str = self._prepare_query(
-            paths, keywords, properties, skip, take
+            paths, keywords, properties, skip, take, max_concurrency
         )
         params = {
             "path": path_str,
@@ -438,15 +470,228 @@ class TagManager(tbase.ITagReader):
             take,
             first_page,
             http_response,
+            max_concurrency=max_concurrency,
         )
 
-    def _prepare_query(
+    def iter_query(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+        *,
+        skip: int = 0,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> Iterator[tbase.TagData]:
+        """Iterate over the available tags matching the given criteria, one at a time.
+
+        Unlike :meth:`query`, no request is sent until iteration starts, and the
+        results aren't grouped into pages. Each tag's keywords and properties are only
+        copied and parsed when they are first accessed.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+            skip: The number of tags to initially skip in the results.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            An iterator over the matching tags.
+
+        Raises:
+            ValueError: if ``skip`` or ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None.
+            ApiException: if the API call fails.
+        """
+        self._prepare_query(paths, keywords, properties, skip, take, max_concurrency)
+
+        def iterate() -> Iterator[tbase.TagData]:
+            pages = self.query(
+                paths,
+                keywords,
+                properties,
+                skip=skip,
+                take=take,
+                max_concurrency=max_concurrency,
+            )
+            for page in pages:
+                yield from page
+
+        return iterate()
+
+    def iter_query_summaries(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+        *,
+        skip: int = 0,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> Iterator[tbase.TagSummary]:
+        """Iterate over the paths and data types of the available tags matching the
+        given criteria, one at a time.
+
+        This is the same as :meth:`iter_query`, except that only a lightweight
+        :class:`TagSummary` is kept for each tag.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+            skip: The number of tags to initially skip in the results.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            An iterator over the paths and data types of the matching tags.
+
+        Raises:
+            ValueError: if ``skip`` or ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None.
+            ApiException: if the API call fails.
+        """
+        tags = self.iter_query(
+            paths,
+            keywords,
+            properties,
+            skip=skip,
+            take=take,
+            max_concurrency=max_concurrency,
+        )
+        return (tbase.TagSummary(t.path, t.data_type) for t in tags)
+
+    def iter_query_async(
         self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+        *,
+        skip: int = 0,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> AsyncIterator[tbase.TagData]:
+        """Asynchronously iterate over the available tags matching the given criteria,
+        one at a time.
+
+        Unlike :meth:`query_async`, no request is sent until iteration starts, and the
+        results aren't grouped into pages. Each tag's keywords and properties are only
+        copied and parsed when they are first accessed.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+            skip: The number of tags to initially skip in the results.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            An asynchronous iterator over the matching tags.
+
+        Raises:
+            ValueError: if ``skip`` or ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None.
+            ApiException: if the API call fails.
+        """
+        self._prepare_query(paths, keywords, properties, skip, take, max_concurrency)
+
+        async def iterate() -> AsyncIterator[tbase.TagData]:
+            pages = await self.query_async(
+                paths,
+                keywords,
+                properties,
+                skip=skip,
+                take=take,
+                max_concurrency=max_concurrency,
+            )
+            page = pages.current_page
+            try:
+                while page is not None:
+                    for tag in page:
+                        yield tag
+                    page = await pages.move_next_page_async()
+            finally:
+                # Don't leave pages that were requested ahead of time running if
+                # iteration stops early
+                pages._discard_pending()
+
+        return iterate()
+
+    def iter_query_summaries_async(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        keywords: Optional[Iterable[str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+        *,
+        skip: int = 0,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> AsyncIterator[tbase.TagSummary]:
+        """Asynchronously iterate over the paths and data types of the available tags
+        matching the given criteria, one at a time.
+
+        This is the same as :meth:`iter_query_async`, except that only a lightweight
+        :class:`TagSummary` is kept for each tag.
+
+        Args:
+            paths: List of tag paths to include in the result. May include glob-style
+                wildcards.
+            keywords: List of keywords that tags must have, or None.
+            properties: Mapping of properties and their values that tags must have, or
+                None.
+            skip: The number of tags to initially skip in the results.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            An asynchronous iterator over the paths and data types of the matching tags.
+
+        Raises:
+            ValueError: if ``skip`` or ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None.
+            ApiException: if the API call fails.
+        """
+        tags = self.iter_query_async(
+            paths,
+            keywords,
+            properties,
+            skip=skip,
+            take=take,
+            max_concurrency=max_concurrency,
+        )
+
+        async def iterate() -> AsyncIterator[tbase.TagSummary]:
+            async for tag in tags:
+                yield tbase.TagSummary(tag.path, tag.data_type)
+
+        return iterate()
+
+    @classmethod
+    def _prepare_query(
+        cls,
         paths: Optional[Sequence[str]],
         keywords: Optional[Iterable[str]],
         properties: Optional[Dict[str, str]],
         skip: Optional[int],
         take: Optional[int] = None,
+        max_concurrency: int = 1,
     ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         if paths is not None and len(paths) == 0:
             raise ValueError("paths cannot be empty an empty list")
@@ -456,6 +701,8 @@ class TagManager(tbase.ITagReader):
             raise ValueError("skip cannot be negative")
         if take is not None and take < 0:
             raise ValueError("take cannot be negative")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency cannot be 0 or negative")
 
         path_str = None
         keyword_str = None
@@ -667,11 +914,247 @@ class TagManager(tbase.ITagReader):
                     "/selections/{id}/tags", params={"id": selection.id}
                 )
 
+    def read_many(
+        self,
+        paths: Iterable[str],
+        *,
+        include_timestamp: bool = False,
+        include_aggregates: bool = False
+    ) -> Dict[str, Optional[tbase.TagWithAggregates]]:
+        """Retrieve the current values of the tags with the given ``paths`` from the server.
+
+        Optionally retrieves the aggregate values as well. Rather than making a request
+        per tag, the tags are read in chunks through temporary selections, which takes
+        a constant number of requests per chunk.
+
+        Args:
+            paths: The paths of the tags to read.
+            include_timestamp: True to include the timestamp associated with each value
+                in the result.
+            include_aggregates: True to include each tag's aggregate values in the
+                result if the tag is set to :attr:`TagData.collect_aggregates`.
+
+        Returns:
+            A mapping of each path to its value, and the timestamp and/or aggregate
+            values if requested, or None if the tag exists but doesn't have a value.
+            Paths of tags that don't exist are not included.
+
+        Raises:
+            ValueError: if any of ``paths`` are empty or invalid.
+            ValueError: if ``paths`` is None.
+            ApiException: if the API call fails.
+        """
+        result = {}  # type: Dict[str, Optional[tbase.TagWithAggregates]]
+        for chunk in self._prepare_read_many(paths):
+            with TemporaryTagSelection.create(self._http_client, chunk) as selection:
+                response, http_response = self._api.get(
+                    "/selections/{id}/values", params={"id": selection.id}
+                )
+            self._handle_read_many(
+                result,
+                chunk,
+                response,
+                http_response,
+                include_timestamp,
+                include_aggregates,
+            )
+        return result
+
+    async def read_many_async(
+        self,
+        paths: Iterable[str],
+        *,
+        include_timestamp: bool = False,
+        include_aggregates: bool = False
+    ) -> Dict[str, Optional[tbase.TagWithAggregates]]:
+        """Asynchronously retrieve the current values of the tags with the given ``paths`` from the server.
+
+        Optionally retrieves the aggregate values as well. Rather than making a request
+        per tag, the tags are read in chunks through temporary selections, which takes
+        a constant number of requests per chunk. The chunks are read concurrently.
+
+        Args:
+            paths: The paths of the tags to read.
+            include_timestamp: True to include the timestamp associated with each value
+                in the result.
+            include_aggregates: True to include each tag's aggregate values in the
+                result if the tag is set to :attr:`TagData.collect_aggregates`.
+
+        Returns:
+            A task representing the asynchronous operation. On success, contains a
+            mapping of each path to its value, and the timestamp and/or aggregate
+            values if requested, or None if the tag exists but doesn't have a value.
+            Paths of tags that don't exist are not included.
+
+        Raises:
+            ValueError: if any of ``paths`` are empty or invalid.
+            ValueError: if ``paths`` is None.
+            ApiException: if the API call fails.
+        """
+        chunks = self._prepare_read_many(paths)
+
+        async def read_chunk(chunk: List[str]) -> Tuple[Any, HttpResponse]:
+            async with await TemporaryTagSelection.create_async(
+                self._http_client, chunk
+            ) as selection:
+                return await self._api.as_async.get(
+                    "/selections/{id}/values", params={"id": selection.id}
+                )
+
+        responses = await asyncio.gather(*[read_chunk(c) for c in chunks])
+
+        result = {}  # type: Dict[str, Optional[tbase.TagWithAggregates]]
+        for chunk, (response, http_response) in zip(chunks, responses):
+            self._handle_read_many(
+                result,
+                chunk,
+                response,
+                http_response,
+                include_timestamp,
+                include_aggregates,
+            )
+        return result
+
+    async def try_read_many_async(
+        self,
+        paths: Iterable[str],
+        *,
+        include_timestamp: bool = False,
+        include_aggregates: bool = False,
+        max_concurrency: int = 16,
+        timeout: Optional[datetime.timedelta] = None
+    ) -> tbase.TagReadResults:
+        """Asynchronously retrieve the current values of the tags with the given ``paths``
+        from the server, one request per tag.
+
+        Unlike :meth:`read_many_async`, each tag is read separately, so a failure to
+        read one tag doesn't prevent reading the others. At most ``max_concurrency``
+        requests are in progress at a time, and all requests share the connection pool
+        of the current event loop.
+
+        Args:
+            paths: The paths of the tags to read.
+            include_timestamp: True to include the timestamp associated with each value
+                in the result.
+            include_aggregates: True to include each tag's aggregate values in the
+                result if the tag is set to :attr:`TagData.collect_aggregates`.
+            max_concurrency: The maximum number of requests to have in progress at the
+                same time.
+            timeout: How long to wait for each request before giving up on it, or None
+                to wait indefinitely.
+
+        Returns:
+            A task representing the asynchronous operation. On completion, contains the
+            value or exception for each path, in the order given, along with statistics
+            of the time taken by each read. Reads that timed out have an
+            :class:`asyncio.TimeoutError`.
+
+        Raises:
+            ValueError: if any of ``paths`` are empty or invalid.
+            ValueError: if ``paths`` is None.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``timeout`` is not positive.
+        """
+        if paths is None:
+            raise ValueError("paths cannot be None")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency cannot be 0 or negative")
+        if timeout is not None and timeout.total_seconds() <= 0:
+            raise ValueError("timeout must be positive")
+
+        validated = list(
+            dict.fromkeys(tbase.TagPathUtilities.validate(p) for p in paths)
+        )
+        timeout_secs = timeout.total_seconds() if timeout is not None else None
+        results = (
+            {}
+        )  # type: Dict[str, Union[Optional[tbase.TagWithAggregates], Exception]]
+        latencies = []  # type: List[float]
+        remaining = iter(validated)
+
+        async def read_remaining() -> None:
+            # Each worker reads one tag at a time until none are left, which bounds the
+            # number of requests in progress by the number of workers
+            for path in remaining:
+                start = time.perf_counter()
+                try:
+                    results[path] = await asyncio.wait_for(
+                        self.read_async(
+                            path,
+                            include_timestamp=include_timestamp,
+                            include_aggregates=include_aggregates,
+                        ),
+                        timeout_secs,
+                    )
+                except Exception as ex:
+                    results[path] = ex
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(
+            *[read_remaining() for _ in range(min(max_concurrency, len(validated)))]
+        )
+        return tbase.TagReadResults({p: results[p] for p in validated}, latencies)
+
+    def _prepare_read_many(self, paths: Iterable[str]) -> List[List[str]]:
+        if paths is None:
+            raise ValueError("paths cannot be None")
+
+        # Remove duplicates, but keep the order given by the caller
+        validated = list(
+            dict.fromkeys(tbase.TagPathUtilities.validate(p) for p in paths)
+        )
+        size = self._READ_MANY_CHUNK_SIZE
+        return [validated[i : i + size] for i in range(0, len(validated), size)]
+
+    def _handle_read_many(
+        self,
+        result: Dict[str, Optional[tbase.TagWithAggregates]],
+        paths: List[str],
+        response: List[Any],
+        http_response: HttpResponse,
+        include_timestamp: bool,
+        include_aggregates: bool,
+    ) -> None:
+        values = HttpTagSelection._handle_read_tags_values(response, http_response)
+        read = {
+            t["path"]: v for t, v in zip(response, values)
+        }  # type: Dict[str, Optional[SerializedTagWithAggregates]]
+
+        for path in paths:
+            if path not in read:
+                continue
+
+            data = read[path]
+            if data is None:
+                result[path] = None
+                continue
+
+            # The selection returns everything it has, so drop whatever wasn't
+            # requested to be consistent with read()
+            data = data.select(include_timestamp, include_aggregates)
+            result[path] = self._deserialize(data)
+
     def create_writer(
         self,
         *,
         buffer_size: Optional[int] = None,
-        max_buffer_time: Optional[datetime.timedelta] = None
+        max_buffer_time: Optional[datetime.timedelta] = None,
+        send_in_background: bool = False,
+        send_error_callback: Optional[Callable[[Exception], None]] = None,
+        max_concurrent_sends: int = 1,
+        coalesce: bool = False,
+        spool_directory: Optional[str] = None,
+        max_spool_bytes: int = 100 * 1024 * 1024,
+        spool_sync: bool = False,
+        max_pending_writes: Optional[int] = None,
+        max_pending_bytes: Optional[int] = None,
+        overflow_policy: tbase.OverflowPolicy = tbase.OverflowPolicy.BLOCK,
+        overflow_timeout: Optional[datetime.timedelta] = None,
+        adaptive: bool = False,
+        change_only: bool = False,
+        deadband: Optional[float] = None,
+        deadband_percent: Optional[float] = None,
+        max_silence: Optional[datetime.timedelta] = None
     ) -> tbase.BufferedTagWriter:
         """Create a tag writer that buffers tag values until
         :meth:`~BufferedTagWriter.send_buffered_writes()` is called on the returned
@@ -683,14 +1166,319 @@ class TagManager(tbase.ITagReader):
             buffer_size: The maximum number of tag writes to buffer before automatically
                 sending them to the server.
             max_buffer_time: The amount of time before writes are sent.
+            send_in_background: Whether to send full buffers from a dedicated thread,
+                so that the write that fills the buffer returns without waiting for
+                the server.
+            send_error_callback: A function to call, from a background thread, with
+                the exception when sending writes automatically fails, or None to
+                raise the exception from the next write instead.
+            max_concurrent_sends: The maximum number of buffers to send to the server
+                at once when ``send_in_background`` is True. Writes to the same tag
+                still reach the server in order: a buffer is held back until earlier
+                buffers that write any of the same tags have been sent.
+            coalesce: Whether to keep only the newest buffered write to each tag, and
+                discard the older ones instead of sending them. Use this when only the
+                tags' current values matter. Because the server updates a tag's
+                aggregates only from the values it receives, a tag's ``count`` then
+                increases by one per send instead of once per write, and its ``min``,
+                ``max``, and ``mean`` ignore the discarded values. The writer's
+                :attr:`~BufferedTagWriter.coalesced_writes` counts the discarded
+                writes. ``buffer_size`` still counts every write, including
+                discarded ones.
+            spool_directory: A directory in which to store full buffers until the
+                server accepts them, or None to not store them. Stored buffers are sent
+                in the background, oldest first, and retried with increasing delays
+                while the server can't be reached, so that writes aren't lost during
+                outages. Buffers left in the directory by a process that exited
+                without sending them are sent first. Only one writer may use a
+                directory at a time.
+            max_spool_bytes: The maximum total size of the buffers stored in
+                ``spool_directory``. The oldest buffers are discarded to make room.
+            spool_sync: Whether to flush each buffer stored in ``spool_directory`` to
+                the storage device before sending it, so that stored buffers also
+                survive operating system crashes and power loss, at the cost of
+                slower stores.
+            max_pending_writes: The maximum number of writes that haven't been sent,
+                including buffered writes and full buffers waiting to be sent, or None
+                for no limit. Writes stored in ``spool_directory`` don't count.
+            max_pending_bytes: The maximum estimated memory, in bytes, used by writes
+                that haven't been sent, or None for no limit.
+            overflow_policy: What to do with a write that would exceed
+                ``max_pending_writes`` or ``max_pending_bytes``, once any buffered
+                writes have been flushed: wait for room, drop the oldest full buffers
+                that are waiting to be sent, drop the write, or raise an error. The
+                writer's :attr:`~BufferedTagWriter.pending_writes`,
+                :attr:`~BufferedTagWriter.pending_bytes`,
+                :attr:`~BufferedTagWriter.dropped_writes`, and
+                :attr:`~BufferedTagWriter.flush_latency` report how close it is to the
+                limits.
+            overflow_timeout: How long a write waits for room with
+                :attr:`OverflowPolicy.BLOCK`, or None to wait indefinitely. The write
+                raises :class:`TimeoutError` if there still isn't room.
+            adaptive: Whether to tune when writes are sent from the observed rate of
+                writes, their size, and how long the server takes to accept them.
+                ``buffer_size`` and ``max_buffer_time`` then become upper bounds:
+                ``max_buffer_time`` is the longest a write should take to reach the
+                server, and the writer sends the largest buffers that meet it, but
+                never buffers so small that sends fall behind the incoming writes. The
+                writer's :attr:`~BufferedTagWriter.buffer_size` and
+                :attr:`~BufferedTagWriter.max_buffer_time` report the current
+                settings.
+            change_only: Whether to suppress writes whose value equals the last value
+                written to the same tag. The writer's
+                :attr:`~BufferedTagWriter.filtered_writes` counts the suppressed
+                writes.
+            deadband: The largest change in the value of a ``DOUBLE``, ``INT32``, or
+                ``UINT64`` tag to suppress, compared with the last value written to
+                the tag, or None to only suppress unchanged values. Implies
+                ``change_only``. Suppressed writes don't replace the value compared
+                with, so that slow drifts are still written.
+            deadband_percent: Like ``deadband``, but as a percentage of the last value
+                written to the tag.
+            max_silence: The longest time to suppress writes to a tag, after which the
+                next write to the tag is sent regardless of its value, or None to
+                suppress writes indefinitely.
 
         Returns:
             The created writer. Close the writer to free resources.
 
         Raises:
             ValueError: if ``buffer_size`` and ``max_buffer_time`` are both None.
+            ValueError: if ``adaptive`` is True and ``max_buffer_time`` is None.
             ValueError: if ``buffer_size`` is less than one.
+            ValueError: if ``max_concurrent_sends`` is less than one, or more than one
+                without ``send_in_background`` or with a ``spool_directory``.
+            ValueError: if ``max_spool_bytes`` is less than one.
+            ValueError: if ``max_pending_writes`` or ``max_pending_bytes`` is less than
+                one.
+            ValueError: if ``overflow_timeout`` is negative.
+            ValueError: if ``deadband`` or ``deadband_percent`` is negative, or both
+                are given.
+            ValueError: if ``max_silence`` is not positive, or is given without
+                ``change_only``, ``deadband``, or ``deadband_percent``.
+            OSError: if ``spool_directory`` can't be created or read.
         """
+        deadband_filter = self._create_deadband_filter(
+            change_only, deadband, deadband_percent, max_silence
+        )
+        buffer_size, max_buffer_time = self._prepare_writer(
+            buffer_size, max_buffer_time
+        )
+        if max_buffer_time is not None:
+            timer = ManualResetTimer(max_buffer_time)
+        else:
+            timer = ManualResetTimer.null_timer
+        if adaptive:
+            if max_buffer_time is None:
+                raise ValueError("adaptive requires max_buffer_time")
+            flush_controller = AdaptiveFlushController(
+                buffer_size or None, max_buffer_time
+            )  # type: Optional[AdaptiveFlushController]
+        else:
+            flush_controller = None
+        if spool_directory is not None:
+            spool = WriteSpool(
+                spool_directory, max_spool_bytes, sync=spool_sync
+            )  # type: Optional[WriteSpool]
+        else:
+            spool = None
+
+        return HttpBufferedTagWriter(
+            self._http_client,
+            SystemTimeStamper(),
+            buffer_size,
+            timer,
+            send_in_background=send_in_background,
+            send_error_callback=send_error_callback,
+            max_concurrent_sends=max_concurrent_sends,
+            coalesce=coalesce,
+            spool=spool,
+            max_pending_writes=max_pending_writes,
+            max_pending_bytes=max_pending_bytes,
+            overflow_policy=overflow_policy,
+            overflow_timeout=overflow_timeout,
+            flush_controller=flush_controller,
+            deadband_filter=deadband_filter,
+        )
+
+    def create_sharded_writer(
+        self,
+        *,
+        num_shards: int,
+        buffer_size: Optional[int] = None,
+        max_buffer_time: Optional[datetime.timedelta] = None,
+        send_error_callback: Optional[Callable[[Exception], None]] = None,
+        max_concurrent_sends: int = 1,
+        coalesce: bool = False,
+        spool_directory: Optional[str] = None,
+        max_spool_bytes: int = 100 * 1024 * 1024,
+        spool_sync: bool = False,
+        max_pending_writes: Optional[int] = None,
+        max_pending_bytes: Optional[int] = None,
+        overflow_policy: tbase.OverflowPolicy = tbase.OverflowPolicy.BLOCK,
+        overflow_timeout: Optional[datetime.timedelta] = None,
+        adaptive: bool = False,
+        change_only: bool = False,
+        deadband: Optional[float] = None,
+        deadband_percent: Optional[float] = None,
+        max_silence: Optional[datetime.timedelta] = None
+    ) -> tbase.ShardedTagWriter:
+        """Create a tag writer that spreads writes across ``num_shards`` buffered
+        writers, for write rates that a single writer from :meth:`create_writer` can't
+        keep up with.
+
+        Each tag is always written by the same shard, so writes to the same tag still
+        reach the server in order. Every shard sends its full buffers in the
+        background, from its own threads and over its own connections to the server.
+
+        The other arguments are as for :meth:`create_writer`, and apply to each shard
+        separately: each shard has its own buffer of up to ``buffer_size`` writes, its
+        own limits on pending writes, and its own subdirectory of ``spool_directory``
+        with up to ``max_spool_bytes`` of stored buffers. Use the same ``num_shards``
+        with a ``spool_directory`` that already contains stored buffers, so that each
+        shard finds the buffers of its own tags.
+
+        Args:
+            num_shards: The number of writers to spread writes across.
+            buffer_size: The maximum number of tag writes each shard buffers before
+                automatically sending them to the server.
+            max_buffer_time: The amount of time before writes are sent.
+            send_error_callback: A function to call, from a background thread, with
+                the exception when sending writes automatically fails, or None to
+                raise the exception from the next write to the shard instead.
+            max_concurrent_sends: The maximum number of buffers each shard sends to
+                the server at once.
+            coalesce: Whether to keep only the newest buffered write to each tag.
+            spool_directory: A directory in which to store full buffers until the
+                server accepts them, or None to not store them.
+            max_spool_bytes: The maximum total size of the buffers stored by each
+                shard.
+            spool_sync: Whether to flush each stored buffer to the storage device.
+            max_pending_writes: The maximum number of writes that each shard hasn't
+                sent, or None for no limit.
+            max_pending_bytes: The maximum estimated memory used by the writes that
+                each shard hasn't sent, or None for no limit.
+            overflow_policy: What to do with a write that would exceed
+                ``max_pending_writes`` or ``max_pending_bytes``.
+            overflow_timeout: How long a write waits for room with
+                :attr:`OverflowPolicy.BLOCK`, or None to wait indefinitely.
+            adaptive: Whether each shard tunes when its writes are sent.
+            change_only: Whether to suppress writes whose value equals the last value
+                written to the same tag.
+            deadband: The largest change in a numeric tag's value to suppress.
+            deadband_percent: The largest change in a numeric tag's value to suppress,
+                as a percentage of the last value written to the tag.
+            max_silence: The longest time to suppress writes to a tag.
+
+        Returns:
+            The created writer. Close the writer to free resources.
+
+        Raises:
+            ValueError: if ``num_shards`` is less than one.
+            ValueError: if any of the other arguments are invalid for
+                :meth:`create_writer`.
+            OSError: if ``spool_directory`` can't be created or read.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        writers = []  # type: List[tbase.BufferedTagWriter]
+        try:
+            for i in range(num_shards):
+                writers.append(
+                    self.create_writer(
+                        buffer_size=buffer_size,
+                        max_buffer_time=max_buffer_time,
+                        send_in_background=True,
+                        send_error_callback=send_error_callback,
+                        max_concurrent_sends=max_concurrent_sends,
+                        coalesce=coalesce,
+                        spool_directory=(
+                            os.path.join(spool_directory, "shard{}".format(i))
+                            if spool_directory is not None
+                            else None
+                        ),
+                        max_spool_bytes=max_spool_bytes,
+                        spool_sync=spool_sync,
+                        max_pending_writes=max_pending_writes,
+                        max_pending_bytes=max_pending_bytes,
+                        overflow_policy=overflow_policy,
+                        overflow_timeout=overflow_timeout,
+                        adaptive=adaptive,
+                        change_only=change_only,
+                        deadband=deadband,
+                        deadband_percent=deadband_percent,
+                        max_silence=max_silence,
+                    )
+                )
+        except BaseException:
+            for writer in writers:
+                writer.__exit__(None, None, None)
+            raise
+        return tbase.ShardedTagWriter(writers)
+
+    async def create_writer_async(
+        self,
+        *,
+        buffer_size: Optional[int] = None,
+        max_buffer_time: Optional[datetime.timedelta] = None
+    ) -> tbase.AsyncBufferedTagWriter:
+        """Asynchronously create a tag writer for use with ``asyncio``, that buffers
+        tag values until
+        :meth:`~AsyncBufferedTagWriter.send_buffered_writes_async()` is called on the
+        returned object, ``buffer_size`` writes have been buffered, or
+        ``max_buffer_time`` time has past since buffering a value, at which point the
+        writes will be sent automatically.
+
+        Unlike the writer returned by :meth:`create_writer`, the returned writer
+        never blocks the event loop: the ``max_buffer_time`` flush is scheduled on the
+        event loop instead of a timer thread, and writes are sent asynchronously.
+
+        Args:
+            buffer_size: The maximum number of tag writes to buffer before automatically
+                sending them to the server.
+            max_buffer_time: The amount of time before writes are sent.
+
+        Returns:
+            A task representing the asynchronous operation. On success, contains the
+            created writer. Close the writer to send any remaining writes.
+
+        Raises:
+            ValueError: if ``buffer_size`` and ``max_buffer_time`` are both None.
+            ValueError: if ``buffer_size`` is less than one.
+            ValueError: if ``max_buffer_time`` is less than 1 millisecond.
+        """
+        buffer_size, max_buffer_time = self._prepare_writer(
+            buffer_size, max_buffer_time
+        )
+        return HttpAsyncBufferedTagWriter(
+            self._http_client, SystemTimeStamper(), buffer_size, max_buffer_time
+        )
+
+    @classmethod
+    def _create_deadband_filter(
+        cls,
+        change_only: bool,
+        deadband: Optional[float],
+        deadband_percent: Optional[float],
+        max_silence: Optional[datetime.timedelta],
+    ) -> Optional[DeadbandFilter]:
+        if not change_only and deadband is None and deadband_percent is None:
+            if max_silence is not None:
+                raise ValueError(
+                    "max_silence requires change_only, deadband, or deadband_percent"
+                )
+            return None
+        return DeadbandFilter(
+            absolute=deadband, percent=deadband_percent, max_silence=max_silence
+        )
+
+    @classmethod
+    def _prepare_writer(
+        cls,
+        buffer_size: Optional[int],
+        max_buffer_time: Optional[datetime.timedelta],
+    ) -> Tuple[int, Optional[datetime.timedelta]]:
         if buffer_size is None and max_buffer_time is None:
             raise ValueError("must provide either buffer_size or max_buffer_time")
 
@@ -703,14 +1491,310 @@ class TagManager(tbase.ITagReader):
         if max_buffer_time is not None:
             if max_buffer_time.total_seconds() < 0.001:
                 raise ValueError("max_buffer_time must be at least 1 millisecond")
-            timer = ManualResetTimer(max_buffer_time)
+        return buffer_size, max_buffer_time
+
+    def create_index(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        *,
+        refresh_interval: Optional[datetime.timedelta] = None,
+        snapshot_file: Optional[str] = None,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> tbase.TagIndex:
+        """Query the server for the metadata of the tags matching ``paths`` and create
+        an in-memory index that answers queries over those tags locally.
+
+        If ``snapshot_file`` is given, the index is saved to that file each time it is
+        refreshed. When the file already contains a snapshot of the same ``paths``,
+        the index is loaded from it instead of querying the server, which is much
+        faster for large numbers of tags, and is then refreshed on a background thread
+        to catch up with any changes made since the snapshot was saved.
+
+        Args:
+            paths: List of tag paths to index, which may include glob-style wildcards,
+                or None to index all tags.
+            refresh_interval: How long to wait after each refresh of the index before
+                refreshing it again, or None to only refresh it when
+                :meth:`TagIndex.refresh` is called.
+            snapshot_file: The path of a file to load the index from and save it to,
+                or None to not use a snapshot.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            The created index. Close the index to stop refreshing it.
+
+        Raises:
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+            ValueError: if ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``refresh_interval`` is zero or negative.
+            ApiException: if the API call fails.
+        """
+        self._prepare_query(paths, None, None, None, take, max_concurrency)
+        timer = self._create_refresh_timer(refresh_interval)
+        snapshot = self._load_index_snapshot(paths, snapshot_file)
+        if snapshot is not None:
+            index = tbase.TagIndex._from_catalog(snapshot)
         else:
-            timer = ManualResetTimer.null_timer
+            index = tbase.TagIndex._from_catalog(
+                tbase.TagCatalog(
+                    self.iter_query(paths, take=take, max_concurrency=max_concurrency)
+                )
+            )
+            self._save_index_snapshot(index, paths, snapshot_file)
+        refresh = self._make_index_refresh(
+            index, paths, snapshot_file, take, max_concurrency
+        )
+        if snapshot is not None:
+            index._refresh_in_background(refresh)
+        if timer is not None:
+            index._start_refresh(refresh, timer)
+        return index
 
-        return HttpBufferedTagWriter(
-            self._http_client, SystemTimeStamper(), buffer_size, timer
+    async def create_index_async(
+        self,
+        paths: Optional[Sequence[str]] = None,
+        *,
+        refresh_interval: Optional[datetime.timedelta] = None,
+        snapshot_file: Optional[str] = None,
+        take: Optional[int] = None,
+        max_concurrency: int = 1
+    ) -> tbase.TagIndex:
+        """Asynchronously query the server for the metadata of the tags matching
+        ``paths`` and create an in-memory index that answers queries over those tags
+        locally.
+
+        If ``snapshot_file`` is given, the index is saved to that file each time it is
+        refreshed. When the file already contains a snapshot of the same ``paths``,
+        the index is loaded from it instead of querying the server, which is much
+        faster for large numbers of tags, and is then refreshed by a background task to
+        catch up with any changes made since the snapshot was saved.
+
+        Args:
+            paths: List of tag paths to index, which may include glob-style wildcards,
+                or None to index all tags.
+            refresh_interval: How long to wait after each refresh of the index before
+                refreshing it again, or None to only refresh it when
+                :meth:`TagIndex.refresh` is called. Periodic refreshes are performed
+                on a background thread.
+            snapshot_file: The path of a file to load the index from and save it to,
+                or None to not use a snapshot.
+            take: The number of tags to request in each page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Returns:
+            A task representing the asynchronous operation. On success, contains the
+            created index. Close the index to stop refreshing it.
+
+        Raises:
+            ValueError: if ``paths`` is an empty list.
+            ValueError: if any of ``paths`` are None or invalid.
+            ValueError: if ``take`` is negative.
+            ValueError: if ``max_concurrency`` is less than one.
+            ValueError: if ``refresh_interval`` is zero or negative.
+            ApiException: if the API call fails.
+        """
+        self._prepare_query(paths, None, None, None, take, max_concurrency)
+        timer = self._create_refresh_timer(refresh_interval)
+        snapshot = self._load_index_snapshot(paths, snapshot_file)
+        if snapshot is not None:
+            index = tbase.TagIndex._from_catalog(snapshot)
+        else:
+            index = tbase.TagIndex()
+            await index.refresh_async(
+                self, paths, take=take, max_concurrency=max_concurrency
+            )
+            self._save_index_snapshot(index, paths, snapshot_file)
+        if snapshot is not None:
+
+            async def revalidate() -> None:
+                await index.refresh_async(
+                    self, paths, take=take, max_concurrency=max_concurrency
+                )
+                self._save_index_snapshot(index, paths, snapshot_file)
+
+            index._refresh_in_background_async(revalidate)
+        if timer is not None:
+            index._start_refresh(
+                self._make_index_refresh(
+                    index, paths, snapshot_file, take, max_concurrency
+                ),
+                timer,
+            )
+        return index
+
+    @classmethod
+    def _create_refresh_timer(
+        cls, refresh_interval: Optional[datetime.timedelta]
+    ) -> Optional[ManualResetTimer]:
+        if refresh_interval is None:
+            return None
+        if refresh_interval.total_seconds() <= 0:
+            raise ValueError("refresh_interval cannot be 0 or negative")
+        return ManualResetTimer(refresh_interval)
+
+    @classmethod
+    def _load_index_snapshot(
+        cls, paths: Optional[Sequence[str]], snapshot_file: Optional[str]
+    ) -> Optional[tbase.TagCatalog]:
+        if snapshot_file is None:
+            return None
+        snapshot = _tag_catalog_snapshot.try_load_snapshot(snapshot_file)
+        if snapshot is None:
+            return None
+        catalog, metadata = snapshot
+        if "paths" not in metadata or metadata["paths"] != (
+            list(paths) if paths is not None else None
+        ):
+            # The snapshot is of a different set of tags
+            return None
+        return catalog
+
+    @classmethod
+    def _save_index_snapshot(
+        cls,
+        index: tbase.TagIndex,
+        paths: Optional[Sequence[str]],
+        snapshot_file: Optional[str],
+    ) -> None:
+        if snapshot_file is None:
+            return
+        _tag_catalog_snapshot.save_snapshot(
+            snapshot_file,
+            index.to_catalog(),
+            {"paths": list(paths) if paths is not None else None},
+        )
+
+    def _make_index_refresh(
+        self,
+        index: tbase.TagIndex,
+        paths: Optional[Sequence[str]],
+        snapshot_file: Optional[str],
+        take: Optional[int],
+        max_concurrency: int,
+    ) -> Callable[[], None]:
+        def refresh() -> None:
+            index.refresh(self, paths, take=take, max_concurrency=max_concurrency)
+            self._save_index_snapshot(index, paths, snapshot_file)
+
+        return refresh
+
+    def create_caching_reader(
+        self,
+        *,
+        time_to_live: datetime.timedelta,
+        max_entries: int = 1000,
+        path_time_to_live: Optional[Mapping[str, datetime.timedelta]] = None,
+        subscribe_paths: Optional[Iterable[str]] = None,
+        update_interval: Optional[datetime.timedelta] = None
+    ) -> tbase.CachingTagReader:
+        """Create a tag reader that caches values read from the server.
+
+        Values are cached for ``time_to_live`` after they are read. If
+        ``subscribe_paths`` is given, a subscription is created for those paths, and
+        values of the subscribed tags are updated as the subscription reports changes
+        instead of expiring.
+
+        Args:
+            time_to_live: How long to cache each value after it is read.
+            max_entries: The maximum number of tags to cache values for.
+            path_time_to_live: How long to cache the values of specific tags, indexed
+                by path, if different from ``time_to_live``.
+            subscribe_paths: The tag paths to subscribe to, which may include glob-style
+                wildcards, or None to not create a subscription.
+            update_interval: How often to receive tag update notifications from the
+                server, or None to use the default.
+
+        Returns:
+            The created reader. Close the reader to free resources.
+
+        Raises:
+            ValueError: if ``max_entries`` is less than one.
+            ValueError: if ``time_to_live`` or any of ``path_time_to_live`` is
+                negative.
+            ApiException: if the API call to create the subscription fails.
+        """
+        subscription = None  # type: Optional[tbase.TagSubscription]
+        if subscribe_paths is not None:
+            subscription = HttpTagSubscription.create(
+                self._http_client,
+                subscribe_paths,
+                ManualResetTimer(update_interval) if update_interval else None,
+            )
+        return self._create_caching_reader(
+            time_to_live, max_entries, path_time_to_live, subscription
+        )
+
+    async def create_caching_reader_async(
+        self,
+        *,
+        time_to_live: datetime.timedelta,
+        max_entries: int = 1000,
+        path_time_to_live: Optional[Mapping[str, datetime.timedelta]] = None,
+        subscribe_paths: Optional[Iterable[str]] = None,
+        update_interval: Optional[datetime.timedelta] = None
+    ) -> tbase.CachingTagReader:
+        """Asynchronously create a tag reader that caches values read from the server.
+
+        Values are cached for ``time_to_live`` after they are read. If
+        ``subscribe_paths`` is given, a subscription is created for those paths, and
+        values of the subscribed tags are updated as the subscription reports changes
+        instead of expiring.
+
+        Args:
+            time_to_live: How long to cache each value after it is read.
+            max_entries: The maximum number of tags to cache values for.
+            path_time_to_live: How long to cache the values of specific tags, indexed
+                by path, if different from ``time_to_live``.
+            subscribe_paths: The tag paths to subscribe to, which may include glob-style
+                wildcards, or None to not create a subscription.
+            update_interval: How often to receive tag update notifications from the
+                server, or None to use the default.
+
+        Returns:
+            A task representing the asynchronous operation. On success, contains the
+            created reader. Close the reader to free resources.
+
+        Raises:
+            ValueError: if ``max_entries`` is less than one.
+            ValueError: if ``time_to_live`` or any of ``path_time_to_live`` is
+                negative.
+            ApiException: if the API call to create the subscription fails.
+        """
+        subscription = None  # type: Optional[tbase.TagSubscription]
+        if subscribe_paths is not None:
+            subscription = await HttpTagSubscription.create_async(
+                self._http_client,
+                subscribe_paths,
+                ManualResetTimer(update_interval) if update_interval else None,
+            )
+        return self._create_caching_reader(
+            time_to_live, max_entries, path_time_to_live, subscription
         )
 
+    def _create_caching_reader(
+        self,
+        time_to_live: datetime.timedelta,
+        max_entries: int,
+        path_time_to_live: Optional[Mapping[str, datetime.timedelta]],
+        subscription: Optional[tbase.TagSubscription],
+    ) -> tbase.CachingTagReader:
+        try:
+            return tbase.CachingTagReader(
+                self,
+                time_to_live=time_to_live,
+                max_entries=max_entries,
+                path_time_to_live=path_time_to_live,
+                subscription=subscription,
+            )
+        except ValueError:
+            if subscription is not None:
+                subscription.close()
+            raise
+
     def _read(
         self, path: str, include_timestamp: bool, include_aggregates: bool
     ) -> Optional[SerializedTagWithAggregates]:
@@ -3,7 +3,8 @@
 """Implementation of TagQueryResultCollection."""
 
 import abc
-from typing import Iterable, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 
 from nisystemlink.clients import core, tag as tbase
 
@@ -16,7 +17,12 @@ class TagQueryResultCollection(abc.ABC):
     """
 
     def __init__(
-        self, first_page: List[tbase.TagData], total_count: int, skip: int
+        self,
+        first_page: List[tbase.TagData],
+        total_count: int,
+        skip: int,
+        *,
+        max_concurrency: int = 1
     ) -> None:
         """Initialize an instance with the first page of query results.
 
@@ -24,7 +30,13 @@ class TagQueryResultCollection(abc.ABC):
             first_page: The first page of results, or None if there are no results.
             total_count: The total number of results in the query.
             skip: The skip used for the first page of results.
+            max_concurrency: The maximum number of pages to request at the same time.
+
+        Raises:
+            ValueError: if ``max_concurrency`` is less than one.
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency cannot be 0 or negative")
         self._first_page = None  # type: Optional[List[tbase.TagData]]
         if first_page:
             if skip >= total_count:
@@ -37,21 +49,28 @@ class TagQueryResultCollection(abc.ABC):
         self._use_cached_page = True
         self._total_count = total_count
         self._skip = skip
+        self._max_concurrency = max_concurrency
 
     @property
     def total_count(self) -> int:  # noqa: D401
         """The total number of tags matched by the query at the time the query was made."""
         return self._total_count
 
-    def __iter__(self) -> Iterable[List[tbase.TagData]]:
+    def __iter__(self) -> Iterator[List[tbase.TagData]]:
         """Enumerate over the pages of tag query results.
 
         Calls to ``next(iter())`` may throw :class:`.ApiException`.
 
+        If the collection was created with a ``max_concurrency`` greater than one, the
+        pages after the first are requested ahead of time on background threads, at
+        offsets computed from the size of the first page. Pages are still enumerated
+        in order.
+
         Returns:
             The created enumerator.
         """
         skip = self._skip
+        page_size = None  # type: Optional[int]
 
         if self._use_cached_page:
             self._use_cached_page = False
@@ -61,23 +80,56 @@ class TagQueryResultCollection(abc.ABC):
             if not page:
                 return
 
+            page_size = len(page)
             skip += len(page)
             yield page
 
             if skip >= self._total_count:
                 return
 
-        while True:
-            page = self._query_page(skip)
-
-            if not page:
-                return
-
-            skip += len(page)
-            yield page
-
-            if skip >= self._total_count:
-                break
+        executor = None  # type: Optional[ThreadPoolExecutor]
+        pending = {}  # type: Dict[int, Future]
+        ahead = skip
+        try:
+            while True:
+                if skip not in pending:
+                    # Either nothing was requested ahead, or a page had an unexpected
+                    # size and the pages requested ahead are at the wrong offsets
+                    self._discard(pending)
+                    ahead = skip
+
+                if self._max_concurrency > 1 and page_size:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(self._max_concurrency)
+                    while (
+                        len(pending) < self._max_concurrency
+                        and ahead < self._total_count
+                    ):
+                        pending[ahead] = executor.submit(self._query_page, ahead)
+                        ahead += page_size
+
+                future = pending.pop(skip, None)
+                page = future.result() if future else self._query_page(skip)
+
+                if not page:
+                    return
+
+                page_size = page_size or len(page)
+                skip += len(page)
+                yield page
+
+                if skip >= self._total_count:
+                    break
+        finally:
+            self._discard(pending)
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    @classmethod
+    def _discard(cls, pending: Dict[int, Future]) -> None:
+        for future in pending.values():
+            future.cancel()
+        pending.clear()
 
     @abc.abstractmethod
     def _query_page(self, skip: int) -> List[tbase.TagData]:
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of TagReadResults and LatencyStatistics."""
+
+import datetime
+import math
+from typing import Dict, Iterable, Optional, Union
+
+from nisystemlink.clients import tag as tbase
+
+
+class LatencyStatistics:
+    """Represents summary statistics of the time taken by a set of requests."""
+
+    def __init__(self, latencies: Iterable[float]) -> None:
+        """Initialize an instance.
+
+        Args:
+            latencies: The time taken by each request, in seconds.
+
+        :meta private:
+        """
+        self._latencies = sorted(latencies)
+
+    @property
+    def count(self) -> int:  # noqa: D401
+        """The number of requests."""
+        return len(self._latencies)
+
+    @property
+    def minimum(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The shortest time taken by a request, or None if there were no requests."""
+        if not self._latencies:
+            return None
+        return datetime.timedelta(seconds=self._latencies[0])
+
+    @property
+    def maximum(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The longest time taken by a request, or None if there were no requests."""
+        if not self._latencies:
+            return None
+        return datetime.timedelta(seconds=self._latencies[-1])
+
+    @property
+    def mean(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The mean time taken by a request, or None if there were no requests."""
+        if not self._latencies:
+            return None
+        return datetime.timedelta(seconds=sum(self._latencies) / len(self._latencies))
+
+    @property
+    def median(self) -> Optional[datetime.timedelta]:  # noqa: D401
+        """The median time taken by a request, or None if there were no requests."""
+        return self.percentile(50)
+
+    def percentile(self, percent: float) -> Optional[datetime.timedelta]:
+        """Get the time within which the given percentage of requests completed.
+
+        Args:
+            percent: The percentage of requests, between 0 and 100.
+
+        Returns:
+            The nearest-rank percentile of the request times, or None if there were no
+            requests.
+
+        Raises:
+            ValueError: if ``percent`` is not between 0 and 100.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        if not self._latencies:
+            return None
+        rank = max(math.ceil(percent / 100 * len(self._latencies)), 1)
+        return datetime.timedelta(seconds=self._latencies[rank - 1])
+
+
+class TagReadResults:
+    """Represents the outcome of reading many tags, where each read may fail independently."""
+
+    def __init__(
+        self,
+        results: Dict[str, Union[Optional[tbase.TagWithAggregates], Exception]],
+        latencies: Iterable[float],
+    ) -> None:
+        """Initialize an instance.
+
+        Args:
+            results: The value read for each path, or the exception raised when reading
+                it.
+            latencies: The time taken by each read, in seconds.
+
+        :meta private:
+        """
+        self._results = results
+        self._latency = LatencyStatistics(latencies)
+
+    @property
+    def results(
+        self,
+    ) -> Dict[str, Union[Optional[tbase.TagWithAggregates], Exception]]:  # noqa: D401
+        """The value read for each path, or the exception raised when reading it.
+
+        Values are None for tags that exist but don't have a value.
+        """
+        return dict(self._results)
+
+    @property
+    def values(
+        self,
+    ) -> Dict[str, Optional[tbase.TagWithAggregates]]:  # noqa: D401
+        """The value read for each path that was read successfully."""
+        return {p: r for p, r in self._results.items() if not isinstance(r, Exception)}
+
+    @property
+    def errors(self) -> Dict[str, Exception]:  # noqa: D401
+        """The exception raised for each path that could not be read."""
+        return {p: r for p, r in self._results.items() if isinstance(r, Exception)}
+
+    @property
+    def latency(self) -> LatencyStatistics:  # noqa: D401
+        """Statistics of the time taken by the reads."""
+        return self._latency
@@ -7,7 +7,7 @@ import contextlib
 import datetime
 import weakref
 from types import TracebackType
-from typing import Iterable, List, Optional, Type
+from typing import Iterable, List, Optional, Tuple, Type
 
 import events
 from nisystemlink.clients import core, tag as tbase
@@ -93,6 +93,11 @@ class TagSubscription(events.Events, abc.ABC):
         self._heartbeat_timer.elapsed += self._heartbeat_timer_handler
         self._closed = False
 
+    @property
+    def paths(self) -> Tuple[str, ...]:  # noqa: D401
+        """The tag path queries included in the subscription."""
+        return tuple(self._paths)
+
     def __del__(self) -> None:
         self._exit_stack.close()
 
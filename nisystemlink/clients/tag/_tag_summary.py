@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of TagSummary."""
+
+from typing import NamedTuple
+
+from nisystemlink.clients import tag as tbase
+
+
+class TagSummary(NamedTuple):
+    """Contains only the path and data type of a SystemLink tag.
+
+    Returned by :meth:`TagManager.iter_query_summaries` for scans that don't need a
+    tag's keywords, properties or other metadata.
+    """
+
+    path: str
+    """The tag's path, which uses a dot-separated hierarchy to uniquely identify the
+    tag on the server."""
+
+    data_type: "tbase.DataType"
+    """The data type for the tag's values."""
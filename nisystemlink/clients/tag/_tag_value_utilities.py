@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""Implementation of TagValueUtilities."""
+
+from typing import Any, List, Optional, Sequence
+
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
+    deserialize_value,
+)
+from typing_extensions import final
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+
+# The NumPy data type used for each tag data type, and whether values that are
+# missing or can't be converted are stored as NaN/NaT rather than raising an error
+_ARRAY_TYPES = {
+    tbase.DataType.DOUBLE: ("float64", True),
+    tbase.DataType.INT32: ("int64", False),
+    tbase.DataType.UINT64: ("uint64", False),
+    tbase.DataType.BOOLEAN: ("bool", False),
+    tbase.DataType.DATE_TIME: ("datetime64[us]", True),
+    tbase.DataType.STRING: ("object", True),
+}
+
+
+@final
+class TagValueUtilities:
+    """Contains helper methods for converting tag values."""
+
+    def __init_subclass__(cls) -> None:
+        raise TypeError("type 'TagValueUtilities' is not an acceptable base type")
+
+    def __init__(self) -> None:
+        raise TypeError("Can't instantiate static class 'TagValueUtilities'")
+
+    @classmethod
+    def to_numpy_array(
+        cls, values: Sequence[Optional[str]], data_type: tbase.DataType
+    ) -> Any:
+        """Convert a batch of values serialized as strings into a NumPy array.
+
+        All of the values must have the same data type. The array's data type depends
+        on ``data_type``:
+
+        - :attr:`DataType.DOUBLE`: ``float64``, with NaN for values that are None or
+          can't be converted.
+        - :attr:`DataType.INT32`: ``int64``.
+        - :attr:`DataType.UINT64`: ``uint64``.
+        - :attr:`DataType.BOOLEAN`: ``bool``.
+        - :attr:`DataType.DATE_TIME`: ``datetime64[us]`` in UTC, with NaT for values
+          that are None or can't be converted.
+        - :attr:`DataType.STRING`: ``object``, containing the strings.
+
+        The whole batch is converted by NumPy at once when possible, which is much
+        faster than converting each value separately.
+
+        Requires the ``numpy`` package.
+
+        Args:
+            values: The values serialized as strings.
+            data_type: The data type of the values.
+
+        Returns:
+            A one-dimensional ``numpy.ndarray`` with one element for each value.
+
+        Raises:
+            ImportError: if ``numpy`` is not installed.
+            ValueError: if ``values`` is None.
+            ValueError: if ``data_type`` is :attr:`DataType.UNKNOWN`.
+            ValueError: if an integer or boolean value is None or can't be
+                converted.
+        """
+        if numpy is None:
+            raise ImportError(
+                "to_numpy_array requires the numpy package, which is installed with "
+                "the 'numpy' extra: pip install nisystemlink-clients[numpy]"
+            )
+        if values is None:
+            raise ValueError("values cannot be None")
+        try:
+            dtype, allow_missing = _ARRAY_TYPES[data_type]
+        except KeyError:
+            raise ValueError("data_type is unknown")
+
+        values = list(values)
+        if data_type == tbase.DataType.STRING:
+            array = numpy.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+
+        try:
+            return cls._convert_all(values, data_type, dtype)
+        except (ValueError, TypeError, OverflowError):
+            pass
+
+        # At least one value is missing or invalid, so convert them one at a time to
+        # find out which
+        limits = (
+            numpy.iinfo(dtype) if numpy.issubdtype(dtype, numpy.integer) else None
+        )  # type: Any
+        converted = []  # type: List[Any]
+        for index, value in enumerate(values):
+            item = deserialize_value(value, data_type)
+            if limits is not None and item is not None:
+                if not limits.min <= item <= limits.max:
+                    item = None
+            if item is None:
+                if not allow_missing:
+                    raise ValueError(
+                        "The value at index {} is not a valid {} value: {!r}".format(
+                            index, data_type.name, value
+                        )
+                    )
+                item = (
+                    numpy.datetime64("NaT")
+                    if data_type == tbase.DataType.DATE_TIME
+                    else numpy.nan
+                )
+            elif data_type == tbase.DataType.DATE_TIME:
+                item = numpy.datetime64(item.replace(tzinfo=None), "us")
+            converted.append(item)
+        return numpy.array(converted, dtype=dtype)
+
+    @classmethod
+    def _convert_all(
+        cls, values: List[Optional[str]], data_type: tbase.DataType, dtype: str
+    ) -> Any:
+        if data_type == tbase.DataType.BOOLEAN:
+            strings = numpy.array(values, dtype=str)
+            result = strings == "True"
+            if not numpy.all(result | (strings == "False")):
+                raise ValueError("Invalid boolean value")
+            return result
+        if data_type == tbase.DataType.DATE_TIME:
+            # NumPy doesn't accept the "Z" suffix, and accepts some formats that
+            # aren't valid SystemLink timestamps, so only strip it from values that
+            # have both a date and a time
+            trimmed = []
+            for value in values:
+                if value is None or value[-1:] != "Z" or value[10:11] != "T":
+                    raise ValueError("Invalid timestamp")
+                trimmed.append(value[:-1])
+            return numpy.array(trimmed, dtype=dtype)
+        if any(value is None for value in values):
+            raise ValueError("Missing value")
+        return numpy.array(values, dtype=dtype)
@@ -0,0 +1,18 @@
+import asyncio
+
+from nisystemlink.clients.core import HttpConfiguration
+from nisystemlink.clients.core._internal._http_client import HttpClient
+
+
+class TestHttpClient:
+    def test__async_client__same_event_loop__client_reused(self):
+        client = HttpClient(HttpConfiguration("http://localhost", "api-key"))
+
+        async def get_clients():
+            return client._async_client, client._async_client
+
+        first, second = asyncio.run(get_clients())
+        third, _ = asyncio.run(get_clients())
+
+        assert first is second
+        assert first is not third
@@ -0,0 +1,222 @@
+import array
+import datetime
+import random
+import time
+import warnings
+
+import pytest  # type: ignore
+from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+
+_UTC = datetime.timezone.utc
+
+
+def _reference_datetime_to_str(value: datetime.datetime) -> str:
+    # The original implementation, which the faster one must match
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return datetime.datetime.utcfromtimestamp(value.timestamp()).isoformat() + "Z"
+
+
+def _reference_str_to_datetime(timestamp: str) -> datetime.datetime:
+    if not timestamp.endswith("Z"):
+        raise ValueError(timestamp)
+    timestamp = timestamp[:-1].ljust(26, "0")[:26] + "+0000"
+    return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def _random_datetimes(count):
+    rng = random.Random(1234)
+    zones = [
+        _UTC,
+        datetime.timezone(datetime.timedelta(hours=-5)),
+        datetime.timezone(datetime.timedelta(hours=5, minutes=30)),
+        None,
+    ]
+    for _ in range(count):
+        value = datetime.datetime.fromtimestamp(rng.uniform(-2e9, 4e9), _UTC)
+        value = value.replace(microsecond=rng.choice([0, rng.randrange(1000000)]))
+        zone = rng.choice(zones)
+        if zone is None:
+            yield value.astimezone().replace(tzinfo=None)
+        else:
+            yield value.astimezone(zone)
+
+
+class TestTimestampUtilities:
+    def test__datetime_to_str__matches_reference(self):
+        for value in _random_datetimes(5000):
+            assert TimestampUtilities.datetime_to_str(
+                value
+            ) == _reference_datetime_to_str(value)
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (
+                datetime.datetime(2020, 1, 2, 3, 4, 5, 6, _UTC),
+                "2020-01-02T03:04:05.000006Z",
+            ),
+            (datetime.datetime(2020, 1, 2, 3, 4, 5, 0, _UTC), "2020-01-02T03:04:05Z"),
+            (
+                datetime.datetime(
+                    2020,
+                    1,
+                    1,
+                    22,
+                    0,
+                    0,
+                    0,
+                    datetime.timezone(-datetime.timedelta(hours=6)),
+                ),
+                "2020-01-02T04:00:00Z",
+            ),
+            (datetime.datetime(999, 12, 31, 0, 0, 0, 0, _UTC), "0999-12-31T00:00:00Z"),
+        ],
+    )
+    def test__datetime_to_str__formats_timestamp(self, value, expected):
+        assert TimestampUtilities.datetime_to_str(value) == expected
+
+    @pytest.mark.parametrize(
+        "timestamp",
+        [
+            "2020-01-02T03:04:05.123456Z",
+            "2020-01-02T03:04:05.1Z",
+            "2020-01-02T03:04:05.123456789Z",
+            "2020-01-02T03:04:05.Z",
+            "2020-01-02T03:04:05.12345678aZ",
+            "2020-1-02T03:04:05.1Z",
+            "2020-01-02T03:04:05.1",
+            "2020-02-30T03:04:05.1Z",
+            "2020-01-02T24:04:05.1Z",
+            "2020-01-02T03:60:05.1Z",
+            "2020-01-02T03:04:60.1Z",
+            "2020-01-02 03:04:05.1Z",
+            "0000-01-02T03:04:05.1Z",
+            "garbage",
+        ],
+    )
+    def test__str_to_datetime__matches_reference(self, timestamp):
+        try:
+            expected = _reference_str_to_datetime(timestamp)
+        except ValueError:
+            with pytest.raises(ValueError):
+                TimestampUtilities.str_to_datetime(timestamp)
+        else:
+            actual = TimestampUtilities.str_to_datetime(timestamp)
+            assert actual == expected
+            assert actual.tzinfo is _UTC
+
+    def test__whole_second_timestamp__str_to_datetime_parses(self):
+        value = TimestampUtilities.str_to_datetime("2020-01-02T03:04:05Z")
+
+        assert value == datetime.datetime(2020, 1, 2, 3, 4, 5, 0, _UTC)
+
+    def test__datetime_to_str__round_trips(self):
+        for value in _random_datetimes(1000):
+            timestamp = TimestampUtilities.datetime_to_str(value)
+
+            assert TimestampUtilities.str_to_datetime(timestamp) == value.astimezone(
+                _UTC
+            )
+
+    @pytest.mark.parametrize(
+        "timestamp,expected",
+        [
+            ("1970-01-01T00:00:00Z", 0),
+            ("1970-01-01T00:00:01.5Z", 1500000000),
+            ("2020-01-02T03:04:05.123456789Z", 1577934245123456789),
+            ("2020-01-02T03:04:05.1234567891Z", 1577934245123456789),
+            ("1969-12-31T23:59:59.999999999Z", -1),
+        ],
+    )
+    def test__str_to_epoch_ns__parses_nanoseconds(self, timestamp, expected):
+        assert TimestampUtilities.str_to_epoch_ns(timestamp) == expected
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (0, "1970-01-01T00:00:00Z"),
+            (1500000000, "1970-01-01T00:00:01.500000Z"),
+            (1577934245123456789, "2020-01-02T03:04:05.123456789Z"),
+            (-1, "1969-12-31T23:59:59.999999999Z"),
+        ],
+    )
+    def test__epoch_ns_to_str__formats_timestamp(self, value, expected):
+        assert TimestampUtilities.epoch_ns_to_str(value) == expected
+
+    def test__epoch_ns__matches_datetime_conversions(self):
+        for value in _random_datetimes(1000):
+            timestamp = TimestampUtilities.datetime_to_str(value)
+            nanoseconds = TimestampUtilities.str_to_epoch_ns(timestamp)
+
+            assert TimestampUtilities.epoch_ns_to_str(nanoseconds) == timestamp
+            assert nanoseconds == round(value.timestamp() * 1e6) * 1000
+
+    @pytest.mark.parametrize(
+        "timestamp",
+        ["2020-01-02T24:04:05.1Z", "2020-02-30T03:04:05.1Z", "2020-01-02T03:04:05.1"],
+    )
+    def test__invalid_timestamp__str_to_epoch_ns_raises(self, timestamp):
+        with pytest.raises(ValueError):
+            TimestampUtilities.str_to_epoch_ns(timestamp)
+
+    def test__out_of_range__epoch_ns_to_str_raises(self):
+        with pytest.raises(ValueError):
+            TimestampUtilities.epoch_ns_to_str(-(10**20))
+
+    def test__vectorized_conversions__match_scalar_conversions(self):
+        values = list(_random_datetimes(100))
+        timestamps = [TimestampUtilities.datetime_to_str(v) for v in values]
+
+        nanoseconds = TimestampUtilities.strs_to_epoch_ns(timestamps)
+
+        assert TimestampUtilities.datetimes_to_strs(values) == timestamps
+        assert TimestampUtilities.strs_to_datetimes(timestamps) == [
+            TimestampUtilities.str_to_datetime(t) for t in timestamps
+        ]
+        assert isinstance(nanoseconds, array.array)
+        assert nanoseconds.typecode == "q"
+        assert list(nanoseconds) == [
+            TimestampUtilities.str_to_epoch_ns(t) for t in timestamps
+        ]
+        assert TimestampUtilities.epoch_ns_to_strs(nanoseconds) == timestamps
+
+    def test__numpy_arrays__vectorized_conversions_accept_them(self):
+        numpy = pytest.importorskip("numpy")
+        timestamps = ["2020-01-02T03:04:05.123456789Z", "2021-01-02T03:04:05Z"]
+
+        values = numpy.frombuffer(
+            TimestampUtilities.strs_to_epoch_ns(timestamps), dtype="datetime64[ns]"
+        )
+
+        assert values.tolist() == [1577934245123456789, 1609556645000000000]
+        assert TimestampUtilities.epoch_ns_to_strs(values.view("int64")) == timestamps
+
+    @pytest.mark.slow
+    def test__conversions__benchmark(self):
+        values = [v.astimezone(_UTC) for v in _random_datetimes(20000) if v.microsecond]
+        timestamps = [_reference_datetime_to_str(v) for v in values]
+
+        def measure(function, items):
+            start = time.perf_counter()
+            for item in items:
+                function(item)
+            return (time.perf_counter() - start) / len(items) * 1e6
+
+        results = {
+            "format (reference)": measure(_reference_datetime_to_str, values),
+            "format": measure(TimestampUtilities.datetime_to_str, values),
+            "parse (reference)": measure(_reference_str_to_datetime, timestamps),
+            "parse": measure(TimestampUtilities.str_to_datetime, timestamps),
+            "parse to epoch ns": measure(
+                TimestampUtilities.str_to_epoch_ns, timestamps
+            ),
+        }
+        nanoseconds = TimestampUtilities.strs_to_epoch_ns(timestamps)
+        results["format from epoch ns"] = measure(
+            TimestampUtilities.epoch_ns_to_str, nanoseconds
+        )
+        for name, microseconds in results.items():
+            print("{}: {:.2f} us".format(name, microseconds))
+
+        assert results["parse"] < results["parse (reference)"]
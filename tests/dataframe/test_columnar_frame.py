@@ -0,0 +1,279 @@
+import math
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+import responses
+from nisystemlink.clients.core import HttpConfiguration
+from nisystemlink.clients.dataframe import DataFrameClient
+from nisystemlink.clients.dataframe.helpers import ColumnarFrame
+from nisystemlink.clients.dataframe.models import (
+    Column,
+    DataFrame,
+    DataType,
+    QueryTableDataRequest,
+)
+from responses import matchers
+
+_BASE_URL = "http://localhost/nidataframe/v1/"
+
+_COLUMNS = [
+    Column(name="index", data_type=DataType.Int32),
+    Column(name="big", data_type=DataType.Int64),
+    Column(name="flag", data_type=DataType.Bool),
+    Column(name="single", data_type=DataType.Float32),
+    Column(name="double", data_type=DataType.Float64),
+    Column(name="time", data_type=DataType.Timestamp),
+    Column(name="name", data_type=DataType.String),
+]
+
+_ROWS = [
+    ["1", "9223372036854775807", "true", "1.5", "0.1", "2022-08-19T16:17:30.123Z", "a"],
+    ["2", "-5", "False", "NaN", "-Infinity", "2022-08-19T16:17:30Z", "b"],
+    ["3", None, None, None, None, None, None],
+    ["4", "7", "TRUE", "Infinity", "1e300", "1970-01-01T00:00:00.000Z", "a"],
+]
+
+
+def _metadata_json(columns):
+    return {
+        "columns": [
+            {"name": c.name, "dataType": c.data_type.value, "columnType": "NULLABLE"}
+            for c in columns
+        ],
+        "createdAt": "2022-08-19T16:17:30.123Z",
+        "id": "t",
+        "metadataModifiedAt": "2022-08-19T16:17:30.123Z",
+        "metadataRevision": 1,
+        "name": "table",
+        "properties": {},
+        "rowCount": 4,
+        "rowsModifiedAt": "2022-08-19T16:17:30.123Z",
+        "supportsAppend": True,
+        "workspace": "ws",
+    }
+
+
+@pytest.fixture
+def client() -> DataFrameClient:
+    """Fixture to create a DataFrameClient."""
+    return DataFrameClient(HttpConfiguration("http://localhost"))
+
+
+class TestColumnarFrame:
+    def test__append__rows_are_converted_by_data_type(self):
+        frame = ColumnarFrame(_COLUMNS)
+        frame.append(DataFrame(columns=[c.name for c in _COLUMNS], data=_ROWS))
+
+        rows = list(frame)
+
+        assert len(frame) == 4
+        assert rows[0] == (
+            1,
+            9223372036854775807,
+            True,
+            1.5,
+            0.1,
+            datetime(2022, 8, 19, 16, 17, 30, 123000, tzinfo=timezone.utc),
+            "a",
+        )
+        assert rows[1][:3] == (2, -5, False)
+        assert math.isnan(rows[1][3])
+        assert rows[1][4] == -math.inf
+        assert rows[1][5] == datetime(2022, 8, 19, 16, 17, 30, tzinfo=timezone.utc)
+        assert rows[2] == (3, None, None, None, None, None, None)
+        assert rows[3][5] == datetime(1970, 1, 1, tzinfo=timezone.utc)
+        assert frame.row(-1) == rows[3]
+
+    def test__string_column__is_dictionary_encoded(self):
+        frame = ColumnarFrame(_COLUMNS)
+        frame.append(DataFrame(columns=None, data=_ROWS))
+
+        assert frame.column("name") == ["a", "b", None, "a"]
+        assert frame.categories("name") == ["a", "b"]
+        assert list(frame.buffer("name"))[:2] == [0, 1]
+        assert frame.buffer("name")[3] == 0
+
+    def test__numeric_columns__are_packed(self):
+        frame = ColumnarFrame(_COLUMNS)
+        frame.append(DataFrame(columns=None, data=_ROWS))
+
+        assert frame.buffer("index").typecode == "i"
+        assert frame.buffer("big").typecode == "q"
+        assert frame.buffer("single").typecode == "f"
+        assert frame.buffer("double").typecode == "d"
+        assert frame.buffer("time").typecode == "q"
+        assert frame.buffer("time")[0] == 1660925850123
+        with pytest.raises(ValueError):
+            frame.categories("index")
+
+    def test__append__columns_in_different_order__values_are_matched_by_name(self):
+        frame = ColumnarFrame(_COLUMNS[:2])
+        frame.append(DataFrame(columns=["big", "index"], data=[["10", "1"]]))
+
+        assert list(frame) == [(1, 10)]
+
+    def test__append__mismatched_columns__raises(self):
+        frame = ColumnarFrame(_COLUMNS[:2])
+
+        with pytest.raises(ValueError):
+            frame.append(DataFrame(columns=["index"], data=[["1"]]))
+
+    def test__append__row_wrong_length__raises_and_frame_unchanged(self):
+        frame = ColumnarFrame(_COLUMNS[:3])
+        frame.append(DataFrame(columns=None, data=[["1", "2", "true"]]))
+
+        with pytest.raises(ValueError):
+            frame.append(DataFrame(columns=None, data=[["3", "4", "false"], ["3"]]))
+
+        assert len(frame) == 1
+        assert list(frame) == [(1, 2, True)]
+
+    def test__append__unparsable_value__raises_and_frame_unchanged(self):
+        frame = ColumnarFrame([_COLUMNS[6], _COLUMNS[0]])
+        frame.append(DataFrame(columns=None, data=[["a", "1"]]))
+
+        with pytest.raises(ValueError):
+            frame.append(DataFrame(columns=None, data=[["b", None], ["c", "x"]]))
+
+        assert len(frame) == 1
+        assert list(frame) == [("a", 1)]
+        assert frame.categories("name") == ["a"]
+        assert frame.null_mask("index") is None
+
+    def test__append__pages_with_new_strings_and_nulls__values_combined(self):
+        frame = ColumnarFrame([_COLUMNS[6], _COLUMNS[0]])
+        frame.append(DataFrame(columns=None, data=[["a", "1"], ["b", "2"]]))
+        frame.append(DataFrame(columns=None, data=[["c", None], [None, "4"]]))
+        frame.append(DataFrame(columns=None, data=[["b", "5"], ["a", "6"]]))
+
+        assert list(frame) == [
+            ("a", 1),
+            ("b", 2),
+            ("c", None),
+            (None, 4),
+            ("b", 5),
+            ("a", 6),
+        ]
+        assert frame.categories("name") == ["a", "b", "c"]
+        assert list(frame.null_mask("index")) == [0, 0, 1, 0, 0, 0]
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("2022-08-19T16:17:30.1Z", 1660925850100),
+            ("2022-08-19T16:17:30.123456Z", 1660925850123),
+            ("2022-08-19T18:17:30.123+02:00", 1660925850123),
+            ("2022-08-19T11:17:30.123-05:00", 1660925850123),
+            ("2022-08-19T16:17:30.123", 1660925850123),
+            ("1969-12-31T23:59:59.999Z", -1),
+        ],
+    )
+    def test__timestamp_formats__are_converted_to_utc_milliseconds(
+        self, value, expected
+    ):
+        frame = ColumnarFrame([Column(name="t", data_type=DataType.Timestamp)])
+        frame.append(DataFrame(data=[[value]]))
+
+        assert frame.buffer("t")[0] == expected
+
+    def test__to_data_frame__round_trips_values(self):
+        frame = ColumnarFrame(_COLUMNS)
+        frame.append(DataFrame(data=_ROWS))
+
+        result = frame.to_data_frame()
+
+        assert result.columns == [c.name for c in _COLUMNS]
+        assert result.data[0] == [
+            "1",
+            "9223372036854775807",
+            "true",
+            "1.5",
+            "0.1",
+            "2022-08-19T16:17:30.123Z",
+            "a",
+        ]
+        assert result.data[1][2:6] == [
+            "false",
+            "NaN",
+            "-Infinity",
+            "2022-08-19T16:17:30.000Z",
+        ]
+        assert result.data[2] == ["3", None, None, None, None, None, None]
+        assert result.data[3][3:5] == ["Infinity", "1e+300"]
+
+    def test__duplicate_column_names__raises(self):
+        with pytest.raises(ValueError):
+            ColumnarFrame([_COLUMNS[0], _COLUMNS[0]])
+
+    def test__from_query__follows_continuation_tokens(self, client):
+        columns = ["name", "index"]
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET, _BASE_URL + "tables/t", json=_metadata_json(_COLUMNS)
+            )
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "tables/t/query-data",
+                json={
+                    "frame": {"columns": columns, "data": [["a", "1"], ["b", "2"]]},
+                    "totalRowCount": 3,
+                    "continuationToken": "page2",
+                },
+                match=[matchers.json_params_matcher({"columns": columns, "take": 2})],
+            )
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "tables/t/query-data",
+                json={
+                    "frame": {"columns": columns, "data": [["a", "3"]]},
+                    "totalRowCount": 3,
+                    "continuationToken": None,
+                },
+                match=[
+                    matchers.json_params_matcher(
+                        {"columns": columns, "take": 2, "continuationToken": "page2"}
+                    )
+                ],
+            )
+
+            frame = ColumnarFrame.from_query(
+                client, "t", QueryTableDataRequest(columns=columns, take=2)
+            )
+
+        assert frame.columns == columns
+        assert frame.data_types == [DataType.String, DataType.Int32]
+        assert list(frame) == [("a", 1), ("b", 2), ("a", 3)]
+        assert frame.categories("name") == ["a", "b"]
+
+    def test__iter_table_data__yields_one_frame_per_page(self, client):
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET, _BASE_URL + "tables/t", json=_metadata_json(_COLUMNS)
+            )
+            rsps.add(
+                responses.GET,
+                _BASE_URL + "tables/t/data",
+                json={
+                    "frame": {"columns": ["index"], "data": [["1"], ["2"]]},
+                    "totalRowCount": 3,
+                    "continuationToken": "page2",
+                },
+                match=[matchers.query_param_matcher({"columns": "index"})],
+            )
+            rsps.add(
+                responses.GET,
+                _BASE_URL + "tables/t/data",
+                json={
+                    "frame": {"columns": ["index"], "data": [["3"]]},
+                    "totalRowCount": 3,
+                },
+                match=[
+                    matchers.query_param_matcher(
+                        {"columns": "index", "continuationToken": "page2"}
+                    )
+                ],
+            )
+
+            pages = list(ColumnarFrame.iter_table_data(client, "t", columns=["index"]))
+
+        assert [frame.column("index") for frame in pages] == [[1, 2], [3]]
@@ -0,0 +1,133 @@
+import time
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+import responses
+from nisystemlink.clients.core import HttpConfiguration
+from nisystemlink.clients.dataframe import DataFrameClient
+from nisystemlink.clients.dataframe.models import (
+    DataFrame,
+    PagedTableRows,
+    QueryDecimatedDataRequest,
+    QueryTableDataRequest,
+    TableRows,
+)
+
+_BASE_URL = "http://localhost/nidataframe/v1/"
+
+
+def _paged_rows_json(row_count: int) -> dict:
+    return {
+        "frame": {
+            "columns": ["index", "value", "time", "name"],
+            "data": [
+                [str(i), str(i * 0.5), "2022-08-19T16:17:30.123Z", None]
+                for i in range(row_count)
+            ],
+        },
+        "totalRowCount": row_count,
+        "continuationToken": "next",
+    }
+
+
+@pytest.fixture
+def client() -> DataFrameClient:
+    """Fixture to create a DataFrameClient that validates table data."""
+    return DataFrameClient(HttpConfiguration("http://localhost"))
+
+
+@pytest.fixture
+def trusted_client() -> DataFrameClient:
+    """Fixture to create a DataFrameClient that trusts table data."""
+    return DataFrameClient(
+        HttpConfiguration("http://localhost"), validate_table_data=False
+    )
+
+
+class TestDataFrameClient:
+    @pytest.mark.parametrize("validate", [True, False])
+    def test__query_table_data__returns_same_model_in_either_mode(self, validate):
+        client = DataFrameClient(
+            HttpConfiguration("http://localhost"), validate_table_data=validate
+        )
+        body = _paged_rows_json(3)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.POST, _BASE_URL + "tables/t/query-data", json=body)
+            response = client.query_table_data("t", QueryTableDataRequest())
+
+        assert isinstance(response, PagedTableRows)
+        assert isinstance(response.frame, DataFrame)
+        assert response.frame.columns == body["frame"]["columns"]
+        assert response.frame.data == body["frame"]["data"]
+        assert response.total_row_count == 3
+        assert response.continuation_token == "next"
+
+    def test__trusted__get_table_data__builds_model_from_response(self, trusted_client):
+        body = _paged_rows_json(2)
+        del body["continuationToken"]
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t/data", json=body)
+            response = trusted_client.get_table_data("t")
+
+        assert response.frame.data == body["frame"]["data"]
+        assert response.continuation_token is None
+        assert response.json(by_alias=True, exclude_unset=True) == (
+            '{"frame": {"columns": ["index", "value", "time", "name"], "data": '
+            '[["0", "0.0", "2022-08-19T16:17:30.123Z", null], '
+            '["1", "0.5", "2022-08-19T16:17:30.123Z", null]]}, "totalRowCount": 2}'
+        )
+
+    def test__trusted__query_decimated_data__builds_model_from_response(
+        self, trusted_client
+    ):
+        body = {"frame": {"columns": ["a"], "data": [["1"], ["2"]]}}
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.POST, _BASE_URL + "tables/t/query-decimated-data", json=body
+            )
+            response = trusted_client.query_decimated_data(
+                "t", QueryDecimatedDataRequest()
+            )
+
+        assert isinstance(response, TableRows)
+        assert response.frame.data == [["1"], ["2"]]
+
+    def test__trusted__metadata_responses_are_still_validated(self, trusted_client):
+        body = {
+            "columns": [{"name": "index", "dataType": "INT32", "columnType": "INDEX"}],
+            "createdAt": "2022-08-19T16:17:30.123Z",
+            "id": "t",
+            "metadataModifiedAt": "2022-08-19T16:17:30.123Z",
+            "metadataRevision": 1,
+            "name": "table",
+            "properties": {},
+            "rowCount": 0,
+            "rowsModifiedAt": "2022-08-19T16:17:30.123Z",
+            "supportsAppend": True,
+            "workspace": "ws",
+        }
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=body)
+            table = trusted_client.get_table_metadata("t")
+
+        assert table.created_at == datetime(
+            2022, 8, 19, 16, 17, 30, 123000, tzinfo=timezone.utc
+        )
+
+    @pytest.mark.slow
+    def test__large_page__trusted_decode_is_faster(self, client, trusted_client):
+        body = _paged_rows_json(100000)
+        timings = {}
+
+        for name, uut in (("validated", client), ("trusted", trusted_client)):
+            with responses.RequestsMock() as rsps:
+                rsps.add(responses.POST, _BASE_URL + "tables/t/query-data", json=body)
+                start = time.perf_counter()
+                uut.query_table_data("t", QueryTableDataRequest())
+                timings[name] = time.perf_counter() - start
+
+        assert timings["trusted"] < timings["validated"]
@@ -0,0 +1,231 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import pytest  # type: ignore
+import responses
+from nisystemlink.clients.core import HttpConfiguration
+from nisystemlink.clients.dataframe import DataFrameClient
+from nisystemlink.clients.dataframe.helpers import (
+    col,
+    ColumnarFrame,
+    CompiledFilter,
+    predicate,
+    query_filtered_data,
+)
+from nisystemlink.clients.dataframe.models import (
+    Column,
+    ColumnFilter,
+    ColumnOrderBy,
+    DataFrame,
+    DataType,
+    FilterOperation,
+)
+from responses import matchers
+
+_BASE_URL = "http://localhost/nidataframe/v1/"
+
+_DATA_TYPES = {
+    "a": DataType.Int32,
+    "b": DataType.Float64,
+    "s": DataType.String,
+    "t": DataType.Timestamp,
+    "ok": DataType.Bool,
+}
+
+_ROWS = [
+    ["1", "0.5", "alpha", "2022-08-19T16:17:30.000Z", "true"],
+    ["2", "3.5", "beta", "2022-08-20T16:17:30.000Z", "false"],
+    ["3", None, None, None, None],
+    ["4", "4", "alphabet", "2022-08-21T16:17:30.000Z", "true"],
+]  # type: List[List[Optional[str]]]
+
+
+def _frame() -> ColumnarFrame:
+    frame = ColumnarFrame(
+        [Column(name=name, data_type=t) for name, t in _DATA_TYPES.items()]
+    )
+    frame.append(DataFrame(data=_ROWS))
+    return frame
+
+
+class TestFilterExpressionCompile:
+    def test__top_level_conjunction__is_pushed_down(self):
+        compiled = (
+            (col("a") > 5)
+            & (col("s") == "x")
+            & (col("t") >= datetime(2022, 8, 19, tzinfo=timezone.utc))
+            & col("b").is_null()
+            & (col("ok") != True)  # noqa: E712
+        ).compile(_DATA_TYPES)
+
+        assert compiled.filters == [
+            ColumnFilter(column="a", operation=FilterOperation.GreaterThan, value="5"),
+            ColumnFilter(column="s", operation=FilterOperation.Equals, value="x"),
+            ColumnFilter(
+                column="t",
+                operation=FilterOperation.GreaterThanEquals,
+                value="2022-08-19T00:00:00.000Z",
+            ),
+            ColumnFilter(column="b", operation=FilterOperation.Equals, value=None),
+            ColumnFilter(
+                column="ok", operation=FilterOperation.NotEquals, value="true"
+            ),
+        ]
+        assert compiled.residual is None
+        assert compiled.residual_columns == []
+
+    def test__unsupported_conditions__are_left_in_residual(self):
+        compiled = (
+            (col("a") > 1)
+            & ((col("a") < 2) | (col("b") > 3))
+            & (col("s") > "m")
+            & (col("a") < 2.5)
+            & (col("a") < col("b"))
+            & ~(col("b") > 1)
+            & ~col("s").contains("x")
+        ).compile(_DATA_TYPES)
+
+        assert compiled.filters == [
+            ColumnFilter(column="a", operation=FilterOperation.GreaterThan, value="1"),
+            ColumnFilter(column="s", operation=FilterOperation.NotContains, value="x"),
+        ]
+        assert compiled.residual is not None
+        assert compiled.residual_columns == ["a", "b", "s"]
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            lambda: col("missing") == 1,
+            lambda: col("a") == "1",
+            lambda: col("ok") == 1,
+            lambda: col("s") == 1,
+            lambda: col("a").contains("1"),
+            lambda: col("t") == 5,
+        ],
+    )
+    def test__invalid_expression__compile_raises(self, expression):
+        with pytest.raises(ValueError):
+            expression().compile(_DATA_TYPES)
+
+    def test__ordering_comparison_with_none__raises(self):
+        with pytest.raises(ValueError):
+            col("a") < None
+
+    def test__boolean_keywords__raise(self):
+        with pytest.raises(TypeError):
+            (col("a") > 1) and (col("a") < 3)
+
+
+class TestFilterExpressionEvaluate:
+    @pytest.mark.parametrize(
+        "expression,expected",
+        [
+            (col("a") > 2, [3, 4]),
+            (col("b") >= 3.5, [2, 4]),
+            (col("b") != 3.5, [1, 3, 4]),
+            (col("b").is_null(), [3]),
+            (col("b").is_not_null(), [1, 2, 4]),
+            (col("s").contains("alpha"), [1, 4]),
+            (col("s").not_contains("alpha"), [2, 3]),
+            (col("s") > "alpha", [2, 4]),
+            (col("s").is_in(["beta", "alphabet"]), [2, 4]),
+            (col("t") > "2022-08-20T00:00:00Z", [2, 4]),
+            (col("t").between(datetime(2022, 8, 20), datetime(2022, 8, 22)), [2, 4]),
+            (col("ok") == True, [1, 4]),  # noqa: E712
+            ((col("a") < 2) | (col("b") > 3.9), [1, 4]),
+            (~(col("a") < 2) & ~col("s").is_null(), [2, 4]),
+            (~(col("b") < 1), [2, 3, 4]),
+            (col("a") < col("b"), [2]),
+            (col("a") == col("b"), [4]),
+            (predicate(lambda a, b: [x % 2 == 0 for x in a], "a", "b"), [2, 4]),
+        ],
+    )
+    def test__evaluate__selects_matching_rows(self, expression, expected):
+        # Evaluate the entire expression locally, including what could be pushed down
+        compiled = CompiledFilter([], expression, _DATA_TYPES)
+
+        result = compiled.apply(_frame())
+
+        assert result.column("a") == expected
+
+    def test__evaluate__returns_byte_mask(self):
+        compiled = ((col("a") > 1) | (col("a") > 10)).compile(_DATA_TYPES)
+
+        assert compiled.evaluate(_frame()) == b"\x00\x01\x01\x01"
+
+    def test__predicate_with_wrong_length__raises(self):
+        compiled = predicate(lambda a: [True], "a").compile(_DATA_TYPES)
+
+        with pytest.raises(ValueError):
+            compiled.evaluate(_frame())
+
+
+class TestQueryFilteredData:
+    def test__query__pushes_filters_and_downloads_only_needed_columns(self):
+        client = DataFrameClient(HttpConfiguration("http://localhost"))
+        metadata = {
+            "columns": [
+                {"name": name, "dataType": t.value, "columnType": "NULLABLE"}
+                for name, t in _DATA_TYPES.items()
+            ],
+            "createdAt": "2022-08-19T16:17:30.123Z",
+            "id": "t",
+            "metadataModifiedAt": "2022-08-19T16:17:30.123Z",
+            "metadataRevision": 1,
+            "name": "table",
+            "properties": {},
+            "rowCount": 4,
+            "rowsModifiedAt": "2022-08-19T16:17:30.123Z",
+            "supportsAppend": True,
+            "workspace": "ws",
+        }
+        expected_body = {
+            "columns": ["s", "b"],
+            "filters": [{"column": "a", "operation": "GREATER_THAN", "value": "1"}],
+            "orderBy": [{"column": "a"}],
+            "take": 2,
+        }
+        pages = [
+            [["beta", "3.5"], [None, None]],
+            [["alphabet", "4"]],
+        ]
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=metadata)
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "tables/t/query-data",
+                json={
+                    "frame": {"columns": ["s", "b"], "data": pages[0]},
+                    "totalRowCount": 3,
+                    "continuationToken": "page2",
+                },
+                match=[matchers.json_params_matcher(expected_body)],
+            )
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "tables/t/query-data",
+                json={
+                    "frame": {"columns": ["s", "b"], "data": pages[1]},
+                    "totalRowCount": 3,
+                },
+                match=[
+                    matchers.json_params_matcher(
+                        dict(expected_body, continuationToken="page2")
+                    )
+                ],
+            )
+
+            result = list(
+                query_filtered_data(
+                    client,
+                    "t",
+                    (col("a") > 1) & ((col("b") > 3.9) | col("b").is_null()),
+                    columns=["s"],
+                    order_by=[ColumnOrderBy(column="a")],
+                    page_size=2,
+                )
+            )
+
+        assert [page.columns for page in result] == [["s"], ["s"]]
+        assert [list(page) for page in result] == [[(None,)], [("alphabet",)]]
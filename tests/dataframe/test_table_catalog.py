@@ -0,0 +1,212 @@
+import json
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+import responses
+from nisystemlink.clients.core import ApiException, HttpConfiguration
+from nisystemlink.clients.dataframe import DataFrameClient
+from nisystemlink.clients.dataframe.helpers import (
+    iter_query_tables,
+    iter_query_tables_partitioned,
+    iter_tables,
+    partition_by_created_at,
+    partition_by_workspace,
+)
+from nisystemlink.clients.dataframe.models import QueryTablesRequest
+from responses import matchers
+
+_BASE_URL = "http://localhost/nidataframe/v1/"
+
+
+def _table_json(id: str, workspace: str = "ws") -> dict:
+    return {
+        "columns": [],
+        "createdAt": "2022-08-19T16:17:30.123Z",
+        "id": id,
+        "metadataModifiedAt": "2022-08-19T16:17:30.123Z",
+        "metadataRevision": 1,
+        "name": "table",
+        "properties": {},
+        "rowCount": 0,
+        "rowsModifiedAt": "2022-08-19T16:17:30.123Z",
+        "supportsAppend": True,
+        "workspace": workspace,
+    }
+
+
+def _add_list_pages(rsps, pages):
+    for index, ids in enumerate(pages):
+        params = {"take": "2"}
+        if index > 0:
+            params["continuationToken"] = str(index)
+        rsps.add(
+            responses.GET,
+            _BASE_URL + "tables",
+            json={
+                "tables": [_table_json(id) for id in ids],
+                "continuationToken": (
+                    str(index + 1) if index + 1 < len(pages) else None
+                ),
+            },
+            match=[matchers.query_param_matcher(params)],
+        )
+
+
+@pytest.fixture
+def client() -> DataFrameClient:
+    """Fixture to create a DataFrameClient."""
+    return DataFrameClient(HttpConfiguration("http://localhost"))
+
+
+class TestTableCatalog:
+    @pytest.mark.parametrize("read_ahead", [0, 1, 3])
+    def test__iter_tables__follows_continuation_tokens(self, client, read_ahead):
+        with responses.RequestsMock() as rsps:
+            _add_list_pages(rsps, [["a", "b"], ["c", "d"], ["e"]])
+            tables = list(iter_tables(client, take=2, read_ahead=read_ahead))
+
+        assert [t.id for t in tables] == ["a", "b", "c", "d", "e"]
+
+    def test__iter_tables__is_lazy(self, client):
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            iterator = iter_tables(client, take=2, read_ahead=0)
+
+            assert len(rsps.calls) == 0
+            _add_list_pages(rsps, [["a", "b"], ["c"]])
+            assert next(iterator).id == "a"
+            assert len(rsps.calls) == 1
+            iterator.close()
+
+    def test__iter_tables__stops_early__does_not_raise(self, client):
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            _add_list_pages(rsps, [["a", "b"], ["c", "d"], ["e"]])
+            iterator = iter_tables(client, take=2, read_ahead=1)
+            assert next(iterator).id == "a"
+            iterator.close()
+
+    def test__iter_query_tables__follows_continuation_tokens(self, client):
+        query = QueryTablesRequest(filter="name == @0", substitutions=["x"], take=1)
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "query-tables",
+                json={"tables": [_table_json("a")], "continuationToken": "next"},
+                match=[
+                    matchers.json_params_matcher(
+                        {"filter": "name == @0", "substitutions": ["x"], "take": 1}
+                    )
+                ],
+            )
+            rsps.add(
+                responses.POST,
+                _BASE_URL + "query-tables",
+                json={"tables": [_table_json("b")], "continuationToken": None},
+                match=[
+                    matchers.json_params_matcher(
+                        {
+                            "filter": "name == @0",
+                            "substitutions": ["x"],
+                            "take": 1,
+                            "continuationToken": "next",
+                        }
+                    )
+                ],
+            )
+            tables = list(iter_query_tables(client, query))
+
+        assert [t.id for t in tables] == ["a", "b"]
+
+    def test__page_fails__error_is_raised_from_iterator(self, client):
+        with responses.RequestsMock() as rsps:
+            _add_list_pages(rsps, [["a", "b"]])
+            rsps.replace(responses.GET, _BASE_URL + "tables", status=500)
+            with pytest.raises(ApiException):
+                list(iter_tables(client, take=2))
+
+
+class TestPartitions:
+    def test__partition_by_created_at__splits_into_disjoint_ranges(self):
+        query = QueryTablesRequest(filter="name == @0", substitutions=["x"], take=5)
+
+        partitions = partition_by_created_at(
+            query,
+            [
+                datetime(2022, 1, 1),
+                datetime(2023, 1, 1, tzinfo=timezone.utc),
+            ],
+        )
+
+        assert [(p.filter, p.substitutions) for p in partitions] == [
+            ("(name == @0) and createdAt < @1", ["x", "2022-01-01T00:00:00+00:00"]),
+            (
+                "(name == @0) and createdAt >= @1 and createdAt < @2",
+                ["x", "2022-01-01T00:00:00+00:00", "2023-01-01T00:00:00+00:00"],
+            ),
+            ("(name == @0) and createdAt >= @1", ["x", "2023-01-01T00:00:00+00:00"]),
+        ]
+        assert all(p.take == 5 for p in partitions)
+
+    def test__partition_by_created_at__unordered_boundaries__raises(self):
+        with pytest.raises(ValueError):
+            partition_by_created_at(
+                QueryTablesRequest(filter=""),
+                [datetime(2023, 1, 1), datetime(2022, 1, 1)],
+            )
+
+    def test__partition_by_workspace__adds_workspace_condition(self):
+        partitions = partition_by_workspace(
+            QueryTablesRequest(filter="", continuation_token="x"), ["w1", "w2"]
+        )
+
+        assert [(p.filter, p.substitutions) for p in partitions] == [
+            ("workspace == @0", ["w1"]),
+            ("workspace == @0", ["w2"]),
+        ]
+        assert all(p.continuation_token is None for p in partitions)
+
+    @pytest.mark.parametrize("max_concurrency", [1, 2, 8])
+    def test__iter_query_tables_partitioned__merges_all_partitions(
+        self, client, max_concurrency
+    ):
+        workspaces = ["w{}".format(i) for i in range(5)]
+
+        def query_tables(request):
+            body = json.loads(request.body)
+            workspace = body["substitutions"][0]
+            page = int(body.get("continuationToken") or 0)
+            return (
+                200,
+                {},
+                json.dumps(
+                    {
+                        "tables": [
+                            _table_json("{}-{}".format(workspace, page), workspace)
+                        ],
+                        "continuationToken": str(page + 1) if page < 2 else None,
+                    }
+                ),
+            )
+
+        with responses.RequestsMock() as rsps:
+            rsps.add_callback(
+                responses.POST, _BASE_URL + "query-tables", callback=query_tables
+            )
+            tables = list(
+                iter_query_tables_partitioned(
+                    client,
+                    partition_by_workspace(QueryTablesRequest(filter=""), workspaces),
+                    max_concurrency=max_concurrency,
+                )
+            )
+
+        assert sorted(t.id for t in tables) == sorted(
+            "{}-{}".format(w, p) for w in workspaces for p in range(3)
+        )
+        for workspace in workspaces:
+            assert [t.id for t in tables if t.workspace == workspace] == [
+                "{}-{}".format(workspace, p) for p in range(3)
+            ]
+
+    def test__iter_query_tables_partitioned__invalid_concurrency__raises(self, client):
+        with pytest.raises(ValueError):
+            iter_query_tables_partitioned(client, [], max_concurrency=0)
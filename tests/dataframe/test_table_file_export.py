@@ -0,0 +1,191 @@
+import os
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+import responses
+from nisystemlink.clients.core import ApiException, HttpConfiguration
+from nisystemlink.clients.dataframe import DataFrameClient
+from nisystemlink.clients.dataframe.helpers import (
+    export_table_to_file,
+    TableFileFormat,
+)
+from nisystemlink.clients.dataframe.models import QueryTableDataRequest
+from responses import matchers
+
+pyarrow = pytest.importorskip("pyarrow")
+ipc = pytest.importorskip("pyarrow.ipc")
+parquet = pytest.importorskip("pyarrow.parquet")
+
+_BASE_URL = "http://localhost/nidataframe/v1/"
+
+_COLUMNS = ["index", "flag", "value", "time", "name"]
+
+_METADATA = {
+    "columns": [
+        {"name": "index", "dataType": "INT32", "columnType": "INDEX"},
+        {"name": "flag", "dataType": "BOOL", "columnType": "NULLABLE"},
+        {"name": "value", "dataType": "FLOAT64", "columnType": "NULLABLE"},
+        {"name": "time", "dataType": "TIMESTAMP", "columnType": "NULLABLE"},
+        {"name": "name", "dataType": "STRING", "columnType": "NULLABLE"},
+    ],
+    "createdAt": "2022-08-19T16:17:30.123Z",
+    "id": "t",
+    "metadataModifiedAt": "2022-08-19T16:17:30.123Z",
+    "metadataRevision": 1,
+    "name": "table",
+    "properties": {},
+    "rowCount": 3,
+    "rowsModifiedAt": "2022-08-19T16:17:30.123Z",
+    "supportsAppend": True,
+    "workspace": "ws",
+}
+
+_PAGES = [
+    [
+        ["1", "true", "0.5", "2022-08-19T16:17:30.123Z", "a"],
+        ["2", None, None, None, None],
+    ],
+    [["3", "FALSE", "-1.25", "1970-01-01T00:00:00Z", "a"]],
+]
+
+_EXPECTED = {
+    "index": [1, 2, 3],
+    "flag": [True, None, False],
+    "value": [0.5, None, -1.25],
+    "time": [
+        datetime(2022, 8, 19, 16, 17, 30, 123000, tzinfo=timezone.utc),
+        None,
+        datetime(1970, 1, 1, tzinfo=timezone.utc),
+    ],
+    "name": ["a", None, "a"],
+}
+
+
+def _add_page(rsps, index, status=200):
+    body = {"take": 2}
+    if index > 0:
+        body["continuationToken"] = "page{}".format(index)
+    rsps.add(
+        responses.POST,
+        _BASE_URL + "tables/t/query-data",
+        status=status,
+        json={
+            "frame": {"columns": _COLUMNS, "data": _PAGES[index]},
+            "totalRowCount": 3,
+            "continuationToken": (
+                "page{}".format(index + 1) if index + 1 < len(_PAGES) else None
+            ),
+        },
+        match=[matchers.json_params_matcher(body)],
+    )
+
+
+def _read(path, file_format):
+    if file_format == TableFileFormat.PARQUET:
+        file = parquet.ParquetFile(path)
+        return file.read(), file.num_row_groups
+    reader = ipc.open_file(path)
+    return reader.read_all(), reader.num_record_batches
+
+
+@pytest.fixture
+def client() -> DataFrameClient:
+    """Fixture to create a DataFrameClient."""
+    return DataFrameClient(HttpConfiguration("http://localhost"))
+
+
+class TestExportTableToFile:
+    @pytest.mark.parametrize("file_format", list(TableFileFormat))
+    def test__export__writes_one_row_group_per_page(
+        self, client, tmp_path, file_format
+    ):
+        path = str(tmp_path / "table.out")
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1)
+            rows = export_table_to_file(
+                client, "t", path, file_format, QueryTableDataRequest(take=2)
+            )
+
+        table, row_groups = _read(path, file_format)
+        assert rows == 3
+        assert row_groups == 2
+        assert table.schema.types == [
+            pyarrow.int32(),
+            pyarrow.bool_(),
+            pyarrow.float64(),
+            pyarrow.timestamp("ms", tz="UTC"),
+            pyarrow.string(),
+        ]
+        assert table.to_pydict() == _EXPECTED
+        assert sorted(os.listdir(str(tmp_path))) == ["table.out"]
+
+    @pytest.mark.parametrize("file_format", list(TableFileFormat))
+    def test__export_interrupted__resumes_from_continuation_token(
+        self, client, tmp_path, file_format
+    ):
+        path = str(tmp_path / "table.out")
+        query = QueryTableDataRequest(take=2)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1, status=500)
+            with pytest.raises(ApiException):
+                export_table_to_file(client, "t", path, file_format, query)
+
+        assert not os.path.exists(path)
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 1)
+            rows = export_table_to_file(client, "t", path, file_format, query)
+
+        table, row_groups = _read(path, file_format)
+        assert rows == 3
+        assert row_groups == 2
+        assert table.to_pydict() == _EXPECTED
+        assert sorted(os.listdir(str(tmp_path))) == ["table.out"]
+
+    def test__resume_disabled__starts_over(self, client, tmp_path):
+        path = str(tmp_path / "table.out")
+        query = QueryTableDataRequest(take=2)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1, status=500)
+            with pytest.raises(ApiException):
+                export_table_to_file(client, "t", path, query=query)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1)
+            rows = export_table_to_file(client, "t", path, query=query, resume=False)
+
+        assert rows == 3
+        assert _read(path, TableFileFormat.PARQUET)[0].to_pydict() == _EXPECTED
+
+    def test__unreadable_partial_file__starts_over(self, client, tmp_path):
+        path = str(tmp_path / "table.out")
+        query = QueryTableDataRequest(take=2)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1, status=500)
+            with pytest.raises(ApiException):
+                export_table_to_file(client, "t", path, query=query)
+        with open(path + ".part", "wb") as file:
+            file.write(b"truncated")
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(responses.GET, _BASE_URL + "tables/t", json=_METADATA)
+            _add_page(rsps, 0)
+            _add_page(rsps, 1)
+            rows = export_table_to_file(client, "t", path, query=query)
+
+        assert rows == 3
+        assert _read(path, TableFileFormat.PARQUET)[0].to_pydict() == _EXPECTED
@@ -0,0 +1,77 @@
+import datetime
+
+import pytest
+from nisystemlink.clients.tag._core._adaptive_flush_controller import (
+    AdaptiveFlushController,
+)
+
+
+def _run(uut, rate, writes_per_flush, send_time, bytes_per_write=100, flushes=20):
+    """Feed the controller flushes of ``writes_per_flush`` writes arriving at
+    ``rate`` writes per second, each sent in ``send_time(num_bytes)`` seconds.
+    """
+    now = 0.0
+    for _ in range(flushes):
+        now += writes_per_flush / rate
+        uut.record_flush(writes_per_flush, now)
+        num_bytes = writes_per_flush * bytes_per_write
+        uut.record_send(writes_per_flush, num_bytes, send_time(num_bytes))
+
+
+class TestAdaptiveFlushController:
+    def test__nothing_recorded__uses_largest_settings(self):
+        uut = AdaptiveFlushController(1000, datetime.timedelta(seconds=2))
+
+        assert uut.buffer_size == 1000
+        assert uut.flush_interval == datetime.timedelta(seconds=2)
+        assert uut.write_rate is None
+
+    def test__fast_server__buffer_fills_within_latency_bound(self):
+        uut = AdaptiveFlushController(10000, datetime.timedelta(milliseconds=500))
+
+        _run(uut, 1000, 100, lambda _: 0.01)
+
+        assert uut.write_rate == pytest.approx(1000)
+        assert uut.buffer_size == pytest.approx(490, abs=1)
+        assert uut.flush_interval.total_seconds() == pytest.approx(0.49)
+
+    def test__send_time_grows_with_payload__buffer_leaves_time_to_send(self):
+        uut = AdaptiveFlushController(10000, datetime.timedelta(seconds=1))
+
+        # 10 ms per request, plus 10 microseconds per byte: 1 ms per 100 byte write
+        now = 0.0
+        uut.record_flush(0, now)
+        for writes in [50, 100] * 10:
+            now += writes / 100
+            uut.record_flush(writes, now)
+            uut.record_send(writes, writes * 100, 0.01 + writes * 100 * 1e-5)
+
+        # 100 writes/s * (1 s - 10 ms) / (1 + 100 writes/s * 1 ms)
+        assert uut.buffer_size == pytest.approx(90, abs=1)
+        assert uut.flush_interval.total_seconds() == pytest.approx(0.9, abs=0.01)
+
+    def test__slow_requests__buffer_large_enough_to_keep_up(self):
+        uut = AdaptiveFlushController(None, datetime.timedelta(milliseconds=60))
+
+        _run(uut, 10000, 500, lambda _: 0.05)
+
+        # 10 ms of latency budget only fits 100 writes, but each request takes 50 ms
+        assert uut.buffer_size == pytest.approx(500, abs=1)
+
+    def test__sends_slower_than_latency_bound__falls_back_to_largest_settings(self):
+        uut = AdaptiveFlushController(1000, datetime.timedelta(milliseconds=100))
+
+        _run(uut, 1000, 100, lambda _: 0.01)
+        assert uut.buffer_size < 1000
+        _run(uut, 1000, 100, lambda _: 1.0)
+
+        assert uut.buffer_size == 1000
+        assert uut.flush_interval == datetime.timedelta(milliseconds=100)
+
+    def test__invalid_arguments__raises(self):
+        with pytest.raises(ValueError):
+            AdaptiveFlushController(0, datetime.timedelta(seconds=1))
+        with pytest.raises(ValueError):
+            AdaptiveFlushController(1, datetime.timedelta(0))
+        with pytest.raises(ValueError):
+            AdaptiveFlushController(1, datetime.timedelta(seconds=1), smoothing=0)
@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+from nisystemlink.clients.tag._core._background_sender import BackgroundSender
+
+
+class RecordingSend:
+    """A send function that records batches, blocking each until it's released."""
+
+    def __init__(self):
+        self.started = []
+        self.finished = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._started = threading.Condition(self._lock)
+        self._releases = {}
+
+    def __call__(self, updates):
+        with self._lock:
+            release = self._releases.setdefault(updates, threading.Event())
+            self.started.append(updates)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self._started.notify_all()
+        release.wait(5)
+        with self._lock:
+            self.in_flight -= 1
+            self.finished.append(updates)
+        if isinstance(updates, Exception):
+            raise updates
+
+    def release(self, updates):
+        with self._lock:
+            self._releases.setdefault(updates, threading.Event()).set()
+
+    def wait_started(self, count):
+        with self._lock:
+            assert self._started.wait_for(lambda: len(self.started) >= count, 5)
+
+
+class TestBackgroundSender:
+    def test__batches_with_different_paths__sent_concurrently(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test", max_concurrency=2)
+
+        first = uut.submit("a", ["tag1"])
+        second = uut.submit("b", ["tag2"])
+        send.wait_started(2)
+        send.release("b")
+        second.result(5)
+
+        assert not first.done()
+        send.release("a")
+        first.result(5)
+        uut.close()
+        assert send.finished == ["b", "a"]
+
+    def test__batches_with_same_path__sent_in_order(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test", max_concurrency=4)
+
+        uut.submit("a", ["tag1", "tag2"])
+        uut.submit("b", ["tag3"])
+        uut.submit("c", ["tag2"])
+        send.wait_started(2)
+        assert sorted(send.started) == ["a", "b"]
+
+        send.release("c")
+        send.release("b")
+        send.release("a")
+        uut.flush().result(5)
+        uut.close()
+
+        assert send.finished.index("a") < send.finished.index("c")
+        assert send.started.index("a") < send.started.index("c")
+
+    def test__later_batch_with_path_of_pending_batch__held_back(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test", max_concurrency=3)
+
+        uut.submit("a", ["tag1"])
+        uut.submit("b", ["tag1", "tag2"])
+        # Doesn't conflict with the batch in flight, but must follow "b"
+        uut.submit("c", ["tag2"])
+        uut.submit("d", ["tag3"])
+        send.wait_started(2)
+
+        assert send.started == ["a", "d"]
+        for batch in "abcd":
+            send.release(batch)
+        uut.flush().result(5)
+        uut.close()
+        assert send.started == ["a", "d", "b", "c"]
+
+    def test__batch_with_unknown_paths__sent_alone(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test", max_concurrency=3)
+
+        for batch in "abc":
+            send.release(batch)
+        uut.submit("a", ["tag1"])
+        uut.submit("b")
+        uut.submit("c", ["tag2"])
+        uut.flush().result(5)
+        uut.close()
+
+        assert send.started == ["a", "b", "c"]
+        assert send.max_in_flight == 1
+
+    def test__many_batches__max_concurrency_not_exceeded(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test", max_concurrency=3)
+
+        for i in range(20):
+            send.release(i)
+            uut.submit(i, ["tag{}".format(i)])
+        uut.flush().result(5)
+        uut.close()
+
+        assert sorted(send.finished) == list(range(20))
+        assert send.max_in_flight <= 3
+
+    def test__send_raises__future_contains_error(self):
+        send = RecordingSend()
+        uut = BackgroundSender(send, "test")
+        error = RuntimeError("failed")
+        send.release(error)
+
+        future = uut.submit(error, ["tag"])
+
+        assert future.exception(5) is error
+        uut.close()
+
+    def test__nothing_submitted__flush_done(self):
+        uut = BackgroundSender(RecordingSend(), "test")
+
+        assert uut.flush().done()
+        uut.close()
+
+    def test__invalid_max_concurrency__raises(self):
+        with pytest.raises(ValueError):
+            BackgroundSender(RecordingSend(), "test", max_concurrency=0)
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._deadband_filter import DeadbandFilter
+
+
+def _accepted(uut, data_type, values, path="tag", interval=1.0):
+    """Return the values that pass the filter, written ``interval`` seconds apart."""
+    return [
+        value
+        for i, value in enumerate(values)
+        if uut.accept(path, data_type, value, i * interval)
+    ]
+
+
+class TestDeadbandFilter:
+    def test__no_deadband__only_unchanged_values_suppressed(self):
+        uut = DeadbandFilter()
+
+        accepted = _accepted(
+            uut, tbase.DataType.DOUBLE, ["1.0", "1.0", "1.01", "1.01", "1.0"]
+        )
+
+        assert accepted == ["1.0", "1.01", "1.0"]
+
+    def test__string_values__unchanged_values_suppressed(self):
+        uut = DeadbandFilter(absolute=5)
+
+        accepted = _accepted(uut, tbase.DataType.STRING, ["a", "a", "b", "3", "4"])
+
+        assert accepted == ["a", "b", "3", "4"]
+
+    def test__absolute_deadband__small_changes_suppressed_until_drift_leaves_band(
+        self,
+    ):
+        uut = DeadbandFilter(absolute=0.5)
+
+        accepted = _accepted(
+            uut, tbase.DataType.DOUBLE, ["10.0", "10.2", "10.4", "10.5", "10.6", "9.9"]
+        )
+
+        assert accepted == ["10.0", "10.6", "9.9"]
+
+    def test__percent_deadband__changes_relative_to_last_value_suppressed(self):
+        uut = DeadbandFilter(percent=10)
+
+        accepted = _accepted(
+            uut, tbase.DataType.INT32, ["100", "109", "110", "111", "123", "0", "1"]
+        )
+
+        assert accepted == ["100", "111", "123", "0", "1"]
+
+    def test__uint64_values__compared_exactly(self):
+        uut = DeadbandFilter(absolute=0)
+        big = 2**64 - 1
+
+        accepted = _accepted(uut, tbase.DataType.UINT64, [str(big), str(big - 1)])
+
+        assert accepted == [str(big), str(big - 1)]
+
+    def test__tags_filtered_separately(self):
+        uut = DeadbandFilter(absolute=1)
+
+        assert uut.accept("a", tbase.DataType.DOUBLE, "1.0", 0)
+        assert uut.accept("b", tbase.DataType.DOUBLE, "1.5", 0)
+        assert not uut.accept("a", tbase.DataType.DOUBLE, "1.5", 0)
+
+    def test__data_type_changed__write_accepted(self):
+        uut = DeadbandFilter()
+
+        assert uut.accept("tag", tbase.DataType.INT32, "1", 0)
+        assert uut.accept("tag", tbase.DataType.DOUBLE, "1", 0)
+        assert not uut.accept("tag", tbase.DataType.DOUBLE, "1", 0)
+
+    def test__max_silence_passed__next_write_accepted(self):
+        uut = DeadbandFilter(absolute=1, max_silence=datetime.timedelta(seconds=2.5))
+
+        accepted = _accepted(uut, tbase.DataType.DOUBLE, ["1.0"] * 7)
+
+        # Written at 0, 1, 2, ... seconds, so every third write is sent
+        assert len(accepted) == 3
+
+    def test__reset__next_write_to_every_tag_accepted(self):
+        uut = DeadbandFilter()
+        uut.accept("tag", tbase.DataType.INT32, "1", 0)
+
+        uut.reset()
+
+        assert uut.accept("tag", tbase.DataType.INT32, "1", 0)
+
+    def test__invalid_arguments__raises(self):
+        with pytest.raises(ValueError):
+            DeadbandFilter(absolute=-1)
+        with pytest.raises(ValueError):
+            DeadbandFilter(percent=-1)
+        with pytest.raises(ValueError):
+            DeadbandFilter(absolute=1, percent=1)
+        with pytest.raises(ValueError):
+            DeadbandFilter(max_silence=datetime.timedelta(0))
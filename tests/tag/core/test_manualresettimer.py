@@ -1,6 +1,7 @@
 import datetime
 import time
 
+import pytest
 from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
 
 
@@ -23,3 +24,24 @@ class TestManualResetTimer:
             time.sleep(0.280)
 
             assert 2 <= len(data) <= 3
+
+    def test__interval_changed__next_start_uses_new_interval(self):
+        data = []
+        with ManualResetTimer(datetime.timedelta(seconds=10)) as uut:
+            uut.elapsed += lambda: data.append(None)
+
+            uut.interval = datetime.timedelta(milliseconds=20)
+            uut.start()
+            time.sleep(0.2)
+
+            assert uut.interval == datetime.timedelta(milliseconds=20)
+            assert len(data) == 1
+
+    def test__invalid_interval__raises(self):
+        with ManualResetTimer(datetime.timedelta(seconds=1)) as uut:
+            with pytest.raises(ValueError):
+                uut.interval = datetime.timedelta(0)
+
+        assert ManualResetTimer.null_timer.interval is None
+        with pytest.raises(RuntimeError):
+            ManualResetTimer.null_timer.interval = datetime.timedelta(seconds=1)
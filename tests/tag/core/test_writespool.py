@@ -0,0 +1,197 @@
+import datetime
+import os
+import threading
+
+import pytest
+from nisystemlink.clients import core
+from nisystemlink.clients.tag._core._write_spool import WriteSpool
+
+_FAST_RETRY = datetime.timedelta(milliseconds=10)
+
+
+class RecordingSend:
+    """A send function that records batches, failing with queued errors first."""
+
+    def __init__(self):
+        self.sent = []
+        self.attempts = 0
+        self.errors = []
+        self.rejected = []
+        self._lock = threading.Condition()
+
+    def __call__(self, data):
+        with self._lock:
+            self.attempts += 1
+            self._lock.notify_all()
+            if self.errors:
+                raise self.errors.pop(0)
+            self.sent.append(data)
+            self._lock.notify_all()
+
+    def on_error(self, error):
+        self.rejected.append(error)
+
+    def wait_for(self, predicate):
+        with self._lock:
+            assert self._lock.wait_for(predicate, 5)
+
+
+def _segments(directory):
+    return sorted(n for n in os.listdir(directory) if n.endswith(".seg"))
+
+
+class TestWriteSpool:
+    def test__batches_appended__sent_in_order_and_removed(self, tmp_path):
+        send = RecordingSend()
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+
+        uut.start(send, send.on_error)
+        for i in range(5):
+            sequence = uut.append(str(i).encode())
+        uut.wait_sent(sequence)
+        uut.close()
+
+        assert send.sent == [b"0", b"1", b"2", b"3", b"4"]
+        assert _segments(str(tmp_path)) == []
+        assert uut.num_batches == 0
+        assert uut.num_bytes == 0
+
+    def test__send_fails__batch_retried_and_later_batches_wait(self, tmp_path):
+        send = RecordingSend()
+        send.errors = [core.ApiException("down", http_status_code=503), OSError()]
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+
+        uut.append(b"a")
+        uut.append(b"b")
+        uut.start(send, send.on_error)
+        send.wait_for(lambda: len(send.sent) == 2)
+        uut.close()
+
+        assert send.sent == [b"a", b"b"]
+        assert send.attempts == 4
+        assert send.rejected == []
+
+    def test__server_rejects_batch__batch_discarded_and_error_reported(self, tmp_path):
+        send = RecordingSend()
+        error = core.ApiException("bad request", http_status_code=400)
+        send.errors = [error]
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+
+        uut.start(send, send.on_error)
+        uut.append(b"a")
+        sequence = uut.append(b"b")
+        uut.wait_sent(sequence)
+        uut.close()
+
+        assert send.sent == [b"b"]
+        assert send.rejected == [error]
+
+    def test__segment_corrupt__set_aside_and_later_batches_sent(self, tmp_path):
+        send = RecordingSend()
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+
+        def decode(data):
+            if data == b"bad":
+                raise ValueError("corrupt")
+            return data.decode()
+
+        uut.append(b"a")
+        uut.append(b"bad")
+        sequence = uut.append(b"c")
+        uut.start(send, send.on_error, decode)
+        uut.wait_sent(sequence)
+        uut.close()
+
+        assert send.sent == ["a", "c"]
+        assert send.attempts == 2
+        assert len(send.rejected) == 1
+        assert isinstance(send.rejected[0].__cause__, ValueError)
+        assert uut.num_dropped == 1
+        assert uut.num_batches == 0
+        assert uut.num_bytes == 0
+        assert os.listdir(str(tmp_path)) == ["00000000000000000001.seg.corrupt"]
+
+    def test__send_fails__wait_sent_raises_and_batch_kept(self, tmp_path):
+        send = RecordingSend()
+        error = core.ApiException("down", http_status_code=503)
+        send.errors = [error] * 100
+        uut = WriteSpool(
+            str(tmp_path),
+            1000,
+            retry_interval=datetime.timedelta(minutes=1),
+            max_retry_interval=datetime.timedelta(minutes=1),
+        )
+
+        uut.start(send, send.on_error)
+        sequence = uut.append(b"a")
+        with pytest.raises(core.ApiException) as excinfo:
+            uut.wait_sent(sequence)
+        # Waiting again retries immediately, instead of after the retry interval
+        with pytest.raises(core.ApiException):
+            uut.wait_sent(sequence)
+        uut.close()
+
+        assert excinfo.value is error
+        assert send.attempts >= 2
+        assert _segments(str(tmp_path)) == ["00000000000000000000.seg"]
+
+    def test__max_bytes_exceeded__oldest_batches_dropped(self, tmp_path):
+        uut = WriteSpool(str(tmp_path), 10, retry_interval=_FAST_RETRY)
+
+        uut.append(b"aaaa")
+        uut.append(b"bbbb")
+        uut.append(b"cccc")
+        uut.append(b"d" * 11)
+
+        assert uut.num_batches == 2
+        assert uut.num_bytes == 8
+        assert uut.num_dropped == 2
+        send = RecordingSend()
+        uut.start(send, send.on_error)
+        uut.wait_sent(uut.last_sequence)
+        uut.close()
+        assert send.sent == [b"bbbb", b"cccc"]
+
+    def test__directory_has_segments__recovered_and_sent_first(self, tmp_path):
+        first = WriteSpool(str(tmp_path), 1000)
+        first.append(b"a")
+        first.append(b"b")
+        # Simulate a crash while writing the next segment
+        with open(os.path.join(str(tmp_path), "00000000000000000002.seg.tmp"), "wb"):
+            pass
+
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+        send = RecordingSend()
+        sequence = uut.append(b"c")
+        uut.start(send, send.on_error)
+        uut.wait_sent(sequence)
+        uut.close()
+
+        assert sequence == 2
+        assert send.sent == [b"a", b"b", b"c"]
+        assert os.listdir(str(tmp_path)) == []
+
+    def test__closed__unsent_batches_kept(self, tmp_path):
+        send = RecordingSend()
+        send.errors = [OSError()] * 100
+        uut = WriteSpool(str(tmp_path), 1000, retry_interval=_FAST_RETRY)
+
+        uut.start(send, send.on_error)
+        uut.append(b"a")
+        send.wait_for(lambda: send.attempts > 0)
+        uut.close()
+
+        assert _segments(str(tmp_path)) == ["00000000000000000000.seg"]
+
+    def test__invalid_arguments__raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            WriteSpool(str(tmp_path), 0)
+        with pytest.raises(ValueError):
+            WriteSpool(str(tmp_path), 1, retry_interval=datetime.timedelta(0))
+        with pytest.raises(ValueError):
+            WriteSpool(
+                str(tmp_path),
+                1,
+                retry_interval=datetime.timedelta(seconds=2),
+                max_retry_interval=datetime.timedelta(seconds=1),
+            )
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._system_time_stamper import SystemTimeStamper
+from nisystemlink.clients.tag._http._http_async_buffered_tag_writer import (
+    HttpAsyncBufferedTagWriter,
+)
+
+from .httpclienttestbase import HttpClientTestBase
+
+
+class TestHttpAsyncBufferedTagWriter(HttpClientTestBase):
+    def setup_method(self, method):
+        super().setup_method(method)
+
+        self._uut = HttpAsyncBufferedTagWriter(
+            self._client, SystemTimeStamper(), 10, None
+        )
+
+    @pytest.mark.asyncio
+    async def test__write_buffered__send_buffered_writes_async__sends_write(self):
+        path = "tag"
+        value = 2
+        timestamp = datetime.now()
+
+        await self._uut.write_async(
+            path, tbase.DataType.INT32, value, timestamp=timestamp
+        )
+        await self._uut.send_buffered_writes_async()
+
+        assert self._client.all_requests.call_count == 1
+        call = self._client.all_requests.call_args_list[0]
+        assert ("POST", "/nitag/v2/update-current-values") == call[0]
+        data = call[1].get("data")
+        assert isinstance(data, list)
+        assert len(data) == 1
+        assert data[0].get("path") == path
+        utctime = datetime.utcfromtimestamp(timestamp.timestamp()).isoformat() + "Z"
+        assert data[0].get("updates") == [
+            {"value": {"type": "INT", "value": str(value)}, "timestamp": utctime}
+        ]
+
+    @pytest.mark.asyncio
+    async def test__multiple_writes_buffered_for_same_tag__send_buffered_writes_async__writes_combined_into_one_batch(
+        self,
+    ):
+        timestamp1 = datetime.now()
+        timestamp2 = timestamp1 + timedelta(seconds=1)
+        timestamp3 = timestamp1 + timedelta(seconds=2)
+
+        self._uut.write("tag1", tbase.DataType.INT32, 2, timestamp=timestamp1)
+        self._uut.write("tag2", tbase.DataType.UINT64, 5, timestamp=timestamp2)
+        self._uut.write("tag1", tbase.DataType.INT32, 9, timestamp=timestamp3)
+        await self._uut.send_buffered_writes_async()
+
+        assert self._client.all_requests.call_count == 1
+        data = self._client.all_requests.call_args_list[0][1]["data"]
+        assert [d["path"] for d in data] == ["tag1", "tag2"]
+        assert [u["value"]["value"] for u in data[0]["updates"]] == ["2", "9"]
+        assert [u["value"]["value"] for u in data[1]["updates"]] == ["5"]
+
+    @pytest.mark.asyncio
+    async def test__buffer_full__write__sends_in_background(self):
+        self._uut = HttpAsyncBufferedTagWriter(
+            self._client, SystemTimeStamper(), 2, None
+        )
+
+        self._uut.write("tag", tbase.DataType.INT32, 1)
+        self._uut.write("tag", tbase.DataType.INT32, 2)
+        assert self._client.all_requests.call_count == 0
+        for _ in range(100):
+            if self._client.all_requests.call_count > 0:
+                break
+            await asyncio.sleep(0.01)
+
+        assert self._client.all_requests.call_count == 1
+        data = self._client.all_requests.call_args_list[0][1]["data"]
+        assert [u["value"]["value"] for u in data[0]["updates"]] == ["1", "2"]
@@ -1,4 +1,6 @@
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 
 import pytest  # type: ignore
 from nisystemlink.clients import tag as tbase
@@ -154,3 +156,132 @@ class TestHttpBufferedTagWriter(HttpClientTestBase):
         assert data2[0]["updates"] == [
             {"value": {"type": "INT", "value": str(value2)}, "timestamp": utctime2}
         ]
+
+    def test__concurrent_sends__writes_to_same_tag_sent_in_order(self):
+        self._uut = HttpBufferedTagWriter(
+            self._client,
+            SystemTimeStamper(),
+            1,
+            ManualResetTimer.null_timer,
+            send_in_background=True,
+            max_concurrent_sends=2,
+        )
+        release = threading.Event()
+        lock = threading.Lock()
+        sent = []
+
+        def mock_request(method, uri, params=None, data=None):
+            path = data[0]["path"]
+            value = data[0]["updates"][0]["value"]["value"]
+            if path == "slow":
+                release.wait(5)
+            with lock:
+                sent.append((path, value))
+            return None, None
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+        with self._uut:
+            self._uut.write("slow", tbase.DataType.INT32, 1)
+            self._uut.write("slow", tbase.DataType.INT32, 2)
+            self._uut.write("fast", tbase.DataType.INT32, 3)
+            for _ in range(500):
+                if sent:
+                    break
+                time.sleep(0.01)
+            # The write to "fast" wasn't held up by the writes to "slow"
+            assert sent == [("fast", "3")]
+            release.set()
+
+        assert sent == [("fast", "3"), ("slow", "1"), ("slow", "2")]
+
+    def test__coalescing__multiple_writes_buffered_for_same_tag__only_newest_sent(
+        self,
+    ):
+        self._uut = HttpBufferedTagWriter(
+            self._client,
+            SystemTimeStamper(),
+            10,
+            ManualResetTimer.null_timer,
+            coalesce=True,
+        )
+        timestamp1 = datetime.now()
+        timestamp2 = timestamp1 + timedelta(seconds=1)
+        timestamp3 = timestamp1 + timedelta(seconds=2)
+
+        self._uut.write("tag1", tbase.DataType.INT32, 2, timestamp=timestamp1)
+        self._uut.write("tag2", tbase.DataType.UINT64, 5, timestamp=timestamp2)
+        self._uut.write("tag1", tbase.DataType.INT32, 9, timestamp=timestamp3)
+        self._uut.send_buffered_writes()
+
+        assert self._client.all_requests.call_count == 1
+        data = self._client.all_requests.call_args_list[0][1]["data"]
+        assert [d["path"] for d in data] == ["tag1", "tag2"]
+        utctime3 = datetime.utcfromtimestamp(timestamp3.timestamp()).isoformat() + "Z"
+        assert data[0]["updates"] == [
+            {"value": {"type": "INT", "value": "9"}, "timestamp": utctime3}
+        ]
+        assert len(data[1]["updates"]) == 1
+        assert self._uut.coalesced_writes == 1
+
+    def test__coalescing__buffer_size_reached__counts_coalesced_writes(self):
+        self._uut = HttpBufferedTagWriter(
+            self._client,
+            SystemTimeStamper(),
+            3,
+            ManualResetTimer.null_timer,
+            coalesce=True,
+        )
+
+        for value in range(6):
+            self._uut.write("tag", tbase.DataType.INT32, value)
+
+        assert self._client.all_requests.call_count == 2
+        sent = [
+            call[1]["data"][0]["updates"]
+            for call in self._client.all_requests.call_args_list
+        ]
+        assert [[u["value"]["value"] for u in updates] for updates in sent] == [
+            ["2"],
+            ["5"],
+        ]
+        assert self._uut.coalesced_writes == 4
+
+    def test__not_coalescing__coalesced_writes_is_zero(self):
+        self._uut.write("tag", tbase.DataType.INT32, 1)
+        self._uut.write("tag", tbase.DataType.INT32, 2)
+
+        assert self._uut.coalesced_writes == 0
+
+    def test__write_many__buffer_filled__sends_each_full_buffer(self):
+        timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        paths = ["tag{}".format(i % 2) for i in range(25)]
+
+        self._uut.write_many(
+            paths, tbase.DataType.INT32, list(range(25)), [timestamp] * 25
+        )
+
+        assert self._client.all_requests.call_count == 2
+        self._uut.send_buffered_writes()
+        sent = {}
+        for call in self._client.all_requests.call_args_list:
+            for entry in call[1]["data"]:
+                sent.setdefault(entry["path"], []).extend(entry["updates"])
+        assert sent == {
+            path: [
+                {
+                    "value": {"type": "INT", "value": str(i)},
+                    "timestamp": "2020-01-01T00:00:00Z",
+                }
+                for i in range(start, 25, 2)
+            ]
+            for start, path in enumerate(["tag0", "tag1"])
+        }
+
+    def test__write_many_without_timestamps__values_stamped_with_same_time(self):
+        self._uut.write_many("tag", tbase.DataType.STRING, ["a", "b"])
+        self._uut.send_buffered_writes()
+
+        updates = self._client.all_requests.call_args[1]["data"][0]["updates"]
+        assert [u["value"]["value"] for u in updates] == ["a", "b"]
+        assert updates[0]["timestamp"] == updates[1]["timestamp"]
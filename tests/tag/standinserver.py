@@ -0,0 +1,70 @@
+"""A local stand-in for the tag service's write endpoint."""
+
+import http.server
+import json
+import threading
+import time
+
+
+class StandInServer:
+    """A minimal HTTP server that records the tag writes posted to it."""
+
+    def __init__(self, port=0, delay=0):
+        self.available = True
+        # Seconds to take to handle each request, like a remote server would
+        self.delay = delay
+        self.batches = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if server.delay:
+                    time.sleep(server.delay)
+                if not server.available:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.path == "/nitag/v2/update-current-values":
+                    with server._lock:
+                        server.batches.append(json.loads(body))
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def uri(self):
+        return "http://127.0.0.1:{}".format(self._httpd.server_address[1])
+
+    def values(self):
+        """Return the written values, in the order the server received them."""
+        with self._lock:
+            return [
+                (entry["path"], update["value"]["value"])
+                for batch in self.batches
+                for entry in batch
+                for update in entry["updates"]
+            ]
+
+    def wait_for_values(self, count):
+        for _ in range(500):
+            if len(self.values()) >= count:
+                break
+            time.sleep(0.01)
+        return self.values()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._httpd.shutdown()
+        self._httpd.server_close()
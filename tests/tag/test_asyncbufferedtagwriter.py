@@ -0,0 +1,197 @@
+import asyncio
+import datetime
+
+import nisystemlink.clients.core as core
+import nisystemlink.clients.tag as tbase
+import pytest  # type: ignore
+from nisystemlink.clients.tag._core._system_time_stamper import SystemTimeStamper
+
+
+class TestAsyncBufferedTagWriter:
+    @pytest.mark.asyncio
+    async def test__buffer_size__write_async__updates_sent_when_buffer_fills(self):
+        writer = self.ListBufferedTagWriter(2)
+
+        await writer.write_async("tag1", tbase.DataType.INT32, 1)
+        assert writer.sent == []
+        await writer.write_async("tag2", tbase.DataType.INT32, 2)
+
+        assert writer.sent == [[("tag1", "1"), ("tag2", "2")]]
+
+    @pytest.mark.asyncio
+    async def test__buffer_size__write__updates_sent_in_background(self):
+        writer = self.ListBufferedTagWriter(1)
+        writer.release.clear()
+
+        writer.write("tag", tbase.DataType.INT32, 1)
+        writer.write("tag", tbase.DataType.INT32, 2)
+        writer.write("tag", tbase.DataType.INT32, 3)
+        # The writes returned without waiting for the server
+        assert writer.sent == []
+
+        writer.release.set()
+        await writer.send_buffered_writes_async()
+
+        assert writer.sent == [[("tag", "1")], [("tag", "2")], [("tag", "3")]]
+
+    @pytest.mark.asyncio
+    async def test__background_send_in_progress__write_async__batches_sent_in_order(
+        self,
+    ):
+        writer = self.ListBufferedTagWriter(1)
+        writer.release.clear()
+
+        writer.write("tag", tbase.DataType.INT32, 1)
+        write = asyncio.ensure_future(
+            writer.write_async("tag", tbase.DataType.INT32, 2)
+        )
+        await asyncio.sleep(0)
+        assert not write.done()
+
+        writer.release.set()
+        await write
+
+        assert writer.sent == [[("tag", "1")], [("tag", "2")]]
+
+    @pytest.mark.asyncio
+    async def test__max_buffer_time__write__updates_sent_when_time_elapses(self):
+        writer = self.ListBufferedTagWriter(0, datetime.timedelta(milliseconds=10))
+
+        writer.write("tag", tbase.DataType.DOUBLE, 1.5)
+        assert writer.sent == []
+        for _ in range(100):
+            if writer.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert writer.sent == [[("tag", "1.5")]]
+
+    @pytest.mark.asyncio
+    async def test__items_buffered__clear_buffered_writes__timer_cancelled(self):
+        writer = self.ListBufferedTagWriter(0, datetime.timedelta(milliseconds=10))
+
+        writer.write("tag", tbase.DataType.DOUBLE, 1.5)
+        writer.clear_buffered_writes()
+        await asyncio.sleep(0.05)
+        await writer.send_buffered_writes_async()
+
+        assert writer.sent == []
+
+    @pytest.mark.asyncio
+    async def test__background_send_failed__write__error_raised(self):
+        writer = self.ListBufferedTagWriter(1)
+        error = core.ApiException("failed")
+        writer.errors.append(error)
+
+        writer.write("tag", tbase.DataType.INT32, 1)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        with pytest.raises(core.ApiException) as excinfo:
+            writer.write("tag", tbase.DataType.INT32, 2)
+        assert excinfo.value is error
+        await writer.send_buffered_writes_async()
+        assert writer.sent == [[("tag", "2")]]
+
+    @pytest.mark.asyncio
+    async def test__send_failed__write_async__error_raised(self):
+        writer = self.ListBufferedTagWriter(1)
+        error = core.ApiException("failed")
+        writer.errors.append(error)
+
+        with pytest.raises(core.ApiException) as excinfo:
+            await writer.write_async("tag", tbase.DataType.INT32, 1)
+        assert excinfo.value is error
+
+    @pytest.mark.asyncio
+    async def test__caller_cancelled__write_async__batch_still_sent(self):
+        writer = self.ListBufferedTagWriter(1)
+        writer.release.clear()
+
+        write = asyncio.ensure_future(
+            writer.write_async("tag", tbase.DataType.INT32, 1)
+        )
+        await asyncio.sleep(0)
+        write.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await write
+        writer.release.set()
+        await writer.send_buffered_writes_async()
+
+        assert writer.sent == [[("tag", "1")]]
+
+    @pytest.mark.asyncio
+    async def test__writer_closed__buffered_writes_sent(self):
+        writer = self.ListBufferedTagWriter(0, datetime.timedelta(minutes=1))
+
+        async with writer:
+            await writer.write_async("tag", tbase.DataType.STRING, "value")
+
+        assert writer.sent == [[("tag", "value")]]
+        assert writer._flush_handle is None
+
+    @pytest.mark.asyncio
+    async def test__writer_closed__methods_called__raises(self):
+        writer = self.ListBufferedTagWriter(2)
+        await writer.close_async()
+
+        with pytest.raises(ReferenceError):
+            writer.clear_buffered_writes()
+        with pytest.raises(ReferenceError):
+            await writer.send_buffered_writes_async()
+        with pytest.raises(ReferenceError):
+            writer.write("tag", tbase.DataType.BOOLEAN, False)
+        with pytest.raises(ReferenceError):
+            await writer.write_async("tag", tbase.DataType.BOOLEAN, False)
+
+    @pytest.mark.asyncio
+    async def test__invalid_arguments__write_async__raises(self):
+        writer = self.ListBufferedTagWriter(2)
+
+        with pytest.raises(ValueError):
+            await writer.write_async("*", tbase.DataType.BOOLEAN, False)
+        with pytest.raises(ValueError):
+            await writer.write_async("tag", tbase.DataType.UNKNOWN, "test")
+
+    @pytest.mark.asyncio
+    async def test__timestamp_given__write_async__timestamp_converted_to_utc(self):
+        writer = self.ListBufferedTagWriter(2)
+        timestamp = datetime.datetime(
+            2020, 1, 1, 19, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))
+        )
+
+        await writer.write_async("tag", tbase.DataType.INT32, 1, timestamp=timestamp)
+
+        assert writer.timestamps == [
+            datetime.datetime(2020, 1, 2, 0, 0, tzinfo=datetime.timezone.utc)
+        ]
+
+    class ListBufferedTagWriter(tbase.AsyncBufferedTagWriter):
+        def __init__(self, buffer_size, max_buffer_time=None):
+            super().__init__(SystemTimeStamper(), buffer_size, max_buffer_time)
+            self.buffer = []
+            self.sent = []
+            self.timestamps = []
+            self.errors = []
+            self.release = asyncio.Event()
+            self.release.set()
+
+        def _buffer_value(self, path, value):
+            self.buffer.append(value)
+
+        def _clear_buffer(self):
+            self.buffer = []
+
+        def _copy_buffer(self):
+            buffer, self.buffer = self.buffer, []
+            return buffer
+
+        def _create_item(self, path, data_type, value, timestamp=None):
+            self.timestamps.append(timestamp)
+            return (path, value)
+
+        async def _send_writes_async(self, updates):
+            await self.release.wait()
+            if self.errors:
+                raise self.errors.pop(0)
+            self.sent.append(updates)
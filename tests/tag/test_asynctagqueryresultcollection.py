@@ -254,3 +254,50 @@ class TestAsyncTagQueryResultCollection:
         assert first_page == uut.current_page
 
         uut.verify([0, 0])
+
+
+class TestAsyncTagQueryResultCollectionParallel:
+    class PagedAsyncTagQueryResultCollection(AsyncTagQueryResultCollection):
+        def __init__(self, tags, page_size, max_concurrency):
+            super().__init__(
+                tags[:page_size], len(tags), 0, max_concurrency=max_concurrency
+            )
+            self._tags = tags
+            self._page_size_for_test = page_size
+            self._in_progress = 0
+            self.max_in_progress = 0
+            self.calls = []
+
+        async def _query_page_async(self, skip):
+            self.calls.append(skip)
+            self._in_progress += 1
+            self.max_in_progress = max(self.max_in_progress, self._in_progress)
+            await asyncio.sleep(0.01)
+            self._in_progress -= 1
+            return self._tags[skip : skip + self._page_size_for_test]
+
+    @pytest.mark.asyncio
+    async def test__parallel__move_next_page__pages_requested_ahead_and_in_order(
+        self,
+    ):
+        tags = [TagData("tag{}".format(i), DataType.INT32) for i in range(20)]
+        uut = self.PagedAsyncTagQueryResultCollection(tags, 3, 3)
+
+        result = list(uut.current_page)
+        while await uut.move_next_page_async() is not None:
+            result.extend(uut.current_page)
+
+        assert result == tags
+        assert sorted(uut.calls) == list(range(3, 20, 3))
+        assert uut.max_in_progress == 3
+
+    @pytest.mark.asyncio
+    async def test__parallel__reset__pages_requested_ahead_are_discarded(self):
+        tags = [TagData("tag{}".format(i), DataType.INT32) for i in range(20)]
+        uut = self.PagedAsyncTagQueryResultCollection(tags, 3, 3)
+
+        await uut.move_next_page_async()
+        await uut.reset_async()
+        await uut.move_next_page_async()
+
+        assert uut.current_page == tags[3:6]
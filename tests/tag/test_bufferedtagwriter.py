@@ -1,13 +1,22 @@
 import datetime
+import threading
 from unittest import mock
 from unittest.mock import Mock, PropertyMock
 
 import nisystemlink.clients.core as core
 import nisystemlink.clients.tag as tbase
 import pytest  # type: ignore
+from nisystemlink.clients.tag._core._adaptive_flush_controller import (
+    AdaptiveFlushController,
+)
+from nisystemlink.clients.tag._core._deadband_filter import DeadbandFilter
 from nisystemlink.clients.tag._core._itime_stamper import ITimeStamper
 from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
 from nisystemlink.clients.tag._core._system_time_stamper import SystemTimeStamper
+from nisystemlink.clients.tag._core._write_spool import WriteSpool
+from nisystemlink.clients.tag._spooling_buffered_tag_writer import (
+    SpoolingBufferedTagWriter,
+)
 
 from .mock_manualresettimer import MockManualResetTimer
 
@@ -623,13 +632,508 @@ class TestBufferedTagWriter:
                 "tag", tbase.DataType.BOOLEAN, False, timestamp=self.timestamp
             )
 
+    def test__send_in_background__buffer_full__write_returns_before_send(self):
+        writer = self.MockBufferedTagWriter(None, 1, send_in_background=True)
+        release = threading.Event()
+        sent = threading.Event()
+        buffer = [object()]
+        caller = threading.get_ident()
+        sender = []
+
+        def send(updates):
+            sender.append(threading.get_ident())
+            release.wait(5)
+            sent.set()
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=None, return_value=buffer)
+        writer.mock_send_writes.configure_mock(side_effect=send)
+
+        with writer:
+            writer.write("tag", tbase.DataType.DOUBLE, 1.1, timestamp=self.timestamp)
+            assert not sent.is_set()
+            release.set()
+
+        assert sent.is_set()
+        writer.mock_send_writes.assert_called_once_with(buffer)
+        assert sender != [caller]
+
+    def test__send_in_background__buffers_filled__sent_in_order(self):
+        writer = self.MockBufferedTagWriter(None, 1, send_in_background=True)
+        buffers = [[i] for i in range(20)]
+        release = threading.Event()
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=buffers)
+        writer.mock_send_writes.configure_mock(side_effect=lambda _: release.wait(5))
+
+        for i in range(len(buffers)):
+            writer.write("tag", tbase.DataType.INT32, i, timestamp=self.timestamp)
+        release.set()
+        writer.send_buffered_writes()
+
+        assert writer.mock_send_writes.call_args_list == [mock.call(b) for b in buffers]
+
+    def test__send_in_background__send_errored__next_write_raises(self):
+        writer = self.MockBufferedTagWriter(None, 1, send_in_background=True)
+        error = core.ApiException("failed")
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[1], [2], [3]])
+        writer.mock_send_writes.configure_mock(side_effect=[error, None, None])
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.send_buffered_writes()  # wait for the background send to fail
+        with pytest.raises(core.ApiException) as excinfo:
+            writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        assert excinfo.value is error
+        writer.write("tag", tbase.DataType.INT32, 3, timestamp=self.timestamp)
+        writer.send_buffered_writes()
+
+        assert writer.mock_send_writes.call_args_list == [
+            mock.call([1]),
+            mock.call([2]),
+            mock.call([3]),
+        ]
+
+    def test__send_error_callback__send_errored__callback_called(self):
+        errors = []
+        writer = self.MockBufferedTagWriter(
+            None, 1, send_in_background=True, send_error_callback=errors.append
+        )
+        error = core.ApiException("failed")
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[1], [2]])
+        writer.mock_send_writes.configure_mock(side_effect=[error, None])
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.send_buffered_writes()
+        writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        writer.send_buffered_writes()
+
+        assert errors == [error]
+
+    def test__send_in_background__send_buffered_writes__raises_send_error(self):
+        writer = self.MockBufferedTagWriter(None, 2, send_in_background=True)
+        buffer = [object()]
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=None, return_value=buffer)
+        writer.mock_send_writes.configure_mock(side_effect=core.ApiException)
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        with pytest.raises(core.ApiException):
+            writer.send_buffered_writes()
+
+        writer.mock_send_writes.assert_called_once_with(buffer)
+
+    def test__send_in_background__flush_timer_elapsed__writes_sent_by_sender(self):
+        writer = self.MockBufferedTagWriter(
+            None, 2, MockManualResetTimer(), send_in_background=True
+        )
+        buffer = [object()]
+        sender = []
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=None, return_value=buffer)
+        writer.mock_send_writes.configure_mock(
+            side_effect=lambda _: sender.append(threading.get_ident())
+        )
+        type(writer.timer).can_start = PropertyMock(return_value=True)
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.trigger_flush_event()
+        writer.send_buffered_writes()
+
+        writer.mock_send_writes.assert_called_once_with(buffer)
+        assert sender != [threading.get_ident()]
+
+    @pytest.mark.asyncio
+    async def test__send_in_background__writer_closed_async__buffered_writes_sent(
+        self,
+    ):
+        writer = self.MockBufferedTagWriter(None, 1, send_in_background=True)
+        buffers = [[1], [2]]
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=buffers)
+        writer.mock_send_writes.configure_mock(side_effect=None)
+
+        async with writer:
+            await writer.write_async(
+                "tag", tbase.DataType.INT32, 1, timestamp=self.timestamp
+            )
+            await writer.write_async(
+                "tag", tbase.DataType.INT32, 2, timestamp=self.timestamp
+            )
+
+        assert writer.mock_send_writes.call_args_list == [mock.call(b) for b in buffers]
+        writer.mock_send_writes_async.assert_not_called()
+
+    def _blocking_writer(self, buffer_size=1, **kwargs):
+        """Create a writer that sends in the background, and whose sends wait for
+        ``writer.release`` to be set.
+        """
+        writer = self.MockBufferedTagWriter(
+            None, buffer_size, send_in_background=True, **kwargs
+        )
+        writer.release = threading.Event()
+        writer.started = threading.Event()
+        writer.sent = []
+
+        def send(updates):
+            writer.started.set()
+            writer.release.wait(5)
+            writer.sent.append(updates)
+
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[i] for i in range(10)])
+        writer.mock_send_writes.configure_mock(side_effect=send)
+        return writer
+
+    def test__pending_limit_reached__raise_policy__write_raises(self):
+        writer = self._blocking_writer(
+            max_pending_writes=2, overflow_policy=tbase.OverflowPolicy.RAISE
+        )
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        assert writer.pending_writes == 2
+        with pytest.raises(BufferError):
+            writer.write("tag", tbase.DataType.INT32, 3, timestamp=self.timestamp)
+
+        writer.release.set()
+        writer.send_buffered_writes()
+        assert writer.sent == [[0], [1]]
+        assert writer.pending_writes == 0
+        assert writer.pending_bytes == 0
+        assert writer.dropped_writes == 0
+        assert writer.flush_latency.count == 2
+
+    def test__pending_limit_reached__drop_newest_policy__write_dropped(self):
+        writer = self._blocking_writer(
+            max_pending_writes=2, overflow_policy=tbase.OverflowPolicy.DROP_NEWEST
+        )
+
+        for i in range(4):
+            writer.write("tag", tbase.DataType.INT32, i, timestamp=self.timestamp)
+
+        writer.release.set()
+        writer.send_buffered_writes()
+        assert writer.sent == [[0], [1]]
+        assert writer.dropped_writes == 2
+        assert writer.pending_writes == 0
+
+    def test__write_many__pending_limit_reached__remaining_writes_dropped(self):
+        writer = self._blocking_writer(
+            max_pending_writes=2, overflow_policy=tbase.OverflowPolicy.DROP_NEWEST
+        )
+
+        writer.write_many(
+            "tag", tbase.DataType.INT32, [1, 2, 3, 4], [self.timestamp] * 4
+        )
+
+        writer.release.set()
+        writer.send_buffered_writes()
+        assert writer.sent == [[0], [1]]
+        assert writer.dropped_writes == 2
+        assert writer.mock_create_item.call_count == 4
+
+    def test__pending_limit_reached__drop_oldest_policy__queued_buffer_dropped(self):
+        writer = self._blocking_writer(
+            max_pending_writes=2, overflow_policy=tbase.OverflowPolicy.DROP_OLDEST
+        )
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        assert writer.started.wait(5)
+        writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        # The first buffer is being sent, so the second one is dropped instead
+        writer.write("tag", tbase.DataType.INT32, 3, timestamp=self.timestamp)
+
+        writer.release.set()
+        writer.send_buffered_writes()
+        assert writer.sent == [[0], [2]]
+        assert writer.dropped_writes == 1
+        assert writer.pending_writes == 0
+
+    def test__pending_limit_reached__block_policy__write_waits_for_send(self):
+        writer = self._blocking_writer(max_pending_writes=1)
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        timer = threading.Timer(0.05, writer.release.set)
+        timer.start()
+        writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        assert writer.release.is_set()
+        timer.join()
+
+        writer.send_buffered_writes()
+        assert writer.sent == [[0], [1]]
+        assert writer.dropped_writes == 0
+
+    @pytest.mark.asyncio
+    async def test__pending_limit_reached__write_async_times_out(self):
+        writer = self._blocking_writer(
+            max_pending_writes=1,
+            overflow_timeout=datetime.timedelta(milliseconds=50),
+        )
+
+        await writer.write_async(
+            "tag", tbase.DataType.INT32, 1, timestamp=self.timestamp
+        )
+        with pytest.raises(TimeoutError):
+            await writer.write_async(
+                "tag", tbase.DataType.INT32, 2, timestamp=self.timestamp
+            )
+
+        writer.release.set()
+        await writer.send_buffered_writes_async()
+        assert writer.sent == [[0]]
+
+    def test__pending_bytes_limit_reached__buffer_flushed_first(self):
+        writer = self.MockBufferedTagWriter(
+            None, 10, max_pending_bytes=250, overflow_policy=tbase.OverflowPolicy.RAISE
+        )
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_clear_buffer.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[1, 2]])
+        writer.mock_send_writes.configure_mock(side_effect=None)
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.write("tag", tbase.DataType.INT32, 2, timestamp=self.timestamp)
+        assert writer.pending_writes == 2
+        assert writer.pending_bytes > 200
+        # Doesn't fit alongside the buffered writes, which are sent to make room
+        writer.write("tag", tbase.DataType.INT32, 3, timestamp=self.timestamp)
+
+        writer.mock_send_writes.assert_called_once_with([1, 2])
+        assert writer.pending_writes == 1
+        writer.clear_buffered_writes()
+        assert writer.pending_writes == 0
+        assert writer.pending_bytes == 0
+
+    def test__invalid_pending_limits__raises(self):
+        with pytest.raises(ValueError):
+            self.MockBufferedTagWriter(None, 1, max_pending_writes=0)
+        with pytest.raises(ValueError):
+            self.MockBufferedTagWriter(None, 1, max_pending_bytes=0)
+        with pytest.raises(ValueError):
+            self.MockBufferedTagWriter(
+                None, 1, overflow_timeout=datetime.timedelta(seconds=-1)
+            )
+
+    def test__spool__only_accepted_by_writers_that_serialize_buffers(self, tmp_path):
+        spool = WriteSpool(str(tmp_path), 1000)
+
+        class MockSpoolingWriter(SpoolingBufferedTagWriter, self.MockBufferedTagWriter):
+            pass
+
+        with pytest.raises(TypeError):
+            self.MockBufferedTagWriter(None, 1, spool=spool)
+        with pytest.raises(TypeError) as excinfo:
+            MockSpoolingWriter(None, 1, None, spool=spool)
+        assert "abstract" in str(excinfo.value)
+        assert spool.num_batches == 0
+
+    def test__spooling_writer__buffers_stored_and_sent(self, tmp_path):
+        class MockSpoolingWriter(SpoolingBufferedTagWriter, self.MockBufferedTagWriter):
+            def _serialize_buffer(self, updates):
+                return ",".join(updates).encode()
+
+            def _deserialize_buffer(self, data):
+                return data.decode().split(",")
+
+        writer = MockSpoolingWriter(
+            None, 2, None, spool=WriteSpool(str(tmp_path), 1000), max_pending_writes=2
+        )
+        writer.mock_create_item.configure_mock(
+            side_effect=lambda path, data_type, value, timestamp: value
+        )
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[["1", "2"], ["3"]])
+        writer.mock_send_writes.configure_mock(side_effect=None)
+
+        with writer:
+            for value in range(1, 4):
+                writer.write("tag", tbase.DataType.INT32, value)
+
+        assert writer.mock_send_writes.call_args_list == [
+            mock.call(["1", "2"]),
+            mock.call(["3"]),
+        ]
+        assert writer.pending_writes == 0
+
+    def test__flush_controller__settings_follow_controller(self):
+        controller = Mock(AdaptiveFlushController)
+        controller.buffer_size = 3
+        controller.flush_interval = datetime.timedelta(seconds=2)
+        timer = MockManualResetTimer()
+        writer = self.MockBufferedTagWriter(
+            None, 100, timer, flush_controller=controller
+        )
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_clear_buffer.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[0], [1]])
+        writer.mock_send_writes.configure_mock(side_effect=None)
+
+        assert writer.buffer_size == 3
+        assert timer.interval == datetime.timedelta(seconds=2)
+
+        # The controller shrinks the buffer once it sees the first flush
+        def record_flush(num_writes, now):
+            controller.buffer_size = 1
+            controller.flush_interval = datetime.timedelta(milliseconds=50)
+
+        controller.record_flush.side_effect = record_flush
+        for i in range(3):
+            writer.write("tag", tbase.DataType.INT32, i, timestamp=self.timestamp)
+        writer.write("tag", tbase.DataType.INT32, 3, timestamp=self.timestamp)
+
+        assert writer.mock_send_writes.call_count == 2
+        assert controller.record_flush.call_args_list[0][0][0] == 3
+        assert controller.record_send.call_count == 2
+        num_writes, _, duration = controller.record_send.call_args_list[0][0]
+        assert num_writes == 3
+        assert duration >= 0
+        assert writer.buffer_size == 1
+        assert timer.interval == datetime.timedelta(milliseconds=50)
+
+    def _filtering_writer(self, **kwargs):
+        """Create a writer with a deadband filter, whose buffered items are the
+        written values.
+        """
+        writer = self.MockBufferedTagWriter(
+            None, 100, deadband_filter=DeadbandFilter(**kwargs)
+        )
+        writer.mock_create_item.configure_mock(
+            side_effect=lambda path, data_type, value, timestamp: value
+        )
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_clear_buffer.configure_mock(side_effect=None)
+        return writer
+
+    def _buffered_values(self, writer):
+        return [c[0][1] for c in writer.mock_buffer_value.call_args_list]
+
+    def test__deadband_filter__writes_within_deadband_not_buffered(self):
+        writer = self._filtering_writer(absolute=1)
+
+        for value in [1.0, 1.5, 2.0, 2.5, 2.5]:
+            writer.write("tag", tbase.DataType.DOUBLE, value, timestamp=self.timestamp)
+        writer.write("tag2", tbase.DataType.DOUBLE, 1.5, timestamp=self.timestamp)
+
+        assert self._buffered_values(writer) == ["1.0", "2.5", "1.5"]
+        assert writer.filtered_writes == 3
+        assert writer.pending_writes == 3
+
+    def test__deadband_filter__write_many__only_changed_values_buffered(self):
+        writer = self._filtering_writer()
+
+        writer.write_many(
+            ["a", "b", "a", "b", "a"],
+            tbase.DataType.INT32,
+            [1, 2, 1, 3, 4],
+            [self.timestamp + datetime.timedelta(seconds=i) for i in range(5)],
+        )
+
+        assert self._buffered_values(writer) == ["1", "2", "3", "4"]
+        assert writer.filtered_writes == 1
+        timestamps = [c[0][3] for c in writer.mock_create_item.call_args_list]
+        assert timestamps == [
+            self.timestamp + datetime.timedelta(seconds=i) for i in (0, 1, 3, 4)
+        ]
+
+    def test__deadband_filter__buffered_writes_cleared__next_write_buffered(self):
+        writer = self._filtering_writer()
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+
+        writer.clear_buffered_writes()
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+
+        assert self._buffered_values(writer) == ["1", "1"]
+        assert writer.filtered_writes == 0
+
+    def test__deadband_filter__send_fails__next_write_sent(self):
+        writer = self._filtering_writer()
+        writer.mock_copy_buffer.configure_mock(side_effect=[[0], [1]])
+        writer.mock_send_writes.configure_mock(
+            side_effect=[core.ApiException("failed"), None]
+        )
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        with pytest.raises(core.ApiException):
+            writer.send_buffered_writes()
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.send_buffered_writes()
+
+        assert self._buffered_values(writer) == ["1", "1"]
+        assert writer.mock_send_writes.call_count == 2
+
+    def _suppressing_writer(self):
+        """Create a writer that sends in the background, whose deadband filter only
+        accepts the first write.
+        """
+        deadband_filter = Mock(DeadbandFilter)
+        deadband_filter.accept.side_effect = [True, False, False]
+        writer = self.MockBufferedTagWriter(
+            None, 1, send_in_background=True, deadband_filter=deadband_filter
+        )
+        writer.mock_create_item.configure_mock(side_effect=None)
+        writer.mock_buffer_value.configure_mock(side_effect=None)
+        writer.mock_copy_buffer.configure_mock(side_effect=[[1]])
+        return writer
+
+    def test__deadband_filter__send_errored__next_suppressed_write_raises(self):
+        writer = self._suppressing_writer()
+        error = core.ApiException("failed")
+        writer.mock_send_writes.configure_mock(side_effect=[error])
+
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.send_buffered_writes()  # wait for the background send to fail
+        with pytest.raises(core.ApiException) as excinfo:
+            writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+        writer.write("tag", tbase.DataType.INT32, 1, timestamp=self.timestamp)
+
+        assert excinfo.value is error
+        assert writer.filtered_writes == 2
+
+    @pytest.mark.asyncio
+    async def test__deadband_filter__send_errored__next_suppressed_write_async_raises(
+        self,
+    ):
+        writer = self._suppressing_writer()
+        error = core.ApiException("failed")
+        writer.mock_send_writes.configure_mock(side_effect=[error])
+
+        await writer.write_async(
+            "tag", tbase.DataType.INT32, 1, timestamp=self.timestamp
+        )
+        writer.send_buffered_writes()  # wait for the background send to fail
+        with pytest.raises(core.ApiException) as excinfo:
+            await writer.write_async(
+                "tag", tbase.DataType.INT32, 1, timestamp=self.timestamp
+            )
+
+        assert excinfo.value is error
+
     class MockBufferedTagWriter(tbase.BufferedTagWriter):
-        def __init__(self, stamper=None, buffer_size=None, flush_timer=None):
+        def __init__(self, stamper=None, buffer_size=None, flush_timer=None, **kwargs):
             assert buffer_size is not None
             super().__init__(
                 stamper or SystemTimeStamper(),
                 buffer_size,
                 flush_timer or ManualResetTimer.null_timer,
+                **kwargs
             )
             self._timer = flush_timer
             self._time_stamper = stamper
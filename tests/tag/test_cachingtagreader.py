@@ -0,0 +1,286 @@
+import asyncio
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.tag._core._manual_reset_timer import ManualResetTimer
+from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
+    SerializedTagWithAggregates,
+)
+from nisystemlink.clients.tag._http._http_tag_subscription import HttpTagSubscription
+
+from .http.httpclienttestbase import HttpClientTestBase, MockResponse
+from .mock_manualresettimer import MockManualResetTimer
+
+
+class MockTagReader(tbase.ITagReader):
+    def __init__(self):
+        super().__init__()
+        self.mock_read = mock.Mock(side_effect=self._serialize)
+
+    @classmethod
+    def _serialize(cls, path, include_timestamp, include_aggregates):
+        return SerializedTagWithAggregates(
+            path,
+            tbase.DataType.INT32,
+            str(len(path)),
+            None,
+            1 if include_aggregates else None,
+            "1" if include_aggregates else None,
+            "1" if include_aggregates else None,
+            1.0 if include_aggregates else None,
+        )
+
+    def _read(self, *args):
+        return self.mock_read(*args)
+
+    async def _read_async(self, *args):
+        await asyncio.sleep(0.01)
+        return self.mock_read(*args)
+
+
+class TestCachingTagReader(HttpClientTestBase):
+    def test__bad_arguments__constructor__raises(self):
+        with pytest.raises(ValueError):
+            tbase.CachingTagReader(None, time_to_live=timedelta(seconds=1))
+        with pytest.raises(ValueError):
+            tbase.CachingTagReader(
+                MockTagReader(), time_to_live=timedelta(seconds=1), max_entries=0
+            )
+        with pytest.raises(ValueError):
+            tbase.CachingTagReader(MockTagReader(), time_to_live=timedelta(seconds=-1))
+        with pytest.raises(ValueError):
+            tbase.CachingTagReader(
+                MockTagReader(),
+                time_to_live=timedelta(seconds=1),
+                path_time_to_live={"tag": timedelta(seconds=-1)},
+            )
+
+    def test__value_cached__read__does_not_read_again(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+
+        first = uut.read("tag")
+        second = uut.read("tag")
+
+        assert reader.mock_read.call_args_list == [mock.call("tag", False, False)]
+        assert first is not None and first.value == 3
+        assert second is not None and second.value == 3
+
+    def test__value_expired__read__reads_again(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(
+            reader,
+            time_to_live=timedelta(seconds=10),
+            path_time_to_live={"short": timedelta(seconds=1)},
+        )
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            uut.read("tag")
+            uut.read("short")
+        with mock.patch("time.monotonic", return_value=105.0):
+            uut.read("tag")
+            uut.read("short")
+        with mock.patch("time.monotonic", return_value=110.0):
+            uut.read("tag")
+
+        assert reader.mock_read.call_args_list == [
+            mock.call("tag", False, False),
+            mock.call("short", False, False),
+            mock.call("short", False, False),
+            mock.call("tag", False, False),
+        ]
+
+    def test__cache_full__read__evicts_least_recently_used(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(
+            reader, time_to_live=timedelta(seconds=60), max_entries=2
+        )
+
+        uut.read("tag1")
+        uut.read("tag2")
+        uut.read("tag1")
+        uut.read("tag3")
+        uut.read("tag1")
+        uut.read("tag2")
+
+        assert [c[0][0] for c in reader.mock_read.call_args_list] == [
+            "tag1",
+            "tag2",
+            "tag3",
+            "tag2",
+        ]
+
+    def test__cached_without_aggregates__read_with_aggregates__reads_again(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+
+        uut.read("tag")
+        with_aggregates = uut.read("tag", include_aggregates=True)
+        without_aggregates = uut.read("tag")
+
+        assert reader.mock_read.call_args_list == [
+            mock.call("tag", False, False),
+            mock.call("tag", False, True),
+        ]
+        assert with_aggregates is not None and with_aggregates.count == 1
+        assert without_aggregates is not None and without_aggregates.count is None
+
+    def test__invalidate__read__reads_again(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+
+        uut.read("tag1")
+        uut.read("tag2")
+        uut.invalidate("tag1")
+        uut.read("tag1")
+        uut.read("tag2")
+        uut.invalidate()
+        uut.read("tag2")
+
+        assert [c[0][0] for c in reader.mock_read.call_args_list] == [
+            "tag1",
+            "tag2",
+            "tag1",
+            "tag2",
+        ]
+
+    def test__concurrent_misses__read__reads_once(self):
+        reader = MockTagReader()
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_read(*args):
+            started.set()
+            release.wait(5)
+            return MockTagReader._serialize(*args)
+
+        reader.mock_read.configure_mock(side_effect=blocking_read)
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+        results = []
+
+        def read():
+            results.append(uut.read("tag").value)
+
+        threads = [threading.Thread(target=read) for _ in range(5)]
+        threads[0].start()
+        assert started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert reader.mock_read.call_count == 1
+        assert results == [3] * 5
+
+    def test__read_fails__read__error_not_cached(self):
+        reader = MockTagReader()
+        reader.mock_read.configure_mock(side_effect=ValueError("failed"))
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+
+        with pytest.raises(ValueError):
+            uut.read("tag")
+        with pytest.raises(ValueError):
+            uut.read("tag")
+
+        assert reader.mock_read.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test__concurrent_misses__read_async__reads_once(self):
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(reader, time_to_live=timedelta(seconds=60))
+
+        results = await asyncio.gather(*[uut.read_async("tag") for _ in range(5)])
+        cached = await uut.read_async("tag")
+
+        assert reader.mock_read.call_count == 1
+        assert [r.value for r in results] == [3] * 5
+        assert cached is not None and cached.value == 3
+
+    def test__subscribed_tag_changed__read__uses_subscription_value(self):
+        update_timer = MockManualResetTimer()
+        subscription = self._create_subscription(["sub.*"], update_timer)
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(
+            reader, time_to_live=timedelta(seconds=1), subscription=subscription
+        )
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {
+                        "subscriptionUpdates": [
+                            {
+                                "updates": [
+                                    {
+                                        "tag": {"path": "sub.tag", "type": "INT"},
+                                        "value": "42",
+                                        "timestamp": "2022-08-19T16:17:30.123Z",
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            )
+        )
+
+        update_timer.elapsed()
+        result = uut.read("sub.tag", include_timestamp=True)
+
+        assert reader.mock_read.call_count == 0
+        assert result is not None
+        assert result.value == 42
+        assert result.timestamp is not None
+
+    def test__subscribed_tag__read__does_not_expire(self):
+        subscription = self._create_subscription(["sub.*"], MockManualResetTimer())
+        reader = MockTagReader()
+        uut = tbase.CachingTagReader(
+            reader, time_to_live=timedelta(seconds=1), subscription=subscription
+        )
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            uut.read("sub.tag")
+            uut.read("other")
+        with mock.patch("time.monotonic", return_value=200.0):
+            uut.read("sub.tag")
+            uut.read("other")
+
+        assert [c[0][0] for c in reader.mock_read.call_args_list] == [
+            "sub.tag",
+            "other",
+            "other",
+        ]
+
+    def test__close__closes_subscription(self):
+        subscription = self._create_subscription(["tag"], MockManualResetTimer())
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        with tbase.CachingTagReader(
+            MockTagReader(),
+            time_to_live=timedelta(seconds=1),
+            subscription=subscription,
+        ):
+            pass
+
+        self._client.all_requests.assert_called_once_with(
+            "DELETE", "/nitag/v2/subscriptions/{id}", params={"id": "token"}
+        )
+
+    def _create_subscription(self, paths, update_timer):
+        def mock_request(method, uri, params=None, data=None):
+            if method == "POST":
+                return {"subscriptionId": "token"}, MockResponse(method, uri)
+            return None, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+        subscription = HttpTagSubscription.create(
+            self._client, paths, update_timer, ManualResetTimer.null_timer
+        )
+        self._client.all_requests.reset_mock()
+        return subscription
@@ -8,6 +8,7 @@ import mypy.api
 import pytest  # type: ignore
 from nisystemlink.clients.tag import DataType, ITagReader
 from nisystemlink.clients.tag._core._serialized_tag_with_aggregates import (
+    deserialize_value,
     SerializedTagWithAggregates,
 )
 
@@ -70,6 +71,52 @@ class TestITagReader:
             assert value == result.value
             assert data_type == result.data_type
 
+    def test__read_same_value_repeatedly__value_is_deserialized_once(self):
+        reader = self.MockTagReader()
+        path = "MyPath"
+        data = SerializedTagWithAggregates(
+            path, DataType.DATE_TIME, "2020-01-01T00:22:11.123456Z"
+        )
+        reader.mock_read.configure_mock(return_value=data)
+
+        with mock.patch(
+            "nisystemlink.clients.tag._core._serialized_tag_with_aggregates"
+            ".deserialize_value",
+            wraps=deserialize_value,
+        ) as deserialize:
+            first = reader.read(path)
+            second = reader.read(path)
+            third = reader.read(path, include_timestamp=True)
+
+        assert deserialize.call_count == 3  # value, min, max
+        assert first is not second
+        assert first.value == second.value == third.value
+
+    def test__serialized_value_selected__deserialized_values_are_shared(self):
+        data = SerializedTagWithAggregates(
+            "MyPath", DataType.DOUBLE, "1.5", None, 2, "1.0", "2.0", 1.5
+        )
+        assert data.deserialized_value == 1.5
+        assert data.deserialized_min == 1.0
+
+        with mock.patch(
+            "nisystemlink.clients.tag._core._serialized_tag_with_aggregates"
+            ".deserialize_value",
+        ) as deserialize:
+            selected = data.select(False, True)
+            assert selected.deserialized_value == 1.5
+            assert selected.deserialized_min == 1.0
+            unselected = data.select(False, False)
+            assert unselected.deserialized_min is None
+
+        assert deserialize.call_count == 0
+
+    def test__invalid_serialized_value__deserialized_value_is_none(self):
+        data = SerializedTagWithAggregates("MyPath", DataType.INT32, "not a number")
+
+        assert data.deserialized_value is None
+        assert data.deserialized_value is None
+
     @pytest.mark.slow
     def test__get_tag_reader__mypy_ensures_correct_type(self):
         code_template = textwrap.dedent(
@@ -200,3 +200,107 @@ class TestITagWriter:
         with pytest.raises(ValueError) as ex:
             ITagWriter._validate_type(2**64, DataType.UINT64)
             assert "range" in ex.message
+
+    def test__write_many__writes_each_value_in_order(self):
+        writer = self.MockTagWriter()
+        timestamps = [
+            datetime.datetime(2020, 1, 1, 0, 0, i, tzinfo=datetime.timezone.utc)
+            for i in range(3)
+        ]
+
+        writer.write_many(["a", "b", "a"], DataType.INT32, [1, 2, 3], timestamps)
+
+        assert writer.mock_write.call_args_list == [
+            mock.call("a", DataType.INT32, "1", timestamps[0]),
+            mock.call("b", DataType.INT32, "2", timestamps[1]),
+            mock.call("a", DataType.INT32, "3", timestamps[2]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test__write_many_async__single_path__writes_each_value(self):
+        writer = self.MockTagWriter()
+
+        await writer.write_many_async("tag", DataType.DOUBLE, [1.5, 2])
+
+        assert writer.mock_write.call_args_list == [
+            mock.call("tag", DataType.DOUBLE, "1.5", None),
+            mock.call("tag", DataType.DOUBLE, "2", None),
+        ]
+
+    def test__write_many__serializes_values_like_write(self):
+        for data_type, (serialized_value, value) in self.test_values.items():
+            writer = self.MockTagWriter()
+            writer.write_many("tag", data_type, [value])
+            writer.mock_write.assert_called_once_with(
+                "tag", data_type, serialized_value, None
+            )
+
+    def test__invalid_arguments__write_many__raises(self):
+        writer = self.MockTagWriter()
+
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.UNKNOWN, [1])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [1, True])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [1, 1.5])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [1, None])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [0, 2**31])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.UINT64, [-1, 0])
+        with pytest.raises(ValueError):
+            writer.write_many(["a", "b"], DataType.INT32, [1])
+        with pytest.raises(ValueError):
+            writer.write_many(["a", "b*"], DataType.INT32, [1, 2])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [1], [])
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, [1], ["2020-01-01T00:00:00Z"])
+        writer.mock_write.assert_not_called()
+
+    def test__numpy_arrays__write_many__values_and_timestamps_serialized(self):
+        numpy = pytest.importorskip("numpy")
+        writer = self.MockTagWriter()
+        timestamps = numpy.array(
+            ["2020-01-01T00:00:00", "2020-01-01T00:00:00.000001"],
+            dtype="datetime64[us]",
+        )
+
+        writer.write_many("tag", DataType.DOUBLE, numpy.array([0.5, 2.0]), timestamps)
+        writer.write_many("tag", DataType.BOOLEAN, numpy.array([True, False]))
+        writer.write_many(
+            "tag", DataType.DATE_TIME, timestamps.astype("datetime64[ns]")
+        )
+
+        first = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        second = first + datetime.timedelta(microseconds=1)
+        assert writer.mock_write.call_args_list == [
+            mock.call("tag", DataType.DOUBLE, "0.5", first),
+            mock.call("tag", DataType.DOUBLE, "2.0", second),
+            mock.call("tag", DataType.BOOLEAN, "True", None),
+            mock.call("tag", DataType.BOOLEAN, "False", None),
+            mock.call("tag", DataType.DATE_TIME, "2020-01-01T00:00:00Z", None),
+            mock.call("tag", DataType.DATE_TIME, "2020-01-01T00:00:00.000001Z", None),
+        ]
+
+    def test__numpy_array_of_wrong_type__write_many__raises(self):
+        numpy = pytest.importorskip("numpy")
+        writer = self.MockTagWriter()
+
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, numpy.array([1.5]))
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.INT32, numpy.array([2**31]))
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.UINT64, numpy.array([-1]))
+        with pytest.raises(ValueError):
+            writer.write_many("tag", DataType.DOUBLE, numpy.zeros((2, 2)))
+        with pytest.raises(ValueError):
+            writer.write_many(
+                "tag",
+                DataType.DATE_TIME,
+                numpy.array(["NaT"], dtype="datetime64[ns]"),
+            )
+        writer.mock_write.assert_not_called()
@@ -0,0 +1,173 @@
+import datetime
+import threading
+from unittest import mock
+
+import nisystemlink.clients.core as core
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+from nisystemlink.clients.core._internal._timestamp_utilities import TimestampUtilities
+
+from .standinserver import StandInServer
+
+
+def _mock_shard():
+    shard = mock.MagicMock(tbase.BufferedTagWriter)
+    shard.pending_writes = 1
+    shard.dropped_writes = 0
+    return shard
+
+
+def _paths_by_shard(uut):
+    """Return a tag path for each shard of ``uut``."""
+    paths = {}
+    for i in range(1000):
+        path = "tag{}".format(i)
+        paths.setdefault(uut.writers.index(uut.get_shard(path)), path)
+        if len(paths) == len(uut.writers):
+            return [paths[i] for i in range(len(uut.writers))]
+    assert False, "no path for every shard"
+
+
+class TestShardedTagWriter:
+    def test__many_paths__spread_across_shards_consistently(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(4)])
+        paths = ["tag{}".format(i) for i in range(400)]
+
+        shards = [uut.get_shard(path) for path in paths]
+
+        assert shards == [uut.get_shard(path) for path in paths]
+        for writer in uut.writers:
+            assert 60 <= shards.count(writer) <= 140
+
+    def test__write__written_by_shard_of_path(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(3)])
+        paths = _paths_by_shard(uut)
+
+        uut.write(paths[1], tbase.DataType.INT32, 5)
+
+        uut.writers[1]._write.assert_called_once_with(
+            paths[1], tbase.DataType.INT32, "5", None
+        )
+        uut.writers[0]._write.assert_not_called()
+        uut.writers[2]._write.assert_not_called()
+
+    def test__write_many__each_shard_gets_its_writes_in_order(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(2)])
+        a, b = _paths_by_shard(uut)
+
+        timestamps = [
+            datetime.datetime(2020, 1, 1, second=i, tzinfo=datetime.timezone.utc)
+            for i in range(5)
+        ]
+        serialized = [TimestampUtilities.datetime_to_str(t) for t in timestamps]
+
+        uut.write_many(
+            [a, b, a, b, a], tbase.DataType.INT32, [1, 2, 3, 4, 5], timestamps
+        )
+
+        uut.writers[0]._write_many.assert_called_once_with(
+            [a, a, a], tbase.DataType.INT32, ["1", "3", "5"], serialized[::2]
+        )
+        uut.writers[1]._write_many.assert_called_once_with(
+            [b, b], tbase.DataType.INT32, ["2", "4"], serialized[1::2]
+        )
+
+    def test__write_many_to_one_tag__passed_to_its_shard_unchanged(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(2)])
+        path = _paths_by_shard(uut)[1]
+
+        uut.write_many(path, tbase.DataType.DOUBLE, [1.5, 2.5])
+
+        uut.writers[1]._write_many.assert_called_once_with(
+            [path, path], tbase.DataType.DOUBLE, ["1.5", "2.5"], None
+        )
+        uut.writers[0]._write_many.assert_not_called()
+
+    def test__send_buffered_writes__shards_sent_at_same_time(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(3)])
+        barrier = threading.Barrier(3, timeout=5)
+        for writer in uut.writers:
+            writer.send_buffered_writes.side_effect = barrier.wait
+
+        uut.send_buffered_writes()
+
+        for writer in uut.writers:
+            writer.send_buffered_writes.assert_called_once_with()
+        uut.__exit__(None, None, None)
+
+    def test__shard_send_fails__other_shards_sent_and_error_raised(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(3)])
+        error = core.ApiException("failed")
+        uut.writers[0].send_buffered_writes.side_effect = error
+
+        with pytest.raises(core.ApiException) as excinfo:
+            uut.send_buffered_writes()
+
+        assert excinfo.value is error
+        uut.writers[1].send_buffered_writes.assert_called_once_with()
+        uut.writers[2].send_buffered_writes.assert_called_once_with()
+        uut.__exit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test__send_buffered_writes_async__every_shard_sent(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(2)])
+
+        await uut.send_buffered_writes_async()
+
+        for writer in uut.writers:
+            writer.send_buffered_writes_async.assert_awaited_once_with()
+
+    def test__pending_writes__summed_across_shards(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(3)])
+
+        assert uut.pending_writes == 3
+        assert uut.dropped_writes == 0
+
+    def test__closed__every_shard_closed_and_writer_unusable(self):
+        uut = tbase.ShardedTagWriter([_mock_shard() for _ in range(2)])
+
+        with uut:
+            pass
+
+        for writer in uut.writers:
+            writer.__enter__.assert_called_once_with()
+            writer.__exit__.assert_called_once_with(None, None, None)
+        with pytest.raises(ReferenceError):
+            uut.send_buffered_writes()
+        with pytest.raises(ReferenceError):
+            uut.clear_buffered_writes()
+
+    def test__bad_arguments__raises(self):
+        with pytest.raises(ValueError):
+            tbase.ShardedTagWriter([])
+        with pytest.raises(ValueError):
+            tbase.ShardedTagWriter([_mock_shard()]).write("", tbase.DataType.INT32, 1)
+
+
+class TestShardedTagWriterStandInServer:
+    def test__many_writes__every_write_sent_in_order_by_its_shard(self):
+        num_writes = 2000
+        paths = ["tag{}".format(i) for i in range(64)]
+
+        with StandInServer() as server:
+            manager = tbase.TagManager(
+                core.HttpConfiguration(server.uri, api_key="key")
+            )
+            with manager.create_sharded_writer(num_shards=4, buffer_size=50) as writer:
+                for i in range(num_writes):
+                    writer.write(paths[i % len(paths)], tbase.DataType.INT32, i)
+                shards = {path: writer.get_shard(path) for path in paths}
+                writers = writer.writers
+
+            values = server.values()
+            batches = list(server.batches)
+
+        assert len(values) == num_writes
+        for path in paths:
+            assert [int(v) for p, v in values if p == path] == list(
+                range(paths.index(path), num_writes, len(paths))
+            )
+        # Each request comes from a single shard, and every shard sent requests
+        batch_shards = [{shards[entry["path"]] for entry in batch} for batch in batches]
+        assert all(len(batch_shard) == 1 for batch_shard in batch_shards)
+        assert set.union(*batch_shards) == set(writers)
@@ -0,0 +1,154 @@
+import gc
+import tracemalloc
+
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+
+
+def _tag_json(index):
+    return {
+        "path": "area{}.device{}.tag{}".format(index % 10, index % 100, index),
+        "type": "DOUBLE" if index % 2 else "INT",
+        "keywords": ["keyword{}".format(index % 3), "shared"],
+        "properties": {
+            "units": "V" if index % 2 else "A",
+            "nitagRetention": "COUNT",
+            "nitagMaxHistoryCount": "1000",
+        },
+        "collectAggregates": index % 5 == 0,
+    }
+
+
+class TestTagCatalog:
+    def test__tags_added__get__round_trips_metadata(self):
+        tag = tbase.TagData("tag2", tbase.DataType.STRING, ["b"], {"prop": "value"})
+        tag.set_retention_days(7)
+        tag.collect_aggregates = True
+        uut = tbase.TagCatalog([tbase.TagData.from_json_dict(_tag_json(1))])
+        uut.append(tag)
+
+        assert len(uut) == 2
+        assert [t.to_json_dict() for t in uut] == [
+            tbase.TagData.from_json_dict(_tag_json(1)).to_json_dict(),
+            tag.to_json_dict(),
+        ]
+        assert uut[-1].retention_days == 7
+
+    def test__tag_changed__catalog_is_unchanged(self):
+        tag = tbase.TagData("tag", tbase.DataType.INT32, ["a"])
+        uut = tbase.TagCatalog([tag])
+
+        tag.keywords.append("b")
+        uut[0].keywords.append("c")
+
+        assert uut[0].keywords == ["a"]
+
+    def test__tags_added__paths_and_summaries__return_columns(self):
+        uut = tbase.TagCatalog(
+            tbase.TagData.from_json_dict(_tag_json(i)) for i in range(3)
+        )
+
+        assert list(uut.paths) == [_tag_json(i)["path"] for i in range(3)]
+        assert list(uut.summaries()) == [
+            tbase.TagSummary("area0.device0.tag0", tbase.DataType.INT32),
+            tbase.TagSummary("area1.device1.tag1", tbase.DataType.DOUBLE),
+            tbase.TagSummary("area2.device2.tag2", tbase.DataType.INT32),
+        ]
+
+    def test__same_metadata__shares_storage(self):
+        uut = tbase.TagCatalog(
+            tbase.TagData.from_json_dict(_tag_json(i)) for i in (0, 6)
+        )
+
+        assert uut._keywords[0] is uut._keywords[1]
+        assert uut._properties[0] is uut._properties[1]
+
+    def test__bad_arguments__raises(self):
+        uut = tbase.TagCatalog()
+
+        with pytest.raises(ValueError):
+            uut.append(None)
+        with pytest.raises(ValueError):
+            uut.extend(None)
+        with pytest.raises(IndexError):
+            uut[0]
+
+    def test__set_item__replaces_tag(self):
+        uut = tbase.TagCatalog([tbase.TagData("tag1"), tbase.TagData("tag2")])
+
+        uut[1] = tbase.TagData("tag3", tbase.DataType.STRING, ["a"])
+
+        assert list(uut.paths) == ["tag1", "tag3"]
+        assert uut[1].keywords == ["a"]
+
+    def test__saved__load__round_trips_metadata(self, tmp_path):
+        file_path = str(tmp_path / "catalog.bin")
+        tags = [tbase.TagData.from_json_dict(_tag_json(i)) for i in range(10)]
+        tags.append(tbase.TagData("\u00e9t\u00e9", tbase.DataType.BOOLEAN))
+        tbase.TagCatalog(tags).save(file_path)
+
+        loaded = tbase.TagCatalog.load(file_path)
+
+        assert [t.to_json_dict() for t in loaded] == [t.to_json_dict() for t in tags]
+        assert loaded._keywords[0] is loaded._keywords[3]
+        loaded.append(tbase.TagData.from_json_dict(_tag_json(0)))
+        assert loaded._keywords[-1] is loaded._keywords[0]
+
+    def test__property_value_not_string__saved__load__round_trips(self, tmp_path):
+        file_path = str(tmp_path / "catalog.bin")
+        tag = tbase.TagData("tag", tbase.DataType.INT32)
+        tag.replace_properties({"count": 5, "units": "V"})
+        tbase.TagCatalog([tag]).save(file_path)
+
+        loaded = tbase.TagCatalog.load(file_path)
+
+        assert loaded[0].properties == {"count": 5, "units": "V"}
+
+    def test__empty_catalog_saved__load__is_empty(self, tmp_path):
+        file_path = str(tmp_path / "catalog.bin")
+        tbase.TagCatalog().save(file_path)
+
+        assert len(tbase.TagCatalog.load(file_path)) == 0
+
+    def test__invalid_file__load__raises(self, tmp_path):
+        file_path = str(tmp_path / "catalog.bin")
+        tbase.TagCatalog([tbase.TagData("tag")]).save(file_path)
+        with open(file_path, "rb") as file:
+            data = file.read()
+
+        with open(file_path, "wb") as file:
+            file.write(data[:-1])
+        with pytest.raises(ValueError):
+            tbase.TagCatalog.load(file_path)
+
+        with open(file_path, "wb") as file:
+            file.write(b"not a catalog")
+        with pytest.raises(ValueError):
+            tbase.TagCatalog.load(file_path)
+
+    @pytest.mark.slow
+    def test__many_tags__memory_benchmark(self):
+        count = 100000
+        json_tags = [_tag_json(i) for i in range(count)]
+
+        def measure(build):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                result = build()
+                size = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            return result, size
+
+        def tag_objects():
+            tags = [tbase.TagData.from_json_dict(t) for t in json_tags]
+            for tag in tags:
+                tag.keywords, tag.properties
+            return tags
+
+        tags, tags_size = measure(tag_objects)
+        catalog, catalog_size = measure(lambda: tbase.TagCatalog(tags))
+
+        assert len(catalog) == count
+        assert catalog_size * 3 < tags_size
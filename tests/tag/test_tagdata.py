@@ -0,0 +1,71 @@
+import sys
+
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+
+
+class TestTagData:
+    def test__tag_data__has_no_instance_dictionary(self):
+        tag = tbase.TagData("tag", tbase.DataType.INT32)
+
+        with pytest.raises(AttributeError):
+            tag.unknown = 1
+
+    def test__no_keywords_or_properties__share_empty_collections(self):
+        tag1 = tbase.TagData("tag1", tbase.DataType.INT32)
+        tag2 = tbase.TagData.from_json_dict({"path": "tag2", "type": "INT"})
+
+        assert tag1._keywords is tag2._keywords
+        assert tag1._properties is tag2._properties
+
+    def test__no_keywords_or_properties__collections_are_mutable(self):
+        tag = tbase.TagData("tag", tbase.DataType.INT32)
+
+        tag.keywords.append("keyword")
+        tag.properties["prop"] = "value"
+
+        assert tag.keywords == ["keyword"]
+        assert tag.properties == {"prop": "value"}
+        assert tbase.TagData("other").keywords == []
+        assert tbase.TagData("other").properties == {}
+
+    def test__keywords_and_properties__strings_are_interned(self):
+        tag1 = tbase.TagData.from_json_dict(
+            {
+                "path": "tag1",
+                "type": "INT",
+                "keywords": ["".join(["key", "word"])],
+                "properties": {"".join(["pr", "op"]): "".join(["val", "ue"])},
+            }
+        )
+        tag2 = tbase.TagData(
+            "tag2",
+            tbase.DataType.INT32,
+            ["".join(["key", "wo", "rd"])],
+            {"".join(["p", "rop"]): "".join(["va", "lue"])},
+        )
+
+        assert tag1.keywords[0] is tag2.keywords[0] is sys.intern("keyword")
+        [(key1, value1)] = tag1.properties.items()
+        [(key2, value2)] = tag2.properties.items()
+        assert key1 is key2
+        assert value1 is value2
+
+    def test__keywords_accessed__replace_keywords__updates_same_list(self):
+        tag = tbase.TagData("tag", tbase.DataType.INT32, ["a"], {"prop": "value"})
+        keywords = tag.keywords
+        properties = tag.properties
+
+        tag.replace_keywords(["b", "c"])
+        tag.replace_properties({"other": "value"})
+
+        assert keywords == ["b", "c"]
+        assert properties == {"other": "value"}
+
+    def test__property_value_not_string__stored_unchanged(self):
+        tag = tbase.TagData("tag", tbase.DataType.INT32)
+
+        tag.replace_properties({"count": 5, "name": "value"})
+
+        assert tag.properties == {"count": 5, "name": "value"}
+        assert tag._compact_metadata() == ((), (("count", 5), ("name", "value")))
@@ -0,0 +1,240 @@
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+import pytest  # type: ignore
+from nisystemlink.clients import tag as tbase
+
+from .http.httpclienttestbase import HttpClientTestBase, MockResponse
+from .mock_manualresettimer import MockManualResetTimer
+
+
+def _tag(path, keywords=None, properties=None, data_type=tbase.DataType.INT32):
+    return tbase.TagData(path, data_type, keywords, properties)
+
+
+class TestTagIndex(HttpClientTestBase):
+    def setup_method(self, method):
+        super().setup_method(method)
+
+        def get_client_mock(*args, **kwargs):
+            return self._client
+
+        with mock.patch(
+            "nisystemlink.clients.tag._tag_manager.HttpClient", get_client_mock
+        ):
+            self._manager = tbase.TagManager(object())
+
+        self._uut = tbase.TagIndex(
+            [
+                _tag("a.b.tag1", ["k1", "k2"], {"units": "V"}),
+                _tag("a.b.tag2", ["k1"], {"units": "A"}),
+                _tag("a.c.tag3", ["k2"], {"units": "V", "site": "x"}),
+                _tag("b.tag4", None, {"site": "x"}),
+                _tag("other", ["k1", "k2"]),
+            ]
+        )
+
+    def test__no_criteria__query__returns_all_tags_by_path(self):
+        assert self._uut.query_paths() == [
+            "a.b.tag1",
+            "a.b.tag2",
+            "a.c.tag3",
+            "b.tag4",
+            "other",
+        ]
+        assert len(self._uut) == 5
+
+    def test__path_patterns__query__matches_any_pattern(self):
+        assert self._uut.query_paths(["a.b.*"]) == ["a.b.tag1", "a.b.tag2"]
+        assert self._uut.query_paths(["*.tag3", "other"]) == ["a.c.tag3", "other"]
+        assert self._uut.query_paths(["a.*.tag*", "a.b.tag1"]) == [
+            "a.b.tag1",
+            "a.b.tag2",
+            "a.c.tag3",
+        ]
+        assert self._uut.query_paths(["missing", "a.b"]) == []
+
+    def test__keywords_and_properties__query__matches_all(self):
+        assert self._uut.query_paths(keywords=["k1", "k2"]) == ["a.b.tag1", "other"]
+        assert self._uut.query_paths(properties={"units": "V", "site": "x"}) == [
+            "a.c.tag3"
+        ]
+        assert self._uut.query_paths(["a.*"], iter(["k2"]), {"units": "V"}) == [
+            "a.b.tag1",
+            "a.c.tag3",
+        ]
+        assert self._uut.query_paths(keywords=["unknown"]) == []
+
+    def test__query__returns_metadata(self):
+        [tag] = self._uut.query(["a.b.tag1"])
+
+        assert tag.path == "a.b.tag1"
+        assert tag.data_type == tbase.DataType.INT32
+        assert tag.keywords == ["k1", "k2"]
+        assert tag.properties == {"units": "V"}
+        assert self._uut.get("b.tag4").properties == {"site": "x"}
+        assert self._uut.get("missing") is None
+
+    def test__bad_arguments__query__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.query([])
+        with pytest.raises(ValueError):
+            self._uut.query_paths(["tag", None])
+        with pytest.raises(ValueError):
+            self._uut.query_paths(["tag,other"])
+
+    def test__refresh__applies_differences_within_paths(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {
+                        "tags": [
+                            {"path": "a.b.tag1", "type": "INT", "keywords": ["k3"]},
+                            {"path": "a.b.tag5", "type": "DOUBLE"},
+                        ],
+                        "totalCount": 2,
+                    }
+                ]
+            )
+        )
+
+        self._uut.refresh(self._manager, ["a.b.*"])
+
+        assert self._uut.query_paths() == [
+            "a.b.tag1",
+            "a.b.tag5",
+            "a.c.tag3",
+            "b.tag4",
+            "other",
+        ]
+        assert self._uut.query_paths(keywords=["k3"]) == ["a.b.tag1"]
+        assert self._uut.query_paths(keywords=["k1"]) == ["other"]
+        assert self._uut.query_paths(properties={"units": "A"}) == []
+        assert self._uut.get("a.b.tag5").data_type == tbase.DataType.DOUBLE
+
+    @pytest.mark.asyncio
+    async def test__refresh_async__applies_differences(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [{"tags": [{"path": "new", "type": "INT"}], "totalCount": 1}]
+            )
+        )
+
+        await self._uut.refresh_async(self._manager)
+
+        assert self._uut.query_paths() == ["new"]
+        assert self._uut.query_paths(keywords=["k1"]) == []
+
+    def test__many_changes__refresh__compacts_storage(self):
+        uut = tbase.TagIndex(_tag("tag{}".format(i)) for i in range(2000))
+
+        def mock_request(method, uri, params=None, data=None):
+            skip = int(params["skip"])
+            tags = [
+                {"path": "tag{}".format(i), "type": "DOUBLE"}
+                for i in range(skip, min(skip + 1000, 2000))
+            ]
+            return {"tags": tags, "totalCount": 2000}, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+        uut.refresh(self._manager)
+
+        assert len(uut) == 2000
+        assert len(uut._catalog) == 2000
+        assert uut.get("tag10").data_type == tbase.DataType.DOUBLE
+
+    def test__create_index_with_refresh_interval__timer_elapsed__refreshes(self):
+        timer = MockManualResetTimer()
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {"tags": [{"path": "tag1", "type": "INT"}], "totalCount": 1},
+                    {"tags": [{"path": "tag2", "type": "INT"}], "totalCount": 1},
+                ]
+            )
+        )
+
+        with mock.patch(
+            "nisystemlink.clients.tag._tag_manager.ManualResetTimer",
+            return_value=timer,
+        ):
+            uut = self._manager.create_index(
+                ["tag*"], refresh_interval=timedelta(seconds=1)
+            )
+        assert uut.query_paths() == ["tag1"]
+
+        timer.elapsed()
+        uut.close()
+        timer.elapsed()
+
+        assert uut.query_paths() == ["tag2"]
+        assert self._client.all_requests.call_count == 2
+
+    def test__bad_arguments__create_index__raises(self):
+        with pytest.raises(ValueError):
+            self._manager.create_index([])
+        with pytest.raises(ValueError):
+            self._manager.create_index(refresh_interval=timedelta(0))
+        with pytest.raises(ValueError):
+            asyncio.run(self._manager.create_index_async(max_concurrency=0))
+
+    def test__snapshot_file__create_index__saves_and_revalidates_snapshot(
+        self, tmp_path
+    ):
+        snapshot_file = str(tmp_path / "tags.bin")
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {"tags": [{"path": "tag1", "type": "INT"}], "totalCount": 1},
+                    {"tags": [{"path": "tag2", "type": "INT"}], "totalCount": 1},
+                ]
+            )
+        )
+
+        first = self._manager.create_index(["tag*"], snapshot_file=snapshot_file)
+        second = self._manager.create_index(["tag*"], snapshot_file=snapshot_file)
+        assert first.query_paths() == ["tag1"]
+        second._refresh_thread.join(5)
+
+        assert second.query_paths() == ["tag2"]
+        assert [t.path for t in tbase.TagCatalog.load(snapshot_file)] == ["tag2"]
+        assert self._client.all_requests.call_count == 2
+
+    def test__snapshot_of_other_paths__create_index__queries_server(self, tmp_path):
+        snapshot_file = str(tmp_path / "tags.bin")
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {"tags": [{"path": "a.tag", "type": "INT"}], "totalCount": 1},
+                    {"tags": [{"path": "b.tag", "type": "INT"}], "totalCount": 1},
+                ]
+            )
+        )
+
+        self._manager.create_index(["a.*"], snapshot_file=snapshot_file)
+        uut = self._manager.create_index(["b.*"], snapshot_file=snapshot_file)
+
+        assert uut.query_paths() == ["b.tag"]
+        assert uut._refresh_thread is None
+
+    @pytest.mark.asyncio
+    async def test__snapshot_file__create_index_async__loads_snapshot(self, tmp_path):
+        snapshot_file = str(tmp_path / "tags.bin")
+        tbase.TagCatalog([_tag("unscoped")]).save(snapshot_file)
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {"tags": [{"path": "tag1", "type": "INT"}], "totalCount": 1},
+                    {"tags": [{"path": "tag1", "type": "INT"}], "totalCount": 1},
+                ]
+            )
+        )
+
+        first = await self._manager.create_index_async(snapshot_file=snapshot_file)
+        second = await self._manager.create_index_async(snapshot_file=snapshot_file)
+        await second._refresh_task
+
+        assert first.query_paths() == ["tag1"]
+        assert second.query_paths() == ["tag1"]
+        assert self._client.all_requests.call_count == 2
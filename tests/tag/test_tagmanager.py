@@ -2472,6 +2472,213 @@ class TestTagManager(HttpClientTestBase):
             ],
         )
 
+    def test__create_writer_sending_in_background__sends_when_buffer_full(self):
+        path = "tag"
+        writer = self._uut.create_writer(buffer_size=2, send_in_background=True)
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        with writer:
+            writer.write(path, tbase.DataType.INT32, 1)
+            writer.write(path, tbase.DataType.INT32, 2)
+            writer.send_buffered_writes()
+
+            assert 1 == self._client.all_requests.call_count
+            call = self._client.all_requests.call_args_list[0]
+            assert ("POST", "/nitag/v2/update-current-values") == call[0]
+            updates = call[1]["data"][0]["updates"]
+            assert [u["value"]["value"] for u in updates] == ["1", "2"]
+
+    def test__create_writer_coalescing__sends_newest_value_per_tag(self):
+        writer = self._uut.create_writer(buffer_size=3, coalesce=True)
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        writer.write("tag", tbase.DataType.INT32, 1)
+        writer.write("tag", tbase.DataType.INT32, 2)
+        writer.write("tag", tbase.DataType.INT32, 3)
+
+        assert 1 == self._client.all_requests.call_count
+        updates = self._client.all_requests.call_args[1]["data"][0]["updates"]
+        assert [u["value"]["value"] for u in updates] == ["3"]
+        assert 2 == writer.coalesced_writes
+
+    def test__bad_max_concurrent_sends__create_writer__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.create_writer(
+                buffer_size=1, send_in_background=True, max_concurrent_sends=0
+            )
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, max_concurrent_sends=2)
+
+    def test__create_writer_with_max_pending_writes__drops_newest_writes(self):
+        writer = self._uut.create_writer(
+            buffer_size=10,
+            max_pending_writes=2,
+            overflow_policy=tbase.OverflowPolicy.DROP_NEWEST,
+        )
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        for i in range(3):
+            writer.write("tag", tbase.DataType.INT32, i)
+
+        # The full pending limit flushes the buffer before any write is dropped
+        assert 1 == self._client.all_requests.call_count
+        updates = self._client.all_requests.call_args[1]["data"][0]["updates"]
+        assert [u["value"]["value"] for u in updates] == ["0", "1"]
+        assert 1 == writer.pending_writes
+        assert 0 == writer.dropped_writes
+        assert 1 == writer.flush_latency.count
+
+    def test__bad_pending_limits__create_writer__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, max_pending_writes=0)
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, max_pending_bytes=0)
+        with pytest.raises(ValueError):
+            self._uut.create_writer(
+                buffer_size=1, overflow_timeout=timedelta(seconds=-1)
+            )
+
+    def test__create_writer_with_deadband__sends_only_changed_values(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        with self._uut.create_writer(buffer_size=100, deadband=0.5) as writer:
+            for value in [20.0, 20.1, 20.4, 20.6, 20.6, 19.9]:
+                writer.write("tag", tbase.DataType.DOUBLE, value)
+            writer.write("flag", tbase.DataType.BOOLEAN, True)
+            writer.write("flag", tbase.DataType.BOOLEAN, True)
+
+        assert 1 == self._client.all_requests.call_count
+        data = self._client.all_requests.call_args[1]["data"]
+        written = {e["path"]: [u["value"]["value"] for u in e["updates"]] for e in data}
+        assert {"tag": ["20.0", "20.6", "19.9"], "flag": ["True"]} == written
+        assert 4 == writer.filtered_writes
+
+    def test__bad_deadband__create_writer__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, deadband=-1)
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, deadband=1, deadband_percent=1)
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=1, max_silence=timedelta(seconds=1))
+
+    def test__create_sharded_writer__writes_sent_by_each_shard(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None] * 3)
+        )
+
+        with self._uut.create_sharded_writer(num_shards=3, buffer_size=100) as writer:
+            assert 3 == len(writer.writers)
+            paths = ["tag{}".format(i) for i in range(30)]
+            writer.write_many(paths, tbase.DataType.INT32, list(range(30)))
+
+        assert 3 == self._client.all_requests.call_count
+        written = {}
+        for args in self._client.all_requests.call_args_list:
+            for entry in args[1]["data"]:
+                written[entry["path"]] = entry["updates"][0]["value"]["value"]
+        assert {p: str(i) for i, p in enumerate(paths)} == written
+
+    def test__bad_num_shards__create_sharded_writer__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.create_sharded_writer(num_shards=0, buffer_size=1)
+        with pytest.raises(ValueError):
+            self._uut.create_sharded_writer(num_shards=2)
+
+    def test__create_adaptive_writer__starts_at_largest_settings(self):
+        with self._uut.create_writer(
+            buffer_size=100, max_buffer_time=timedelta(seconds=1), adaptive=True
+        ) as writer:
+            assert 100 == writer.buffer_size
+            assert timedelta(seconds=1) == writer.max_buffer_time
+            self._client.all_requests.configure_mock(
+                side_effect=self._get_mock_request([None])
+            )
+
+            writer.write("tag", tbase.DataType.INT32, 1)
+            writer.send_buffered_writes()
+
+            assert 1 == self._client.all_requests.call_count
+            assert writer.buffer_size <= 100
+            assert writer.max_buffer_time <= timedelta(seconds=1)
+
+    def test__create_adaptive_writer_without_buffer_time__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.create_writer(buffer_size=100, adaptive=True)
+
+    @pytest.mark.asyncio
+    async def test__bad_arguments__create_writer_async__raises(self):
+        with pytest.raises(ValueError):
+            await self._uut.create_writer_async(buffer_size=0)
+        with pytest.raises(ValueError):
+            await self._uut.create_writer_async(max_buffer_time=timedelta(0))
+        with pytest.raises(ValueError):
+            await self._uut.create_writer_async(
+                buffer_size=1, max_buffer_time=timedelta(0)
+            )
+
+    @pytest.mark.asyncio
+    async def test__create_writer_async_with_buffer_size__sends_when_buffer_full(self):
+        path = "tag"
+        writer = await self._uut.create_writer_async(buffer_size=2)
+        timestamp = datetime.now()
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        await writer.write_async(path, tbase.DataType.INT32, 1, timestamp=timestamp)
+        self._client.all_requests.assert_not_called()
+        await writer.write_async(path, tbase.DataType.INT32, 2, timestamp=timestamp)
+
+        utctime = datetime.utcfromtimestamp(timestamp.timestamp()).isoformat() + "Z"
+        self._client.all_requests.assert_called_once_with(
+            "POST",
+            "/nitag/v2/update-current-values",
+            params=None,
+            data=[
+                {
+                    "path": path,
+                    "updates": [
+                        {
+                            "value": {"type": "INT", "value": "1"},
+                            "timestamp": utctime,
+                        },
+                        {
+                            "value": {"type": "INT", "value": "2"},
+                            "timestamp": utctime,
+                        },
+                    ],
+                },
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test__create_writer_async_with_buffer_time__sends_when_timer_elapsed(
+        self,
+    ):
+        writer = await self._uut.create_writer_async(
+            max_buffer_time=timedelta(milliseconds=50)
+        )
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([None])
+        )
+
+        await writer.write_async("tag", tbase.DataType.INT32, 1)
+        self._client.all_requests.assert_not_called()
+        for i in range(100):
+            if self._client.all_requests.call_count > 0:
+                break
+            await asyncio.sleep(0.01)
+
+        assert 1 == self._client.all_requests.call_count
+
     def test__bad_arguments__read__raises(self):
         with pytest.raises(ValueError):
             self._uut.read(None, include_timestamp=True, include_aggregates=True)
@@ -2847,3 +3054,397 @@ class TestTagManager(HttpClientTestBase):
                 params={"path": path},
             ),
         ]
+
+    def _mock_selection_values(self, values):
+        def mock_request(method, uri, params=None, data=None):
+            if (method, uri) == ("POST", "/nitag/v2/selections"):
+                return (
+                    {"id": ",".join(data["searchPaths"])},
+                    MockResponse(method, uri),
+                )
+            elif (method, uri) == ("GET", "/nitag/v2/selections/{id}/values"):
+                return (
+                    [v for v in values if v["path"] in params["id"].split(",")],
+                    MockResponse(method, uri),
+                )
+            elif (method, uri) == ("DELETE", "/nitag/v2/selections/{id}"):
+                return None, MockResponse(method, uri)
+            else:
+                assert False, (method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+    def test__bad_arguments__read_many__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.read_many(None)
+        with pytest.raises(ValueError):
+            self._uut.read_many(["tag", None])
+        with pytest.raises(ValueError):
+            self._uut.read_many(["tag", " "])
+        with pytest.raises(ValueError):
+            self._uut.read_many(["tag", "*"])
+
+        assert self._client.all_requests.call_count == 0
+
+    def test__read_many__reads_values_with_temporary_selection(self):
+        utctime = "2022-08-19T16:17:30.123Z"
+        self._mock_selection_values(
+            [
+                {
+                    "path": "tag1",
+                    "current": {
+                        "value": {"type": "DOUBLE", "value": "3.5"},
+                        "timestamp": utctime,
+                    },
+                    "aggregates": {"min": "1", "max": "4", "count": 3, "avg": 2.5},
+                },
+                {"path": "tag2", "current": None},
+                {
+                    "path": "tag3",
+                    "current": {
+                        "value": {"type": "BOOLEAN", "value": "True"},
+                        "timestamp": utctime,
+                    },
+                },
+            ]
+        )
+
+        result = self._uut.read_many(["tag3", "tag2", "tag1", "missing", "tag3"])
+
+        assert self._client.all_requests.call_args_list == [
+            mock.call(
+                "POST",
+                "/nitag/v2/selections",
+                params=None,
+                data={
+                    "searchPaths": ["tag3", "tag2", "tag1", "missing"],
+                    "inactivityTimeout": 30,
+                },
+            ),
+            mock.call(
+                "GET",
+                "/nitag/v2/selections/{id}/values",
+                params={"id": "tag3,tag2,tag1,missing"},
+            ),
+            mock.call(
+                "DELETE",
+                "/nitag/v2/selections/{id}",
+                params={"id": "tag3,tag2,tag1,missing"},
+            ),
+        ]
+        assert list(result.keys()) == ["tag3", "tag2", "tag1"]
+        assert result["tag2"] is None
+        tag1 = result["tag1"]
+        assert tag1 is not None
+        assert tag1.data_type == tbase.DataType.DOUBLE
+        assert tag1.value == 3.5
+        assert tag1.timestamp is None
+        assert tag1.count is None
+        assert tag1.min is None
+        assert tag1.max is None
+        assert tag1.mean is None
+        tag3 = result["tag3"]
+        assert tag3 is not None
+        assert tag3.value is True
+
+    def test__read_many_with_timestamp_and_aggregates__includes_all_data(self):
+        self._mock_selection_values(
+            [
+                {
+                    "path": "tag1",
+                    "current": {
+                        "value": {"type": "INT", "value": "3"},
+                        "timestamp": "2022-08-19T16:17:30.123Z",
+                    },
+                    "aggregates": {"min": "1", "max": "4", "count": 3, "avg": 2.5},
+                }
+            ]
+        )
+
+        result = self._uut.read_many(
+            ["tag1"], include_timestamp=True, include_aggregates=True
+        )
+
+        tag1 = result["tag1"]
+        assert tag1 is not None
+        assert tag1.value == 3
+        assert tag1.timestamp == datetime(
+            2022, 8, 19, 16, 17, 30, 123000, tzinfo=timezone.utc
+        )
+        assert (tag1.count, tag1.min, tag1.max, tag1.mean) == (3, 1, 4, 2.5)
+
+    def test__many_paths__read_many__reads_in_chunks(self):
+        paths = ["tag{}".format(i) for i in range(5)]
+        self._mock_selection_values(
+            [
+                {"path": p, "current": {"value": {"type": "INT", "value": str(i)}}}
+                for i, p in enumerate(paths)
+            ]
+        )
+
+        with mock.patch.object(tbase.TagManager, "_READ_MANY_CHUNK_SIZE", 2):
+            result = self._uut.read_many(paths)
+
+        assert self._client.all_requests.call_count == 9
+        assert {p: v.value for p, v in result.items()} == {
+            p: i for i, p in enumerate(paths)
+        }
+
+    def test__empty_list__read_many__api_not_called(self):
+        assert self._uut.read_many([]) == {}
+        assert self._client.all_requests.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test__many_paths__read_many_async__reads_in_chunks(self):
+        paths = ["tag{}".format(i) for i in range(5)]
+        self._mock_selection_values(
+            [
+                {
+                    "path": p,
+                    "current": {
+                        "value": {"type": "STRING", "value": p},
+                        "timestamp": "2022-08-19T16:17:30.123Z",
+                    },
+                }
+                for p in paths
+            ]
+        )
+
+        with mock.patch.object(tbase.TagManager, "_READ_MANY_CHUNK_SIZE", 2):
+            result = await self._uut.read_many_async(paths, include_timestamp=True)
+
+        assert self._client.all_requests.call_count == 9
+        assert list(result.keys()) == paths
+        assert all(v.value == p for p, v in result.items())
+        assert all(v.timestamp is not None for v in result.values())
+
+    def test__create_caching_reader__reads_through_manager_once(self):
+        path = "test"
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request([{"type": "INT", "value": "3"}])
+        )
+
+        with self._uut.create_caching_reader(
+            time_to_live=timedelta(seconds=60)
+        ) as reader:
+            assert reader.read(path).value == 3
+            assert reader.read(path).value == 3
+
+        self._client.all_requests.assert_called_once_with(
+            "GET", "/nitag/v2/tags/{path}/values/current/value", params={"path": path}
+        )
+
+    @pytest.mark.asyncio
+    async def test__bad_arguments__try_read_many_async__raises(self):
+        with pytest.raises(ValueError):
+            await self._uut.try_read_many_async(None)
+        with pytest.raises(ValueError):
+            await self._uut.try_read_many_async(["tag", "*"])
+        with pytest.raises(ValueError):
+            await self._uut.try_read_many_async(["tag"], max_concurrency=0)
+        with pytest.raises(ValueError):
+            await self._uut.try_read_many_async(["tag"], timeout=timedelta(0))
+
+        assert self._client.all_requests.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test__some_reads_fail__try_read_many_async__returns_value_or_error_per_path(
+        self,
+    ):
+        error = core.ApiException("no such tag")
+
+        def mock_request(method, uri, params=None, data=None):
+            path = params["path"]
+            if path == "missing":
+                raise error
+            elif path == "empty":
+                return None, MockResponse(method, uri)
+            return {"type": "INT", "value": path[-1]}, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+        result = await self._uut.try_read_many_async(
+            ["tag1", "missing", "empty", "tag2"]
+        )
+
+        assert list(result.results.keys()) == ["tag1", "missing", "empty", "tag2"]
+        assert {p: v and v.value for p, v in result.values.items()} == {
+            "tag1": 1,
+            "empty": None,
+            "tag2": 2,
+        }
+        assert result.errors == {"missing": error}
+        assert result.latency.count == 4
+        assert result.latency.minimum <= result.latency.median <= result.latency.maximum
+
+    @pytest.mark.asyncio
+    async def test__many_paths__try_read_many_async__limits_concurrency(self):
+        paths = ["tag{}".format(i) for i in range(20)]
+        in_progress = []
+        max_in_progress = []
+
+        async def slow_read(path, include_timestamp, include_aggregates):
+            in_progress.append(path)
+            max_in_progress.append(len(in_progress))
+            await asyncio.sleep(0.01)
+            in_progress.remove(path)
+            return None
+
+        with mock.patch.object(self._uut, "_read_async", slow_read):
+            result = await self._uut.try_read_many_async(paths, max_concurrency=3)
+
+        assert max(max_in_progress) == 3
+        assert result.values == {p: None for p in paths}
+
+    @pytest.mark.asyncio
+    async def test__slow_read__try_read_many_async__times_out_that_read(self):
+        async def read(path, include_timestamp, include_aggregates):
+            if path == "slow":
+                await asyncio.sleep(10)
+            return None
+
+        with mock.patch.object(self._uut, "_read_async", read):
+            result = await self._uut.try_read_many_async(
+                ["fast", "slow"], timeout=timedelta(milliseconds=50)
+            )
+
+        assert result.values == {"fast": None}
+        assert isinstance(result.errors["slow"], asyncio.TimeoutError)
+
+    def test__parallel_query__iterate__pages_fetched_by_offset(self):
+        def mock_request(method, uri, params=None, data=None):
+            skip = int(params["skip"])
+            tags = [
+                {"path": "tag{}".format(i), "type": "INT"}
+                for i in range(skip, min(skip + 2, 7))
+            ]
+            return {"tags": tags, "totalCount": 7}, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+        result = self._uut.query(["tag*"], take=2, max_concurrency=3)
+        paths = [t.path for page in result for t in page]
+
+        assert paths == ["tag{}".format(i) for i in range(7)]
+        assert sorted(
+            c[1]["params"]["skip"] for c in self._client.all_requests.call_args_list
+        ) == ["0", "2", "4", "6"]
+
+    def test__bad_max_concurrency__query__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.query(max_concurrency=0)
+        with pytest.raises(ValueError):
+            asyncio.run(self._uut.query_async(max_concurrency=0))
+
+    def test__iter_query__yields_tags_lazily(self):
+        def mock_request(method, uri, params=None, data=None):
+            skip = int(params["skip"])
+            tags = [
+                {
+                    "path": "tag{}".format(i),
+                    "type": "INT",
+                    "keywords": ["kw"],
+                    "properties": {"prop": "value", "nitagRetention": "COUNT"},
+                }
+                for i in range(skip, min(skip + 2, 5))
+            ]
+            return {"tags": tags, "totalCount": 5}, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+        tags = self._uut.iter_query(["tag*"], take=2)
+        assert self._client.all_requests.call_count == 0
+        first = next(tags)
+        assert self._client.all_requests.call_count == 1
+        rest = list(tags)
+
+        assert [t.path for t in [first] + rest] == ["tag{}".format(i) for i in range(5)]
+        assert first.data_type == tbase.DataType.INT32
+        assert first.keywords == ["kw"]
+        assert first.properties == {"prop": "value"}
+        assert first.retention_type == tbase.RetentionType.COUNT
+
+    def test__iter_query_summaries__yields_paths_and_types(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {
+                        "tags": [
+                            {"path": "tag1", "type": "INT", "keywords": ["kw"]},
+                            {"path": "tag2", "type": "STRING"},
+                        ],
+                        "totalCount": 2,
+                    }
+                ]
+            )
+        )
+
+        summaries = list(self._uut.iter_query_summaries(["tag*"]))
+
+        assert summaries == [
+            tbase.TagSummary("tag1", tbase.DataType.INT32),
+            tbase.TagSummary("tag2", tbase.DataType.STRING),
+        ]
+
+    @pytest.mark.asyncio
+    async def test__iter_query_summaries_async__yields_paths_and_types(self):
+        def mock_request(method, uri, params=None, data=None):
+            skip = int(params["skip"])
+            tags = [
+                {"path": "tag{}".format(i), "type": "DOUBLE"}
+                for i in range(skip, min(skip + 2, 5))
+            ]
+            return {"tags": tags, "totalCount": 5}, MockResponse(method, uri)
+
+        self._client.all_requests.configure_mock(side_effect=mock_request)
+
+        summaries = [
+            s
+            async for s in self._uut.iter_query_summaries_async(
+                ["tag*"], take=2, max_concurrency=2
+            )
+        ]
+
+        assert summaries == [
+            tbase.TagSummary("tag{}".format(i), tbase.DataType.DOUBLE) for i in range(5)
+        ]
+
+    def test__bad_arguments__iter_query__raises(self):
+        with pytest.raises(ValueError):
+            self._uut.iter_query([])
+        with pytest.raises(ValueError):
+            self._uut.iter_query_summaries(skip=-1)
+        with pytest.raises(ValueError):
+            self._uut.iter_query_async(max_concurrency=0)
+        assert self._client.all_requests.call_count == 0
+
+    def test__retention_changed_before_properties_accessed__query__keeps_change(self):
+        self._client.all_requests.configure_mock(
+            side_effect=self._get_mock_request(
+                [
+                    {
+                        "tags": [
+                            {
+                                "path": "tag",
+                                "type": "INT",
+                                "properties": {
+                                    "prop": "value",
+                                    "nitagRetention": "COUNT",
+                                    "nitagMaxHistoryCount": "5",
+                                },
+                            }
+                        ],
+                        "totalCount": 1,
+                    }
+                ]
+            )
+        )
+
+        tag = next(self._uut.iter_query(["tag"]))
+        tag.set_retention_days(3)
+
+        assert tag.to_json_dict()["properties"] == {
+            "prop": "value",
+            "nitagRetention": "DURATION",
+            "nitagHistoryTTLDays": "3",
+        }
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest  # type: ignore
 from nisystemlink.clients.core import ApiException
 from nisystemlink.clients.tag import DataType, TagData, TagQueryResultCollection
@@ -266,3 +269,69 @@ class TestTagQueryResultCollectionTests:
             next(itr)
 
         uut.verify([0, 0])
+
+
+class TestTagQueryResultCollectionParallel:
+    class PagedTagQueryResultCollection(TagQueryResultCollection):
+        def __init__(self, tags, page_size, max_concurrency, short_page_skip=None):
+            super().__init__(
+                tags[:page_size], len(tags), 0, max_concurrency=max_concurrency
+            )
+            self._tags = tags
+            self._page_size = page_size
+            self._short_page_skip = short_page_skip
+            self._lock = threading.Lock()
+            self._in_progress = 0
+            self.max_in_progress = 0
+            self.calls = []
+
+        def _query_page(self, skip):
+            with self._lock:
+                self.calls.append(skip)
+                self._in_progress += 1
+                self.max_in_progress = max(self.max_in_progress, self._in_progress)
+            time.sleep(0.01)
+            with self._lock:
+                self._in_progress -= 1
+            size = self._page_size - (1 if skip == self._short_page_skip else 0)
+            return self._tags[skip : skip + size]
+
+    @classmethod
+    def _tags(cls, count):
+        return [TagData("tag{}".format(i), DataType.INT32) for i in range(count)]
+
+    def test__bad_max_concurrency__constructor__raises(self):
+        with pytest.raises(ValueError):
+            self.PagedTagQueryResultCollection(self._tags(1), 1, 0)
+
+    def test__parallel__iterate__pages_requested_concurrently_and_returned_in_order(
+        self,
+    ):
+        tags = self._tags(25)
+        uut = self.PagedTagQueryResultCollection(tags, 3, 4)
+
+        pages = list(uut)
+
+        assert [t for page in pages for t in page] == tags
+        assert [len(page) for page in pages] == [3] * 8 + [1]
+        assert sorted(uut.calls) == list(range(3, 25, 3))
+        assert uut.max_in_progress == 4
+
+    def test__parallel__page_shorter_than_expected__remaining_pages_requeried(self):
+        tags = self._tags(12)
+        uut = self.PagedTagQueryResultCollection(tags, 3, 2, short_page_skip=3)
+
+        pages = list(uut)
+
+        assert [t for page in pages for t in page] == tags
+        assert 5 in uut.calls
+
+    def test__parallel__stop_iterating_early__does_not_request_everything(self):
+        uut = self.PagedTagQueryResultCollection(self._tags(300), 3, 2)
+
+        itr = iter(uut)
+        next(itr)
+        next(itr)
+        itr.close()
+
+        assert len(uut.calls) <= 3
@@ -0,0 +1,113 @@
+import pytest  # type: ignore
+from nisystemlink.clients.tag import DataType, TagValueUtilities
+
+numpy = pytest.importorskip("numpy")
+
+
+class TestTagValueUtilities:
+    def test__double_values__converted_to_float64(self):
+        array = TagValueUtilities.to_numpy_array(
+            ["1.5", "-2", "1e3", "Infinity"], DataType.DOUBLE
+        )
+
+        assert array.dtype == numpy.float64
+        assert array.tolist() == [1.5, -2.0, 1000.0, float("inf")]
+
+    def test__missing_or_invalid_double_values__converted_to_nan(self):
+        array = TagValueUtilities.to_numpy_array(
+            ["1.5", None, "not a number"], DataType.DOUBLE
+        )
+
+        assert array[0] == 1.5
+        assert numpy.isnan(array[1])
+        assert numpy.isnan(array[2])
+
+    def test__integer_values__converted_to_integer_arrays(self):
+        int32 = TagValueUtilities.to_numpy_array(["1", "-2"], DataType.INT32)
+        uint64 = TagValueUtilities.to_numpy_array(
+            ["0", "18446744073709551615"], DataType.UINT64
+        )
+
+        assert int32.dtype == numpy.int64
+        assert int32.tolist() == [1, -2]
+        assert uint64.dtype == numpy.uint64
+        assert uint64.tolist() == [0, 18446744073709551615]
+
+    @pytest.mark.parametrize(
+        "data_type,values",
+        [
+            (DataType.INT32, ["1", None]),
+            (DataType.INT32, ["1", "1.5"]),
+            (DataType.UINT64, ["-1"]),
+            (DataType.BOOLEAN, ["True", "true"]),
+        ],
+    )
+    def test__invalid_value_without_missing_representation__raises(
+        self, data_type, values
+    ):
+        with pytest.raises(ValueError, match="index {}".format(len(values) - 1)):
+            TagValueUtilities.to_numpy_array(values, data_type)
+
+    def test__boolean_values__converted_to_bool(self):
+        array = TagValueUtilities.to_numpy_array(["True", "False"], DataType.BOOLEAN)
+
+        assert array.dtype == numpy.bool_
+        assert array.tolist() == [True, False]
+
+    def test__date_time_values__converted_to_datetime64(self):
+        array = TagValueUtilities.to_numpy_array(
+            ["2020-01-01T00:22:11.123456Z", "2020-01-01T00:22:11.1234567Z"],
+            DataType.DATE_TIME,
+        )
+
+        assert array.dtype == numpy.dtype("datetime64[us]")
+        assert array.tolist() == [
+            numpy.datetime64("2020-01-01T00:22:11.123456").item(),
+            numpy.datetime64("2020-01-01T00:22:11.123456").item(),
+        ]
+
+    def test__whole_second_date_time_values__converted_to_datetime64(self):
+        valid = TagValueUtilities.to_numpy_array(
+            ["2020-01-01T00:22:11Z"], DataType.DATE_TIME
+        )
+        with_missing = TagValueUtilities.to_numpy_array(
+            ["2020-01-01T00:22:11Z", None], DataType.DATE_TIME
+        )
+
+        assert valid[0] == numpy.datetime64("2020-01-01T00:22:11")
+        assert with_missing[0] == numpy.datetime64("2020-01-01T00:22:11")
+
+    def test__invalid_date_time_values__converted_to_nat(self):
+        array = TagValueUtilities.to_numpy_array(
+            [
+                "2020-01-01T00:22:11.5Z",
+                None,
+                "2020-01-01T00:22:11.5",
+                "2020-01-01Z",
+                "garbage",
+            ],
+            DataType.DATE_TIME,
+        )
+
+        assert array[0] == numpy.datetime64("2020-01-01T00:22:11.5")
+        assert numpy.isnat(array[1:]).all()
+
+    def test__string_values__converted_to_object_array(self):
+        array = TagValueUtilities.to_numpy_array(["a", None, "3"], DataType.STRING)
+
+        assert array.dtype == numpy.dtype(object)
+        assert array.tolist() == ["a", None, "3"]
+
+    def test__empty_values__empty_array_returned(self):
+        array = TagValueUtilities.to_numpy_array([], DataType.DOUBLE)
+
+        assert array.dtype == numpy.float64
+        assert len(array) == 0
+
+    def test__unknown_data_type__raises(self):
+        with pytest.raises(ValueError):
+            TagValueUtilities.to_numpy_array(["1"], DataType.UNKNOWN)
+
+    def test__values_none__raises(self):
+        with pytest.raises(ValueError):
+            TagValueUtilities.to_numpy_array(None, DataType.DOUBLE)
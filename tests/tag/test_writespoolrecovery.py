@@ -0,0 +1,162 @@
+"""Crash-recovery tests for spooled tag writes, against a local stand-in server."""
+
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import nisystemlink.clients.core as core
+import nisystemlink.clients.tag as tbase
+
+from .standinserver import StandInServer
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _segments(directory):
+    return sorted(n for n in os.listdir(directory) if n.endswith(".seg"))
+
+
+class TestWriteSpoolRecovery:
+    def test__process_crashed_while_server_down__writes_sent_by_next_process(
+        self, tmp_path
+    ):
+        spool_directory = str(tmp_path / "spool")
+        # Fill three buffers while nothing is listening, then exit without closing the
+        # writer
+        script = textwrap.dedent(
+            """
+            import os
+            import nisystemlink.clients.core as core
+            import nisystemlink.clients.tag as tbase
+
+            manager = tbase.TagManager(core.HttpConfiguration({uri!r}, api_key="key"))
+            writer = manager.create_writer(buffer_size=2, spool_directory={dir!r})
+            for i in range(6):
+                writer.write("tag", tbase.DataType.INT32, i)
+            os._exit(0)
+            """
+        ).format(uri="http://127.0.0.1:{}".format(_unused_port()), dir=spool_directory)
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+        assert _segments(spool_directory) == [
+            "00000000000000000000.seg",
+            "00000000000000000001.seg",
+            "00000000000000000002.seg",
+        ]
+
+        with StandInServer() as server:
+            manager = tbase.TagManager(
+                core.HttpConfiguration(server.uri, api_key="key")
+            )
+            writer = manager.create_writer(
+                buffer_size=2, spool_directory=spool_directory
+            )
+            with writer:
+                writer.write("tag", tbase.DataType.INT32, 6)
+
+            values = server.values()
+
+        assert values == [("tag", str(i)) for i in range(7)]
+        assert _segments(spool_directory) == []
+
+    def test__process_crashed_while_storing__truncated_segment_set_aside(
+        self, tmp_path
+    ):
+        spool_directory = str(tmp_path / "spool")
+        script = textwrap.dedent(
+            """
+            import os
+            import nisystemlink.clients.core as core
+            import nisystemlink.clients.tag as tbase
+
+            manager = tbase.TagManager(core.HttpConfiguration({uri!r}, api_key="key"))
+            writer = manager.create_writer(buffer_size=2, spool_directory={dir!r})
+            for i in range(6):
+                writer.write("tag", tbase.DataType.INT32, i)
+            os._exit(0)
+            """
+        ).format(uri="http://127.0.0.1:{}".format(_unused_port()), dir=spool_directory)
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+        # Simulate storage that lost the end of the first segment in the crash
+        first = os.path.join(spool_directory, "00000000000000000000.seg")
+        with open(first, "r+b") as file:
+            file.truncate(os.path.getsize(first) // 2)
+
+        errors = []
+        with StandInServer() as server:
+            manager = tbase.TagManager(
+                core.HttpConfiguration(server.uri, api_key="key")
+            )
+            writer = manager.create_writer(
+                buffer_size=2,
+                spool_directory=spool_directory,
+                send_error_callback=errors.append,
+            )
+            with writer:
+                writer.write("tag", tbase.DataType.INT32, 6)
+
+            values = server.values()
+
+        assert values == [("tag", str(i)) for i in range(2, 7)]
+        assert len(errors) == 1
+        assert _segments(spool_directory) == []
+        assert os.listdir(spool_directory) == ["00000000000000000000.seg.corrupt"]
+
+    def test__server_unavailable__writes_retried_in_order(self, tmp_path):
+        spool_directory = str(tmp_path / "spool")
+
+        with StandInServer() as server:
+            server.available = False
+            manager = tbase.TagManager(
+                core.HttpConfiguration(server.uri, api_key="key")
+            )
+            writer = manager.create_writer(
+                buffer_size=1, spool_directory=spool_directory
+            )
+            writer._spool._retry_interval = 0.01
+
+            for i in range(5):
+                writer.write("tag{}".format(i % 2), tbase.DataType.INT32, i)
+            time.sleep(0.05)
+            assert server.values() == []
+            server.available = True
+            values = server.wait_for_values(5)
+            writer.__exit__(None, None, None)
+
+        assert values == [("tag{}".format(i % 2), str(i)) for i in range(5)]
+        assert _segments(spool_directory) == []
+
+    def test__server_unavailable__send_buffered_writes_raises_and_keeps_writes(
+        self, tmp_path
+    ):
+        spool_directory = str(tmp_path / "spool")
+
+        with StandInServer() as server:
+            server.available = False
+            manager = tbase.TagManager(
+                core.HttpConfiguration(server.uri, api_key="key")
+            )
+            writer = manager.create_writer(
+                buffer_size=10, spool_directory=spool_directory
+            )
+
+            writer.write("tag", tbase.DataType.INT32, 1)
+            try:
+                writer.send_buffered_writes()
+            except core.ApiException as ex:
+                assert ex.http_status_code == 503
+            else:
+                assert False, "send_buffered_writes should have raised"
+            assert len(_segments(spool_directory)) == 1
+
+            server.available = True
+            writer.send_buffered_writes()
+            writer.__exit__(None, None, None)
+
+            assert server.values() == [("tag", "1")]